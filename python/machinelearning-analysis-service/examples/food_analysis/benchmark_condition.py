@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark do modelo de condição no pipeline de análise nutricional.
+
+Compara o custo por imagem de executar o modelo de condição uma vez por
+previsão top-k (comportamento anterior) com uma única execução por imagem,
+em lote e em paralelo com o classificador. Os dois modelos são redes
+convolucionais sintéticas do mesmo porte, de modo que apenas o número e o
+agrupamento das chamadas difere.
+"""
+
+import os
+import sys
+import time
+import argparse
+import tensorflow as tf
+
+# Configurar path para incluir a raiz do projeto
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from src.core.context import TensorFlowContext
+from src.models.generic.generic_model import GenericModel
+from examples.food_analysis.food_nutrition_model import FoodNutritionModel, FoodOutputs
+
+
+def build_model(num_classes: int) -> tf.keras.Model:
+    """Cria uma rede convolucional sintética com entrada 224x224x3."""
+    return tf.keras.Sequential([
+        tf.keras.Input((224, 224, 3)),
+        tf.keras.layers.Conv2D(32, 3, strides=2, activation="relu"),
+        tf.keras.layers.Conv2D(64, 3, strides=2, activation="relu"),
+        tf.keras.layers.Conv2D(128, 3, strides=2, activation="relu"),
+        tf.keras.layers.GlobalAveragePooling2D(),
+        tf.keras.layers.Dense(num_classes)
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do modelo de condição de alimentos")
+    parser.add_argument("--images", type=int, default=64, help="Número de imagens")
+    parser.add_argument("--batch-size", type=int, default=16, help="Tamanho do lote")
+    args = parser.parse_args()
+    
+    model = FoodNutritionModel()
+    model.batch_size = args.batch_size
+    model.metadata["batch_prediction"] = True
+    model._context = TensorFlowContext()
+    model._model = build_model(len(model.food_classes))
+    model._condition_model = build_model(len(model.condition_classes))
+    top_k = model.postprocessing_config["top_k"]
+    
+    images = [tf.random.uniform([1, 224, 224, 3]) for _ in range(args.images)]
+    
+    # Aquecimento
+    for image in images[:2]:
+        model.postprocess(model.predict(image))
+        model.analyze_food_condition(image)
+    model.predict(images[:args.batch_size])
+    
+    # Antes: classificador por imagem e modelo de condição por previsão top-k
+    start = time.perf_counter()
+    for image in images:
+        outputs = GenericModel.predict(model, image)
+        for _ in range(top_k):
+            model.analyze_food_condition(image)
+        model.postprocess(FoodOutputs(outputs))
+    before = (time.perf_counter() - start) / len(images)
+    
+    # Depois, imagem a imagem: condição uma vez, em paralelo com o classificador
+    start = time.perf_counter()
+    for image in images:
+        model.postprocess(model.predict(image))
+    after_single = (time.perf_counter() - start) / len(images)
+    
+    # Depois, em lote: classificador e condição agrupados em batch_size imagens
+    start = time.perf_counter()
+    for output in model.predict(images):
+        model.postprocess(output)
+    after_batched = (time.perf_counter() - start) / len(images)
+    
+    print(f"Imagens: {args.images}, top_k: {top_k}, batch_size: {args.batch_size}")
+    print(f"Antes (condição por previsão):        {before * 1000:8.2f} ms/imagem")
+    print(f"Depois (condição por imagem):         {after_single * 1000:8.2f} ms/imagem")
+    print(f"Depois (lote, condição em paralelo):  {after_batched * 1000:8.2f} ms/imagem")
+
+
+if __name__ == "__main__":
+    main()
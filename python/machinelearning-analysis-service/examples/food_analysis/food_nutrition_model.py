@@ -13,9 +13,11 @@ import json
 import numpy as np
 import tensorflow as tf
 from pathlib import Path
-from typing import Dict, Any, List, Tuple, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, NamedTuple, Tuple, Optional
 
 from src.models.generic.generic_model import GenericModel
+from src.models.food.nutrition_db import NUTRITION_FUZZY_MATCH, NutritionDatabase, get_nutrition_database
 
 # Diretório base para recursos do modelo
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -23,6 +25,12 @@ RESOURCES_DIR = os.path.join(BASE_DIR, "resources")
 MODELS_DIR = os.path.join(os.environ.get("MODELS_DIR", "models_repository"), "food_nutrition_analyzer")
 
 
+class FoodOutputs(NamedTuple):
+    """Saídas de uma imagem: classificador de alimentos e modelo de condição."""
+    food: Any
+    condition: Any = None
+
+
 class FoodNutritionModel(GenericModel):
     """
     Modelo especializado para análise nutricional de alimentos em imagens ou vídeos.
@@ -31,13 +39,16 @@ class FoodNutritionModel(GenericModel):
     para análise de alimentos, incluindo classificação, estado e informações nutricionais.
     """
     
-    def __init__(self, model_id: str = "food_nutrition_analyzer", version: str = "1.0.0"):
+    def __init__(self, model_id: str = "food_nutrition_analyzer", version: str = "1.0.0",
+                 fuzzy_match: Optional[bool] = None):
         """
         Inicializa o modelo de análise nutricional.
         
         Args:
             model_id: Identificador do modelo
             version: Versão do modelo
+            fuzzy_match: Se True, classes sem correspondência exata são buscadas
+                por similaridade de nome (None = NUTRITION_FUZZY_MATCH)
         """
         # Caminhos para recursos do modelo
         model_path = os.path.join(MODELS_DIR, "food_classifier")
@@ -60,6 +71,7 @@ class FoodNutritionModel(GenericModel):
         
         # Carregar base de dados nutricional
         self.nutrition_db = self._load_nutrition_database(nutrition_db_path)
+        self.fuzzy_match = NUTRITION_FUZZY_MATCH if fuzzy_match is None else fuzzy_match
         
         # Carregar mapeamentos de classes
         class_mapping_path = os.path.join(RESOURCES_DIR, "food_classes.json")
@@ -88,16 +100,19 @@ class FoodNutritionModel(GenericModel):
         # Modelo secundário para análise de condição do alimento
         self.condition_model_path = condition_model_path
         self._condition_model = None
+        
+        # Thread que executa o modelo de condição junto com o classificador
+        self._condition_executor: Optional[ThreadPoolExecutor] = None
     
-    def _load_nutrition_database(self, path: str) -> Dict[str, Dict[str, Any]]:
+    def _load_nutrition_database(self, path: str) -> NutritionDatabase:
         """
-        Carrega a base de dados nutricional.
+        Carrega a base de dados nutricional (compartilhada entre instâncias).
         
         Args:
             path: Caminho para o arquivo JSON com dados nutricionais
             
         Returns:
-            Dicionário mapeando alimentos para informações nutricionais
+            Base nutricional indexada por nome, apelidos e trigramas
         """
         if not os.path.exists(path):
             # Criar pasta de recursos se não existir
@@ -107,10 +122,8 @@ class FoodNutritionModel(GenericModel):
             default_db = self._create_default_nutrition_db()
             with open(path, 'w') as f:
                 json.dump(default_db, f, indent=2)
-            return default_db
         
-        with open(path, 'r') as f:
-            return json.load(f)
+        return get_nutrition_database(path)
     
     def _create_default_nutrition_db(self) -> Dict[str, Dict[str, Any]]:
         """
@@ -279,37 +292,95 @@ class FoodNutritionModel(GenericModel):
             except Exception as e:
                 print(f"Aviso: Não foi possível carregar modelo de condição: {e}")
     
-    def analyze_food_condition(self, image: tf.Tensor, food_class: str) -> Dict[str, Any]:
+    def predict(self, inputs: Any) -> Any:
         """
-        Analisa a condição (fresco, estragado, etc.) de um alimento.
+        Executa o classificador e o modelo de condição sobre a mesma entrada.
+        
+        O modelo de condição roda uma única vez por imagem, sobre o tensor
+        pré-processado, em paralelo com o classificador principal. Em lotes,
+        as imagens são agrupadas em chamadas de até batch_size itens.
         
         Args:
-            image: Imagem pré-processada
-            food_class: Classe do alimento identificado
+            inputs: Tensor de uma imagem ou lista de tensores
             
         Returns:
-            Dicionário com condição do alimento e confiança
+            FoodOutputs (ou lista de FoodOutputs, uma por item)
         """
         if self._condition_model is None:
+            outputs = super().predict(inputs)
+            if isinstance(outputs, list):
+                return [FoodOutputs(output) for output in outputs]
+            return FoodOutputs(outputs)
+        
+        if self._condition_executor is None:
+            self._condition_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"{self.model_id}-condition")
+        
+        condition_future = self._condition_executor.submit(self.predict_condition, inputs)
+        outputs = super().predict(inputs)
+        condition_outputs = condition_future.result()
+        
+        if isinstance(outputs, list):
+            return [FoodOutputs(output, condition) for output, condition in zip(outputs, condition_outputs)]
+        return FoodOutputs(outputs, condition_outputs)
+    
+    def predict_condition(self, inputs: Any) -> Any:
+        """
+        Executa o modelo de condição sobre imagens pré-processadas.
+        
+        Args:
+            inputs: Tensor [1, H, W, C] ou lista desses tensores
+            
+        Returns:
+            Saída do modelo (lista com uma saída por item para listas de entrada)
+        """
+        if not isinstance(inputs, list):
+            return self._context.run_inference(self._condition_model, inputs)
+        
+        outputs = []
+        for start in range(0, len(inputs), self.batch_size):
+            chunk = inputs[start:start + self.batch_size]
+            batched_inputs = tf.concat(chunk, axis=0) if chunk[0].shape.rank == 4 else tf.stack(chunk)
+            batch_outputs = self._context.run_inference(self._condition_model, batched_inputs)
+            outputs.extend(batch_outputs[i:i + 1] for i in range(len(chunk)))
+        return outputs
+    
+    def _condition_from_output(self, condition_output: Any) -> Dict[str, Any]:
+        """
+        Converte a saída do modelo de condição em condição e confiança.
+        
+        Args:
+            condition_output: Saída do modelo para uma imagem (None = indisponível)
+            
+        Returns:
+            Dicionário com condição do alimento e confiança
+        """
+        if condition_output is None:
             # Retornar valor padrão se modelo não disponível
             return {"condition": "unknown", "confidence": 0.0}
         
-        # Fazer predição com modelo de condição
-        condition_output = self._context.run_inference(self._condition_model, image)
-        
-        # Processar saída
         condition_probs = tf.nn.softmax(condition_output, axis=-1).numpy()[0]
-        condition_id = np.argmax(condition_probs)
-        confidence = float(condition_probs[condition_id])
-        
-        # Obter nome da condição
-        condition_name = self.condition_classes.get(condition_id, "unknown")
+        condition_id = int(np.argmax(condition_probs))
         
         return {
-            "condition": condition_name,
-            "confidence": confidence
+            "condition": self.condition_classes.get(condition_id, "unknown"),
+            "confidence": float(condition_probs[condition_id])
         }
     
+    def analyze_food_condition(self, image: tf.Tensor, food_class: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Analisa a condição (fresco, estragado, etc.) do alimento em uma imagem.
+        
+        Args:
+            image: Imagem pré-processada
+            food_class: Classe do alimento identificado (não usada pelo modelo)
+            
+        Returns:
+            Dicionário com condição do alimento e confiança
+        """
+        if self._condition_model is None:
+            return self._condition_from_output(None)
+        return self._condition_from_output(self.predict_condition(image))
+    
     def get_nutrition_info(self, food_class: str) -> Dict[str, Any]:
         """
         Obtém informações nutricionais para um alimento.
@@ -320,22 +391,55 @@ class FoodNutritionModel(GenericModel):
         Returns:
             Dicionário com informações nutricionais
         """
-        # Buscar na base de dados
-        if food_class in self.nutrition_db:
-            return self.nutrition_db[food_class]
+        return self.get_nutrition_info_batch([food_class])[0]
+    
+    def get_nutrition_info_batch(self, food_classes: List[str]) -> List[Dict[str, Any]]:
+        """
+        Obtém informações nutricionais de vários alimentos em uma única busca.
         
-        # Retornar valores padrão se não encontrado
-        return {
-            "calories": 0,
-            "protein": 0,
-            "carbs": 0,
-            "fat": 0,
-            "fiber": 0,
-            "vitamins": [],
-            "minerals": [],
-            "health_tips": ["Informações nutricionais não disponíveis"],
-            "diet_type": ["desconhecido"]
-        }
+        Classes são resolvidas pelo nome normalizado, por apelido e, com
+        fuzzy_match, por similaridade de nome; sem correspondência, são
+        retornados valores padrão com "nutrition_match" None.
+        
+        Args:
+            food_classes: Classes dos alimentos
+            
+        Returns:
+            Lista com as informações nutricionais de cada classe
+        """
+        infos = []
+        records = self.nutrition_db.find_batch(food_classes, fuzzy=self.fuzzy_match)
+        for food_class, record in zip(food_classes, records):
+            if record is None:
+                # Retornar valores padrão se não encontrado
+                print(f"Aviso: Classe de alimento sem informações nutricionais: {food_class}")
+                infos.append({
+                    "calories": 0,
+                    "protein": 0,
+                    "carbs": 0,
+                    "fat": 0,
+                    "fiber": 0,
+                    "vitamins": [],
+                    "minerals": [],
+                    "health_tips": ["Informações nutricionais não disponíveis"],
+                    "diet_type": ["desconhecido"],
+                    "nutrition_match": None
+                })
+                continue
+            
+            infos.append({
+                "calories": record["calories"],
+                "protein": record["proteins"],
+                "carbs": record["carbohydrates"],
+                "fat": record["fats"],
+                "fiber": record["fiber"],
+                "vitamins": record["vitamins"],
+                "minerals": record["minerals"],
+                "health_tips": record["health_tips"],
+                "diet_type": record["diet_type"] or ["desconhecido"],
+                "nutrition_match": {"key": record["key"], "match": record["match"]}
+            })
+        return infos
     
     def analyze_health_impact(self, nutrition_info: Dict[str, Any], condition: str) -> str:
         """
@@ -375,18 +479,26 @@ class FoodNutritionModel(GenericModel):
             else:
                 return "Alto valor calórico, consumo moderado recomendado"
     
-    def postprocess(self, outputs: Any) -> Dict[str, Any]:
+    def postprocess(self, outputs: Any, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Processa a saída do modelo e gera análise nutricional completa.
         
         Args:
-            outputs: Saída do modelo de classificação
+            outputs: FoodOutputs produzido por predict (ou a saída do classificador)
+            params: Parâmetros de pós-processamento da requisição
             
         Returns:
             Dicionário com análise completa dos alimentos
         """
+        if isinstance(outputs, list):
+            # Vídeo: agregação do GenericModel sobre a saída do classificador
+            return super().postprocess([getattr(output, 'food', output) for output in outputs], params)
+        
+        if not isinstance(outputs, FoodOutputs):
+            outputs = FoodOutputs(outputs)
+        
         # Processar classificação básica usando GenericModel
-        base_results = super().postprocess(outputs)
+        base_results = super().postprocess(outputs.food, params)
         
         # Extrair previsões
         if "predictions" not in base_results:
@@ -394,21 +506,20 @@ class FoodNutritionModel(GenericModel):
         
         predictions = base_results["predictions"]
         
+        # A condição é da imagem, calculada uma única vez para todas as previsões
+        condition_result = self._condition_from_output(outputs.condition)
+        
+        # Informações nutricionais de todas as previsões em uma única busca
+        food_classes = [pred["class_name"].lower() for pred in predictions]
+        nutrition_infos = self.get_nutrition_info_batch(food_classes)
+        
         # Formatar resultados por alimento
         food_items = []
         
-        for pred in predictions:
-            # Obter classe e confiança
-            food_class = pred["class_name"].lower()
+        for pred, food_class, nutrition_info in zip(predictions, food_classes, nutrition_infos):
+            # Obter confiança
             confidence = pred["confidence"]
             
-            # Analisar condição do alimento usando o modelo secundário
-            # Estamos usando a mesma imagem para analisar a condição
-            condition_result = self.analyze_food_condition(outputs, food_class)
-            
-            # Obter informações nutricionais
-            nutrition_info = self.get_nutrition_info(food_class)
-            
             # Analisar impacto na saúde
             health_impact = self.analyze_health_impact(nutrition_info, condition_result["condition"])
             
@@ -429,6 +540,7 @@ class FoodNutritionModel(GenericModel):
                 },
                 "health_tips": nutrition_info.get("health_tips", []),
                 "diet_type": nutrition_info.get("diet_type", ["desconhecido"]),
+                "nutrition_match": nutrition_info.get("nutrition_match"),
                 "health_impact": health_impact
             }
             
@@ -5,6 +5,7 @@ Testes para o modelo de análise nutricional de alimentos.
 import os
 import sys
 import pytest
+from collections.abc import Mapping
 import numpy as np
 import tensorflow as tf
 
@@ -12,7 +13,8 @@ import tensorflow as tf
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
 sys.path.insert(0, project_root)
 
-from examples.food_analysis.food_nutrition_model import FoodNutritionModel
+from examples.food_analysis.food_nutrition_model import FoodNutritionModel, FoodOutputs
+from src.models.generic.generic_model import GenericModel
 
 
 class TestFoodNutritionModel:
@@ -32,7 +34,7 @@ class TestFoodNutritionModel:
     def test_nutrition_db_loaded(self, model):
         """Testa se a base de dados nutricional foi carregada."""
         assert model.nutrition_db is not None
-        assert isinstance(model.nutrition_db, dict)
+        assert isinstance(model.nutrition_db, Mapping)
         assert len(model.nutrition_db) > 0
         
         # Verificar se contém pelo menos alguns alimentos comuns
@@ -90,8 +92,8 @@ class TestFoodNutritionModel:
     
     def test_postprocess(self, model, monkeypatch):
         """Testa o pós-processamento dos resultados."""
-        # Mock para a função de predição
-        def mock_process_single_classification(self, output):
+        # Mock para a classificação do GenericModel
+        def mock_generic_postprocess(self, outputs, params=None):
             return {
                 "predictions": [
                     {"class_name": "apple", "confidence": 0.9},
@@ -99,18 +101,18 @@ class TestFoodNutritionModel:
                 ]
             }
         
-        # Mock para a função de análise de condição
-        def mock_analyze_food_condition(self, image, food_class):
+        # Mock para a conversão da saída do modelo de condição
+        condition_calls = []
+        def mock_condition_from_output(self, condition_output):
+            condition_calls.append(condition_output)
             return {"condition": "fresh", "confidence": 0.85}
         
         # Aplicar mocks
-        monkeypatch.setattr(FoodNutritionModel, "_process_single_classification", 
-                           mock_process_single_classification)
-        monkeypatch.setattr(FoodNutritionModel, "analyze_food_condition",
-                           mock_analyze_food_condition)
+        monkeypatch.setattr(GenericModel, "postprocess", mock_generic_postprocess)
+        monkeypatch.setattr(FoodNutritionModel, "_condition_from_output", mock_condition_from_output)
         
         # Simular saída do modelo
-        mock_output = tf.constant([[0.1, 0.9, 0.0, 0.0]])
+        mock_output = FoodOutputs(tf.constant([[0.1, 0.9, 0.0, 0.0]]), tf.constant([[2.0, 0.0]]))
         
         # Processar resultados
         results = model.postprocess(mock_output)
@@ -120,9 +122,37 @@ class TestFoodNutritionModel:
         assert len(results["food_items"]) > 0
         assert results["count"] == len(results["food_items"])
         
+        # Condição avaliada uma única vez por imagem
+        assert len(condition_calls) == 1
+        
         food_item = results["food_items"][0]
         assert food_item["name"] == "apple"
         assert "confidence" in food_item
         assert "condition" in food_item
         assert "nutrition" in food_item
         assert "health_impact" in food_item
+    
+    def test_condition_model_batched(self, model):
+        """Testa que o modelo de condição roda uma vez por lote de imagens."""
+        condition_model = object()
+        calls = {"condition": 0}
+        
+        class FakeContext:
+            def run_inference(self, m, inputs):
+                if m is condition_model:
+                    calls["condition"] += 1
+                    return tf.one_hot([1] * int(inputs.shape[0]), depth=len(model.condition_classes)) * 5
+                return tf.one_hot([0] * int(inputs.shape[0]), depth=len(model.food_classes)) * 5
+        
+        model._context = FakeContext()
+        model._model = object()
+        model._condition_model = condition_model
+        
+        images = [tf.zeros([1, 8, 8, 3]) for _ in range(3)]
+        outputs = model.predict(images)
+        
+        assert calls["condition"] == 1
+        assert len(outputs) == 3
+        
+        result = model.postprocess(outputs[2])
+        assert result["food_items"][0]["condition"] == model.condition_classes[1]
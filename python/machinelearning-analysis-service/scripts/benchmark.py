@@ -23,6 +23,8 @@ sys.path.insert(0, project_root)
 
 from src.core.registry import ModelRegistry
 from src.core.context import TensorFlowContext, ONNXContext, PyTorchContext
+from src.models.generic.processors import ImageProcessor, BatchProcessor
+from src.setup import setup_models
 
 # Configurar logging
 logging.basicConfig(
@@ -68,20 +70,22 @@ def load_test_images(image_dir, size=(224, 224), batch_size=1, num_images=None):
     
     logger.info(f"Carregando {len(image_paths)} imagens")
     
-    # Carregar e pré-processar imagens
-    images = []
-    for path in tqdm(image_paths, desc="Carregando imagens"):
-        try:
-            img = tf.io.read_file(str(path))
-            img = tf.image.decode_image(img, channels=3, expand_animations=False)
-            img = tf.image.resize(img, size)
-            img = tf.cast(img, tf.float32) / 255.0
-            images.append(img)
-        except Exception as e:
-            logger.warning(f"Erro ao carregar imagem {path}: {e}")
+    # Carregar e pré-processar imagens em paralelo (tf.data)
+    image_processor = ImageProcessor(target_size=size, normalize=True, add_batch_dim=False)
+    batch_processor = BatchProcessor(
+        image_processor=image_processor,
+        batch_size=max(batch_size, 32),
+        ignore_errors=True
+    )
+    
+    images, indices = batch_processor.process_batch([str(path) for path in image_paths], return_indices=True)
+    
+    loaded = set(indices)
+    skipped = [str(path) for i, path in enumerate(image_paths) if i not in loaded]
+    if skipped:
+        logger.warning(f"{len(skipped)} imagens não puderam ser carregadas: {', '.join(skipped)}")
     
-    # Converter para batch
-    return tf.stack(images)
+    return images
 
 
 def benchmark_model(model_id, version, context_name, batch_size=1, num_runs=10, image_dir=None):
@@ -154,6 +158,108 @@ def benchmark_model(model_id, version, context_name, batch_size=1, num_runs=10,
     return stats
 
 
+def _to_numpy(outputs):
+    """Converte saídas do modelo (tensores, listas ou dicionários) em um array achatado por item."""
+    if isinstance(outputs, dict):
+        outputs = [outputs[key] for key in sorted(outputs)]
+    if isinstance(outputs, (list, tuple)):
+        return np.concatenate([_to_numpy(output) for output in outputs], axis=-1)
+    outputs = outputs.numpy() if hasattr(outputs, 'numpy') else np.asarray(outputs)
+    return outputs.reshape(outputs.shape[0], -1).astype(np.float32)
+
+
+def compare_variants(model_id, version, base_context, variant_contexts, batch_size=1, num_runs=10, image_dir=None):
+    """
+    Compara variantes quantizadas com o modelo em float32.
+    
+    Todas as variantes recebem as mesmas entradas, pré-processadas pelo próprio
+    modelo. A precisão é medida contra as saídas do modelo original.
+    
+    Args:
+        model_id: ID do modelo
+        version: Versão do modelo
+        base_context: Contexto do modelo original (referência)
+        variant_contexts: Contextos das variantes (ex.: onnx_int8, tflite_float16)
+        batch_size: Tamanho do lote
+        num_runs: Número de execuções
+        image_dir: Diretório com imagens de teste
+        
+    Returns:
+        Dict com tempos, speedup e diferença de precisão de cada variante
+    """
+    registry = ModelRegistry()
+    base = registry.create_model_context(model_id, version, base_context)
+    if base is None:
+        logger.error(f"Modelo {model_id}@{version} ou contexto {base_context} não encontrado")
+        return None
+    
+    # Entradas pré-processadas pelo próprio modelo
+    if image_dir:
+        image_paths = sorted(str(path) for ext in ('.jpg', '.jpeg', '.png') for path in Path(image_dir).glob(f'*{ext}'))
+        model_processor = base.model.image_processor
+        image_processor = ImageProcessor(
+            target_size=model_processor.target_size,
+            normalize=model_processor.normalize,
+            mean=model_processor.mean,
+            std=model_processor.std,
+            add_batch_dim=False,
+            output_dtype=model_processor.output_dtype
+        )
+        batch_processor = BatchProcessor(image_processor, ignore_errors=True)
+        test_data = batch_processor.process_batch(image_paths[:max(batch_size, 32)])
+    else:
+        input_shape = getattr(base.model, 'input_shape', [None, 224, 224, 3])
+        test_data = tf.random.uniform([max(batch_size, 32)] + list(input_shape[1:]), 0, 1)
+    
+    def run(model_context):
+        batches = [test_data[i:i + batch_size] for i in range(0, int(test_data.shape[0]), batch_size)]
+        outputs = np.concatenate([_to_numpy(model_context.model.predict(batch)) for batch in batches])
+        
+        times = []
+        for _ in range(num_runs):
+            start_time = time.time()
+            model_context.model.predict(batches[0])
+            times.append(time.time() - start_time)
+        return outputs, float(np.mean(times))
+    
+    reference, base_time = run(base)
+    results = {
+        "model_id": model_id,
+        "version": version,
+        "base_context": base_context,
+        "batch_size": batch_size,
+        "num_samples": int(reference.shape[0]),
+        "base_mean_time": base_time,
+        "variants": {}
+    }
+    
+    for context_name in variant_contexts:
+        variant = registry.create_model_context(model_id, version, context_name)
+        if variant is None:
+            logger.warning(f"Variante {context_name} indisponível para {model_id}@{version}")
+            continue
+        
+        outputs, variant_time = run(variant)
+        stats = {
+            "mean_time": variant_time,
+            "speedup": base_time / variant_time if variant_time > 0 else None,
+            "mean_abs_diff": float(np.mean(np.abs(outputs - reference))),
+            "max_abs_diff": float(np.max(np.abs(outputs - reference)))
+        }
+        # Para classificação, a concordância do top-1 com o modelo original
+        if getattr(base.model, 'task_type', None) == 'classification':
+            stats["top1_agreement"] = float(np.mean(np.argmax(outputs, -1) == np.argmax(reference, -1)))
+        
+        results["variants"][context_name] = stats
+        logger.info(
+            f"{context_name}: speedup {stats['speedup']:.2f}x, "
+            f"diferença média {stats['mean_abs_diff']:.5f}"
+            + (f", top-1 {stats['top1_agreement']:.2%}" if "top1_agreement" in stats else "")
+        )
+    
+    return results
+
+
 def save_results(results, output_dir=RESULTS_DIR):
     """
     Salva resultados do benchmark.
@@ -190,9 +296,28 @@ def main():
                         help="Diretório com imagens de teste")
     parser.add_argument("--output-dir", type=str, default=RESULTS_DIR,
                         help="Diretório para salvar resultados")
+    parser.add_argument("--compare-variants", type=str, nargs="+", default=None,
+                        help="Contextos de variantes a comparar com --context (ex.: onnx_int8 tflite_float16)")
     
     args = parser.parse_args()
     
+    # Registrar modelos e contextos do serviço
+    setup_models()
+    
+    if args.compare_variants:
+        results = compare_variants(
+            model_id=args.model_id,
+            version=args.version,
+            base_context=args.context,
+            variant_contexts=args.compare_variants,
+            batch_size=args.batch_size,
+            num_runs=args.num_runs,
+            image_dir=args.image_dir
+        )
+        if results:
+            save_results(results, args.output_dir)
+        return
+    
     # Executar benchmark
     results = benchmark_model(
         model_id=args.model_id,
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Script de benchmark dos índices vetoriais.
+
+Gera vetores sintéticos agrupados (semelhantes a embeddings reais, que se
+concentram em regiões do espaço), constrói cada tipo de índice e mede a
+revocação@k em relação à busca exata e a latência por consulta. O índice IVF
+é avaliado com vários valores de nprobe, mostrando a curva revocação x latência.
+"""
+
+import os
+import sys
+import time
+import argparse
+import logging
+import tempfile
+import numpy as np
+
+# Configurar paths para importar módulos do projeto
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.indexes import FlatIndex, IVFIndex, FaissIndex, normalize_vectors
+
+# Configurar logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(message)s",
+    handlers=[logging.StreamHandler()]
+)
+
+logger = logging.getLogger(__name__)
+
+
+def generate_vectors(num_vectors, dimension, num_clusters, seed=0, chunk_size=100000):
+    """
+    Gera vetores normalizados em torno de centros aleatórios.
+    
+    Args:
+        num_vectors: Número de vetores
+        dimension: Dimensão dos vetores
+        num_clusters: Número de agrupamentos
+        seed: Semente aleatória
+        chunk_size: Vetores gerados por iteração (limita a memória temporária)
+    
+    Returns:
+        Tupla (vetores [N, dimensão], centros dos agrupamentos)
+    """
+    rng = np.random.default_rng(seed)
+    centers = normalize_vectors(rng.normal(size=(num_clusters, dimension)), dimension)
+    
+    vectors = np.empty((num_vectors, dimension), dtype=np.float32)
+    for start in range(0, num_vectors, chunk_size):
+        size = min(chunk_size, num_vectors - start)
+        noise = rng.normal(scale=0.5 / np.sqrt(dimension), size=(size, dimension))
+        vectors[start:start + size] = centers[rng.integers(0, num_clusters, size)] + noise
+    
+    return normalize_vectors(vectors, dimension), centers
+
+
+def generate_queries(vectors, num_queries, seed=1):
+    """Gera consultas próximas (mas não idênticas) a vetores do conjunto."""
+    rng = np.random.default_rng(seed)
+    base = vectors[rng.choice(len(vectors), num_queries, replace=False)]
+    noise = rng.normal(scale=0.25 / np.sqrt(vectors.shape[1]), size=base.shape)
+    return normalize_vectors(base + noise, vectors.shape[1])
+
+
+def build_index(index, ids, vectors, chunk_size=100000):
+    """Insere os vetores em lotes e retorna o tempo de construção."""
+    start_time = time.time()
+    for start in range(0, len(vectors), chunk_size):
+        index.add(ids[start:start + chunk_size], vectors[start:start + chunk_size])
+    if isinstance(index, IVFIndex) and not index.is_trained:
+        index.train()
+    return time.time() - start_time
+
+
+def measure_queries(index, queries, k):
+    """
+    Executa as consultas uma a uma e mede a latência.
+    
+    Returns:
+        Tupla (resultados, latências em milissegundos)
+    """
+    results = []
+    latencies = []
+    for query in queries:
+        start_time = time.perf_counter()
+        results.append([vector_id for vector_id, _ in index.search(query, k)[0]])
+        latencies.append((time.perf_counter() - start_time) * 1000)
+    return results, np.array(latencies)
+
+
+def recall_at_k(results, ground_truth, k):
+    """Fração dos k vizinhos exatos recuperados pelo índice."""
+    hits = sum(len(set(result[:k]) & set(truth[:k])) for result, truth in zip(results, ground_truth))
+    return hits / (k * len(ground_truth))
+
+
+def report(name, build_time, results, latencies, ground_truth, k):
+    """Exibe uma linha de resultado."""
+    print(
+        f"{name:<24} "
+        f"{build_time:>10.1f}s "
+        f"{recall_at_k(results, ground_truth, k):>10.4f} "
+        f"{np.mean(latencies):>10.2f} "
+        f"{np.percentile(latencies, 50):>10.2f} "
+        f"{np.percentile(latencies, 95):>10.2f}"
+    )
+
+
+def main():
+    """Função principal."""
+    parser = argparse.ArgumentParser(description="Benchmark de revocação e latência dos índices vetoriais")
+    parser.add_argument("--num-vectors", type=int, default=1000000,
+                        help="Número de vetores indexados (padrão: 1000000)")
+    parser.add_argument("--dimension", type=int, default=128,
+                        help="Dimensão dos vetores (padrão: 128)")
+    parser.add_argument("--clusters", type=int, default=1000,
+                        help="Número de agrupamentos dos dados sintéticos (padrão: 1000)")
+    parser.add_argument("--num-queries", type=int, default=200,
+                        help="Número de consultas (padrão: 200)")
+    parser.add_argument("--k", type=int, default=10,
+                        help="Número de vizinhos (padrão: 10)")
+    parser.add_argument("--nlist", type=int, default=1024,
+                        help="Número de listas do índice IVF (padrão: 1024)")
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 16, 64],
+                        help="Valores de nprobe avaliados (padrão: 1 4 16 64)")
+    parser.add_argument("--faiss-factory", type=str, nargs="*", default=["IVF1024,PQ16", "HNSW32"],
+                        help="Índices FAISS avaliados, se o faiss estiver instalado")
+    parser.add_argument("--persistent", action="store_true",
+                        help="Armazenar os vetores em disco (mapeados em memória)")
+    
+    args = parser.parse_args()
+    
+    logger.info(f"Gerando {args.num_vectors} vetores de dimensão {args.dimension}")
+    vectors, _ = generate_vectors(args.num_vectors, args.dimension, args.clusters)
+    queries = generate_queries(vectors, args.num_queries)
+    ids = [str(i) for i in range(args.num_vectors)]
+    
+    work_dir = tempfile.mkdtemp(prefix="index_benchmark_") if args.persistent else None
+    
+    def index_path(name):
+        return os.path.join(work_dir, name) if work_dir else None
+    
+    print(f"\n{'Índice':<24} {'Construção':>11} {'Recall@' + str(args.k):>10} "
+          f"{'Média (ms)':>10} {'p50 (ms)':>10} {'p95 (ms)':>10}")
+    print("-" * 80)
+    
+    # Busca exata: referência de revocação
+    flat_index = FlatIndex(args.dimension, index_path("flat"))
+    build_time = build_index(flat_index, ids, vectors)
+    ground_truth, latencies = measure_queries(flat_index, queries, args.k)
+    report("flat", build_time, ground_truth, latencies, ground_truth, args.k)
+    del flat_index
+    
+    ivf_index = IVFIndex(args.dimension, index_path("ivf"), nlist=args.nlist)
+    build_time = build_index(ivf_index, ids, vectors)
+    for nprobe in args.nprobe:
+        ivf_index.nprobe = nprobe
+        results, latencies = measure_queries(ivf_index, queries, args.k)
+        report(f"ivf (nprobe={nprobe})", build_time, results, latencies, ground_truth, args.k)
+    del ivf_index
+    
+    for factory in args.faiss_factory:
+        try:
+            faiss_index = FaissIndex(args.dimension, factory=factory, train_threshold=min(args.num_vectors, 100000))
+        except ImportError as e:
+            logger.warning(str(e))
+            break
+        build_time = build_index(faiss_index, ids, vectors)
+        for nprobe in (args.nprobe if factory.startswith("IVF") else [None]):
+            if nprobe is not None:
+                faiss_index.set_nprobe(nprobe)
+            results, latencies = measure_queries(faiss_index, queries, args.k)
+            label = f"faiss {factory}" + (f" ({nprobe})" if nprobe is not None else "")
+            report(label, build_time, results, latencies, ground_truth, args.k)
+    
+    if work_dir:
+        logger.info(f"Índices salvos em {work_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Script para gerar variantes quantizadas de modelos.
+
+Gera, a partir do modelo em float32, variantes INT8 (dinâmica ou estática com
+calibração) e float16 usando TFLite ou ONNX Runtime. Cada variante é salva ao
+lado do modelo e registrada no manifesto `<model_path>.variants.json`, de onde
+o registry a carrega quando o contexto de mesmo nome é usado (ex.: onnx_int8).
+"""
+
+import os
+import sys
+import argparse
+import logging
+from pathlib import Path
+import numpy as np
+
+# Configurar paths para importar módulos do projeto
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.core.variants import save_variant
+
+# Configurar logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(message)s",
+    handlers=[logging.StreamHandler()]
+)
+
+logger = logging.getLogger(__name__)
+
+
+def load_calibration_data(calibration_dir, size=(224, 224), mean=None, std=None, num_images=100):
+    """
+    Carrega o conjunto de calibração com o mesmo pré-processamento do serviço.
+    
+    Args:
+        calibration_dir: Diretório com imagens representativas
+        size: Tamanho de entrada do modelo (altura, largura)
+        mean: Médias por canal para normalização
+        std: Desvios padrão por canal para normalização
+        num_images: Número máximo de imagens
+    
+    Returns:
+        Array float32 [N, altura, largura, 3]
+    """
+    from src.models.generic.processors import ImageProcessor, BatchProcessor
+    
+    image_paths = []
+    for ext in ('.jpg', '.jpeg', '.png'):
+        image_paths.extend(str(path) for path in Path(calibration_dir).glob(f'*{ext}'))
+    image_paths = sorted(image_paths)[:num_images]
+    
+    if not image_paths:
+        raise ValueError(f"Nenhuma imagem de calibração encontrada em {calibration_dir}")
+    
+    logger.info(f"Carregando {len(image_paths)} imagens de calibração")
+    
+    image_processor = ImageProcessor(target_size=size, normalize=True, mean=mean, std=std, add_batch_dim=False)
+    batch_processor = BatchProcessor(image_processor, ignore_errors=True)
+    return batch_processor.process_batch(image_paths).numpy()
+
+
+def quantize_tflite(model_path, output_path, mode, calibration_data=None):
+    """
+    Converte um modelo Keras/SavedModel para TFLite quantizado.
+    
+    Args:
+        model_path: Caminho do modelo TensorFlow
+        output_path: Caminho do arquivo .tflite gerado
+        mode: 'dynamic', 'static' ou 'float16'
+        calibration_data: Dados representativos (obrigatórios no modo 'static')
+    """
+    import tensorflow as tf
+    
+    if os.path.isdir(model_path):
+        converter = tf.lite.TFLiteConverter.from_saved_model(model_path)
+    else:
+        converter = tf.lite.TFLiteConverter.from_keras_model(tf.keras.models.load_model(model_path))
+    
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    
+    if mode == 'float16':
+        converter.target_spec.supported_types = [tf.float16]
+    elif mode == 'static':
+        if calibration_data is None:
+            raise ValueError("A quantização estática requer um conjunto de calibração")
+        
+        def representative_dataset():
+            for sample in calibration_data:
+                yield [sample[np.newaxis, ...].astype(np.float32)]
+        
+        converter.representative_dataset = representative_dataset
+        # Pesos e ativações em INT8; entrada e saída permanecem float32
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    
+    with open(output_path, 'wb') as f:
+        f.write(converter.convert())
+
+
+class _CalibrationReader:
+    """Leitor de dados de calibração no formato do ONNX Runtime."""
+    
+    def __init__(self, input_name, calibration_data):
+        self._samples = iter(
+            {input_name: sample[np.newaxis, ...].astype(np.float32)} for sample in calibration_data
+        )
+    
+    def get_next(self):
+        return next(self._samples, None)
+
+
+def quantize_onnx(model_path, output_path, mode, calibration_data=None):
+    """
+    Quantiza um modelo ONNX com as ferramentas do ONNX Runtime.
+    
+    Args:
+        model_path: Caminho do modelo .onnx em float32
+        output_path: Caminho do modelo gerado
+        mode: 'dynamic', 'static' ou 'float16'
+        calibration_data: Dados representativos (obrigatórios no modo 'static')
+    """
+    if mode == 'float16':
+        try:
+            import onnx
+            from onnxconverter_common import float16
+        except ImportError:
+            raise ImportError("A conversão para float16 requer onnxconverter-common. Instale com 'pip install onnxconverter-common'")
+        
+        model = float16.convert_float_to_float16(onnx.load(model_path), keep_io_types=True)
+        onnx.save(model, output_path)
+        return
+    
+    try:
+        import onnxruntime as ort
+        from onnxruntime.quantization import QuantType, QuantFormat, quantize_dynamic, quantize_static
+    except ImportError:
+        raise ImportError("ONNX Runtime não está instalado. Instale com 'pip install onnxruntime'")
+    
+    if mode == 'dynamic':
+        quantize_dynamic(model_path, output_path, weight_type=QuantType.QInt8)
+    else:
+        if calibration_data is None:
+            raise ValueError("A quantização estática requer um conjunto de calibração")
+        
+        input_name = ort.InferenceSession(model_path, providers=['CPUExecutionProvider']).get_inputs()[0].name
+        quantize_static(
+            model_path,
+            output_path,
+            _CalibrationReader(input_name, calibration_data),
+            quant_format=QuantFormat.QDQ,
+            activation_type=QuantType.QInt8,
+            weight_type=QuantType.QInt8
+        )
+
+
+def main():
+    """Função principal."""
+    parser = argparse.ArgumentParser(description="Gera variantes quantizadas de um modelo")
+    parser.add_argument("--model-path", type=str, required=True,
+                        help="Caminho do modelo em float32 (Keras/SavedModel para TFLite, .onnx para ONNX)")
+    parser.add_argument("--format", type=str, choices=["tflite", "onnx"], required=True,
+                        help="Formato da variante gerada")
+    parser.add_argument("--mode", type=str, choices=["dynamic", "static", "float16"], default="dynamic",
+                        help="Tipo de quantização (padrão: dynamic)")
+    parser.add_argument("--calibration-dir", type=str, default=None,
+                        help="Diretório com imagens de calibração (necessário no modo static)")
+    parser.add_argument("--num-calibration", type=int, default=100,
+                        help="Número de imagens de calibração (padrão: 100)")
+    parser.add_argument("--input-size", type=int, nargs=2, default=[224, 224],
+                        help="Tamanho de entrada do modelo: altura largura (padrão: 224 224)")
+    parser.add_argument("--mean", type=float, nargs=3, default=None,
+                        help="Médias por canal usadas no pré-processamento")
+    parser.add_argument("--std", type=float, nargs=3, default=None,
+                        help="Desvios padrão por canal usados no pré-processamento")
+    parser.add_argument("--registry-model-path", type=str, default=None,
+                        help="Caminho do modelo registrado no serviço, se diferente de --model-path "
+                             "(ex.: SavedModel registrado e .onnx exportado usado como origem)")
+    
+    args = parser.parse_args()
+    
+    variant = f"{args.format}_{'float16' if args.mode == 'float16' else 'int8'}"
+    base_path = args.model_path.rstrip("/\\")
+    extension = ".tflite" if args.format == "tflite" else ".onnx"
+    stem = base_path if os.path.isdir(base_path) else os.path.splitext(base_path)[0]
+    output_path = f"{stem}.{variant}{extension}"
+    
+    calibration_data = None
+    if args.mode == "static":
+        if not args.calibration_dir:
+            parser.error("--calibration-dir é obrigatório no modo static")
+        calibration_data = load_calibration_data(
+            args.calibration_dir, tuple(args.input_size), args.mean, args.std, args.num_calibration
+        )
+    
+    logger.info(f"Gerando variante {variant} ({args.mode}) de {args.model_path}")
+    
+    if args.format == "tflite":
+        quantize_tflite(args.model_path, output_path, args.mode, calibration_data)
+    else:
+        quantize_onnx(args.model_path, output_path, args.mode, calibration_data)
+    
+    save_variant(
+        args.registry_model_path or args.model_path,
+        variant,
+        output_path,
+        {
+            "format": args.format,
+            "mode": args.mode,
+            "source": os.path.abspath(args.model_path),
+            "calibration_images": len(calibration_data) if calibration_data is not None else 0
+        }
+    )
+    
+    source_size = sum(f.stat().st_size for f in Path(args.model_path).rglob('*') if f.is_file()) \
+        if os.path.isdir(args.model_path) else os.path.getsize(args.model_path)
+    logger.info(
+        f"Variante salva em {output_path} "
+        f"({os.path.getsize(output_path) / 1e6:.1f} MB, original {source_size / 1e6:.1f} MB)"
+    )
+
+
+if __name__ == "__main__":
+    main()
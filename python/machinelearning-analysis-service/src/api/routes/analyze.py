@@ -1,19 +1,34 @@
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, BackgroundTasks
-from fastapi.responses import FileResponse
-from typing import Optional, Dict, Any, List
+from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, BackgroundTasks, Query, Request
+from fastapi.responses import FileResponse, StreamingResponse
+from typing import Optional, Dict, Any, Iterator, List, Tuple
+import functools
+import math
 import uuid
 import os
+import time
 import asyncio
 import json
 import logging
+import numpy as np
 
 from ...core.registry import ModelRegistry
-from ...schemas.requests import AnalysisRequest, ImageAnalysisRequest, VideoAnalysisRequest
-from ...schemas.responses import AnalysisResponse, AsyncAnalysisResponse, TaskStatus
+from ...core.admission import AdmissionRejected, DEADLINE_HEADER, get_admission_controller
+from ...core.callbacks import validate_callback_url
+from ...core.tasks import (
+    PENDING, TASK_WAIT_MAX, get_task_index, get_task_notifier, read_task_payload, status_from_extensions
+)
+from ...schemas.requests import (
+    AnalysisRequest, BatchAnalysisRequest, BulkTaskRequest, ImageAnalysisRequest, VideoAnalysisRequest
+)
+from ...schemas.responses import (
+    AnalysisResponse, AsyncAnalysisResponse, BatchItemResult, BatchSummary, BulkTaskStatusResponse,
+    TaskStatus, TaskStatusRecord
+)
 from ...exporters import get_exporter, list_supported_formats
-from ...utils.storage import save_uploaded_file, get_result_path, list_results
-from ...utils.metrics import measure_time, increment_counter
+from ...utils.storage import save_uploaded_file, get_result_path, save_result_json, resolve_input_path
+from ...utils.metrics import measure_time, increment_counter, observe_histogram
 from ...utils.logging import get_task_logger
+from .background_tasks import process_analysis_task
 
 # Configuração do router
 router = APIRouter(prefix="/analyze", tags=["analysis"])
@@ -24,26 +39,125 @@ registry = ModelRegistry()
 # Logger
 logger = logging.getLogger(__name__)
 
+# Maior dimensão de target_size aceita nos parâmetros de pré-processamento da requisição (pixels)
+REQUEST_MAX_TARGET_SIZE = int(os.environ.get("REQUEST_MAX_TARGET_SIZE", 2048))
+
+
+def _is_int(value: Any, low: int, high: int) -> bool:
+    """Inteiro (não booleano) no intervalo [low, high]."""
+    return isinstance(value, int) and not isinstance(value, bool) and low <= value <= high
+
+
+def _is_float(value: Any, low: float, high: float) -> bool:
+    """Número (não booleano) no intervalo [low, high]; NaN é rejeitado."""
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and low <= value <= high
+
+
+def _is_channel_values(value: Any, positive: bool = False) -> bool:
+    """Lista de 1 a 4 valores por canal (estritamente positivos, se positive)."""
+    if not isinstance(value, list) or not 1 <= len(value) <= 4:
+        return False
+    return all(_is_float(v, -math.inf, math.inf) and (v > 0 or not positive) for v in value)
+
+
+# Parâmetros que a requisição pode sobrescrever e a validação de cada um; os
+# demais (batch_size, num_parallel_calls, ...) ficam na configuração do modelo
+REQUEST_PREPROCESSING_PARAMS = {
+    "target_size": lambda v: isinstance(v, list) and len(v) == 2 and all(
+        _is_int(x, 1, REQUEST_MAX_TARGET_SIZE) for x in v
+    ),
+    "normalize": lambda v: isinstance(v, bool),
+    "mean": _is_channel_values,
+    "std": lambda v: _is_channel_values(v, positive=True),
+    "fast_decode": lambda v: isinstance(v, bool),
+    "output_dtype": lambda v: v in ("float32", "uint8")
+}
+
+REQUEST_POSTPROCESSING_PARAMS = {
+    "confidence_threshold": lambda v: _is_float(v, 0.0, 1.0),
+    "iou_threshold": lambda v: _is_float(v, 0.0, 1.0),
+    "apply_nms": lambda v: isinstance(v, bool),
+    "top_k": lambda v: _is_int(v, 1, 1000),
+    "max_detections": lambda v: _is_int(v, 1, 1000),
+    "normalize": lambda v: isinstance(v, bool)
+}
+
+
+def _validate_request_params(
+    params: Optional[Dict[str, Any]],
+    allowed: Dict[str, Any],
+    name: str
+) -> Optional[Dict[str, Any]]:
+    """
+    Valida os parâmetros de processamento informados pelo cliente.
+    
+    Args:
+        params: Parâmetros da requisição
+        allowed: Parâmetros aceitos e a validação de cada um
+        name: Nome do campo, para a mensagem de erro
+        
+    Returns:
+        Os próprios parâmetros
+        
+    Raises:
+        HTTPException: 400 se houver parâmetros não permitidos ou fora dos limites
+    """
+    if not params:
+        return params
+    
+    unknown = sorted(key for key in params if key not in allowed)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Parâmetros não permitidos em {name}: {', '.join(unknown)}")
+    
+    invalid = sorted(key for key, value in params.items() if not allowed[key](value))
+    if invalid:
+        raise HTTPException(status_code=400, detail=f"Valores inválidos em {name}: {', '.join(invalid)}")
+    
+    return params
+
+
+def _postprocessing_params(confidence_threshold: Optional[float]) -> Optional[Dict[str, Any]]:
+    """Monta os parâmetros de pós-processamento informados na requisição."""
+    if confidence_threshold is None:
+        return None
+    return {"confidence_threshold": confidence_threshold}
+
 
 @router.post("", response_model=AnalysisResponse)
 async def analyze_file(
+    request: Request,
     file: UploadFile = File(...),
     model_id: str = "generic_detector",
     model_version: str = "latest",
     context_name: str = "tensorflow",
-    confidence_threshold: Optional[float] = 0.5,
-    include_visualization: Optional[bool] = False
+    confidence_threshold: Optional[float] = Query(None, ge=0.0, le=1.0),
+    include_visualization: Optional[bool] = False,
+    tiled: bool = False,
+    tile_size: Optional[int] = Query(None, gt=0),
+    tile_overlap: float = Query(0.25, ge=0.0, lt=1.0),
+    max_tiles: int = Query(16, gt=0, le=256)
 ):
     """
     Endpoint para análise síncrona de um arquivo (imagem ou vídeo).
     
+    A análise passa pelo controle de admissão: cada modelo tem um limite de
+    análises simultâneas e uma fila limitada. O cliente pode informar um prazo
+    no cabeçalho X-Request-Deadline-Ms; requisições que não cabem no prazo ou
+    na fila são rejeitadas com 429/503 e Retry-After.
+    
     Args:
+        request: Requisição HTTP (cabeçalho de prazo e estado da conexão)
         file: Arquivo a ser analisado
         model_id: ID do modelo a utilizar
         model_version: Versão do modelo
         context_name: Nome do contexto de execução
-        confidence_threshold: Limiar de confiança (0.0 a 1.0)
+        confidence_threshold: Limiar de confiança (0.0 a 1.0; padrão: configuração do modelo)
         include_visualization: Incluir visualização nos resultados
+        tiled: Analisar a imagem em blocos sobrepostos na resolução do modelo
+            (detecção e segmentação em imagens de alta resolução)
+        tile_size: Lado do bloco em pixels da imagem original (padrão: resolução do modelo)
+        tile_overlap: Fração de sobreposição entre blocos vizinhos
+        max_tiles: Número máximo de blocos
         
     Returns:
         Resultados da análise
@@ -56,6 +170,12 @@ async def analyze_file(
     # Métricas
     increment_counter("analysis_requests", labels={"type": "sync"})
     
+    admission = get_admission_controller()
+    try:
+        deadline = admission.parse_deadline(request.headers.get(DEADLINE_HEADER))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
     # Salvar arquivo temporariamente
     with measure_time("file_upload_time"):
         file_path = await save_uploaded_file(file)
@@ -72,13 +192,31 @@ async def analyze_file(
                     detail=f"Modelo {model_id}@{model_version} não encontrado"
                 )
         
-        # Modificar configurações de pós-processamento se necessário
-        if hasattr(model_context.model, 'postprocessing_config'):
-            model_context.model.postprocessing_config['confidence_threshold'] = confidence_threshold
+        # Parâmetros da requisição, sem alterar a configuração compartilhada do modelo
+        postprocessing_params = _postprocessing_params(confidence_threshold)
+        
+        # Executar análise fora do loop de eventos, após obter uma vaga do modelo
+        if tiled:
+            analyze = functools.partial(
+                model_context.analyze_tiled,
+                file_path, tile_size=tile_size, overlap=tile_overlap, max_tiles=max_tiles,
+                postprocessing_params=postprocessing_params
+            )
+        else:
+            analyze = functools.partial(model_context.analyze, file_path, postprocessing_params=postprocessing_params)
         
-        # Executar análise
-        with measure_time("analysis_time", labels={"model_id": model_id}):
-            result = model_context.analyze(file_path)
+        model = model_context.model
+        model_metadata = model.metadata if isinstance(getattr(model, 'metadata', None), dict) else {}
+        loop = asyncio.get_running_loop()
+        async with admission.admit(
+            f"{model.model_id}@{model.version}",
+            deadline=deadline,
+            is_disconnected=request.is_disconnected,
+            max_in_flight=model_metadata.get('max_in_flight'),
+            max_queue=model_metadata.get('max_queue')
+        ):
+            with measure_time("analysis_time", labels={"model_id": model_id}):
+                result = await loop.run_in_executor(None, analyze)
         
         # Adicionar metadados da análise
         result["task_id"] = task_id
@@ -94,9 +232,8 @@ async def analyze_file(
             }
         
         # Salvar resultado para possível uso futuro
-        result_path = get_result_path(task_id, "json")
-        with open(result_path, 'w', encoding='utf-8') as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
+        save_result_json(task_id, result)
+        get_task_index().add(task_id, "json")
         
         task_logger.info(f"Análise concluída com sucesso")
         
@@ -106,6 +243,11 @@ async def analyze_file(
             results=result
         )
     
+    except AdmissionRejected as e:
+        task_logger.warning(f"Análise rejeitada pelo controle de admissão: {str(e)}")
+        headers = {"Retry-After": str(math.ceil(e.retry_after))} if e.retry_after else None
+        raise HTTPException(status_code=e.status_code, detail=str(e), headers=headers)
+    
     except Exception as e:
         task_logger.error(f"Erro durante análise: {str(e)}", exc_info=True)
         
@@ -117,9 +259,8 @@ async def analyze_file(
             "file_name": file.filename
         }
         
-        error_path = get_result_path(task_id, "error.json")
-        with open(error_path, 'w', encoding='utf-8') as f:
-            json.dump(error_data, f, ensure_ascii=False, indent=2)
+        save_result_json(task_id, error_data, "error.json")
+        get_task_index().add(task_id, "error.json")
         
         raise HTTPException(
             status_code=500,
@@ -140,12 +281,17 @@ async def analyze_file_async(
     model_version: str = "latest",
     context_name: str = "tensorflow",
     export_format: Optional[str] = None,
-    confidence_threshold: Optional[float] = 0.5,
-    include_visualization: Optional[bool] = False
+    confidence_threshold: Optional[float] = Query(None, ge=0.0, le=1.0),
+    include_visualization: Optional[bool] = False,
+    callback_url: Optional[str] = None
 ):
     """
     Endpoint para análise assíncrona de um arquivo (imagem ou vídeo).
     
+    A conclusão pode ser acompanhada sem polling: com callback_url, o
+    resultado é enviado por POST a essa URL; ou GET /analyze/tasks/{task_id}
+    com ?wait= aguarda a conclusão.
+    
     Args:
         background_tasks: Gerenciador de tarefas em background
         file: Arquivo a ser analisado
@@ -153,12 +299,19 @@ async def analyze_file_async(
         model_version: Versão do modelo
         context_name: Nome do contexto de execução
         export_format: Formato para exportação de resultados
-        confidence_threshold: Limiar de confiança (0.0 a 1.0)
+        confidence_threshold: Limiar de confiança (0.0 a 1.0; padrão: configuração do modelo)
         include_visualization: Incluir visualização nos resultados
+        callback_url: URL notificada (POST) com o resultado ao fim da tarefa
         
     Returns:
         Informações da tarefa assíncrona
     """
+    if callback_url:
+        # A validação resolve o host (DNS), fora do loop de eventos
+        callback_error = await asyncio.get_running_loop().run_in_executor(None, validate_callback_url, callback_url)
+        if callback_error:
+            raise HTTPException(status_code=400, detail=callback_error)
+    
     # Gerar ID de tarefa
     task_id = str(uuid.uuid4())
     task_logger = get_task_logger(task_id)
@@ -170,6 +323,9 @@ async def analyze_file_async(
     # Salvar arquivo para processamento posterior (permanente)
     file_path = await save_uploaded_file(file, permanent=True)
     
+    # Registrar a tarefa para consultas de status e long-poll
+    get_task_notifier().register(task_id)
+    
     # Adicionar tarefa de análise em background
     background_tasks.add_task(
         process_analysis_task,
@@ -181,7 +337,8 @@ async def analyze_file_async(
         file_name=file.filename,
         export_format=export_format,
         confidence_threshold=confidence_threshold,
-        include_visualization=include_visualization
+        include_visualization=include_visualization,
+        callback_url=callback_url
     )
     
     return AsyncAnalysisResponse(
@@ -191,17 +348,313 @@ async def analyze_file_async(
     )
 
 
+def _json_default(value: Any) -> Any:
+    """Converte tipos NumPy para tipos serializáveis em JSON."""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Tipo não serializável: {type(value).__name__}")
+
+
+def _stream_batch_results(
+    batch_id: str,
+    model_context: Any,
+    inputs: List[Any],
+    file_names: List[str],
+    preprocessing_params: Optional[Dict[str, Any]] = None,
+    postprocessing_params: Optional[Dict[str, Any]] = None
+) -> Iterator[str]:
+    """
+    Gera as linhas NDJSON de uma análise em lote.
+    
+    Cada item é emitido assim que seu lote termina; a última linha traz o resumo.
+    Executado pelo StreamingResponse em um threadpool, sem bloquear o loop de eventos.
+    
+    Args:
+        batch_id: ID do lote
+        model_context: Contexto com o modelo carregado
+        inputs: Entradas a analisar (bytes ou caminhos)
+        file_names: Nome de cada entrada
+        preprocessing_params: Parâmetros de pré-processamento da requisição
+        postprocessing_params: Parâmetros de pós-processamento da requisição
+    """
+    task_logger = get_task_logger(batch_id)
+    start_time = time.time()
+    completed = 0
+    failed = 0
+    
+    # Parâmetros repassados apenas quando informados
+    params = {
+        name: value for name, value in (
+            ("preprocessing_params", preprocessing_params),
+            ("postprocessing_params", postprocessing_params)
+        ) if value
+    }
+    
+    for index, result in model_context.analyze_batch(inputs, **params):
+        if "error" in result and len(result) == 1:
+            failed += 1
+            item = BatchItemResult(
+                batch_id=batch_id, index=index, file_name=file_names[index],
+                status=TaskStatus.FAILED, error=result["error"]
+            )
+        else:
+            completed += 1
+            item = BatchItemResult(
+                batch_id=batch_id, index=index, file_name=file_names[index],
+                status=TaskStatus.COMPLETED, results=result
+            )
+        yield json.dumps(item.dict(), ensure_ascii=False, default=_json_default) + "\n"
+    
+    total_time = time.time() - start_time
+    observe_histogram("batch_analysis_time", total_time, labels={"model_id": model_context.model.model_id})
+    increment_counter("batch_analysis_items", value=completed, labels={"status": "completed"})
+    increment_counter("batch_analysis_items", value=failed, labels={"status": "failed"})
+    task_logger.info(f"Lote concluído: {completed} itens analisados, {failed} com erro")
+    
+    summary = BatchSummary(
+        batch_id=batch_id,
+        total_items=len(inputs),
+        completed_items=completed,
+        failed_items=failed,
+        total_time=total_time,
+        items_per_second=len(inputs) / total_time if total_time > 0 else 0.0
+    )
+    yield json.dumps(summary.dict(), ensure_ascii=False) + "\n"
+
+
+def _get_batch_model_context(model_id: str, model_version: str, context_name: str):
+    """Obtém o contexto do modelo para uma análise em lote ou retorna 404."""
+    model_context = registry.create_model_context(model_id, model_version, context_name)
+    
+    if model_context is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Modelo {model_id}@{model_version} não encontrado"
+        )
+    
+    return model_context
+
+
+@router.post("/batch")
+async def analyze_batch(
+    files: List[UploadFile] = File(...),
+    model_id: str = "generic_classifier",
+    model_version: str = "latest",
+    context_name: str = "tensorflow",
+    confidence_threshold: Optional[float] = Query(None, ge=0.0, le=1.0)
+):
+    """
+    Endpoint para análise em lote de imagens enviadas via multipart.
+    
+    As imagens são decodificadas em paralelo e inferidas em lotes. Os resultados
+    são transmitidos em NDJSON (application/x-ndjson), um item por linha à medida
+    que ficam prontos, seguidos de uma linha de resumo.
+    
+    Args:
+        files: Imagens a serem analisadas
+        model_id: ID do modelo a utilizar
+        model_version: Versão do modelo
+        context_name: Nome do contexto de execução
+        confidence_threshold: Limiar de confiança (0.0 a 1.0; padrão: configuração do modelo)
+        
+    Returns:
+        Stream NDJSON com os resultados
+    """
+    batch_id = str(uuid.uuid4())
+    task_logger = get_task_logger(batch_id)
+    task_logger.info(f"Iniciando análise em lote: {len(files)} arquivos")
+    
+    # Métricas
+    increment_counter("analysis_requests", labels={"type": "batch"})
+    observe_histogram("batch_size", len(files))
+    
+    # Os arquivos são lidos em memória; nada é gravado em disco
+    with measure_time("file_upload_time"):
+        inputs = [await file.read() for file in files]
+    file_names = [file.filename for file in files]
+    
+    with measure_time("model_setup_time"):
+        model_context = _get_batch_model_context(model_id, model_version, context_name)
+    
+    return StreamingResponse(
+        _stream_batch_results(
+            batch_id, model_context, inputs, file_names,
+            postprocessing_params=_postprocessing_params(confidence_threshold)
+        ),
+        media_type="application/x-ndjson",
+        headers={"X-Batch-ID": batch_id}
+    )
+
+
+@router.post("/batch/paths")
+async def analyze_batch_paths(request: BatchAnalysisRequest):
+    """
+    Endpoint para análise em lote de arquivos já presentes no servidor.
+    
+    Os caminhos devem estar dentro dos diretórios permitidos (ALLOWED_INPUT_DIRS).
+    A resposta segue o mesmo formato NDJSON de /analyze/batch.
+    
+    Args:
+        request: Requisição com o modelo e os caminhos dos arquivos
+        
+    Returns:
+        Stream NDJSON com os resultados
+    """
+    if request.export_format:
+        raise HTTPException(
+            status_code=400,
+            detail="export_format não é suportado em /batch/paths: os resultados são retornados apenas como NDJSON"
+        )
+    preprocessing_params = _validate_request_params(
+        request.preprocessing_params, REQUEST_PREPROCESSING_PARAMS, "preprocessing_params"
+    )
+    postprocessing_params = _validate_request_params(
+        request.postprocessing_params, REQUEST_POSTPROCESSING_PARAMS, "postprocessing_params"
+    )
+    
+    batch_id = str(uuid.uuid4())
+    task_logger = get_task_logger(batch_id)
+    task_logger.info(f"Iniciando análise em lote: {len(request.file_paths)} caminhos")
+    
+    # Métricas
+    increment_counter("analysis_requests", labels={"type": "batch"})
+    observe_histogram("batch_size", len(request.file_paths))
+    
+    inputs = []
+    for path in request.file_paths:
+        resolved_path = resolve_input_path(path)
+        if resolved_path is None:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Caminho fora dos diretórios permitidos: {path}"
+            )
+        inputs.append(resolved_path)
+    
+    with measure_time("model_setup_time"):
+        model_context = _get_batch_model_context(request.model_id, request.model_version, request.context_name)
+    
+    return StreamingResponse(
+        _stream_batch_results(
+            batch_id, model_context, inputs, list(request.file_paths),
+            preprocessing_params=preprocessing_params,
+            postprocessing_params=postprocessing_params
+        ),
+        media_type="application/x-ndjson",
+        headers={"X-Batch-ID": batch_id}
+    )
+
+
+def _parse_target(target: str) -> Tuple[str, str]:
+    """Separa um alvo 'model_id[@versão]' em ID e versão."""
+    model_id, _, version = target.partition("@")
+    return model_id, version or "latest"
+
+
+@router.post("/multi", response_model=AnalysisResponse)
+async def analyze_multi_models(
+    file: UploadFile = File(...),
+    targets: List[str] = Query(..., description="Modelos no formato model_id ou model_id@versão"),
+    context_name: str = "tensorflow"
+):
+    """
+    Endpoint para análise de uma imagem por vários modelos em uma única requisição.
+    
+    A imagem é decodificada uma única vez, o pré-processamento é compartilhado
+    entre modelos com a mesma configuração e os modelos são executados em paralelo.
+    
+    Args:
+        file: Imagem a ser analisada
+        targets: Modelos a executar (model_id ou model_id@versão)
+        context_name: Nome do contexto de execução
+        
+    Returns:
+        Resultados combinados, indexados pelo alvo
+    """
+    task_id = str(uuid.uuid4())
+    task_logger = get_task_logger(task_id)
+    task_logger.info(f"Iniciando análise multimodelo: {file.filename} ({len(targets)} modelos)")
+    
+    # Métricas
+    increment_counter("analysis_requests", labels={"type": "multi"})
+    
+    with measure_time("model_setup_time"):
+        model_contexts = {}
+        for target in dict.fromkeys(targets):
+            model_id, model_version = _parse_target(target)
+            model_context = registry.create_model_context(model_id, model_version, context_name)
+            if model_context is None:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"Modelo {model_id}@{model_version} não encontrado"
+                )
+            model_contexts[target] = model_context
+    
+    data = await file.read()
+    
+    # Importação tardia: carrega o TensorFlow apenas quando a rota é usada
+    from ...models.generic.fanout import analyze_multi
+    
+    loop = asyncio.get_running_loop()
+    try:
+        with measure_time("analysis_time", labels={"model_id": "multi"}):
+            results, metadata = await loop.run_in_executor(None, analyze_multi, model_contexts, data)
+    except Exception as e:
+        task_logger.error(f"Erro durante análise: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Erro durante análise: {str(e)}"
+        )
+    
+    failed = [target for target, result in results.items() if "error" in result and len(result) == 1]
+    if len(failed) == len(results):
+        task_logger.error(f"Todos os modelos falharam: {failed}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Erro durante análise: {results[failed[0]]['error']}"
+        )
+    
+    task_logger.info(f"Análise multimodelo concluída ({len(failed)} modelos com erro)")
+    
+    return AnalysisResponse(
+        task_id=task_id,
+        status=TaskStatus.COMPLETED,
+        results={
+            "file_name": file.filename,
+            "models": results,
+            "metadata": metadata
+        }
+    )
+
+
 @router.get("/tasks/{task_id}", response_model=AnalysisResponse)
-async def get_task_result(task_id: str):
+async def get_task_result(
+    task_id: str,
+    wait: float = Query(0, ge=0, le=TASK_WAIT_MAX)
+):
     """
     Recupera o resultado de uma tarefa de análise.
     
+    Tarefas em andamento neste processo são respondidas sem acessar o disco.
+    
     Args:
         task_id: ID da tarefa
+        wait: Espera máxima pela conclusão de uma tarefa em andamento
+            (segundos, 0 = responde imediatamente)
         
     Returns:
         Resultados da análise
     """
+    notifier = get_task_notifier()
+    status = await notifier.wait(task_id, wait) if wait > 0 else notifier.status(task_id)
+    
+    if status == TaskStatus.PROCESSING.value:
+        return AnalysisResponse(
+            task_id=task_id,
+            status=TaskStatus.PROCESSING
+        )
+    
     result_path = get_result_path(task_id, "json")
     error_path = get_result_path(task_id, "error.json")
     
@@ -226,10 +679,10 @@ async def get_task_result(task_id: str):
         )
     
     else:
-        # Verificar se há outros arquivos para esta tarefa
-        task_files = list_results(task_id)
+        # Verificar no índice se há outros arquivos para esta tarefa
+        task_files = await asyncio.get_running_loop().run_in_executor(None, get_task_index().lookup, [task_id])
         
-        if task_id in task_files:
+        if task_files[task_id]:
             # Tarefa existe mas o resultado principal não está pronto
             return AnalysisResponse(
                 task_id=task_id,
@@ -243,6 +696,101 @@ async def get_task_result(task_id: str):
             )
 
 
+def _bulk_task_status(task_ids: List[str]) -> List[Tuple[str, str, List[str]]]:
+    """
+    Resolve o status de várias tarefas pelo mapa de tarefas em andamento e pelo índice.
+    
+    Args:
+        task_ids: IDs das tarefas
+    
+    Returns:
+        Lista de (task_id, status, formatos exportados), na ordem da requisição
+    """
+    notifier = get_task_notifier()
+    files = get_task_index().lookup(task_ids)
+    
+    statuses = []
+    for task_id in task_ids:
+        extensions = files[task_id]
+        status = PENDING if notifier.status(task_id) == PENDING else status_from_extensions(extensions)
+        exports = sorted(extension for extension in extensions if extension not in ("json", "error.json"))
+        statuses.append((task_id, status, exports))
+    return statuses
+
+
+@router.post("/tasks/status", response_model=BulkTaskStatusResponse)
+async def get_tasks_status(request: BulkTaskRequest):
+    """
+    Consulta o status de várias tarefas em uma única requisição.
+    
+    Os status vêm do mapa de tarefas em andamento e do índice de resultados,
+    sem verificar a existência de cada arquivo.
+    
+    Args:
+        request: IDs das tarefas
+        
+    Returns:
+        Status compacto de cada tarefa e contagem por status
+    """
+    statuses = await asyncio.get_running_loop().run_in_executor(None, _bulk_task_status, request.task_ids)
+    
+    counts: Dict[str, int] = {}
+    for _, status, _ in statuses:
+        counts[status] = counts.get(status, 0) + 1
+    
+    increment_counter("bulk_task_requests", labels={"type": "status"})
+    
+    return BulkTaskStatusResponse(
+        tasks=[
+            TaskStatusRecord(task_id=task_id, status=status, exports=exports)
+            for task_id, status, exports in statuses
+        ],
+        counts=counts
+    )
+
+
+def _stream_task_results(statuses: List[Tuple[str, str, List[str]]]) -> Iterator[bytes]:
+    """
+    Gera uma linha NDJSON por tarefa, copiando os resultados gravados sem decodificá-los.
+    
+    Executado pelo StreamingResponse em um threadpool, sem bloquear o loop de eventos.
+    
+    Args:
+        statuses: Status resolvidos por _bulk_task_status
+    """
+    index = get_task_index()
+    for task_id, status, _ in statuses:
+        final_status, line = read_task_payload(task_id, status)
+        if final_status == TaskStatus.NOT_FOUND.value:
+            # Arquivos removidos desde a última listagem
+            index.discard(task_id)
+        yield line + b"\n"
+
+
+@router.post("/tasks/results")
+async def get_tasks_results(request: BulkTaskRequest):
+    """
+    Recupera os resultados de várias tarefas como NDJSON.
+    
+    Cada linha traz task_id, status e results (tarefas concluídas) ou error
+    (tarefas com falha); tarefas em andamento ou desconhecidas trazem apenas
+    o status. As linhas seguem a ordem da requisição.
+    
+    Args:
+        request: IDs das tarefas
+        
+    Returns:
+        Resposta NDJSON com uma linha por tarefa
+    """
+    statuses = await asyncio.get_running_loop().run_in_executor(None, _bulk_task_status, request.task_ids)
+    increment_counter("bulk_task_requests", labels={"type": "results"})
+    
+    return StreamingResponse(
+        _stream_task_results(statuses),
+        media_type="application/x-ndjson"
+    )
+
+
 @router.get("/tasks/{task_id}/export/{format}")
 async def get_task_export(task_id: str, format: str):
     """
@@ -256,6 +804,7 @@ async def get_task_export(task_id: str, format: str):
         Arquivo de exportação
     """
     export_path = get_result_path(task_id, format)
+    exporter = get_exporter(format)
     
     if not os.path.exists(export_path):
         # Verificar se temos o resultado JSON e podemos exportar sob demanda
@@ -264,9 +813,9 @@ async def get_task_export(task_id: str, format: str):
             with open(result_path, 'r', encoding='utf-8') as f:
                 result = json.load(f)
             
-            exporter = get_exporter(format)
             if exporter:
                 exporter.export(result, export_path)
+                get_task_index().add(task_id, format)
             else:
                 raise HTTPException(
                     status_code=400, 
@@ -286,7 +835,7 @@ async def get_task_export(task_id: str, format: str):
         "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
     }
     
-    mime_type = mime_types.get(format, "application/octet-stream")
+    mime_type = exporter.mime_type if exporter else mime_types.get(format, "application/octet-stream")
     
     # Retornar arquivo de exportação
     return FileResponse(
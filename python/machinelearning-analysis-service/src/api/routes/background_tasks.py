@@ -3,13 +3,16 @@ Implementação de tarefas em background para o serviço de análise.
 """
 
 import os
-import json
+import asyncio
+import functools
 from typing import Optional, Dict, Any
 import logging
 
 from ...core.registry import ModelRegistry
+from ...core.callbacks import get_callback_dispatcher
+from ...core.tasks import get_task_index, get_task_notifier
 from ...exporters import get_exporter
-from ...utils.storage import get_result_path
+from ...utils.storage import get_result_path, save_result_json
 from ...utils.metrics import measure_time
 from ...utils.logging import get_task_logger
 
@@ -28,12 +31,17 @@ async def process_analysis_task(
     context_name: str,
     file_name: str,
     export_format: Optional[str] = None,
-    confidence_threshold: float = 0.5,
-    include_visualization: bool = False
+    confidence_threshold: Optional[float] = None,
+    include_visualization: bool = False,
+    callback_url: Optional[str] = None
 ):
     """
     Processa uma tarefa de análise em background.
     
+    A análise é executada em uma thread, para não bloquear o loop de eventos;
+    ao terminar, as consultas de status em espera são acordadas e, se houver
+    callback_url, o callback é gravado na caixa de saída.
+    
     Args:
         task_id: ID da tarefa
         file_path: Caminho para o arquivo a analisar
@@ -42,8 +50,55 @@ async def process_analysis_task(
         context_name: Nome do contexto
         file_name: Nome original do arquivo
         export_format: Formato para exportação
-        confidence_threshold: Limiar de confiança
+        confidence_threshold: Limiar de confiança (None = configuração do modelo)
         include_visualization: Incluir visualização
+        callback_url: URL notificada com o resultado ao fim da tarefa
+    """
+    loop = asyncio.get_running_loop()
+    analysis = functools.partial(
+        _run_analysis_task,
+        task_id=task_id,
+        file_path=file_path,
+        model_id=model_id,
+        model_version=model_version,
+        context_name=context_name,
+        file_name=file_name,
+        export_format=export_format,
+        confidence_threshold=confidence_threshold,
+        include_visualization=include_visualization
+    )
+    
+    try:
+        status = await loop.run_in_executor(None, analysis)
+    except Exception as e:
+        logger.error(f"Erro ao registrar resultado da tarefa {task_id}: {e}", exc_info=True)
+        status = "failed"
+    
+    if callback_url:
+        try:
+            await loop.run_in_executor(None, get_callback_dispatcher().enqueue, task_id, callback_url, status)
+        except Exception as e:
+            logger.error(f"Erro ao registrar callback da tarefa {task_id}: {e}", exc_info=True)
+    
+    get_task_notifier().complete(task_id, status)
+
+
+def _run_analysis_task(
+    task_id: str,
+    file_path: str,
+    model_id: str,
+    model_version: str,
+    context_name: str,
+    file_name: str,
+    export_format: Optional[str] = None,
+    confidence_threshold: Optional[float] = None,
+    include_visualization: bool = False
+) -> str:
+    """
+    Executa a análise e grava o resultado ou o erro.
+    
+    Returns:
+        Status final da tarefa ('completed' ou 'failed')
     """
     task_logger = get_task_logger(task_id)
     task_logger.info(f"Iniciando processamento background da tarefa {task_id}")
@@ -54,13 +109,14 @@ async def process_analysis_task(
         if model_context is None:
             raise ValueError(f"Modelo {model_id}@{model_version} não encontrado")
         
-        # Modificar configurações de pós-processamento se necessário
-        if hasattr(model_context.model, 'postprocessing_config'):
-            model_context.model.postprocessing_config['confidence_threshold'] = confidence_threshold
+        # Parâmetros da requisição, sem alterar a configuração compartilhada do modelo
+        postprocessing_params = None
+        if confidence_threshold is not None:
+            postprocessing_params = {"confidence_threshold": confidence_threshold}
         
         # Executar análise
         with measure_time("analysis_time", labels={"model_id": model_id, "async": "true"}):
-            result = model_context.analyze(file_path)
+            result = model_context.analyze(file_path, postprocessing_params=postprocessing_params)
         
         # Adicionar metadados
         result["task_id"] = task_id
@@ -75,9 +131,8 @@ async def process_analysis_task(
             }
         
         # Salvar resultados
-        result_path = get_result_path(task_id, "json")
-        with open(result_path, 'w', encoding='utf-8') as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
+        save_result_json(task_id, result)
+        get_task_index().add(task_id, "json")
         
         # Exportar em formato específico se solicitado
         if export_format:
@@ -85,10 +140,12 @@ async def process_analysis_task(
             if exporter:
                 export_path = get_result_path(task_id, export_format)
                 exporter.export(result, export_path)
+                get_task_index().add(task_id, export_format)
             else:
                 task_logger.warning(f"Formato de exportação não suportado: {export_format}")
         
         task_logger.info(f"Processamento background concluído com sucesso")
+        return "completed"
     
     except Exception as e:
         task_logger.error(f"Erro durante processamento background: {str(e)}", exc_info=True)
@@ -101,9 +158,10 @@ async def process_analysis_task(
             "file_name": file_name
         }
         
-        error_path = get_result_path(task_id, "error.json")
-        with open(error_path, 'w', encoding='utf-8') as f:
-            json.dump(error_data, f, ensure_ascii=False, indent=2)
+        save_result_json(task_id, error_data, "error.json")
+        get_task_index().add(task_id, "error.json")
+        
+        return "failed"
     
     finally:
         # Opcional: limpar arquivo de entrada após processamento
@@ -0,0 +1,286 @@
+"""
+Endpoints para índices de similaridade vetorial.
+
+Os índices armazenam embeddings (vetores de norma unitária) e respondem a
+buscas pelos k vizinhos mais similares. Os vetores podem ser enviados
+diretamente ou extraídos de imagens por um modelo de embedding.
+"""
+
+from fastapi import APIRouter, UploadFile, File, HTTPException, Query
+from typing import Optional, List, Dict, Any, Tuple
+import time
+import asyncio
+import logging
+
+from ...core.registry import ModelRegistry
+from ...indexes import VectorIndexBase, get_index
+from ...schemas.requests import VectorInsertRequest, VectorDeleteRequest, VectorQueryRequest
+from ...schemas.responses import IndexInfo, VectorMatch, VectorQueryResponse
+from ...utils.metrics import measure_time, increment_counter, observe_histogram
+
+# Configuração do router
+router = APIRouter(prefix="/indexes", tags=["indexes"])
+
+# Registry global
+registry = ModelRegistry()
+
+# Logger
+logger = logging.getLogger(__name__)
+
+
+def _get_index(name: str, dimension: Optional[int] = None, index_type: Optional[str] = None) -> VectorIndexBase:
+    """Obtém (ou cria, se a dimensão for informada) um índice ou retorna 404."""
+    try:
+        index = get_index(name, dimension, index_type)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if index is None:
+        raise HTTPException(status_code=404, detail=f"Índice {name} não encontrado")
+    return index
+
+
+def _index_info(name: str, index: VectorIndexBase) -> IndexInfo:
+    """Converte as informações do índice para o formato de resposta."""
+    details = index.info()
+    return IndexInfo(
+        name=name,
+        index_type=details.pop("index_type"),
+        dimension=details.pop("dimension"),
+        count=details.pop("count"),
+        details=details
+    )
+
+
+async def _insert(name: str, index: VectorIndexBase, ids: List[str], vectors: Any) -> None:
+    """Insere vetores e persiste o índice fora do loop de eventos."""
+    def insert():
+        index.add(ids, vectors)
+        if getattr(index, 'path', None):
+            index.save()
+    
+    loop = asyncio.get_running_loop()
+    try:
+        with measure_time("index_insert_time", labels={"index": name}):
+            await loop.run_in_executor(None, insert)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    increment_counter("index_vectors_inserted", len(ids), labels={"index": name})
+
+
+async def _search(name: str, index: VectorIndexBase, vectors: Any, k: int) -> VectorQueryResponse:
+    """Executa a busca fora do loop de eventos."""
+    loop = asyncio.get_running_loop()
+    start_time = time.time()
+    try:
+        results = await loop.run_in_executor(None, index.search, vectors, k)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    query_time = time.time() - start_time
+    
+    increment_counter("index_queries", len(results), labels={"index": name})
+    observe_histogram("index_query_time", query_time, labels={"index": name})
+    
+    return VectorQueryResponse(
+        index=name,
+        matches=[[VectorMatch(id=vector_id, score=score) for vector_id, score in result] for result in results],
+        query_time=query_time
+    )
+
+
+async def _embed_files(files: List[UploadFile], model_id: str, model_version: str,
+                       context_name: str) -> Tuple[List[List[float]], List[Dict[str, Any]]]:
+    """
+    Extrai os embeddings de imagens enviadas com um modelo de embedding.
+    
+    Returns:
+        Tupla (embeddings, erros por arquivo)
+    """
+    model_context = registry.create_model_context(model_id, model_version, context_name)
+    if model_context is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Modelo {model_id}@{model_version} não encontrado"
+        )
+    if getattr(model_context.model, 'task_type', None) != 'embedding':
+        raise HTTPException(
+            status_code=400,
+            detail=f"Modelo {model_id} não é um modelo de embedding"
+        )
+    
+    inputs = [await file.read() for file in files]
+    
+    def embed():
+        embeddings: List[Optional[List[float]]] = [None] * len(inputs)
+        for index, result in model_context.analyze_batch(inputs):
+            embeddings[index] = result.get("embedding")
+        return embeddings
+    
+    loop = asyncio.get_running_loop()
+    with measure_time("embedding_time", labels={"model_id": model_id}):
+        embeddings = await loop.run_in_executor(None, embed)
+    
+    errors = [
+        {"index": i, "file_name": file.filename}
+        for i, (file, embedding) in enumerate(zip(files, embeddings)) if embedding is None
+    ]
+    return embeddings, errors
+
+
+@router.get("/{name}", response_model=IndexInfo)
+async def get_index_info(name: str):
+    """
+    Obtém informações sobre um índice.
+    
+    Args:
+        name: Nome do índice
+    
+    Returns:
+        Tipo, dimensão e número de vetores do índice
+    """
+    return _index_info(name, _get_index(name))
+
+
+@router.post("/{name}/vectors", response_model=IndexInfo)
+async def insert_vectors(name: str, request: VectorInsertRequest):
+    """
+    Insere (ou substitui) vetores em lote, criando o índice se necessário.
+    
+    Args:
+        name: Nome do índice
+        request: Identificadores e vetores a inserir
+    
+    Returns:
+        Informações atualizadas do índice
+    """
+    if len(request.ids) != len(request.vectors):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Número de identificadores ({len(request.ids)}) diferente do número de vetores ({len(request.vectors)})"
+        )
+    
+    index = _get_index(name, len(request.vectors[0]), request.index_type)
+    await _insert(name, index, request.ids, request.vectors)
+    return _index_info(name, index)
+
+
+@router.post("/{name}/vectors/delete", response_model=Dict[str, int])
+async def delete_vectors(name: str, request: VectorDeleteRequest):
+    """
+    Remove vetores do índice pelo identificador.
+    
+    Args:
+        name: Nome do índice
+        request: Identificadores a remover
+    
+    Returns:
+        Número de vetores removidos
+    """
+    index = _get_index(name)
+    
+    def remove():
+        removed = index.remove(request.ids)
+        if removed and getattr(index, 'path', None):
+            index.save()
+        return removed
+    
+    loop = asyncio.get_running_loop()
+    try:
+        removed = await loop.run_in_executor(None, remove)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return {"removed": removed, "count": len(index)}
+
+
+@router.post("/{name}/query", response_model=VectorQueryResponse)
+async def query_vectors(name: str, request: VectorQueryRequest):
+    """
+    Busca os k vetores mais similares a cada vetor de consulta.
+    
+    Args:
+        name: Nome do índice
+        request: Vetores de consulta e número de vizinhos
+    
+    Returns:
+        Vizinhos de cada consulta com a similaridade de cosseno
+    """
+    index = _get_index(name)
+    return await _search(name, index, request.vectors, request.k)
+
+
+@router.post("/{name}/images", response_model=IndexInfo)
+async def insert_images(
+    name: str,
+    files: List[UploadFile] = File(...),
+    ids: Optional[List[str]] = Query(None, description="Identificadores (padrão: nomes dos arquivos)"),
+    model_id: str = "generic_embedder",
+    model_version: str = "latest",
+    context_name: str = "tensorflow",
+    index_type: Optional[str] = None
+):
+    """
+    Extrai os embeddings das imagens e os insere no índice.
+    
+    Args:
+        name: Nome do índice
+        files: Imagens a indexar
+        ids: Identificadores das imagens (padrão: nomes dos arquivos)
+        model_id: ID do modelo de embedding
+        model_version: Versão do modelo
+        context_name: Nome do contexto de execução
+        index_type: Tipo do índice, se ainda não existir
+    
+    Returns:
+        Informações atualizadas do índice
+    """
+    ids = ids or [file.filename for file in files]
+    if len(ids) != len(files):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Número de identificadores ({len(ids)}) diferente do número de arquivos ({len(files)})"
+        )
+    
+    embeddings, errors = await _embed_files(files, model_id, model_version, context_name)
+    if errors:
+        raise HTTPException(
+            status_code=422,
+            detail={"message": "Falha ao extrair o embedding de alguns arquivos", "files": errors}
+        )
+    
+    index = _get_index(name, len(embeddings[0]), index_type)
+    await _insert(name, index, ids, embeddings)
+    return _index_info(name, index)
+
+
+@router.post("/{name}/query/image", response_model=VectorQueryResponse)
+async def query_image(
+    name: str,
+    file: UploadFile = File(...),
+    k: int = Query(10, gt=0, le=1000),
+    model_id: str = "generic_embedder",
+    model_version: str = "latest",
+    context_name: str = "tensorflow"
+):
+    """
+    Busca as imagens mais similares a uma imagem de consulta.
+    
+    Args:
+        name: Nome do índice
+        file: Imagem de consulta
+        k: Número de vizinhos
+        model_id: ID do modelo de embedding (o mesmo usado na indexação)
+        model_version: Versão do modelo
+        context_name: Nome do contexto de execução
+    
+    Returns:
+        Vizinhos da imagem com a similaridade de cosseno
+    """
+    index = _get_index(name)
+    
+    embeddings, errors = await _embed_files([file], model_id, model_version, context_name)
+    if errors:
+        raise HTTPException(status_code=422, detail="Falha ao extrair o embedding da imagem")
+    
+    return await _search(name, index, embeddings, k)
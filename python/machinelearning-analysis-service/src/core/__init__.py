@@ -1,9 +1,20 @@
 from .protocols import ModelProtocol, ExecutionContextProtocol, ModelContextProtocol
-from .context import TensorFlowContext, ONNXContext, PyTorchContext
 from .registry import ModelRegistry
 
+# Os contextos são exportados sob demanda para que importar o pacote core
+# não carregue TensorFlow, ONNX Runtime ou PyTorch antes do primeiro uso
+_LAZY_CONTEXTS = ('TensorFlowContext', 'ONNXContext', 'TFLiteContext', 'PyTorchContext')
+
+
+def __getattr__(name):
+    if name in _LAZY_CONTEXTS:
+        from . import context
+        return getattr(context, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 __all__ = [
     'ModelProtocol', 'ExecutionContextProtocol', 'ModelContextProtocol',
-    'TensorFlowContext', 'ONNXContext', 'PyTorchContext',
+    'TensorFlowContext', 'ONNXContext', 'TFLiteContext', 'PyTorchContext',
     'ModelRegistry'
 ]
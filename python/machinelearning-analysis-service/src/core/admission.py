@@ -0,0 +1,289 @@
+"""
+Controle de admissão das requisições de análise.
+
+Cada modelo tem um limite de inferências simultâneas e uma fila limitada de
+requisições aguardando. Uma requisição é rejeitada logo na chegada quando a
+fila está cheia ou quando a espera estimada (pela média móvel exponencial da
+duração das análises do modelo) não cabe no prazo informado pelo cliente, em
+vez de ficar presa no loop de eventos enquanto a latência de todos cresce.
+Requisições cujo cliente desconectou enquanto aguardavam são descartadas
+antes de iniciar a inferência.
+"""
+
+import os
+import time
+import math
+import asyncio
+import logging
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Optional
+
+from ..utils.metrics import increment_counter, observe_histogram, set_gauge
+
+logger = logging.getLogger(__name__)
+
+# Inferências simultâneas por modelo
+ADMISSION_MAX_IN_FLIGHT = int(os.environ.get("ADMISSION_MAX_IN_FLIGHT", 4))
+
+# Requisições aguardando por modelo
+ADMISSION_MAX_QUEUE = int(os.environ.get("ADMISSION_MAX_QUEUE", 32))
+
+# Prazo aplicado quando o cliente não informa um (milissegundos, 0 = sem prazo)
+ADMISSION_DEFAULT_DEADLINE_MS = int(os.environ.get("ADMISSION_DEFAULT_DEADLINE_MS", 0))
+
+# Cabeçalho com o prazo do cliente, em milissegundos a partir da chegada
+DEADLINE_HEADER = "X-Request-Deadline-Ms"
+
+# Intervalo de verificação de desconexão do cliente durante a espera (segundos)
+_DISCONNECT_POLL_INTERVAL = 0.1
+
+# Peso da amostra mais recente na média móvel da duração
+_LATENCY_EWMA_ALPHA = 0.2
+
+
+class AdmissionRejected(Exception):
+    """Requisição recusada pelo controle de admissão."""
+    
+    def __init__(self, message: str, status_code: int, reason: str, retry_after: Optional[float] = None):
+        """
+        Inicializa a exceção.
+        
+        Args:
+            message: Mensagem de erro
+            status_code: Código HTTP sugerido (429, 503 ou 499)
+            reason: Motivo da rejeição (queue_full, deadline, deadline_expired,
+                client_disconnected)
+            retry_after: Tempo sugerido antes de tentar novamente (segundos)
+        """
+        super().__init__(message)
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class _ModelSlots:
+    """Vagas de inferência e fila de espera de um modelo."""
+    
+    def __init__(self, max_in_flight: int, max_queue: int):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.in_flight = 0
+        self.waiters: Deque[asyncio.Future] = deque()
+        self.latency: Optional[float] = None
+    
+    def expected_wait(self) -> float:
+        """Espera estimada para uma nova requisição (segundos)."""
+        if self.in_flight < self.max_in_flight or self.latency is None:
+            return 0.0
+        # Cada vaga libera uma requisição por duração média
+        return math.ceil((len(self.waiters) + 1) / self.max_in_flight) * self.latency
+    
+    def release(self) -> None:
+        """Libera uma vaga, repassando-a à próxima requisição da fila."""
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+    
+    def record_latency(self, duration: float) -> None:
+        """Atualiza a média móvel da duração das análises."""
+        if self.latency is None:
+            self.latency = duration
+        else:
+            self.latency = _LATENCY_EWMA_ALPHA * duration + (1 - _LATENCY_EWMA_ALPHA) * self.latency
+
+
+class AdmissionController:
+    """
+    Limita as análises simultâneas e a fila de espera por modelo.
+    
+    Deve ser usado a partir do loop de eventos; o estado não é protegido por
+    travas porque todas as alterações ocorrem na mesma thread.
+    """
+    
+    def __init__(self,
+                 max_in_flight: int = ADMISSION_MAX_IN_FLIGHT,
+                 max_queue: int = ADMISSION_MAX_QUEUE,
+                 default_deadline_ms: int = ADMISSION_DEFAULT_DEADLINE_MS):
+        """
+        Inicializa o controlador.
+        
+        Args:
+            max_in_flight: Inferências simultâneas por modelo
+            max_queue: Requisições aguardando por modelo
+            default_deadline_ms: Prazo usado quando o cliente não informa um
+                (milissegundos, 0 = sem prazo)
+        """
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.default_deadline_ms = default_deadline_ms
+        self._slots: Dict[str, _ModelSlots] = {}
+    
+    def _get_slots(self, key: str, max_in_flight: Optional[int], max_queue: Optional[int]) -> _ModelSlots:
+        """Obtém as vagas do modelo, criando-as no primeiro uso."""
+        if key not in self._slots:
+            self._slots[key] = _ModelSlots(
+                max(1, max_in_flight or self.max_in_flight),
+                max(0, max_queue if max_queue is not None else self.max_queue)
+            )
+        return self._slots[key]
+    
+    def parse_deadline(self, header_value: Optional[str]) -> Optional[float]:
+        """
+        Converte o cabeçalho de prazo em um instante absoluto (time.monotonic).
+        
+        Args:
+            header_value: Valor do cabeçalho em milissegundos (None = prazo padrão)
+        
+        Returns:
+            Instante limite ou None se não houver prazo
+        """
+        deadline_ms = self.default_deadline_ms
+        if header_value:
+            try:
+                deadline_ms = float(header_value)
+            except ValueError:
+                raise ValueError(f"Cabeçalho {DEADLINE_HEADER} inválido: {header_value}")
+        
+        if not deadline_ms or deadline_ms <= 0:
+            return None
+        return time.monotonic() + deadline_ms / 1000
+    
+    def _reject(self, key: str, message: str, status_code: int, reason: str,
+                retry_after: Optional[float] = None) -> AdmissionRejected:
+        """Registra a rejeição e cria a exceção correspondente."""
+        increment_counter("admission_shed_total", labels={"model": key, "reason": reason})
+        logger.warning(f"Requisição para {key} rejeitada ({reason}): {message}")
+        return AdmissionRejected(message, status_code, reason, retry_after)
+    
+    @asynccontextmanager
+    async def admit(self,
+                    key: str,
+                    deadline: Optional[float] = None,
+                    is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+                    max_in_flight: Optional[int] = None,
+                    max_queue: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Aguarda uma vaga de inferência para o modelo.
+        
+        Rejeita com 503 se a fila estiver cheia ou se o prazo expirar durante a
+        espera, com 429 se a espera estimada exceder o prazo já na chegada e
+        com 499 se o cliente desconectar antes de a inferência começar.
+        
+        Args:
+            key: Identificador do modelo (ex.: 'model_id@versão')
+            deadline: Instante limite (time.monotonic) ou None
+            is_disconnected: Função assíncrona que indica se o cliente desconectou
+            max_in_flight: Limite de inferências simultâneas deste modelo
+                (None = limite do controlador; vale a partir do primeiro uso)
+            max_queue: Tamanho da fila deste modelo (None = limite do controlador)
+        
+        Yields:
+            Informações da admissão (tempo de espera na fila)
+        """
+        slots = self._get_slots(key, max_in_flight, max_queue)
+        labels = {"model": key}
+        arrival = time.monotonic()
+        
+        if slots.in_flight >= slots.max_in_flight:
+            expected_wait = slots.expected_wait()
+            if len(slots.waiters) >= slots.max_queue:
+                raise self._reject(
+                    key, "Fila de análise cheia", 503, "queue_full",
+                    retry_after=expected_wait or None
+                )
+            if deadline is not None and arrival + expected_wait + (slots.latency or 0.0) > deadline:
+                raise self._reject(
+                    key, f"Espera estimada de {expected_wait:.2f}s excede o prazo", 429, "deadline",
+                    retry_after=expected_wait or None
+                )
+            
+            waiter = asyncio.get_running_loop().create_future()
+            slots.waiters.append(waiter)
+            set_gauge("admission_queue_depth", len(slots.waiters), labels=labels)
+            try:
+                await self._wait(key, waiter, deadline, is_disconnected)
+            except BaseException:
+                if waiter in slots.waiters:
+                    slots.waiters.remove(waiter)
+                elif waiter.done() and not waiter.cancelled():
+                    # A vaga foi repassada a esta requisição ao mesmo tempo
+                    slots.release()
+                raise
+            finally:
+                set_gauge("admission_queue_depth", len(slots.waiters), labels=labels)
+        else:
+            slots.in_flight += 1
+        
+        try:
+            queue_wait = time.monotonic() - arrival
+            observe_histogram("admission_queue_wait_seconds", queue_wait, labels=labels)
+            set_gauge("admission_in_flight", slots.in_flight, labels=labels)
+            
+            # Última verificação antes de iniciar a inferência
+            if is_disconnected is not None and await is_disconnected():
+                raise self._reject(key, "Cliente desconectado antes da análise", 499, "client_disconnected")
+            
+            start_time = time.monotonic()
+            yield {"queue_wait": queue_wait}
+            slots.record_latency(time.monotonic() - start_time)
+        finally:
+            slots.release()
+            set_gauge("admission_in_flight", slots.in_flight, labels=labels)
+    
+    async def _wait(self,
+                    key: str,
+                    waiter: asyncio.Future,
+                    deadline: Optional[float],
+                    is_disconnected: Optional[Callable[[], Awaitable[bool]]]) -> None:
+        """Aguarda a vaga, verificando o prazo e a conexão do cliente."""
+        while True:
+            timeout = _DISCONNECT_POLL_INTERVAL if is_disconnected is not None else None
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise self._reject(key, "Prazo expirou na fila de análise", 503, "deadline_expired")
+                timeout = min(timeout, remaining) if timeout is not None else remaining
+            
+            done, _ = await asyncio.wait({waiter}, timeout=timeout)
+            if done:
+                return
+            if is_disconnected is not None and await is_disconnected():
+                raise self._reject(key, "Cliente desconectado na fila de análise", 499, "client_disconnected")
+    
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Retorna o estado atual por modelo.
+        
+        Returns:
+            Dicionário com vagas ocupadas, fila e duração média por modelo
+        """
+        return {
+            key: {
+                "in_flight": slots.in_flight,
+                "max_in_flight": slots.max_in_flight,
+                "queued": len(slots.waiters),
+                "max_queue": slots.max_queue,
+                "latency_ewma": slots.latency
+            }
+            for key, slots in self._slots.items()
+        }
+
+
+_admission_controller: Optional[AdmissionController] = None
+
+
+def get_admission_controller() -> AdmissionController:
+    """
+    Retorna o controlador de admissão compartilhado pelo serviço.
+    
+    Returns:
+        Instância do controlador
+    """
+    global _admission_controller
+    if _admission_controller is None:
+        _admission_controller = AdmissionController()
+    return _admission_controller
@@ -0,0 +1,447 @@
+"""
+Entrega de callbacks de conclusão das tarefas assíncronas.
+
+Quando uma tarefa criada com callback_url termina, uma entrada é gravada na
+caixa de saída (um arquivo JSON por tarefa em CALLBACK_OUTBOX_DIR) e o
+despachante envia um POST com o mesmo corpo de GET /analyze/tasks/{task_id}.
+Falhas de rede, 408, 429 e 5xx são repetidas com espera exponencial; após
+CALLBACK_MAX_ATTEMPTS tentativas, ou diante de outros 4xx, a entrada é
+renomeada para '<task>.failed.json'. Como a caixa de saída fica em disco,
+entregas pendentes são retomadas após um reinício do serviço.
+
+Para que clientes não façam o serviço enviar resultados a endereços
+internos, o host de destino precisa constar em CALLBACK_ALLOWED_HOSTS ou,
+sem lista configurada, resolver apenas para endereços públicos (loopback,
+redes privadas, link-local, metadados de nuvem e afins são recusados).
+A verificação é repetida a cada envio, e redirecionamentos não são seguidos.
+"""
+
+import os
+import time
+import json
+import hmac
+import asyncio
+import socket
+import hashlib
+import logging
+import ipaddress
+import threading
+import http.client
+import urllib.error
+import urllib.request
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from ..utils.metrics import increment_counter, observe_histogram, set_gauge
+from ..utils.storage import RESULTS_DIR, ensure_directory
+from .tasks import read_task_payload
+
+logger = logging.getLogger(__name__)
+
+# Diretório da caixa de saída
+CALLBACK_OUTBOX_DIR = os.environ.get("CALLBACK_OUTBOX_DIR", os.path.join(RESULTS_DIR, "callbacks"))
+
+# Tentativas de entrega e espera exponencial entre elas (segundos)
+CALLBACK_MAX_ATTEMPTS = int(os.environ.get("CALLBACK_MAX_ATTEMPTS", 8))
+CALLBACK_BACKOFF = float(os.environ.get("CALLBACK_BACKOFF", 2))
+CALLBACK_BACKOFF_MAX = float(os.environ.get("CALLBACK_BACKOFF_MAX", 10 * 60))
+
+# Prazo de cada requisição (segundos) e entregas simultâneas
+CALLBACK_TIMEOUT = float(os.environ.get("CALLBACK_TIMEOUT", 10))
+CALLBACK_CONCURRENCY = int(os.environ.get("CALLBACK_CONCURRENCY", 4))
+
+# Segredo para assinar o corpo (HMAC-SHA256 no cabeçalho X-Signature-256)
+CALLBACK_SECRET = os.environ.get("CALLBACK_SECRET") or None
+
+# Hosts aceitos como destino (separados por vírgula); vazio = qualquer host
+# que resolva apenas para endereços públicos
+CALLBACK_ALLOWED_HOSTS = [
+    host.strip().lower() for host in os.environ.get("CALLBACK_ALLOWED_HOSTS", "").split(",") if host.strip()
+]
+
+# Intervalo máximo entre verificações da caixa de saída (segundos)
+_POLL_INTERVAL = 5.0
+
+# Respostas 4xx que ainda justificam nova tentativa
+_RETRYABLE_STATUS = {408, 425, 429}
+
+
+def validate_callback_url(url: str, allowed_hosts: Optional[List[str]] = None) -> Optional[str]:
+    """
+    Valida uma URL de callback.
+    
+    Args:
+        url: URL informada pelo cliente
+        allowed_hosts: Hosts aceitos (None = CALLBACK_ALLOWED_HOSTS; vazio =
+            qualquer host com endereços públicos)
+    
+    Returns:
+        Mensagem de erro, ou None se a URL é válida
+    """
+    try:
+        parts = urlsplit(url)
+        # port valida o número da porta (levanta ValueError se inválido)
+        hostname, _ = parts.hostname, parts.port
+    except ValueError:
+        return "callback_url inválida"
+    if parts.scheme not in ("http", "https") or not hostname:
+        return "callback_url deve ser uma URL http ou https"
+    
+    allowed_hosts = CALLBACK_ALLOWED_HOSTS if allowed_hosts is None else allowed_hosts
+    if allowed_hosts:
+        if hostname.lower() not in allowed_hosts:
+            return f"Host de callback não permitido: {hostname}"
+        return None
+    
+    return _check_public_host(hostname)
+
+
+def _check_public_host(hostname: str) -> Optional[str]:
+    """Resolve o host e recusa endereços que não sejam públicos."""
+    try:
+        addresses = {info[4][0] for info in socket.getaddrinfo(hostname, None)}
+    except (socket.gaierror, UnicodeError):
+        return f"Host de callback não resolvido: {hostname}"
+    
+    for address in addresses:
+        ip = ipaddress.ip_address(address.split("%", 1)[0])
+        if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped:
+            ip = ip.ipv4_mapped
+        if not ip.is_global or ip.is_multicast:
+            return f"Host de callback resolve para endereço não público: {hostname}"
+    
+    return None
+
+
+class _NoRedirectHandler(urllib.request.HTTPRedirectHandler):
+    """Não segue redirecionamentos: a resposta 3xx vira HTTPError."""
+    
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+
+def _write_json(path: str, data: Dict[str, Any]) -> None:
+    """Grava um arquivo JSON de forma atômica."""
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(temp_path, path)
+
+
+class CallbackDispatcher:
+    """
+    Caixa de saída persistente e entrega dos callbacks com novas tentativas.
+    
+    enqueue pode ser chamado de qualquer thread; as entregas são feitas em
+    threads pelo laço iniciado com start().
+    """
+    
+    def __init__(self,
+                 outbox_dir: str = CALLBACK_OUTBOX_DIR,
+                 max_attempts: int = CALLBACK_MAX_ATTEMPTS,
+                 backoff: float = CALLBACK_BACKOFF,
+                 backoff_max: float = CALLBACK_BACKOFF_MAX,
+                 timeout: float = CALLBACK_TIMEOUT,
+                 concurrency: int = CALLBACK_CONCURRENCY,
+                 secret: Optional[str] = CALLBACK_SECRET,
+                 allowed_hosts: Optional[List[str]] = None):
+        """
+        Inicializa o despachante.
+        
+        Args:
+            outbox_dir: Diretório da caixa de saída
+            max_attempts: Tentativas antes de desistir da entrega
+            backoff: Espera após a primeira falha (segundos), dobrada a cada tentativa
+            backoff_max: Espera máxima entre tentativas (segundos)
+            timeout: Prazo de cada requisição (segundos)
+            concurrency: Entregas simultâneas
+            secret: Segredo para assinar o corpo (None = sem assinatura)
+            allowed_hosts: Hosts aceitos (None = CALLBACK_ALLOWED_HOSTS; vazio =
+                qualquer host com endereços públicos)
+        """
+        self.outbox_dir = outbox_dir
+        self.max_attempts = max(1, max_attempts)
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.concurrency = max(1, concurrency)
+        self.secret = secret
+        self.allowed_hosts = CALLBACK_ALLOWED_HOSTS if allowed_hosts is None else allowed_hosts
+        self._opener = urllib.request.build_opener(_NoRedirectHandler)
+        
+        # task_id -> horário da próxima tentativa
+        self._schedule: Dict[str, float] = {}
+        
+        # task_id -> erros inesperados seguidos no laço de entregas
+        self._unexpected_errors: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._loaded = False
+        
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+    
+    def _entry_path(self, task_id: str) -> str:
+        return os.path.join(self.outbox_dir, f"{task_id}.json")
+    
+    def _load(self) -> None:
+        """Carrega as entregas pendentes gravadas na caixa de saída."""
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+        
+        ensure_directory(self.outbox_dir)
+        with os.scandir(self.outbox_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".json") or entry.name.endswith(".failed.json"):
+                    continue
+                try:
+                    with open(entry.path, 'r', encoding='utf-8') as f:
+                        next_attempt = float(json.load(f).get("next_attempt", 0))
+                except (OSError, ValueError, AttributeError, TypeError):
+                    # Entradas ilegíveis são tentadas (e abandonadas) por deliver
+                    next_attempt = 0
+                with self._lock:
+                    self._schedule.setdefault(entry.name[:-len(".json")], next_attempt)
+        
+        set_gauge("callback_outbox_size", len(self._schedule))
+    
+    def enqueue(self, task_id: str, url: str, status: str) -> None:
+        """
+        Grava a entrega de um callback na caixa de saída.
+        
+        Args:
+            task_id: ID da tarefa concluída
+            url: URL de destino
+            status: Status final da tarefa
+        """
+        ensure_directory(self.outbox_dir)
+        now = time.time()
+        _write_json(self._entry_path(task_id), {
+            "task_id": task_id,
+            "url": url,
+            "status": status,
+            "attempts": 0,
+            "next_attempt": now,
+            "created_at": now
+        })
+        
+        with self._lock:
+            self._schedule[task_id] = now
+            set_gauge("callback_outbox_size", len(self._schedule))
+        
+        increment_counter("callback_deliveries", labels={"result": "enqueued"})
+        self._wake()
+    
+    def pending(self) -> Dict[str, float]:
+        """
+        Retorna as entregas pendentes.
+        
+        Returns:
+            Dicionário task_id -> horário da próxima tentativa
+        """
+        with self._lock:
+            return dict(self._schedule)
+    
+    def _due(self, now: float) -> List[str]:
+        """Tarefas cuja próxima tentativa já venceu."""
+        with self._lock:
+            return [task_id for task_id, next_attempt in self._schedule.items() if next_attempt <= now]
+    
+    def _send(self, url: str, body: bytes, task_id: str) -> None:
+        """Envia o POST, levantando exceção em caso de falha."""
+        headers = {"Content-Type": "application/json", "X-Task-Id": task_id}
+        if self.secret:
+            signature = hmac.new(self.secret.encode('utf-8'), body, hashlib.sha256).hexdigest()
+            headers["X-Signature-256"] = f"sha256={signature}"
+        
+        request = urllib.request.Request(url, data=body, headers=headers, method="POST")
+        with self._opener.open(request, timeout=self.timeout) as response:
+            response.read()
+    
+    def deliver(self, task_id: str) -> bool:
+        """
+        Tenta entregar o callback de uma tarefa.
+        
+        Args:
+            task_id: ID da tarefa
+        
+        Returns:
+            True se a entrega foi concluída ou abandonada, False se será repetida
+        """
+        path = self._entry_path(task_id)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            with self._lock:
+                self._schedule.pop(task_id, None)
+            return True
+        except ValueError as e:
+            # Entrada corrompida: preservada como está para inspeção
+            logger.warning(f"Entrada de callback inválida {path}: {e}")
+            os.replace(path, os.path.join(self.outbox_dir, f"{task_id}.failed.json"))
+            with self._lock:
+                self._schedule.pop(task_id, None)
+            increment_counter("callback_deliveries", labels={"result": "failed"})
+            return True
+        
+        if not isinstance(entry, dict):
+            entry = {"task_id": task_id, "entry": entry}
+        error, retryable = self._attempt(task_id, entry)
+        
+        entry["attempts"] = int(entry.get("attempts") or 0) + 1
+        
+        if error is None:
+            os.remove(path)
+            result = "delivered"
+        elif not retryable or entry["attempts"] >= self.max_attempts:
+            entry["last_error"] = error
+            _write_json(path, entry)
+            os.replace(path, os.path.join(self.outbox_dir, f"{task_id}.failed.json"))
+            logger.warning(f"Callback da tarefa {task_id} abandonado após {entry['attempts']} tentativas: {error}")
+            result = "failed"
+        else:
+            entry["last_error"] = error
+            entry["next_attempt"] = time.time() + min(self.backoff_max, self.backoff * 2 ** (entry["attempts"] - 1))
+            _write_json(path, entry)
+            with self._lock:
+                self._schedule[task_id] = entry["next_attempt"]
+            increment_counter("callback_deliveries", labels={"result": "retry"})
+            return False
+        
+        with self._lock:
+            self._schedule.pop(task_id, None)
+            set_gauge("callback_outbox_size", len(self._schedule))
+        increment_counter("callback_deliveries", labels={"result": result})
+        return True
+    
+    def _attempt(self, task_id: str, entry: Dict[str, Any]):
+        """
+        Monta o corpo e envia o callback de uma entrada.
+        
+        Returns:
+            Tupla (erro ou None, se o erro justifica nova tentativa)
+        """
+        try:
+            url = entry["url"]
+            _, body = read_task_payload(task_id, entry["status"])
+        except (KeyError, TypeError, ValueError) as e:
+            # Entrada ou arquivo de resultado corrompido: repetir não resolve
+            return f"Corpo do callback inválido: {e!r}", False
+        except OSError as e:
+            return f"Falha ao ler o resultado: {e}", True
+        
+        # Repetida a cada envio: o DNS pode ter mudado desde a requisição
+        address_error = validate_callback_url(url, self.allowed_hosts)
+        if address_error:
+            return address_error, False
+        
+        start = time.time()
+        try:
+            self._send(url, body, task_id)
+            return None, True
+        except urllib.error.HTTPError as e:
+            return f"HTTP {e.code}", e.code >= 500 or e.code in _RETRYABLE_STATUS
+        except (urllib.error.URLError, http.client.HTTPException, OSError) as e:
+            return str(getattr(e, "reason", e)), True
+        finally:
+            observe_histogram("callback_delivery_time", time.time() - start)
+    
+    def deliver_due(self) -> int:
+        """
+        Tenta entregar, em sequência, todos os callbacks vencidos.
+        
+        Returns:
+            Número de entregas tentadas
+        """
+        self._load()
+        due = self._due(time.time())
+        for task_id in due:
+            self.deliver(task_id)
+        return len(due)
+    
+    def _wake(self) -> None:
+        """Acorda o laço de entregas, se estiver em execução."""
+        if self._loop is not None and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+    
+    async def _run(self) -> None:
+        """Laço de entregas."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._load)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        
+        async def deliver(task_id: str) -> None:
+            async with semaphore:
+                try:
+                    await loop.run_in_executor(None, self.deliver, task_id)
+                    self._unexpected_errors.pop(task_id, None)
+                except Exception as e:
+                    # Ex.: falha ao gravar a caixa de saída; a entrada fica em disco
+                    # e é retomada no próximo início do serviço
+                    logger.error(f"Erro ao entregar callback da tarefa {task_id}: {e}", exc_info=True)
+                    errors = self._unexpected_errors[task_id] = self._unexpected_errors.get(task_id, 0) + 1
+                    with self._lock:
+                        if errors >= self.max_attempts:
+                            self._schedule.pop(task_id, None)
+                            self._unexpected_errors.pop(task_id, None)
+                        elif task_id in self._schedule:
+                            self._schedule[task_id] = time.time() + min(
+                                self.backoff_max, self.backoff * 2 ** (errors - 1)
+                            )
+        
+        while True:
+            self._wakeup.clear()
+            due = self._due(time.time())
+            if due:
+                await asyncio.gather(*(deliver(task_id) for task_id in due))
+                continue
+            
+            with self._lock:
+                next_attempt = min(self._schedule.values(), default=None)
+            timeout = _POLL_INTERVAL
+            if next_attempt is not None:
+                timeout = max(0.0, min(_POLL_INTERVAL, next_attempt - time.time()))
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+    
+    def start(self) -> None:
+        """Inicia o laço de entregas no loop de eventos atual."""
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        """Interrompe o laço de entregas; as pendentes continuam na caixa de saída."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._loop = None
+        self._wakeup = None
+
+
+_callback_dispatcher: Optional[CallbackDispatcher] = None
+
+
+def get_callback_dispatcher() -> CallbackDispatcher:
+    """
+    Retorna o despachante de callbacks compartilhado pelo serviço.
+    
+    Returns:
+        Instância do despachante
+    """
+    global _callback_dispatcher
+    if _callback_dispatcher is None:
+        _callback_dispatcher = CallbackDispatcher()
+    return _callback_dispatcher
@@ -1,21 +1,49 @@
-import tensorflow as tf
-from typing import Any, Dict
+import os
+import hashlib
+import threading
+import weakref
+from typing import Any, Dict, List, Optional
+import numpy as np
 from .protocols import ExecutionContextProtocol
+from ..utils.metrics import increment_counter
 
 class TensorFlowContext(ExecutionContextProtocol):
     """Contexto de execução para modelos TensorFlow."""
     
-    def __init__(self, gpu_enabled: bool = True, memory_limit: int = None, mixed_precision: bool = False):
+    def __init__(self,
+                 gpu_enabled: bool = True,
+                 memory_limit: int = None,
+                 mixed_precision: bool = False,
+                 compile_inference: bool = False,
+                 jit_compile: bool = False,
+                 batch_buckets: Optional[List[int]] = None):
         """Inicializa o contexto TensorFlow.
         
         Args:
             gpu_enabled: Se True, utiliza GPU quando disponível
             memory_limit: Limite de memória em MB para GPU (None = sem limite)
             mixed_precision: Se True, utiliza precisão mista para aceleração
+            compile_inference: Se True, executa o modelo por um tf.function com
+                assinatura de entrada fixa em vez do modo eager
+            jit_compile: Se True, compila o tf.function com XLA
+            batch_buckets: Tamanhos de batch para os quais as entradas são
+                completadas, permitindo reaproveitar os grafos compilados
         """
+        # Importação tardia para não carregar o TensorFlow se o contexto não for usado
+        import tensorflow as tf
+        self._tf = tf
+        
         self.gpu_enabled = gpu_enabled
         self.memory_limit = memory_limit
         self.mixed_precision = mixed_precision
+        self.compile_inference = compile_inference
+        self.jit_compile = jit_compile
+        self.batch_buckets = sorted(batch_buckets) if batch_buckets else []
+        
+        # Funções compiladas por modelo e por assinatura de entrada; as chaves
+        # fracas liberam as funções quando o modelo é descarregado ou substituído
+        self._compiled: "weakref.WeakKeyDictionary[Any, Dict[Any, Any]]" = weakref.WeakKeyDictionary()
+        self._compile_lock = threading.Lock()
         
         # Configuração para uso de GPU se disponível e habilitado
         if not gpu_enabled:
@@ -37,8 +65,9 @@ class TensorFlowContext(ExecutionContextProtocol):
         if mixed_precision:
             tf.keras.mixed_precision.set_global_policy('mixed_float16')
     
-    def load_model(self, model_path: str) -> tf.keras.Model:
+    def load_model(self, model_path: str) -> Any:
         """Carrega um modelo TensorFlow salvo."""
+        tf = self._tf
         try:
             # Tenta carregar como SavedModel
             return tf.keras.models.load_model(model_path)
@@ -52,12 +81,71 @@ class TensorFlowContext(ExecutionContextProtocol):
                 except:
                     raise ValueError(f"Não foi possível carregar o modelo: {str(e)}")
     
-    def run_inference(self, model: tf.keras.Model, inputs: Any) -> Any:
+    def run_inference(self, model: Any, inputs: Any) -> Any:
         """Executa inferência usando o modelo TensorFlow."""
-        return model(inputs, training=False)
+        if not self.compile_inference:
+            return model(inputs, training=False)
+        
+        tf = self._tf
+        inputs = tf.convert_to_tensor(inputs)
+        if inputs.shape.rank is None or inputs.shape.rank == 0:
+            return model(inputs, training=False)
+        
+        # Completar o batch até o bucket mais próximo para reaproveitar o grafo
+        batch_size = int(inputs.shape[0])
+        padded_size = self._bucket_size(batch_size)
+        if padded_size > batch_size:
+            padding = tf.zeros([padded_size - batch_size] + inputs.shape[1:].as_list(), dtype=inputs.dtype)
+            inputs = tf.concat([inputs, padding], axis=0)
+        
+        outputs = self._get_compiled_function(model, inputs)(inputs)
+        
+        if padded_size > batch_size:
+            outputs = tf.nest.map_structure(lambda output: output[:batch_size], outputs)
+        return outputs
+    
+    def _bucket_size(self, batch_size: int) -> int:
+        """Retorna o menor bucket que comporta o batch (ou o próprio batch)."""
+        for bucket in self.batch_buckets:
+            if bucket >= batch_size:
+                return bucket
+        return batch_size
+    
+    def _get_compiled_function(self, model: Any, inputs: Any) -> Any:
+        """
+        Retorna o tf.function do modelo para a assinatura da entrada.
+        
+        A assinatura declara a dimensão de batch como dinâmica, então apenas
+        mudanças no formato de cada exemplo ou no dtype geram um novo grafo.
+        """
+        tf = self._tf
+        key = (tuple(inputs.shape[1:].as_list()), inputs.dtype.name)
+        compiled = self._compiled.get(model, {}).get(key)
+        if compiled is not None:
+            return compiled
+        
+        with self._compile_lock:
+            functions = self._compiled.setdefault(model, {})
+            compiled = functions.get(key)
+            if compiled is None:
+                model_name = getattr(model, 'name', type(model).__name__)
+                signature = [tf.TensorSpec([None] + inputs.shape[1:].as_list(), inputs.dtype)]
+                # Referência fraca: a função em cache não deve manter o modelo vivo
+                model_ref = weakref.ref(model)
+                
+                def inference(x):
+                    # Código Python só executa durante o tracing
+                    increment_counter("tf_function_traces_total", labels={"model": model_name})
+                    return model_ref()(x, training=False)
+                
+                compiled = functions[key] = tf.function(
+                    inference, input_signature=signature, jit_compile=self.jit_compile or None
+                )
+        return compiled
     
     def get_metadata(self) -> Dict[str, Any]:
         """Retorna metadados sobre o contexto TensorFlow."""
+        tf = self._tf
         return {
             "context_type": "tensorflow",
             "version": tf.__version__,
@@ -65,20 +153,156 @@ class TensorFlowContext(ExecutionContextProtocol):
             "gpu_available": len(tf.config.list_physical_devices('GPU')) > 0,
             "devices": [d.name for d in tf.config.list_physical_devices()],
             "mixed_precision": self.mixed_precision,
-            "memory_limit": self.memory_limit
+            "memory_limit": self.memory_limit,
+            "compile_inference": self.compile_inference,
+            "jit_compile": self.jit_compile,
+            "batch_buckets": self.batch_buckets
         }
 
 
+# Tipos de tensor ONNX para dtypes numpy
+_ONNX_NUMPY_TYPES = {
+    'tensor(float)': np.float32,
+    'tensor(float16)': np.float16,
+    'tensor(double)': np.float64,
+    'tensor(int8)': np.int8,
+    'tensor(int16)': np.int16,
+    'tensor(int32)': np.int32,
+    'tensor(int64)': np.int64,
+    'tensor(uint8)': np.uint8,
+    'tensor(uint16)': np.uint16,
+    'tensor(bool)': np.bool_,
+}
+
+
+class ONNXModelSession:
+    """Sessão ONNX de um modelo com assinaturas de entrada e saída em cache."""
+    
+    def __init__(self, session: Any, model_path: str, use_io_binding: bool = False):
+        """Inicializa a sessão e extrai as assinaturas do modelo.
+        
+        Args:
+            session: InferenceSession do ONNX Runtime
+            model_path: Caminho do modelo de origem
+            use_io_binding: Se True, usa IOBinding com buffers de saída pré-alocados
+                quando todas as dimensões de entrada e saída forem fixas
+        """
+        self.session = session
+        self.model_path = model_path
+        
+        inputs = session.get_inputs()
+        outputs = session.get_outputs()
+        self.input_names = [i.name for i in inputs]
+        self.input_dtypes = {i.name: _ONNX_NUMPY_TYPES.get(i.type, np.float32) for i in inputs}
+        self.input_shapes = {i.name: i.shape for i in inputs}
+        self.output_names = [o.name for o in outputs]
+        self.output_dtypes = {o.name: _ONNX_NUMPY_TYPES.get(o.type, np.float32) for o in outputs}
+        self.output_shapes = {o.name: o.shape for o in outputs}
+        
+        # Buffers pré-alocados só fazem sentido quando os formatos não variam
+        self.fixed_shape = all(
+            all(isinstance(dim, int) for dim in shape)
+            for shape in list(self.input_shapes.values()) + list(self.output_shapes.values())
+        )
+        self.use_io_binding = use_io_binding and self.fixed_shape
+        
+        # Cada thread mantém seu próprio binding e buffers de saída
+        self._local = threading.local()
+    
+    def _get_binding(self):
+        """Retorna o IOBinding e os buffers de saída da thread atual."""
+        binding = getattr(self._local, 'binding', None)
+        if binding is None:
+            binding = self.session.io_binding()
+            buffers = {}
+            for name in self.output_names:
+                buffer = np.empty(self.output_shapes[name], dtype=self.output_dtypes[name])
+                binding.bind_output(
+                    name, 'cpu', 0, buffer.dtype, list(buffer.shape), buffer.ctypes.data
+                )
+                buffers[name] = buffer
+            self._local.binding = binding
+            self._local.buffers = buffers
+        return binding, self._local.buffers
+    
+    def prepare_inputs(self, inputs: Any) -> Dict[str, np.ndarray]:
+        """Converte as entradas para arrays numpy contíguos no dtype esperado.
+        
+        Args:
+            inputs: Array, tensor ou dicionário nome -> valor
+            
+        Returns:
+            Dicionário de entradas no formato do ONNX Runtime
+        """
+        if not isinstance(inputs, dict):
+            inputs = {self.input_names[0]: inputs}
+        
+        feed = {}
+        for name, value in inputs.items():
+            # Tensores TensorFlow/PyTorch expõem .numpy()
+            if not isinstance(value, np.ndarray) and hasattr(value, 'numpy'):
+                value = value.numpy()
+            feed[name] = np.ascontiguousarray(value, dtype=self.input_dtypes.get(name, None))
+        return feed
+    
+    def run(self, inputs: Any) -> Any:
+        """Executa inferência na sessão.
+        
+        Args:
+            inputs: Entradas do modelo
+            
+        Returns:
+            Saída única ou lista de saídas na ordem do modelo
+        """
+        feed = self.prepare_inputs(inputs)
+        
+        if self.use_io_binding:
+            binding, buffers = self._get_binding()
+            for name, value in feed.items():
+                binding.bind_cpu_input(name, value)
+            self.session.run_with_iobinding(binding)
+            # Cópias para que a próxima inferência não sobrescreva o resultado
+            outputs = [buffers[name].copy() for name in self.output_names]
+        else:
+            outputs = self.session.run(self.output_names, feed)
+        
+        # Se tivermos apenas uma saída, retorna diretamente
+        if len(outputs) == 1:
+            return outputs[0]
+        return outputs
+
+
 class ONNXContext(ExecutionContextProtocol):
     """Contexto de execução para modelos ONNX."""
     
-    def __init__(self, providers=None):
+    def __init__(self,
+                 providers=None,
+                 intra_op_num_threads: int = 0,
+                 inter_op_num_threads: int = 0,
+                 graph_optimization_level: str = "all",
+                 optimized_model_dir: Optional[str] = None,
+                 use_io_binding: bool = False,
+                 variant: Optional[str] = None):
         """Inicializa o contexto ONNX.
         
         Args:
             providers: Lista de providers ONNX (None = usa padrões disponíveis)
+            intra_op_num_threads: Threads usadas dentro de cada operador (0 = padrão do ONNX Runtime)
+            inter_op_num_threads: Threads usadas entre operadores (0 = padrão do ONNX Runtime)
+            graph_optimization_level: Nível de otimização do grafo ('disable', 'basic', 'extended', 'all')
+            optimized_model_dir: Diretório onde o grafo otimizado é salvo e reaproveitado
+                entre reinicializações (None = não salva)
+            use_io_binding: Se True, usa IOBinding com buffers pré-alocados em modelos de formato fixo
+            variant: Variante do modelo executada por este contexto (ex.: 'onnx_int8');
+                None executa o modelo original
         """
         self.providers = providers
+        self.variant = variant
+        self.intra_op_num_threads = intra_op_num_threads
+        self.inter_op_num_threads = inter_op_num_threads
+        self.graph_optimization_level = graph_optimization_level
+        self.optimized_model_dir = optimized_model_dir
+        self.use_io_binding = use_io_binding
         
         # Importação tardia para não exigir dependência se não for usado
         try:
@@ -93,57 +317,284 @@ class ONNXContext(ExecutionContextProtocol):
                 else:
                     self.providers = ['CPUExecutionProvider']
             
-            self._session = None
+            # Uma sessão por modelo, indexada pelo caminho do modelo
+            self._sessions: Dict[str, ONNXModelSession] = {}
+            self._lock = threading.Lock()
         except ImportError:
             raise ImportError("ONNX Runtime não está instalado. Instale com 'pip install onnxruntime-gpu' ou 'pip install onnxruntime'")
     
+    def _optimization_level(self, level: str) -> Any:
+        """Converte o nome do nível de otimização para a constante do ONNX Runtime."""
+        levels = {
+            "disable": self._ort.GraphOptimizationLevel.ORT_DISABLE_ALL,
+            "basic": self._ort.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+            "extended": self._ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+            "all": self._ort.GraphOptimizationLevel.ORT_ENABLE_ALL,
+        }
+        if level not in levels:
+            raise ValueError(f"Nível de otimização inválido: {level}")
+        return levels[level]
+    
+    def _optimized_model_path(self, model_path: str) -> str:
+        """Calcula o caminho do grafo otimizado em cache para o modelo."""
+        stat = os.stat(model_path)
+        # O nome muda quando o modelo de origem, o nível ou os providers mudam
+        key = f"{os.path.abspath(model_path)}:{stat.st_size}:{stat.st_mtime_ns}:" \
+              f"{self.graph_optimization_level}:{','.join(self.providers)}"
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+        name = os.path.splitext(os.path.basename(model_path))[0]
+        return os.path.join(self.optimized_model_dir, f"{name}.{digest}.opt.onnx")
+    
+    def _create_session(self, model_path: str) -> ONNXModelSession:
+        """Cria a sessão ONNX com as opções configuradas."""
+        ort = self._ort
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = self.intra_op_num_threads
+        options.inter_op_num_threads = self.inter_op_num_threads
+        if self.inter_op_num_threads > 1:
+            options.execution_mode = ort.ExecutionMode.ORT_PARALLEL
+        options.graph_optimization_level = self._optimization_level(self.graph_optimization_level)
+        
+        source_path = model_path
+        optimized_path = temp_path = None
+        if self.optimized_model_dir:
+            optimized_path = self._optimized_model_path(model_path)
+            if os.path.exists(optimized_path):
+                # Grafo já otimizado em uma execução anterior
+                source_path = optimized_path
+                options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+            else:
+                # O ONNX Runtime grava o grafo otimizado em um arquivo temporário,
+                # movido para o destino apenas depois de completo
+                os.makedirs(self.optimized_model_dir, exist_ok=True)
+                temp_path = f"{optimized_path[:-len('.onnx')]}.{os.getpid()}.{threading.get_ident()}.tmp.onnx"
+                options.optimized_model_filepath = temp_path
+        
+        try:
+            session = ort.InferenceSession(source_path, sess_options=options, providers=self.providers)
+            if temp_path is not None and os.path.exists(temp_path):
+                os.replace(temp_path, optimized_path)
+        finally:
+            if temp_path is not None and os.path.exists(temp_path):
+                os.remove(temp_path)
+        return ONNXModelSession(session, model_path, use_io_binding=self.use_io_binding)
+    
     def load_model(self, model_path: str) -> Any:
-        """Carrega um modelo ONNX."""
-        self._session = self._ort.InferenceSession(model_path, providers=self.providers)
-        return self._session
+        """Carrega um modelo ONNX, reaproveitando a sessão se já estiver carregado."""
+        with self._lock:
+            model_session = self._sessions.get(model_path)
+            if model_session is None:
+                model_session = self._create_session(model_path)
+                self._sessions[model_path] = model_session
+        return model_session
+    
+    def unload_model(self, model_path: str) -> None:
+        """Remove a sessão de um modelo, liberando seus recursos."""
+        with self._lock:
+            self._sessions.pop(model_path, None)
     
     def run_inference(self, model: Any, inputs: Any) -> Any:
         """Executa inferência usando o modelo ONNX."""
-        # Determinar nomes de entrada e saída do modelo
-        input_name = model.get_inputs()[0].name
-        output_names = [output.name for output in model.get_outputs()]
-        
-        # Preparar entrada
-        if isinstance(inputs, dict):
-            # Entrada já está no formato de dicionário
-            input_dict = inputs
-        else:
-            # Convertemos para o formato esperado pelo ONNX
-            input_dict = {input_name: inputs}
+        if not isinstance(model, ONNXModelSession):
+            # InferenceSession criada fora do contexto
+            model = ONNXModelSession(model, model_path="")
+        return model.run(inputs)
+    
+    def get_metadata(self) -> Dict[str, Any]:
+        """Retorna metadados sobre o contexto ONNX."""
+        return {
+            "context_type": "onnx",
+            "version": self._ort.__version__,
+            "providers": self.providers,
+            "available_providers": self._ort.get_available_providers(),
+            "intra_op_num_threads": self.intra_op_num_threads,
+            "inter_op_num_threads": self.inter_op_num_threads,
+            "graph_optimization_level": self.graph_optimization_level,
+            "use_io_binding": self.use_io_binding,
+            "variant": self.variant,
+            "loaded_models": list(self._sessions.keys())
+        }
+
+
+class TFLiteModel:
+    """Modelo TFLite com um interpretador por thread."""
+    
+    def __init__(self, model_path: str, interpreter_class: Any, num_threads: Optional[int] = None):
+        """Inicializa o modelo.
         
-        # Executar inferência
-        outputs = model.run(output_names, input_dict)
+        Args:
+            model_path: Caminho do arquivo .tflite
+            interpreter_class: Classe Interpreter (LiteRT, tflite_runtime ou tf.lite)
+            num_threads: Threads usadas por cada interpretador (None = padrão)
+        """
+        self.model_path = model_path
+        self._interpreter_class = interpreter_class
+        self.num_threads = num_threads
         
-        # Se tivermos apenas uma saída, retorna diretamente
+        # Interpretadores TFLite não são seguros entre threads
+        self._local = threading.local()
+        self._get_interpreter()
+    
+    def _get_interpreter(self) -> Any:
+        """Retorna o interpretador da thread atual, criando-o se necessário."""
+        interpreter = getattr(self._local, 'interpreter', None)
+        if interpreter is None:
+            interpreter = self._interpreter_class(model_path=self.model_path, num_threads=self.num_threads)
+            interpreter.allocate_tensors()
+            self._local.interpreter = interpreter
+            self._local.input_details = interpreter.get_input_details()
+            self._local.output_details = interpreter.get_output_details()
+        return interpreter
+    
+    @staticmethod
+    def _quantize(value: np.ndarray, detail: Dict[str, Any]) -> np.ndarray:
+        """Converte a entrada para o dtype do tensor, quantizando se necessário."""
+        dtype = detail['dtype']
+        scale, zero_point = detail.get('quantization', (0.0, 0))
+        if np.issubdtype(dtype, np.integer) and scale and not np.issubdtype(value.dtype, np.integer):
+            info = np.iinfo(dtype)
+            value = np.clip(np.round(value / scale + zero_point), info.min, info.max)
+        return value.astype(dtype, copy=False)
+    
+    @staticmethod
+    def _dequantize(value: np.ndarray, detail: Dict[str, Any]) -> np.ndarray:
+        """Converte a saída quantizada de volta para float32."""
+        scale, zero_point = detail.get('quantization', (0.0, 0))
+        if np.issubdtype(value.dtype, np.integer) and scale:
+            return (value.astype(np.float32) - zero_point) * scale
+        return value
+    
+    def run(self, inputs: Any) -> Any:
+        """Executa inferência no interpretador da thread atual.
+        
+        Args:
+            inputs: Array ou tensor de entrada (ou lista, para modelos com várias entradas)
+            
+        Returns:
+            Saída única ou lista de saídas
+        """
+        interpreter = self._get_interpreter()
+        values = inputs if isinstance(inputs, (list, tuple)) else [inputs]
+        values = [v.numpy() if not isinstance(v, np.ndarray) and hasattr(v, 'numpy') else np.asarray(v) for v in values]
+        
+        # Redimensionar os tensores de entrada quando o batch muda
+        input_details = self._local.input_details
+        if any(tuple(v.shape) != tuple(d['shape']) for v, d in zip(values, input_details)):
+            for value, detail in zip(values, input_details):
+                interpreter.resize_tensor_input(detail['index'], list(value.shape))
+            interpreter.allocate_tensors()
+            self._local.input_details = input_details = interpreter.get_input_details()
+            self._local.output_details = interpreter.get_output_details()
+        
+        for value, detail in zip(values, input_details):
+            interpreter.set_tensor(detail['index'], self._quantize(value, detail))
+        interpreter.invoke()
+        
+        outputs = [
+            self._dequantize(interpreter.get_tensor(detail['index']), detail)
+            for detail in self._local.output_details
+        ]
         if len(outputs) == 1:
             return outputs[0]
         return outputs
+
+
+class TFLiteContext(ExecutionContextProtocol):
+    """Contexto de execução para modelos TFLite (incluindo variantes quantizadas)."""
+    
+    def __init__(self, num_threads: Optional[int] = None, variant: Optional[str] = None):
+        """Inicializa o contexto TFLite.
+        
+        Args:
+            num_threads: Threads usadas por cada interpretador (None = padrão)
+            variant: Variante do modelo executada por este contexto (ex.: 'tflite_int8');
+                None executa o modelo original
+        """
+        self.num_threads = num_threads
+        self.variant = variant
+        
+        # Importação tardia: usa o runtime mais leve disponível
+        try:
+            from ai_edge_litert.interpreter import Interpreter
+            self._runtime = "ai_edge_litert"
+        except ImportError:
+            try:
+                from tflite_runtime.interpreter import Interpreter
+                self._runtime = "tflite_runtime"
+            except ImportError:
+                try:
+                    import tensorflow as tf
+                    Interpreter = tf.lite.Interpreter
+                    self._runtime = "tensorflow"
+                except ImportError:
+                    raise ImportError("Nenhum runtime TFLite disponível. Instale com 'pip install ai-edge-litert' ou 'pip install tensorflow'")
+        self._interpreter_class = Interpreter
+    
+    def load_model(self, model_path: str) -> Any:
+        """Carrega um modelo TFLite."""
+        return TFLiteModel(model_path, self._interpreter_class, num_threads=self.num_threads)
+    
+    def run_inference(self, model: Any, inputs: Any) -> Any:
+        """Executa inferência usando o modelo TFLite."""
+        return model.run(inputs)
     
     def get_metadata(self) -> Dict[str, Any]:
-        """Retorna metadados sobre o contexto ONNX."""
+        """Retorna metadados sobre o contexto TFLite."""
         return {
-            "context_type": "onnx",
-            "version": self._ort.__version__,
-            "providers": self.providers,
-            "available_providers": self._ort.get_available_providers()
+            "context_type": "tflite",
+            "version": self._runtime,
+            "num_threads": self.num_threads,
+            "variant": self.variant
         }
 
 
+class PyTorchCompiledModel:
+    """Modelo PyTorch compilado (TorchScript ou torch.compile) com cache em disco."""
+    
+    def __init__(self, module: Any, compile_mode: str, cache_path: Optional[str] = None):
+        """Inicializa o modelo compilado.
+        
+        Args:
+            module: Módulo já compilado ou, no modo 'trace', o módulo original
+                a ser rastreado na primeira inferência
+            compile_mode: Modo de compilação ('script', 'trace' ou 'compile')
+            cache_path: Arquivo TorchScript onde o módulo rastreado é salvo
+        """
+        self.module = module
+        self.compile_mode = compile_mode
+        self.cache_path = cache_path
+        self.traced = compile_mode != 'trace'
+        self._lock = threading.Lock()
+
+
 class PyTorchContext(ExecutionContextProtocol):
     """Contexto de execução para modelos PyTorch."""
     
-    def __init__(self, gpu_enabled: bool = True, device_id: int = 0):
+    COMPILE_MODES = ('script', 'trace', 'compile')
+    
+    def __init__(self,
+                 gpu_enabled: bool = True,
+                 device_id: int = 0,
+                 compile_mode: Optional[str] = None,
+                 channels_last: bool = False,
+                 num_threads: Optional[int] = None,
+                 cache_dir: Optional[str] = None,
+                 input_layout: Optional[str] = None):
         """Inicializa o contexto PyTorch.
         
         Args:
             gpu_enabled: Se True, utiliza GPU quando disponível
             device_id: ID do dispositivo GPU a ser usado
+            compile_mode: Modo de compilação ('script', 'trace', 'compile' ou None para eager)
+            channels_last: Se True, usa o formato de memória channels-last (redes convolucionais)
+            num_threads: Número de threads de CPU usadas pelo PyTorch (None = padrão)
+            cache_dir: Diretório onde os modelos TorchScript compilados são salvos
+            input_layout: 'nhwc' para converter a saída do pré-processamento (NHWC)
+                em NCHW sem cópia; None mantém a entrada como está
         """
+        if compile_mode is not None and compile_mode not in self.COMPILE_MODES:
+            raise ValueError(f"Modo de compilação inválido: {compile_mode}")
+        
         # Importação tardia para não exigir dependência se não for usado
         try:
             import torch
@@ -151,18 +602,47 @@ class PyTorchContext(ExecutionContextProtocol):
             
             self.gpu_enabled = gpu_enabled
             self.device_id = device_id
+            self.compile_mode = compile_mode
+            self.channels_last = channels_last
+            self.num_threads = num_threads
+            self.cache_dir = cache_dir
+            self.input_layout = input_layout
             
             if gpu_enabled and torch.cuda.is_available():
                 self.device = torch.device(f"cuda:{device_id}")
             else:
                 self.device = torch.device("cpu")
+            
+            if num_threads:
+                torch.set_num_threads(num_threads)
+            
+            # O cache do Inductor (torch.compile) também fica no diretório de cache
+            if compile_mode == 'compile' and cache_dir:
+                os.environ.setdefault("TORCHINDUCTOR_CACHE_DIR", os.path.join(cache_dir, "inductor"))
                 
         except ImportError:
             raise ImportError("PyTorch não está instalado. Instale com 'pip install torch'")
     
-    def load_model(self, model_path: str) -> Any:
-        """Carrega um modelo PyTorch."""
-        model = self._torch.load(model_path, map_location=self.device)
+    def _cache_path(self, model_path: str) -> Optional[str]:
+        """Calcula o caminho do modelo TorchScript em cache para o modelo de origem."""
+        if not self.cache_dir:
+            return None
+        stat = os.stat(model_path)
+        # O nome muda quando o modelo de origem, o modo ou o dispositivo mudam
+        key = f"{os.path.abspath(model_path)}:{stat.st_size}:{stat.st_mtime_ns}:" \
+              f"{self.compile_mode}:{self.device}:{self.channels_last}:{self._torch.__version__}"
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+        name = os.path.splitext(os.path.basename(model_path))[0]
+        return os.path.join(self.cache_dir, f"{name}.{digest}.{self.compile_mode}.pt")
+    
+    def _load_module(self, model_path: str) -> Any:
+        """Carrega o módulo PyTorch completo a partir do arquivo."""
+        torch = self._torch
+        try:
+            model = torch.load(model_path, map_location=self.device, weights_only=False)
+        except TypeError:
+            # Versões anteriores ao parâmetro weights_only
+            model = torch.load(model_path, map_location=self.device)
         
         # Verificar se é um estado de modelo ou um modelo completo
         if isinstance(model, dict) and 'state_dict' in model:
@@ -171,39 +651,125 @@ class PyTorchContext(ExecutionContextProtocol):
         
         # Coloca o modelo no modo de avaliação
         model.eval()
+        if self.channels_last:
+            model = model.to(memory_format=torch.channels_last)
         return model
     
+    def _freeze(self, scripted: Any) -> Any:
+        """Congela um módulo TorchScript para inferência, quando suportado."""
+        try:
+            return self._torch.jit.freeze(scripted)
+        except Exception:
+            return scripted
+    
+    def load_model(self, model_path: str) -> Any:
+        """Carrega um modelo PyTorch, compilando-o se configurado."""
+        torch = self._torch
+        
+        if self.compile_mode in ('script', 'trace'):
+            cache_path = self._cache_path(model_path)
+            if cache_path and os.path.exists(cache_path):
+                # Módulo compilado em uma execução anterior
+                module = torch.jit.load(cache_path, map_location=self.device)
+                return PyTorchCompiledModel(module, 'script', cache_path)
+            
+            module = self._load_module(model_path)
+            if self.compile_mode == 'trace':
+                # O rastreamento precisa de uma entrada real; ocorre na primeira inferência
+                return PyTorchCompiledModel(module, 'trace', cache_path)
+            
+            scripted = self._freeze(torch.jit.script(module))
+            self._save_compiled(scripted, cache_path)
+            return PyTorchCompiledModel(scripted, 'script', cache_path)
+        
+        model = self._load_module(model_path)
+        if self.compile_mode == 'compile':
+            if not hasattr(torch, 'compile'):
+                raise ValueError("torch.compile requer PyTorch 2.0 ou superior")
+            return PyTorchCompiledModel(torch.compile(model), 'compile')
+        return model
+    
+    def _save_compiled(self, module: Any, cache_path: Optional[str]) -> None:
+        """Salva o módulo TorchScript no cache de forma atômica."""
+        if not cache_path:
+            return
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        self._torch.jit.save(module, temp_path)
+        os.replace(temp_path, cache_path)
+    
+    def _trace(self, compiled: PyTorchCompiledModel, inputs: Any) -> None:
+        """Rastreia o módulo com a primeira entrada recebida e salva no cache."""
+        with compiled._lock:
+            if compiled.traced:
+                return
+            example = tuple(inputs) if isinstance(inputs, list) else inputs
+            traced = self._freeze(self._torch.jit.trace(compiled.module, example))
+            self._save_compiled(traced, compiled.cache_path)
+            compiled.module = traced
+            compiled.traced = True
+    
     def run_inference(self, model: Any, inputs: Any) -> Any:
         """Executa inferência usando o modelo PyTorch."""
-        with self._torch.no_grad():
+        torch = self._torch
+        with torch.inference_mode():
             # Converter entrada para tensor PyTorch se necessário
-            if not isinstance(inputs, self._torch.Tensor):
-                if isinstance(inputs, (list, tuple)):
-                    inputs = [self._ensure_tensor(x).to(self.device) for x in inputs]
-                else:
-                    inputs = self._ensure_tensor(inputs).to(self.device)
+            if isinstance(inputs, (list, tuple)):
+                inputs = [self._prepare_input(x) for x in inputs]
+            else:
+                inputs = self._prepare_input(inputs)
+            
+            if isinstance(model, PyTorchCompiledModel):
+                if not model.traced:
+                    self._trace(model, inputs)
+                model = model.module
             
             # Executa inferência
-            outputs = model(inputs)
+            outputs = model(*inputs) if isinstance(inputs, list) else model(inputs)
             
             # Converter saída para CPU/numpy para compatibilidade
-            if isinstance(outputs, self._torch.Tensor):
-                return outputs.cpu().numpy()
-            elif isinstance(outputs, (list, tuple)) and all(isinstance(x, self._torch.Tensor) for x in outputs):
-                return [x.cpu().numpy() for x in outputs]
-            else:
-                return outputs
+            return self._to_numpy(outputs)
+    
+    def _prepare_input(self, data: Any) -> Any:
+        """Converte a entrada para tensor no dispositivo e layout do modelo."""
+        torch = self._torch
+        tensor = self._ensure_tensor(data)
+        
+        if tensor.dim() == 4:
+            if self.input_layout == 'nhwc':
+                # Permutar NHWC para NCHW é uma view: o resultado já é channels-last
+                tensor = tensor.permute(0, 3, 1, 2)
+            if self.channels_last:
+                tensor = tensor.contiguous(memory_format=torch.channels_last)
+        
+        return tensor.to(self.device, non_blocking=True)
+    
+    def _to_numpy(self, outputs: Any) -> Any:
+        """Converte as saídas do modelo para arrays numpy."""
+        torch = self._torch
+        if isinstance(outputs, torch.Tensor):
+            return outputs.cpu().numpy()
+        elif isinstance(outputs, (list, tuple)):
+            return [self._to_numpy(x) for x in outputs]
+        elif isinstance(outputs, dict):
+            return {key: self._to_numpy(value) for key, value in outputs.items()}
+        else:
+            return outputs
     
     def _ensure_tensor(self, data: Any) -> Any:
-        """Converte dados para tensor PyTorch se necessário."""
-        if isinstance(data, self._torch.Tensor):
+        """Converte dados para tensor PyTorch sem cópia sempre que possível."""
+        torch = self._torch
+        if isinstance(data, torch.Tensor):
             return data
-        elif isinstance(data, (list, tuple)):
-            return self._torch.tensor(data)
-        elif isinstance(data, np.ndarray):
-            return self._torch.from_numpy(data)
-        else:
-            return self._torch.tensor(data)
+        # Tensores TensorFlow (saída do pré-processamento) expõem .numpy()
+        if not isinstance(data, np.ndarray) and hasattr(data, 'numpy'):
+            data = data.numpy()
+        if isinstance(data, np.ndarray):
+            if not data.flags.writeable:
+                # torch.from_numpy não aceita arrays somente leitura
+                data = data.copy()
+            return torch.from_numpy(data)
+        return torch.as_tensor(data)
     
     def get_metadata(self) -> Dict[str, Any]:
         """Retorna metadados sobre o contexto PyTorch."""
@@ -213,5 +779,9 @@ class PyTorchContext(ExecutionContextProtocol):
             "gpu_enabled": self.gpu_enabled,
             "gpu_available": self._torch.cuda.is_available(),
             "device": str(self.device),
-            "device_count": self._torch.cuda.device_count() if self._torch.cuda.is_available() else 0
+            "device_count": self._torch.cuda.device_count() if self._torch.cuda.is_available() else 0,
+            "compile_mode": self.compile_mode,
+            "channels_last": self.channels_last,
+            "num_threads": self._torch.get_num_threads(),
+            "input_layout": self.input_layout
         }
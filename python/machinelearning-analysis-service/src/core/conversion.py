@@ -0,0 +1,241 @@
+"""
+Conversão de modelos TensorFlow/Keras para formatos otimizados (ONNX ou TFLite).
+
+O artefato convertido é salvo ao lado do modelo de origem, com o hash do
+conteúdo de origem no nome (`<modelo>.converted-<hash>.onnx`), de modo que
+outros workers e inicializações posteriores o reaproveitem e que uma nova
+versão do modelo gere um novo artefato. A conversão é protegida por uma
+trava (flock) em um arquivo ao lado do artefato, para que apenas um processo
+converta o mesmo modelo; a trava é liberada pelo sistema operacional se o
+processo terminar durante a conversão.
+"""
+
+import os
+import glob
+import fcntl
+import time
+import hashlib
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Extensão do artefato por formato de destino
+CONVERSION_TARGETS = {
+    "onnx": ".onnx",
+    "tflite": ".tflite"
+}
+
+# Tempo máximo de espera pela conversão feita por outro processo (segundos)
+CONVERSION_LOCK_TIMEOUT = float(os.environ.get("CONVERSION_LOCK_TIMEOUT", 600))
+
+# Tempo durante o qual uma conversão que falhou não é repetida (segundos)
+CONVERSION_FAILURE_TTL = float(os.environ.get("CONVERSION_FAILURE_TTL", 24 * 60 * 60))
+
+# Erros de ambiente (disco, memória, dependência ausente): não marcam a falha,
+# para que a conversão seja tentada de novo no próximo carregamento
+_TRANSIENT_ERRORS = (ImportError, OSError, MemoryError)
+
+
+def source_hash(model_path: str) -> str:
+    """
+    Calcula o hash do conteúdo do modelo de origem.
+    
+    Args:
+        model_path: Arquivo do modelo ou diretório SavedModel
+    
+    Returns:
+        Hash SHA-1 em hexadecimal
+    """
+    digest = hashlib.sha1()
+    
+    if os.path.isdir(model_path):
+        files = []
+        for root, _, names in os.walk(model_path):
+            files.extend(os.path.join(root, name) for name in names)
+        files.sort()
+    else:
+        files = [model_path]
+    
+    for path in files:
+        # O caminho relativo entra no hash para detectar arquivos renomeados
+        digest.update(os.path.relpath(path, model_path).encode('utf-8'))
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    
+    return digest.hexdigest()
+
+
+def _artifact_prefix(model_path: str) -> str:
+    """Prefixo comum aos artefatos convertidos de um modelo."""
+    base_path = model_path.rstrip("/\\")
+    stem = base_path if os.path.isdir(base_path) else os.path.splitext(base_path)[0]
+    return f"{stem}.converted-"
+
+
+def converted_model_path(model_path: str, target: str, digest: Optional[str] = None) -> str:
+    """
+    Retorna o caminho do artefato convertido de um modelo.
+    
+    Args:
+        model_path: Caminho do modelo de origem
+        target: Formato de destino ('onnx' ou 'tflite')
+        digest: Hash do modelo de origem (calculado se omitido)
+    
+    Returns:
+        Caminho do artefato convertido
+    """
+    if target not in CONVERSION_TARGETS:
+        raise ValueError(f"Formato de conversão não suportado: {target}")
+    
+    digest = digest or source_hash(model_path)
+    return f"{_artifact_prefix(model_path)}{digest[:16]}{CONVERSION_TARGETS[target]}"
+
+
+def _convert_to_tflite(model_path: str, output_path: str) -> None:
+    """Converte um modelo Keras/SavedModel para TFLite."""
+    import tensorflow as tf
+    
+    if os.path.isdir(model_path):
+        converter = tf.lite.TFLiteConverter.from_saved_model(model_path)
+    else:
+        converter = tf.lite.TFLiteConverter.from_keras_model(tf.keras.models.load_model(model_path))
+    
+    with open(output_path, 'wb') as f:
+        f.write(converter.convert())
+
+
+def _convert_to_onnx(model_path: str, output_path: str) -> None:
+    """Converte um modelo Keras/SavedModel para ONNX com tf2onnx."""
+    try:
+        import tf2onnx
+    except ImportError:
+        raise ImportError("A conversão para ONNX requer tf2onnx. Instale com 'pip install tf2onnx'")
+    import tensorflow as tf
+    
+    if os.path.isdir(model_path):
+        tf2onnx.convert.from_saved_model(model_path, output_path=output_path)
+    else:
+        tf2onnx.convert.from_keras(tf.keras.models.load_model(model_path), output_path=output_path)
+
+
+_CONVERTERS = {
+    "onnx": _convert_to_onnx,
+    "tflite": _convert_to_tflite
+}
+
+
+def _acquire_lock(lock_fd: int, timeout: float) -> bool:
+    """
+    Obtém a trava exclusiva do arquivo, aguardando a conversão feita por outro processo.
+    
+    Returns:
+        True se a trava foi obtida, False se o tempo de espera expirou
+    """
+    deadline = time.time() + timeout
+    while True:
+        try:
+            fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            if time.time() >= deadline:
+                return False
+            time.sleep(0.5)
+
+
+def _recently_failed(failed_path: str) -> bool:
+    """Indica se há um marcador de falha com menos de CONVERSION_FAILURE_TTL segundos."""
+    try:
+        return time.time() - os.path.getmtime(failed_path) < CONVERSION_FAILURE_TTL
+    except OSError:
+        return False
+
+
+def _mark_failed(failed_path: str, error: Exception) -> None:
+    """Grava o marcador de falha; sem ele, a conversão apenas será tentada de novo."""
+    try:
+        with open(failed_path, 'w', encoding='utf-8') as f:
+            f.write(str(error))
+    except OSError as e:
+        logger.warning(f"Não foi possível gravar o marcador de falha {failed_path}: {str(e)}")
+
+
+def _remove_stale_artifacts(model_path: str, target: str, output_path: str) -> None:
+    """Remove artefatos de versões anteriores do modelo (as travas são mantidas)."""
+    for stale_path in glob.glob(f"{glob.escape(_artifact_prefix(model_path))}*{CONVERSION_TARGETS[target]}"):
+        if stale_path == output_path:
+            continue
+        try:
+            os.remove(stale_path)
+        except OSError as e:
+            logger.debug(f"Não foi possível remover o artefato antigo {stale_path}: {str(e)}")
+
+
+def convert_model(model_path: str, target: str, timeout: float = CONVERSION_LOCK_TIMEOUT) -> Optional[str]:
+    """
+    Obtém o artefato convertido de um modelo, convertendo-o se necessário.
+    
+    Args:
+        model_path: Caminho do modelo TensorFlow/Keras de origem
+        target: Formato de destino ('onnx' ou 'tflite')
+        timeout: Tempo máximo de espera pela conversão de outro processo
+    
+    Returns:
+        Caminho do artefato convertido, ou None se a conversão falhou
+    """
+    try:
+        digest = source_hash(model_path)
+        output_path = converted_model_path(model_path, target, digest)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Não foi possível preparar a conversão de {model_path}: {str(e)}")
+        return None
+    
+    if os.path.exists(output_path):
+        return output_path
+    
+    # Conversões que falharam recentemente para este conteúdo não são repetidas
+    failed_path = f"{output_path}.failed"
+    if _recently_failed(failed_path):
+        return None
+    
+    # O arquivo de trava é mantido entre conversões: removê-lo permitiria que
+    # um processo travasse o arquivo antigo e outro um arquivo novo
+    lock_path = f"{output_path}.lock"
+    try:
+        lock_fd = os.open(lock_path, os.O_CREAT | os.O_RDWR)
+    except OSError as e:
+        logger.warning(f"Não foi possível criar a trava de conversão de {model_path}: {str(e)}")
+        return None
+    
+    temp_path = f"{output_path}.{os.getpid()}.tmp"
+    try:
+        if not _acquire_lock(lock_fd, timeout):
+            logger.warning(f"Tempo esgotado aguardando a conversão de {model_path}")
+            return None
+        
+        # Outro processo pode ter concluído (ou falhado) enquanto aguardávamos a trava
+        if os.path.exists(output_path):
+            return output_path
+        if _recently_failed(failed_path):
+            return None
+        
+        start_time = time.time()
+        _CONVERTERS[target](model_path, temp_path)
+        os.replace(temp_path, output_path)
+        logger.info(f"Modelo {model_path} convertido para {target} em {time.time() - start_time:.1f}s: {output_path}")
+    except _TRANSIENT_ERRORS as e:
+        logger.warning(f"Conversão de {model_path} para {target} indisponível no momento: {str(e)}")
+        return None
+    except Exception as e:
+        logger.warning(f"Falha ao converter {model_path} para {target}, usando o modelo original: {str(e)}")
+        _mark_failed(failed_path, e)
+        return None
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        # Fechar o descritor libera a trava
+        os.close(lock_fd)
+    
+    _remove_stale_artifacts(model_path, target, output_path)
+    return output_path
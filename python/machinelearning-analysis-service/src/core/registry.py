@@ -1,7 +1,13 @@
-from typing import Dict, List, Any, Optional, Type
+import copy
+import logging
+import threading
+from typing import Callable, Dict, List, Any, Optional, Type
 from .protocols import ModelProtocol, ExecutionContextProtocol
 from ..models.base import ModelContext
 from ..exporters.exporter_base import ExporterBase
+from .variants import load_variant_manifest, resolve_variant_path
+
+logger = logging.getLogger(__name__)
 
 class ModelRegistry:
     """Registro global de modelos disponíveis."""
@@ -13,6 +19,9 @@ class ModelRegistry:
             cls._instance = super(ModelRegistry, cls).__new__(cls)
             cls._instance._models = {}
             cls._instance._contexts = {}
+            cls._instance._context_factories = {}
+            cls._instance._variant_models = {}
+            cls._instance._lock = threading.Lock()
         return cls._instance
     
     def register_model(self, model: ModelProtocol) -> None:
@@ -24,6 +33,21 @@ class ModelRegistry:
         """Registra um contexto de execução no registro."""
         self._contexts[name] = context
     
+    def register_context_factory(
+        self, name: str, factory: Callable[[], ExecutionContextProtocol]
+    ) -> None:
+        """
+        Registra um contexto de execução criado apenas no primeiro uso.
+        
+        Evita importar o framework do contexto (TensorFlow, ONNX Runtime,
+        PyTorch) enquanto nenhum modelo precisar dele.
+        
+        Args:
+            name: Nome do contexto
+            factory: Função sem argumentos que cria o contexto
+        """
+        self._context_factories[name] = factory
+    
     def get_model(self, model_id: str, version: str = "latest") -> Optional[ModelProtocol]:
         """Obtém um modelo pelo ID e versão."""
         # Se for "latest", encontrar a versão mais recente
@@ -63,20 +87,71 @@ class ModelRegistry:
     
     def get_context(self, name: str) -> Optional[ExecutionContextProtocol]:
         """Obtém um contexto de execução pelo nome."""
-        return self._contexts.get(name)
+        context = self._contexts.get(name)
+        if context is not None or name not in self._context_factories:
+            return context
+        
+        # Criar o contexto sob demanda uma única vez, mesmo com chamadas concorrentes
+        with self._lock:
+            context = self._contexts.get(name)
+            if context is None:
+                try:
+                    context = self._context_factories[name]()
+                except ImportError:
+                    # Framework indisponível: o contexto deixa de ser anunciado
+                    del self._context_factories[name]
+                    raise
+                self._contexts[name] = context
+        return context
     
     def create_model_context(
         self, model_id: str, version: str = "latest", context_name: str = "default"
     ) -> Optional[ModelContext]:
-        """Cria um ModelContext combinando um modelo e um contexto."""
+        """
+        Cria um ModelContext combinando um modelo e um contexto.
+        
+        Se o contexto executa uma variante (atributo `variant`, por exemplo
+        'onnx_int8'), o modelo usado é a cópia que aponta para o artefato da variante.
+        """
         model = self.get_model(model_id, version)
         context = self.get_context(context_name)
         
         if model is None or context is None:
             return None
         
+        variant = getattr(context, 'variant', None)
+        if variant:
+            model = self._get_variant_model(model, variant)
+            if model is None:
+                return None
+        
         return ModelContext(model, context)
     
+    def _get_variant_model(self, model: ModelProtocol, variant: str) -> Optional[ModelProtocol]:
+        """Obtém (e mantém em cache) a cópia do modelo que usa o artefato da variante."""
+        key = f"{model.model_id}@{model.version}#{variant}"
+        variant_model = self._variant_models.get(key)
+        if variant_model is not None:
+            return variant_model
+        
+        variant_path = resolve_variant_path(model, variant)
+        if variant_path is None:
+            logger.warning(f"Variante {variant} não encontrada para o modelo {model.model_id}@{model.version}")
+            return None
+        
+        with self._lock:
+            variant_model = self._variant_models.get(key)
+            if variant_model is None:
+                # Cópia rasa: processadores e metadados são compartilhados com o original
+                variant_model = copy.copy(model)
+                variant_model.model_path = variant_path
+                variant_model._model = None
+                variant_model._is_loaded = False
+                variant_model._context = None
+                variant_model._source_context = None
+                self._variant_models[key] = variant_model
+        return variant_model
+    
     def list_available_models(self) -> List[Dict[str, str]]:
         """Lista todos os modelos disponíveis no registro."""
         models = []
@@ -87,7 +162,9 @@ class ModelRegistry:
     
     def list_available_contexts(self) -> List[str]:
         """Lista todos os contextos disponíveis no registro."""
-        return list(self._contexts.keys())
+        names = list(self._contexts.keys())
+        names.extend(name for name in self._context_factories if name not in self._contexts)
+        return names
     
     def get_model_metadata(self, model_id: str, version: str = "latest") -> Optional[Dict[str, Any]]:
         """Obtém metadados de um modelo específico."""
@@ -105,6 +182,12 @@ class ModelRegistry:
         if hasattr(model, 'metadata'):
             metadata.update(model.metadata)
         
+        # Variantes disponíveis (quantizadas ou convertidas)
+        if getattr(model, 'model_path', None):
+            variants = sorted(set(metadata.get('variants', {})) | set(load_variant_manifest(model.model_path)))
+            if variants:
+                metadata['variants'] = variants
+        
         return metadata
 
 
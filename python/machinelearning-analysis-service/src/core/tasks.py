@@ -0,0 +1,363 @@
+"""
+Notificação de conclusão e índice das tarefas assíncronas.
+
+As tarefas criadas por /analyze/async são registradas em um mapa em memória
+até terminarem. Consultas de status de tarefas em andamento são respondidas
+pelo mapa, sem acessar o sistema de arquivos, e consultas com espera
+(long-poll) ficam suspensas até a conclusão da tarefa ou o fim do prazo.
+O mapa é local ao processo: em implantações com vários workers, uma tarefa
+desconhecida pelo processo cai no índice dos arquivos de resultado.
+
+O índice associa cada tarefa às extensões dos seus arquivos em RESULTS_DIR
+('json', 'error.json', formatos exportados). Ele é montado com uma única
+listagem do diretório, atualizado a cada arquivo gravado pelo serviço e
+relistado periodicamente para refletir remoções (retenção) e arquivos
+gravados por outros processos.
+"""
+
+import os
+import json
+import time
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from ..utils import storage
+from ..utils.metrics import observe_histogram, set_gauge
+
+# Tarefas concluídas mantidas no mapa (as mais antigas são descartadas)
+TASK_NOTIFIER_MAX_COMPLETED = int(os.environ.get("TASK_NOTIFIER_MAX_COMPLETED", 10000))
+
+# Espera máxima de uma consulta de status com long-poll (segundos)
+TASK_WAIT_MAX = float(os.environ.get("TASK_WAIT_MAX", 60))
+
+# Intervalo mínimo entre relistagens motivadas por tarefas desconhecidas (segundos)
+TASK_INDEX_RESCAN_INTERVAL = float(os.environ.get("TASK_INDEX_RESCAN_INTERVAL", 5))
+
+# Idade máxima do índice antes de uma nova listagem (segundos)
+TASK_INDEX_MAX_AGE = float(os.environ.get("TASK_INDEX_MAX_AGE", 60))
+
+# Status de uma tarefa registrada e ainda não concluída
+PENDING = "processing"
+
+# Status de uma tarefa sem registro nem arquivos
+NOT_FOUND = "not_found"
+
+
+class TaskNotifier:
+    """
+    Mapa de tarefas assíncronas com espera pela conclusão.
+    
+    Pode ser usado a partir de qualquer thread; as esperas são corrotinas e
+    são acordadas no loop de eventos em que foram criadas.
+    """
+    
+    def __init__(self, max_completed: int = TASK_NOTIFIER_MAX_COMPLETED):
+        """
+        Inicializa o mapa.
+        
+        Args:
+            max_completed: Tarefas concluídas mantidas no mapa
+        """
+        self.max_completed = max_completed
+        self._lock = threading.Lock()
+        self._pending: Dict[str, List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]]] = {}
+        self._completed: "OrderedDict[str, str]" = OrderedDict()
+    
+    def register(self, task_id: str) -> None:
+        """
+        Registra uma tarefa em andamento.
+        
+        Args:
+            task_id: ID da tarefa
+        """
+        with self._lock:
+            self._pending.setdefault(task_id, [])
+            set_gauge("tasks_pending", len(self._pending))
+    
+    def complete(self, task_id: str, status: str) -> None:
+        """
+        Marca uma tarefa como concluída e acorda as consultas que aguardam por ela.
+        
+        Args:
+            task_id: ID da tarefa
+            status: Status final ('completed' ou 'failed')
+        """
+        with self._lock:
+            waiters = self._pending.pop(task_id, [])
+            self._completed[task_id] = status
+            self._completed.move_to_end(task_id)
+            while len(self._completed) > self.max_completed:
+                self._completed.popitem(last=False)
+            set_gauge("tasks_pending", len(self._pending))
+        
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_resolve, future, status)
+    
+    def status(self, task_id: str) -> Optional[str]:
+        """
+        Retorna o status conhecido de uma tarefa.
+        
+        Args:
+            task_id: ID da tarefa
+        
+        Returns:
+            'processing', o status final, ou None se a tarefa não é conhecida pelo processo
+        """
+        with self._lock:
+            if task_id in self._pending:
+                return PENDING
+            return self._completed.get(task_id)
+    
+    async def wait(self, task_id: str, timeout: float) -> Optional[str]:
+        """
+        Aguarda a conclusão de uma tarefa.
+        
+        Args:
+            task_id: ID da tarefa
+            timeout: Espera máxima (segundos)
+        
+        Returns:
+            Status da tarefa ao fim da espera ('processing' se o prazo acabou),
+            ou None se a tarefa não é conhecida pelo processo
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if task_id not in self._pending:
+                return self._completed.get(task_id)
+            future = loop.create_future()
+            waiter = (loop, future)
+            self._pending[task_id].append(waiter)
+        
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return PENDING
+        finally:
+            with self._lock:
+                waiters = self._pending.get(task_id)
+                if waiters and waiter in waiters:
+                    waiters.remove(waiter)
+
+
+def _resolve(future: asyncio.Future, status: str) -> None:
+    """Conclui a espera, se ainda não foi cancelada."""
+    if not future.done():
+        future.set_result(status)
+
+
+class TaskIndex:
+    """
+    Índice em memória tarefa -> extensões dos arquivos de resultado.
+    
+    Pode ser usado a partir de qualquer thread.
+    """
+    
+    def __init__(self,
+                 results_dir: Optional[str] = None,
+                 rescan_interval: float = TASK_INDEX_RESCAN_INTERVAL,
+                 max_age: float = TASK_INDEX_MAX_AGE):
+        """
+        Inicializa o índice (a primeira listagem ocorre na primeira consulta).
+        
+        Args:
+            results_dir: Diretório de resultados (None = RESULTS_DIR)
+            rescan_interval: Intervalo mínimo entre relistagens motivadas por
+                tarefas desconhecidas (segundos)
+            max_age: Idade máxima do índice antes de uma nova listagem (segundos)
+        """
+        self._results_dir = results_dir
+        self.rescan_interval = rescan_interval
+        self.max_age = max_age
+        
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._entries: Dict[str, Set[str]] = {}
+        self._scanned_at: Optional[float] = None
+        
+        # Arquivos adicionados durante uma listagem em andamento
+        self._journal: Optional[List[Tuple[str, str]]] = None
+    
+    @property
+    def results_dir(self) -> str:
+        return self._results_dir or storage.RESULTS_DIR
+    
+    def _scan(self) -> Dict[str, Set[str]]:
+        """Lista o diretório de resultados (sem stat por arquivo)."""
+        entries: Dict[str, Set[str]] = {}
+        try:
+            with os.scandir(self.results_dir) as scan:
+                for entry in scan:
+                    name = entry.name
+                    if name.startswith(".") or name.endswith(".tmp") or "." not in name:
+                        continue
+                    if not entry.is_file():
+                        continue
+                    task_id, extension = name.split(".", 1)
+                    entries.setdefault(task_id, set()).add(extension)
+        except FileNotFoundError:
+            pass
+        return entries
+    
+    def refresh(self) -> None:
+        """Relista o diretório de resultados e substitui o índice."""
+        with self._refresh_lock:
+            start = time.time()
+            with self._lock:
+                self._journal = []
+            
+            entries = self._scan()
+            
+            with self._lock:
+                for task_id, extension in self._journal:
+                    entries.setdefault(task_id, set()).add(extension)
+                self._journal = None
+                self._entries = entries
+                self._scanned_at = time.time()
+            
+            observe_histogram("task_index_scan_time", time.time() - start)
+            set_gauge("task_index_size", len(entries))
+    
+    def add(self, task_id: str, extension: str) -> None:
+        """
+        Registra um arquivo gravado para uma tarefa.
+        
+        Args:
+            task_id: ID da tarefa
+            extension: Extensão do arquivo ('json', 'error.json', 'csv', ...)
+        """
+        with self._lock:
+            self._entries.setdefault(task_id, set()).add(extension)
+            if self._journal is not None:
+                self._journal.append((task_id, extension))
+    
+    def discard(self, task_id: str, extension: Optional[str] = None) -> None:
+        """
+        Remove um arquivo (ou todos, se extension for None) de uma tarefa do índice.
+        
+        Args:
+            task_id: ID da tarefa
+            extension: Extensão do arquivo removido
+        """
+        with self._lock:
+            extensions = self._entries.get(task_id)
+            if extensions is None:
+                return
+            if extension is not None:
+                extensions.discard(extension)
+            if extension is None or not extensions:
+                del self._entries[task_id]
+    
+    def lookup(self, task_ids: Iterable[str]) -> Dict[str, Set[str]]:
+        """
+        Retorna as extensões dos arquivos de várias tarefas.
+        
+        O diretório é relistado se o índice estiver mais velho que max_age, ou
+        se alguma tarefa for desconhecida e a última listagem tiver mais de
+        rescan_interval segundos.
+        
+        Args:
+            task_ids: IDs das tarefas
+        
+        Returns:
+            Dicionário task_id -> extensões (conjunto vazio se não houver arquivos)
+        """
+        task_ids = list(task_ids)
+        now = time.time()
+        
+        with self._lock:
+            age = None if self._scanned_at is None else now - self._scanned_at
+            missing = any(task_id not in self._entries for task_id in task_ids)
+        
+        if age is None or age > self.max_age or (missing and age > self.rescan_interval):
+            self.refresh()
+        
+        with self._lock:
+            return {task_id: set(self._entries.get(task_id, ())) for task_id in task_ids}
+
+
+def status_from_extensions(extensions: Set[str]) -> str:
+    """
+    Deriva o status de uma tarefa a partir dos seus arquivos de resultado.
+    
+    Args:
+        extensions: Extensões dos arquivos da tarefa
+    
+    Returns:
+        'completed', 'failed', 'processing' (arquivos sem o resultado
+        principal) ou 'not_found'
+    """
+    if "json" in extensions:
+        return "completed"
+    if "error.json" in extensions:
+        return "failed"
+    return PENDING if extensions else NOT_FOUND
+
+
+def read_task_payload(task_id: str, status: str) -> Tuple[str, bytes]:
+    """
+    Monta o registro JSON de uma tarefa, em uma única linha, a partir dos seus arquivos.
+    
+    O resultado é copiado do arquivo sem ser decodificado; como quebras de
+    linha não podem aparecer dentro de strings JSON, removê-las mantém o
+    documento válido.
+    
+    Args:
+        task_id: ID da tarefa
+        status: Status conhecido da tarefa
+    
+    Returns:
+        Status final ('not_found' se os arquivos foram removidos) e JSON com
+        task_id, status e results ou error
+    """
+    head = f'{{"task_id": {json.dumps(task_id)}, "status": '
+    
+    if status in ("completed", "failed"):
+        try:
+            with open(storage.get_result_path(task_id, "json"), 'rb') as f:
+                results = f.read().replace(b"\r", b"").replace(b"\n", b"")
+            return "completed", f'{head}"completed", "results": '.encode('utf-8') + results + b'}'
+        except FileNotFoundError:
+            pass
+        
+        try:
+            with open(storage.get_result_path(task_id, "error.json"), 'r', encoding='utf-8') as f:
+                error = json.load(f).get("error", "Erro desconhecido durante processamento")
+            status = "failed"
+        except FileNotFoundError:
+            error = "Resultado da tarefa não está mais disponível"
+            status = NOT_FOUND
+        return status, json.dumps({"task_id": task_id, "status": status, "error": error}, ensure_ascii=False).encode('utf-8')
+    
+    return status, json.dumps({"task_id": task_id, "status": status}).encode('utf-8')
+
+
+_task_notifier: Optional[TaskNotifier] = None
+_task_index: Optional[TaskIndex] = None
+
+
+def get_task_notifier() -> TaskNotifier:
+    """
+    Retorna o mapa de tarefas compartilhado pelo serviço.
+    
+    Returns:
+        Instância do mapa
+    """
+    global _task_notifier
+    if _task_notifier is None:
+        _task_notifier = TaskNotifier()
+    return _task_notifier
+
+
+def get_task_index() -> TaskIndex:
+    """
+    Retorna o índice de tarefas compartilhado pelo serviço.
+    
+    Returns:
+        Instância do índice
+    """
+    global _task_index
+    if _task_index is None:
+        _task_index = TaskIndex()
+    return _task_index
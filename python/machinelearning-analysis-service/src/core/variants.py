@@ -0,0 +1,103 @@
+"""
+Variantes de modelos (quantizadas ou convertidas) associadas a um modelo de origem.
+
+As variantes são descritas em um manifesto JSON salvo ao lado do modelo
+(`<model_path>.variants.json`), indexado pelo nome da variante, por exemplo
+`onnx_int8` ou `tflite_float16`. O nome da variante coincide com o atributo
+`variant` do contexto de execução que sabe executá-la.
+"""
+
+import os
+import json
+import time
+from typing import Any, Dict, Optional
+
+# Sufixo do manifesto de variantes
+VARIANT_MANIFEST_SUFFIX = ".variants.json"
+
+
+def variant_manifest_path(model_path: str) -> str:
+    """
+    Retorna o caminho do manifesto de variantes de um modelo.
+    
+    Args:
+        model_path: Caminho do modelo de origem (arquivo ou diretório SavedModel)
+    
+    Returns:
+        Caminho do manifesto
+    """
+    return model_path.rstrip("/\\") + VARIANT_MANIFEST_SUFFIX
+
+
+def load_variant_manifest(model_path: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Carrega o manifesto de variantes de um modelo.
+    
+    Args:
+        model_path: Caminho do modelo de origem
+    
+    Returns:
+        Dicionário nome da variante -> informações (vazio se não houver manifesto)
+    """
+    manifest_path = variant_manifest_path(model_path)
+    if not os.path.exists(manifest_path):
+        return {}
+    
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_variant(model_path: str, variant: str, variant_path: str, info: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Registra uma variante no manifesto do modelo.
+    
+    Args:
+        model_path: Caminho do modelo de origem
+        variant: Nome da variante (ex.: 'onnx_int8')
+        variant_path: Caminho do artefato gerado
+        info: Informações adicionais (método de quantização, calibração, etc.)
+    """
+    manifest_path = variant_manifest_path(model_path)
+    manifest = load_variant_manifest(model_path)
+    
+    entry = dict(info or {})
+    # Caminho relativo ao manifesto para que o repositório de modelos possa ser movido
+    entry["path"] = os.path.relpath(variant_path, os.path.dirname(os.path.abspath(manifest_path)))
+    entry["created"] = time.time()
+    manifest[variant] = entry
+    
+    # Escrita atômica para não corromper o manifesto lido por outros workers
+    temp_path = f"{manifest_path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(temp_path, manifest_path)
+
+
+def resolve_variant_path(model: Any, variant: str) -> Optional[str]:
+    """
+    Obtém o caminho de uma variante de um modelo.
+    
+    Procura primeiro em `metadata["variants"]` do modelo e depois no manifesto
+    salvo ao lado do modelo.
+    
+    Args:
+        model: Modelo de origem (com atributo model_path)
+        variant: Nome da variante
+    
+    Returns:
+        Caminho da variante, ou None se não existir
+    """
+    declared = getattr(model, 'metadata', {}).get('variants', {})
+    if variant in declared:
+        return declared[variant]
+    
+    model_path = getattr(model, 'model_path', None)
+    if not model_path:
+        return None
+    
+    entry = load_variant_manifest(model_path).get(variant)
+    if entry is None:
+        return None
+    
+    manifest_dir = os.path.dirname(os.path.abspath(variant_manifest_path(model_path)))
+    return os.path.normpath(os.path.join(manifest_dir, entry["path"]))
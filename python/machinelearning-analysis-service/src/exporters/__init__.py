@@ -3,6 +3,7 @@ from .exporter_base import ExporterBase
 from .json_exporter import JsonExporter
 from .csv_exporter import CsvExporter
 from .nutrition_exporter import NutritionExporter
+from .arrow_exporter import ParquetExporter, ArrowExporter, PYARROW_AVAILABLE
 
 # Registro de exportadores disponíveis
 EXPORTERS: Dict[str, Type[ExporterBase]] = {
@@ -11,6 +12,11 @@ EXPORTERS: Dict[str, Type[ExporterBase]] = {
     "nutrition": NutritionExporter,
 }
 
+# Formatos colunares dependem do pyarrow (opcional)
+if PYARROW_AVAILABLE:
+    EXPORTERS["parquet"] = ParquetExporter
+    EXPORTERS["arrow"] = ArrowExporter
+
 def get_exporter(format_name: str) -> Optional[ExporterBase]:
     """
     Obtém uma instância de exportador pelo nome do formato.
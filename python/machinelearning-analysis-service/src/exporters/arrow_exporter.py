@@ -0,0 +1,176 @@
+"""
+Exportadores colunares (Parquet e Arrow IPC).
+
+Detecções, classificações e resultados por frame de vídeo são gravados como
+colunas tipadas (frame_id, class_id, score, coordenadas da caixa), um grupo de
+linhas por vez, de modo que a memória usada na exportação é limitada pelo
+tamanho do grupo e não pelo número de frames. Leitores podem carregar apenas
+as colunas de que precisam.
+"""
+
+import json
+from abc import abstractmethod
+from typing import Any, Dict, Iterator, List, Optional
+
+from .exporter_base import ExporterBase
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Número de linhas por grupo (Parquet) ou lote (Arrow IPC)
+ROW_GROUP_SIZE = 65536
+
+
+def _schema(metadata: Optional[Dict[str, Any]] = None) -> "pa.Schema":
+    """Esquema compartilhado pelos exportadores colunares."""
+    fields = [
+        pa.field("frame_id", pa.int32(), nullable=False),
+        pa.field("item_index", pa.int32(), nullable=False),
+        pa.field("kind", pa.dictionary(pa.int8(), pa.string()), nullable=False),
+        pa.field("class_id", pa.int32()),
+        pa.field("class_name", pa.dictionary(pa.int32(), pa.string())),
+        pa.field("score", pa.float32()),
+        pa.field("y1", pa.float32()),
+        pa.field("x1", pa.float32()),
+        pa.field("y2", pa.float32()),
+        pa.field("x2", pa.float32()),
+    ]
+    schema_metadata = None
+    if metadata:
+        schema_metadata = {b"metadata": json.dumps(metadata, ensure_ascii=False, default=str).encode("utf-8")}
+    return pa.schema(fields, metadata=schema_metadata)
+
+
+def _iter_frames(data: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Percorre os frames do resultado (um único frame para imagens)."""
+    if "frames" in data and isinstance(data["frames"], list):
+        for i, frame in enumerate(data["frames"]):
+            if isinstance(frame, dict):
+                yield {"frame_id": frame.get("frame_id", i), **frame}
+    else:
+        yield {"frame_id": 0, **data}
+
+
+def _iter_rows(data: Dict[str, Any]) -> Iterator[tuple]:
+    """Gera as linhas (frame, índice, tipo, classe, nome, score, caixa) do resultado."""
+    for frame in _iter_frames(data):
+        frame_id = int(frame["frame_id"])
+        
+        for i, detection in enumerate(frame.get("detections") or []):
+            box = detection.get("box") or [None] * 4
+            yield (frame_id, i, "detection", detection.get("class_id"), detection.get("class_name"),
+                   detection.get("score"), *box[:4])
+        
+        for i, prediction in enumerate(frame.get("predictions") or []):
+            yield (frame_id, i, "classification", prediction.get("class_id"), prediction.get("class_name"),
+                   prediction.get("confidence", prediction.get("score")), None, None, None, None)
+
+
+def iter_record_batches(data: Dict[str, Any],
+                        schema: "pa.Schema",
+                        batch_size: int = ROW_GROUP_SIZE) -> Iterator["pa.RecordBatch"]:
+    """
+    Converte o resultado em lotes colunares de tamanho limitado.
+    
+    Args:
+        data: Resultado da análise (imagem ou vídeo)
+        schema: Esquema dos lotes
+        batch_size: Número máximo de linhas por lote
+    
+    Returns:
+        Iterador de lotes
+    """
+    buffer: List[tuple] = []
+    
+    def flush() -> "pa.RecordBatch":
+        columns = list(zip(*buffer))
+        buffer.clear()
+        arrays = [pa.array(column, type=field.type) for column, field in zip(columns, schema)]
+        return pa.RecordBatch.from_arrays(arrays, schema=schema)
+    
+    for row in _iter_rows(data):
+        buffer.append(row)
+        if len(buffer) >= batch_size:
+            yield flush()
+    
+    if buffer:
+        yield flush()
+
+
+class _ColumnarExporter(ExporterBase):
+    """Base dos exportadores que gravam os resultados em lotes colunares."""
+    
+    def __init__(self, batch_size: int = ROW_GROUP_SIZE):
+        """
+        Inicializa o exportador.
+        
+        Args:
+            batch_size: Número de linhas por grupo/lote gravado
+        """
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow não está instalado")
+        self.batch_size = batch_size
+    
+    def export(self, data: Dict[str, Any], output_path: str) -> str:
+        """Exporta os resultados gravando um lote por vez."""
+        schema = _schema(data.get("metadata") if isinstance(data.get("metadata"), dict) else None)
+        
+        with self._open_writer(output_path, schema) as writer:
+            for batch in iter_record_batches(data, schema, self.batch_size):
+                self._write_batch(writer, batch)
+        
+        return output_path
+    
+    @abstractmethod
+    def _open_writer(self, output_path: str, schema: "pa.Schema") -> Any:
+        """
+        Abre o gravador do formato.
+        
+        Args:
+            output_path: Caminho do arquivo
+            schema: Esquema das colunas
+            
+        Returns:
+            Gravador (gerenciador de contexto) que recebe os lotes
+        """
+        pass
+    
+    def _write_batch(self, writer: Any, batch: "pa.RecordBatch") -> None:
+        writer.write_batch(batch)
+
+
+class ParquetExporter(_ColumnarExporter):
+    """Exportador para Parquet, com um grupo de linhas por lote."""
+    
+    @property
+    def format_name(self) -> str:
+        return "parquet"
+    
+    @property
+    def mime_type(self) -> str:
+        return "application/vnd.apache.parquet"
+    
+    def _open_writer(self, output_path: str, schema: "pa.Schema") -> Any:
+        return pq.ParquetWriter(output_path, schema, compression="zstd")
+    
+    def _write_batch(self, writer: Any, batch: "pa.RecordBatch") -> None:
+        writer.write_batch(batch, row_group_size=self.batch_size)
+
+
+class ArrowExporter(_ColumnarExporter):
+    """Exportador para o formato de streaming Arrow IPC."""
+    
+    @property
+    def format_name(self) -> str:
+        return "arrow"
+    
+    @property
+    def mime_type(self) -> str:
+        return "application/vnd.apache.arrow.stream"
+    
+    def _open_writer(self, output_path: str, schema: "pa.Schema") -> Any:
+        return pa.ipc.new_stream(output_path, schema)
@@ -1,8 +1,13 @@
-from typing import Dict, Any, List
-import pandas as pd
-import numpy as np
+import csv
+from typing import Dict, Any, Iterator, List, Optional
 from .exporter_base import ExporterBase
 
+try:
+    import pandas as pd
+    PANDAS_AVAILABLE = True
+except ImportError:
+    PANDAS_AVAILABLE = False
+
 class CsvExporter(ExporterBase):
     """Exportador para formato CSV."""
     
@@ -15,57 +20,82 @@ class CsvExporter(ExporterBase):
         return "text/csv"
     
     def export(self, data: Dict[str, Any], output_path: str) -> str:
-        """Exporta resultados para CSV."""
-        # Converter para DataFrame do pandas
-        df = self._convert_to_dataframe(data)
+        """
+        Exporta resultados para CSV.
+        
+        Detecções, classificações e frames de vídeo são escritos linha a
+        linha diretamente da estrutura do resultado, sem montar DataFrames,
+        de modo que a memória adicional não cresce com o número de frames.
+        """
+        if self._has_records(data):
+            fieldnames = self._collect_fieldnames(data)
+            with open(output_path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=fieldnames, restval='', lineterminator='\n')
+                writer.writeheader()
+                for record in self._iter_records(data):
+                    writer.writerow({key: self._format_value(value) for key, value in record.items()})
+            return output_path
+        
+        # Estrutura genérica: uma única linha achatada
+        if PANDAS_AVAILABLE:
+            try:
+                # Usar pandas para normalizar JSON aninhado
+                pd.json_normalize(data).to_csv(output_path, index=False, encoding='utf-8')
+                return output_path
+            except Exception:
+                pass
         
-        # Salvar como CSV
-        df.to_csv(output_path, index=False, encoding='utf-8')
+        # Fallback sem pandas: achatar o dicionário com o utilitário local
+        row = self._flatten_dict(data)
+        with open(output_path, 'w', newline='', encoding='utf-8') as f:
+            if row:
+                writer = csv.DictWriter(f, fieldnames=list(row), lineterminator='\n')
+                writer.writeheader()
+                writer.writerow({key: self._format_value(value) for key, value in row.items()})
         
         return output_path
     
-    def _convert_to_dataframe(self, data: Dict[str, Any]) -> pd.DataFrame:
-        """Converte dados hierárquicos para formato DataFrame."""
-        # Verificar se temos tipos de dados específicos
+    def _has_records(self, data: Dict[str, Any]) -> bool:
+        """Indica se o resultado tem itens tabulares (detecções, classificações ou frames)."""
+        return "detections" in data or "predictions" in data or (
+            "frames" in data and isinstance(data["frames"], list)
+        )
+    
+    def _iter_records(self, data: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Gera as linhas do CSV a partir da estrutura do resultado."""
         if "detections" in data:
             # Resultados de detecção de objetos
-            return pd.DataFrame(data["detections"])
+            yield from data["detections"]
         
         elif "predictions" in data:
             # Resultados de classificação
-            return pd.DataFrame(data["predictions"])
+            yield from data["predictions"]
         
-        elif "frames" in data and isinstance(data["frames"], list):
-            # Resultados de vídeo
-            frames_data = []
+        else:
+            # Resultados de vídeo: itens de cada frame com o ID do frame
             for i, frame in enumerate(data["frames"]):
-                if "detections" in frame:
-                    frame_df = pd.DataFrame(frame["detections"])
-                    frame_df["frame_id"] = i
-                    frames_data.append(frame_df)
-                elif "predictions" in frame:
-                    frame_df = pd.DataFrame(frame["predictions"])
-                    frame_df["frame_id"] = i
-                    frames_data.append(frame_df)
-            
-            if frames_data:
-                return pd.concat(frames_data, ignore_index=True)
+                items = frame.get("detections") if "detections" in frame else frame.get("predictions")
+                for item in items or []:
+                    yield {**item, "frame_id": i}
+    
+    def _collect_fieldnames(self, data: Dict[str, Any]) -> List[str]:
+        """Reúne as colunas de todas as linhas, na ordem em que aparecem."""
+        fieldnames: Dict[str, None] = {}
+        for record in self._iter_records(data):
+            for key in record:
+                fieldnames.setdefault(key)
         
-        # Se nenhum dos formatos específicos for encontrado,
-        # tentar normalizar estrutura genérica
-        try:
-            # Usar pandas para normalizar JSON aninhado
-            return pd.json_normalize(data)
-        except:
-            # Fallback: extrair apenas metadados ou criar DataFrame vazio
-            meta_data = {}
-            if "metadata" in data:
-                meta_data = self._flatten_dict(data["metadata"])
-            
-            if meta_data:
-                return pd.DataFrame([meta_data])
-            else:
-                return pd.DataFrame()
+        # Em vídeos, o ID do frame fica na última coluna
+        if "frame_id" in fieldnames and "detections" not in data and "predictions" not in data:
+            del fieldnames["frame_id"]
+            fieldnames["frame_id"] = None
+        return list(fieldnames)
+    
+    def _format_value(self, value: Any) -> Optional[Any]:
+        """Converte valores aninhados (caixas, listas) para texto."""
+        if isinstance(value, (list, tuple, dict)):
+            return str(value)
+        return value
     
     def _flatten_dict(self, d: Dict[str, Any], parent_key: str = '') -> Dict[str, Any]:
         """Achata um dicionário aninhado para um formato de linha única."""
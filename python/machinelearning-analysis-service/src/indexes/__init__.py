@@ -0,0 +1,97 @@
+import os
+import re
+import json
+import threading
+from typing import Any, Dict, Optional, Type
+from .index_base import VectorIndexBase, normalize_vectors
+from .flat_index import FlatIndex
+from .ivf_index import IVFIndex
+from .faiss_index import FaissIndex
+
+# Diretório dos índices persistidos
+VECTOR_INDEX_DIR = os.environ.get("VECTOR_INDEX_DIR", os.path.join(os.environ.get("MODELS_DIR", "models_repository"), ".indexes"))
+
+# Tipo de índice criado por padrão ('flat', 'ivf' ou 'faiss')
+VECTOR_INDEX_TYPE = os.environ.get("VECTOR_INDEX_TYPE", "flat")
+
+# Registro de tipos de índice disponíveis
+INDEX_TYPES: Dict[str, Type[VectorIndexBase]] = {
+    "flat": FlatIndex,
+    "ivf": IVFIndex,
+    "faiss": FaissIndex,
+}
+
+# Nomes válidos de índice (usados como nome de diretório); o primeiro caractere
+# alfanumérico impede '.', '..' e diretórios ocultos
+_INDEX_NAME_PATTERN = re.compile(r"[A-Za-z0-9][A-Za-z0-9_.-]{0,63}")
+
+_indexes: Dict[str, VectorIndexBase] = {}
+_indexes_lock = threading.Lock()
+
+
+def create_index(index_type: str, dimension: int, path: Optional[str] = None, **kwargs: Any) -> VectorIndexBase:
+    """
+    Cria um índice pelo nome do tipo.
+    
+    Args:
+        index_type: Tipo do índice (flat, ivf ou faiss)
+        dimension: Dimensão dos vetores
+        path: Diretório de persistência (None = apenas em memória)
+        **kwargs: Parâmetros específicos do tipo (ex.: nlist, nprobe)
+    
+    Returns:
+        Instância do índice
+    """
+    index_class = INDEX_TYPES.get(index_type.lower())
+    if index_class is None:
+        raise ValueError(f"Tipo de índice não suportado: {index_type}")
+    return index_class(dimension, path, **kwargs)
+
+
+def get_index(name: str,
+              dimension: Optional[int] = None,
+              index_type: Optional[str] = None,
+              **kwargs: Any) -> Optional[VectorIndexBase]:
+    """
+    Obtém um índice nomeado, carregando-o do disco ou criando-o se necessário.
+    
+    Args:
+        name: Nome do índice
+        dimension: Dimensão dos vetores (obrigatória para criar um índice novo)
+        index_type: Tipo usado na criação (None = VECTOR_INDEX_TYPE)
+        **kwargs: Parâmetros específicos do tipo usados na criação
+    
+    Returns:
+        Índice ou None se não existir e a dimensão não for informada
+    """
+    if not _INDEX_NAME_PATTERN.fullmatch(name):
+        raise ValueError(f"Nome de índice inválido: {name}")
+    
+    with _indexes_lock:
+        if name in _indexes:
+            return _indexes[name]
+        
+        path = os.path.join(VECTOR_INDEX_DIR, name)
+        meta_path = os.path.join(path, "meta.json")
+        if os.path.exists(meta_path):
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            index = create_index(meta["index_type"], meta["dimension"], path, **meta.get("params", {}))
+        elif dimension is not None:
+            index = create_index(index_type or VECTOR_INDEX_TYPE, dimension, path, **kwargs)
+        else:
+            return None
+        
+        _indexes[name] = index
+        return index
+
+
+def list_indexes() -> Dict[str, Dict[str, Any]]:
+    """
+    Lista os índices carregados.
+    
+    Returns:
+        Dicionário com nomes e informações dos índices
+    """
+    with _indexes_lock:
+        return {name: index.info() for name, index in _indexes.items()}
@@ -0,0 +1,204 @@
+import os
+import json
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+from .index_base import VectorIndexBase, normalize_vectors
+
+
+class FaissIndex(VectorIndexBase):
+    """
+    Índice aproximado baseado em FAISS (IVF-PQ ou HNSW).
+    
+    Requer o pacote faiss (faiss-cpu). O IVF-PQ comprime os vetores em códigos
+    de produto quantizado, reduzindo a memória em conjuntos muito grandes; o
+    HNSW oferece a melhor relação revocação/latência, mas não suporta remoção.
+    O índice salvo é carregado por completo (índices FAISS mapeados em memória
+    não aceitam inserções).
+    """
+    
+    def __init__(self,
+                 dimension: int,
+                 path: Optional[str] = None,
+                 factory: str = "IVF1024,PQ16",
+                 nprobe: int = 16,
+                 train_threshold: int = 40000):
+        """
+        Inicializa o índice.
+        
+        Args:
+            dimension: Dimensão dos vetores
+            path: Diretório de persistência (None = apenas em memória)
+            factory: Descrição do índice no formato do index_factory do FAISS
+                (ex.: 'IVF1024,PQ16' ou 'HNSW32')
+            nprobe: Número de listas examinadas por consulta (índices IVF)
+            train_threshold: Número de vetores acumulados antes do treinamento
+        """
+        try:
+            import faiss
+        except ImportError:
+            raise ImportError("O índice FAISS requer faiss. Instale com 'pip install faiss-cpu'")
+        self._faiss = faiss
+        
+        self.dimension = dimension
+        self.path = path
+        self.factory = factory
+        self.nprobe = nprobe
+        self.train_threshold = train_threshold
+        self._lock = threading.RLock()
+        
+        # Identificadores externos -> identificadores numéricos do FAISS
+        self._rows: Dict[str, int] = {}
+        self._ids: Dict[int, str] = {}
+        self._next_id = 0
+        # Vetores aguardando o treinamento
+        self._pending: List[Tuple[str, np.ndarray]] = []
+        
+        if path and os.path.exists(os.path.join(path, "index.faiss")):
+            self._index = faiss.read_index(os.path.join(path, "index.faiss"))
+            with open(os.path.join(path, "ids.json"), 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+            self._ids = {int(row): vector_id for row, vector_id in stored["ids"].items()}
+            self._rows = {vector_id: row for row, vector_id in self._ids.items()}
+            self._next_id = stored["next_id"]
+        else:
+            base = faiss.index_factory(dimension, factory, faiss.METRIC_INNER_PRODUCT)
+            self._index = base if factory.startswith("HNSW") else faiss.IndexIDMap2(base)
+        
+        self.set_nprobe(nprobe)
+    
+    @property
+    def index_type(self) -> str:
+        return "faiss"
+    
+    @property
+    def supports_remove(self) -> bool:
+        """Indica se o índice suporta remoção (HNSW não suporta)."""
+        return not self.factory.startswith("HNSW")
+    
+    def __len__(self) -> int:
+        return len(self._rows) + len(self._pending)
+    
+    def set_nprobe(self, nprobe: int) -> None:
+        """Configura o número de listas examinadas em índices IVF."""
+        self.nprobe = nprobe
+        try:
+            self._faiss.ParameterSpace().set_index_parameter(self._index, "nprobe", self.nprobe)
+        except RuntimeError:
+            pass
+    
+    def add(self, ids: Sequence[str], vectors: Any) -> int:
+        vectors = normalize_vectors(vectors, self.dimension)
+        if len(ids) != len(vectors):
+            raise ValueError(f"Número de identificadores ({len(ids)}) diferente do número de vetores ({len(vectors)})")
+        
+        with self._lock:
+            replaced = [vector_id for vector_id in ids if vector_id in self._rows]
+            if replaced:
+                if not self.supports_remove:
+                    raise ValueError("O índice HNSW não suporta substituição de vetores")
+                self.remove(replaced)
+            
+            if not self._index.is_trained:
+                self._pending.extend(zip(ids, vectors))
+                if len(self._pending) < self.train_threshold:
+                    return len(ids)
+                ids = [vector_id for vector_id, _ in self._pending]
+                vectors = np.stack([vector for _, vector in self._pending])
+                self._pending = []
+                self._index.train(vectors)
+            
+            rows = np.arange(self._next_id, self._next_id + len(ids), dtype=np.int64)
+            self._next_id += len(ids)
+            if self.supports_remove:
+                self._index.add_with_ids(vectors, rows)
+            else:
+                # HNSW atribui identificadores sequenciais
+                rows = np.arange(self._index.ntotal, self._index.ntotal + len(ids), dtype=np.int64)
+                self._index.add(vectors)
+            
+            for row, vector_id in zip(rows.tolist(), ids):
+                self._rows[vector_id] = row
+                self._ids[row] = vector_id
+        
+        return len(ids)
+    
+    def remove(self, ids: Sequence[str]) -> int:
+        if not self.supports_remove:
+            raise ValueError("O índice HNSW não suporta remoção de vetores")
+        
+        with self._lock:
+            pending_ids = set(ids)
+            pending_before = len(self._pending)
+            self._pending = [(vector_id, vector) for vector_id, vector in self._pending if vector_id not in pending_ids]
+            
+            rows = [self._rows.pop(vector_id) for vector_id in ids if vector_id in self._rows]
+            for row in rows:
+                del self._ids[row]
+            if rows:
+                self._index.remove_ids(np.asarray(rows, dtype=np.int64))
+        
+        return len(rows) + pending_before - len(self._pending)
+    
+    def search(self, queries: Any, k: int = 10) -> List[List[Tuple[str, float]]]:
+        queries = normalize_vectors(queries, self.dimension)
+        
+        with self._lock:
+            if not self._index.is_trained or self._index.ntotal == 0:
+                if not self._pending:
+                    return [[] for _ in range(len(queries))]
+                # Antes do treinamento, busca exata nos vetores pendentes
+                pending_ids = [vector_id for vector_id, _ in self._pending]
+                scores = queries @ np.stack([vector for _, vector in self._pending]).T
+                order = np.argsort(-scores, axis=1)[:, :k]
+                return [
+                    [(pending_ids[i], float(query_scores[i])) for i in query_order]
+                    for query_order, query_scores in zip(order, scores)
+                ]
+            
+            scores, rows = self._index.search(queries, k)
+            return [
+                [(self._ids[row], float(score)) for row, score in zip(query_rows, query_scores) if row in self._ids]
+                for query_rows, query_scores in zip(rows.tolist(), scores.tolist())
+            ]
+    
+    def save(self) -> None:
+        if not self.path:
+            raise ValueError("Índice sem diretório de persistência")
+        
+        with self._lock:
+            if self._pending and not self._index.is_trained:
+                raise ValueError(f"Índice ainda não treinado ({len(self._pending)} vetores pendentes)")
+            
+            os.makedirs(self.path, exist_ok=True)
+            temp_path = os.path.join(self.path, f"index.{os.getpid()}.tmp")
+            self._faiss.write_index(self._index, temp_path)
+            os.replace(temp_path, os.path.join(self.path, "index.faiss"))
+            
+            temp_path = os.path.join(self.path, f"ids.{os.getpid()}.tmp")
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({"ids": self._ids, "next_id": self._next_id}, f, ensure_ascii=False)
+            os.replace(temp_path, os.path.join(self.path, "ids.json"))
+            
+            with open(os.path.join(self.path, "meta.json"), 'w', encoding='utf-8') as f:
+                json.dump({
+                    "index_type": self.index_type,
+                    "dimension": self.dimension,
+                    "count": len(self._rows),
+                    "params": {
+                        "factory": self.factory,
+                        "nprobe": self.nprobe,
+                        "train_threshold": self.train_threshold
+                    }
+                }, f)
+    
+    def info(self) -> Dict[str, Any]:
+        info = super().info()
+        info.update({
+            "factory": self.factory,
+            "nprobe": self.nprobe,
+            "trained": bool(self._index.is_trained),
+            "pending": len(self._pending)
+        })
+        return info
@@ -0,0 +1,356 @@
+import os
+import json
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+from .index_base import VectorIndexBase, normalize_vectors
+
+# Capacidade inicial do armazenamento de vetores
+_INITIAL_CAPACITY = 1024
+
+# Consultas avaliadas por multiplicação de matrizes (limita a memória dos escores)
+_QUERY_CHUNK = 64
+
+
+class FlatIndex(VectorIndexBase):
+    """
+    Índice de força bruta: uma matriz NumPy com todos os vetores.
+    
+    Exato e sem treinamento, indicado para conjuntos pequenos. Com um diretório
+    configurado, os vetores ficam em um arquivo .npy mapeado em memória, de modo
+    que o índice não precisa caber na memória do processo nem ser recarregado
+    por completo a cada inicialização. Remoções marcam a linha como inativa; as
+    linhas inativas são compactadas ao salvar.
+    
+    Os identificadores são persistidos como um retrato (ids.<geração>.json)
+    mais um log de alterações (ids.<geração>.log, uma linha JSON por
+    inserção ou remoção), de modo que cada save grava apenas as alterações
+    desde o anterior. Um novo retrato é gravado ao compactar ou quando o log
+    fica maior que o próprio índice.
+    """
+    
+    def __init__(self, dimension: int, path: Optional[str] = None):
+        """
+        Inicializa o índice.
+        
+        Args:
+            dimension: Dimensão dos vetores
+            path: Diretório de persistência (None = apenas em memória)
+        """
+        self.dimension = dimension
+        self.path = path
+        self._lock = threading.RLock()
+        
+        self._count = 0
+        self._ids: List[Optional[str]] = []
+        self._rows: Dict[str, int] = {}
+        self._vectors = np.zeros((0, dimension), dtype=np.float32)
+        self._active = np.zeros(0, dtype=bool)
+        
+        # Alterações de identificadores ainda não gravadas no log
+        self._ids_log: List[Any] = []
+        self._ids_log_entries = 0
+        self._ids_generation = 0
+        self._ids_rewrite = True
+        
+        if path and os.path.exists(self._file("meta.json")):
+            self._load()
+    
+    @property
+    def index_type(self) -> str:
+        return "flat"
+    
+    def __len__(self) -> int:
+        return len(self._rows)
+    
+    def _file(self, name: str) -> str:
+        """Caminho de um arquivo do índice."""
+        return os.path.join(self.path, name)
+    
+    def _ensure_capacity(self, required: int) -> None:
+        """Amplia o armazenamento (dobrando a capacidade) para comportar `required` linhas."""
+        capacity = self._vectors.shape[0]
+        if required <= capacity:
+            return
+        
+        new_capacity = max(_INITIAL_CAPACITY, capacity)
+        while new_capacity < required:
+            new_capacity *= 2
+        
+        if self.path:
+            os.makedirs(self.path, exist_ok=True)
+            temp_path = self._file(f"vectors.{os.getpid()}.tmp.npy")
+            vectors = np.lib.format.open_memmap(temp_path, mode='w+', dtype=np.float32, shape=(new_capacity, self.dimension))
+            vectors[:self._count] = self._vectors[:self._count]
+            vectors.flush()
+            del vectors
+            os.replace(temp_path, self._file("vectors.npy"))
+            self._vectors = np.load(self._file("vectors.npy"), mmap_mode='r+')
+        else:
+            vectors = np.zeros((new_capacity, self.dimension), dtype=np.float32)
+            vectors[:self._count] = self._vectors[:self._count]
+            self._vectors = vectors
+        
+        active = np.zeros(new_capacity, dtype=bool)
+        active[:self._count] = self._active[:self._count]
+        self._active = active
+    
+    def add(self, ids: Sequence[str], vectors: Any) -> int:
+        vectors = normalize_vectors(vectors, self.dimension)
+        if len(ids) != len(vectors):
+            raise ValueError(f"Número de identificadores ({len(ids)}) diferente do número de vetores ({len(vectors)})")
+        
+        # Em caso de identificadores repetidos no lote, prevalece o último
+        latest = {vector_id: i for i, vector_id in enumerate(ids)}
+        order = sorted(latest.values())
+        ids = [ids[i] for i in order]
+        vectors = vectors[order]
+        
+        with self._lock:
+            self._deactivate([self._rows[vector_id] for vector_id in ids if vector_id in self._rows])
+            
+            start = self._count
+            self._ensure_capacity(start + len(ids))
+            self._vectors[start:start + len(ids)] = vectors
+            self._active[start:start + len(ids)] = True
+            self._count += len(ids)
+            
+            for offset, vector_id in enumerate(ids):
+                self._ids.append(vector_id)
+                self._rows[vector_id] = start + offset
+            self._ids_log.extend(ids)
+            
+            self._on_add(np.arange(start, start + len(ids)))
+        
+        return len(ids)
+    
+    def remove(self, ids: Sequence[str]) -> int:
+        with self._lock:
+            rows = [self._rows.pop(vector_id) for vector_id in ids if vector_id in self._rows]
+            self._deactivate(rows)
+        return len(rows)
+    
+    def _deactivate(self, rows: List[int]) -> None:
+        """Marca linhas como inativas."""
+        if not rows:
+            return
+        self._active[rows] = False
+        for row in rows:
+            self._ids[row] = None
+        self._ids_log.append({"remove": [int(row) for row in rows]})
+        self._on_remove(np.asarray(rows))
+    
+    def _on_add(self, rows: np.ndarray) -> None:
+        """Hook para subclasses após inserir linhas."""
+        pass
+    
+    def _on_remove(self, rows: np.ndarray) -> None:
+        """Hook para subclasses após desativar linhas."""
+        pass
+    
+    def search(self, queries: Any, k: int = 10) -> List[List[Tuple[str, float]]]:
+        queries = normalize_vectors(queries, self.dimension)
+        
+        # A busca roda fora da trava sobre um retrato do índice; inserções
+        # concorrentes escrevem apenas em linhas além do retrato
+        with self._lock:
+            if not self._rows:
+                return [[] for _ in range(len(queries))]
+            snapshot = self._snapshot()
+            k = min(k, len(self._rows))
+        
+        ids = snapshot["ids"]
+        rows, scores = self._search(queries, k, snapshot)
+        return [
+            [(ids[row], float(score)) for row, score in zip(query_rows, query_scores) if ids[row] is not None]
+            for query_rows, query_scores in zip(rows, scores)
+        ]
+    
+    def _snapshot(self) -> Dict[str, Any]:
+        """Estado consistente do índice para uma busca (chamado com a trava)."""
+        return {
+            "vectors": self._vectors[:self._count],
+            "active": self._active[:self._count].copy(),
+            "ids": self._ids[:self._count]
+        }
+    
+    def _search(self, queries: np.ndarray, k: int, snapshot: Dict[str, Any]) -> Tuple[List[np.ndarray], List[np.ndarray]]:
+        """Busca exata sobre todas as linhas ativas."""
+        vectors = snapshot["vectors"]
+        inactive = ~snapshot["active"]
+        all_rows = np.arange(len(vectors))
+        
+        result_rows, result_scores = [], []
+        for start in range(0, len(queries), _QUERY_CHUNK):
+            scores = queries[start:start + _QUERY_CHUNK] @ vectors.T
+            scores[:, inactive] = -np.inf
+            for query_scores in scores:
+                rows, top_scores = _top_k(all_rows, query_scores, k)
+                result_rows.append(rows)
+                result_scores.append(top_scores)
+        return result_rows, result_scores
+    
+    def save(self) -> None:
+        if not self.path:
+            raise ValueError("Índice sem diretório de persistência")
+        
+        with self._lock:
+            # Compactar se houver muitas linhas inativas
+            if self._count - len(self._rows) > self._count // 4:
+                self._compact()
+            
+            os.makedirs(self.path, exist_ok=True)
+            self._ensure_capacity(max(self._count, 1))
+            if isinstance(self._vectors, np.memmap):
+                self._vectors.flush()
+            
+            # Novo retrato após compactação ou quando o log supera o índice
+            rewrite = self._ids_rewrite or self._ids_log_entries + len(self._ids_log) > max(self._count, 1024)
+            previous_generation = self._ids_generation
+            if rewrite:
+                generation = previous_generation + 1
+                self._write_json(f"ids.{generation}.json", self._ids)
+                self._ids_log_entries = 0
+            else:
+                generation = previous_generation
+                self._append_ids_log(generation, self._ids_log)
+                self._ids_log_entries += len(self._ids_log)
+            self._ids_log = []
+            
+            self._save_extra()
+            self._write_json("meta.json", {
+                "index_type": self.index_type,
+                "dimension": self.dimension,
+                "count": self._count,
+                "ids_generation": generation,
+                **self._meta_extra()
+            })
+            
+            # O retrato anterior só é descartado depois que meta.json aponta para o novo
+            if rewrite:
+                for name in ("ids.json", f"ids.{previous_generation}.json", f"ids.{previous_generation}.log"):
+                    if os.path.exists(self._file(name)):
+                        os.remove(self._file(name))
+                self._ids_generation = generation
+                self._ids_rewrite = False
+    
+    def _append_ids_log(self, generation: int, entries: List[Any]) -> None:
+        """Acrescenta alterações de identificadores ao log da geração."""
+        if not entries:
+            return
+        with open(self._file(f"ids.{generation}.log"), 'a', encoding='utf-8') as f:
+            f.write("".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries))
+    
+    def _read_ids(self, generation: Optional[int]) -> List[Optional[str]]:
+        """Lê o retrato de identificadores e aplica o log da geração."""
+        if generation is None:
+            # Formato anterior: apenas ids.json, sem log
+            with open(self._file("ids.json"), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        
+        with open(self._file(f"ids.{generation}.json"), 'r', encoding='utf-8') as f:
+            ids = json.load(f)
+        
+        log_path = self._file(f"ids.{generation}.log")
+        if os.path.exists(log_path):
+            with open(log_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # Linha incompleta de uma gravação interrompida
+                        break
+                    self._ids_log_entries += 1
+                    if isinstance(entry, dict):
+                        for row in entry["remove"]:
+                            ids[row] = None
+                    else:
+                        ids.append(entry)
+        return ids
+    
+    def _compact(self) -> None:
+        """Remove as linhas inativas, reescrevendo o armazenamento."""
+        keep = np.nonzero(self._active[:self._count])[0]
+        vectors = np.array(self._vectors[keep])
+        ids = [self._ids[row] for row in keep]
+        
+        self._count = 0
+        self._ids = []
+        self._rows = {}
+        self._vectors = np.zeros((0, self.dimension), dtype=np.float32)
+        self._active = np.zeros(0, dtype=bool)
+        if self.path and os.path.exists(self._file("vectors.npy")):
+            os.remove(self._file("vectors.npy"))
+        
+        self._after_compact(keep)
+        if len(ids):
+            self.add(ids, vectors)
+        self._ids_rewrite = True
+    
+    def _after_compact(self, kept_rows: np.ndarray) -> None:
+        """Hook para subclasses antes da reinserção das linhas mantidas."""
+        pass
+    
+    def _save_extra(self) -> None:
+        """Hook para subclasses salvarem dados adicionais."""
+        pass
+    
+    def _meta_extra(self) -> Dict[str, Any]:
+        """Hook para subclasses adicionarem metadados."""
+        return {}
+    
+    def _write_json(self, name: str, data: Any) -> None:
+        """Grava um arquivo JSON de forma atômica."""
+        temp_path = self._file(f"{name}.{os.getpid()}.tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(temp_path, self._file(name))
+    
+    def _load(self) -> None:
+        """Carrega o índice persistido, mapeando os vetores em memória."""
+        with open(self._file("meta.json"), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta["dimension"] != self.dimension:
+            raise ValueError(f"Índice em {self.path} tem dimensão {meta['dimension']}, esperada {self.dimension}")
+        
+        generation = meta.get("ids_generation")
+        self._ids = self._read_ids(generation)
+        self._ids_generation = generation or 0
+        self._ids_rewrite = generation is None
+        
+        self._count = meta["count"]
+        if len(self._ids) != self._count:
+            # Save interrompido entre o log e o meta.json: vale o meta.json, e o
+            # próximo save grava um novo retrato no lugar do log inconsistente
+            self._ids = (self._ids + [None] * self._count)[:self._count]
+            self._ids_rewrite = True
+        self._vectors = np.load(self._file("vectors.npy"), mmap_mode='r+')
+        self._active = np.zeros(self._vectors.shape[0], dtype=bool)
+        for row, vector_id in enumerate(self._ids):
+            if vector_id is not None:
+                self._active[row] = True
+                self._rows[vector_id] = row
+        
+        self._load_extra(meta)
+    
+    def _load_extra(self, meta: Dict[str, Any]) -> None:
+        """Hook para subclasses carregarem dados adicionais."""
+        pass
+    
+    def info(self) -> Dict[str, Any]:
+        info = super().info()
+        info["deleted"] = self._count - len(self._rows)
+        info["persistent"] = bool(self.path)
+        return info
+
+
+def _top_k(rows: np.ndarray, scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Seleciona as k linhas de maior escore (desconsiderando -inf), em ordem decrescente."""
+    k = min(k, len(scores))
+    if k == 0:
+        return rows[:0], scores[:0]
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top])]
+    top = top[np.isfinite(scores[top])]
+    return rows[top], scores[top]
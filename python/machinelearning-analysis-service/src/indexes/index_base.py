@@ -0,0 +1,105 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Sequence, Tuple
+import numpy as np
+
+
+def normalize_vectors(vectors: Any, dimension: int) -> np.ndarray:
+    """
+    Converte vetores para float32 [N, dimensão] com norma L2 unitária.
+    
+    Com vetores normalizados, o produto interno equivale à similaridade de cosseno.
+    
+    Args:
+        vectors: Vetores (lista ou array)
+        dimension: Dimensão esperada
+    
+    Returns:
+        Array normalizado
+    """
+    array = np.asarray(vectors, dtype=np.float32)
+    if array.ndim == 1:
+        array = array[np.newaxis, :]
+    if array.ndim != 2 or array.shape[1] != dimension:
+        raise ValueError(f"Vetores com formato {array.shape} incompatíveis com a dimensão {dimension}")
+    
+    norms = np.linalg.norm(array, axis=1, keepdims=True)
+    return array / np.maximum(norms, 1e-12)
+
+
+class VectorIndexBase(ABC):
+    """Classe base para índices de similaridade vetorial."""
+    
+    @abstractmethod
+    def add(self, ids: Sequence[str], vectors: Any) -> int:
+        """
+        Insere (ou substitui) vetores em lote.
+        
+        Args:
+            ids: Identificadores externos dos vetores
+            vectors: Vetores [N, dimensão]
+        
+        Returns:
+            Número de vetores inseridos
+        """
+        pass
+    
+    @abstractmethod
+    def remove(self, ids: Sequence[str]) -> int:
+        """
+        Remove vetores pelo identificador.
+        
+        Args:
+            ids: Identificadores a remover
+        
+        Returns:
+            Número de vetores removidos
+        """
+        pass
+    
+    @abstractmethod
+    def search(self, queries: Any, k: int = 10) -> List[List[Tuple[str, float]]]:
+        """
+        Busca os k vetores mais similares a cada consulta.
+        
+        Args:
+            queries: Vetores de consulta [Q, dimensão]
+            k: Número de vizinhos por consulta
+        
+        Returns:
+            Para cada consulta, lista de (identificador, similaridade) em ordem decrescente
+        """
+        pass
+    
+    @abstractmethod
+    def save(self) -> None:
+        """Persiste o índice no diretório configurado."""
+        pass
+    
+    @abstractmethod
+    def __len__(self) -> int:
+        """Número de vetores ativos no índice."""
+        pass
+    
+    @property
+    @abstractmethod
+    def index_type(self) -> str:
+        """
+        Retorna o nome do tipo de índice.
+        
+        Returns:
+            Nome do tipo
+        """
+        pass
+    
+    def info(self) -> Dict[str, Any]:
+        """
+        Retorna informações sobre o índice.
+        
+        Returns:
+            Dicionário com tipo, dimensão e número de vetores
+        """
+        return {
+            "index_type": self.index_type,
+            "dimension": self.dimension,
+            "count": len(self)
+        }
@@ -0,0 +1,211 @@
+import os
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+
+from .flat_index import FlatIndex, _top_k
+
+# Pontos de treinamento por lista usados no k-means
+_TRAINING_POINTS_PER_LIST = 64
+
+# Linhas atribuídas aos centroides por multiplicação de matrizes
+_ASSIGN_CHUNK = 65536
+
+
+class IVFIndex(FlatIndex):
+    """
+    Índice de arquivo invertido (IVF) para conjuntos grandes.
+    
+    Os vetores são agrupados por k-means esférico em `nlist` listas; a busca
+    examina apenas as `nprobe` listas de centroides mais próximos da consulta,
+    trocando uma pequena perda de revocação por latência sublinear. Enquanto o
+    índice não tem vetores suficientes para o treinamento, a busca é exata.
+    Os vetores usam o mesmo armazenamento mapeado em memória do FlatIndex.
+    """
+    
+    def __init__(self,
+                 dimension: int,
+                 path: Optional[str] = None,
+                 nlist: int = 1024,
+                 nprobe: int = 16,
+                 train_threshold: Optional[int] = None,
+                 seed: int = 0):
+        """
+        Inicializa o índice.
+        
+        Args:
+            dimension: Dimensão dos vetores
+            path: Diretório de persistência (None = apenas em memória)
+            nlist: Número de listas (centroides)
+            nprobe: Número de listas examinadas por consulta
+            train_threshold: Número de vetores a partir do qual o índice é
+                treinado automaticamente (None = 39 * nlist)
+            seed: Semente do k-means
+        """
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.train_threshold = train_threshold if train_threshold is not None else 39 * nlist
+        self.seed = seed
+        
+        self._centroids: Optional[np.ndarray] = None
+        self._assignments = np.zeros(0, dtype=np.int32)
+        self._lists: Optional[List[np.ndarray]] = None
+        
+        super().__init__(dimension, path)
+    
+    @property
+    def index_type(self) -> str:
+        return "ivf"
+    
+    @property
+    def is_trained(self) -> bool:
+        """Indica se os centroides foram calculados."""
+        return self._centroids is not None
+    
+    def train(self, sample_size: Optional[int] = None) -> None:
+        """
+        Calcula os centroides por k-means esférico sobre uma amostra dos vetores ativos.
+        
+        Args:
+            sample_size: Tamanho da amostra (None = nlist * 64)
+        """
+        with self._lock:
+            active_rows = np.nonzero(self._active[:self._count])[0]
+            nlist = min(self.nlist, len(active_rows))
+            if nlist == 0:
+                raise ValueError("Índice vazio não pode ser treinado")
+            
+            rng = np.random.default_rng(self.seed)
+            sample_size = sample_size or nlist * _TRAINING_POINTS_PER_LIST
+            sample_rows = np.sort(rng.choice(active_rows, min(sample_size, len(active_rows)), replace=False))
+            sample = np.asarray(self._vectors[sample_rows])
+            
+            self._centroids = _spherical_kmeans(sample, nlist, rng)
+            self._assignments = np.zeros(self._vectors.shape[0], dtype=np.int32)
+            self._assignments[:self._count] = self._assign(self._vectors[:self._count])
+            self._lists = None
+    
+    def _assign(self, vectors: np.ndarray) -> np.ndarray:
+        """Lista (centroide mais próximo) de cada vetor."""
+        assignments = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), _ASSIGN_CHUNK):
+            chunk = np.asarray(vectors[start:start + _ASSIGN_CHUNK])
+            assignments[start:start + len(chunk)] = np.argmax(chunk @ self._centroids.T, axis=1)
+        return assignments
+    
+    def _on_add(self, rows: np.ndarray) -> None:
+        if len(self._assignments) < self._vectors.shape[0]:
+            assignments = np.zeros(self._vectors.shape[0], dtype=np.int32)
+            assignments[:len(self._assignments)] = self._assignments
+            self._assignments = assignments
+        
+        if self.is_trained:
+            self._assignments[rows] = self._assign(self._vectors[rows])
+            self._lists = None
+        elif len(self._rows) >= self.train_threshold:
+            self.train()
+    
+    def _on_remove(self, rows: np.ndarray) -> None:
+        self._lists = None
+    
+    def _after_compact(self, kept_rows: np.ndarray) -> None:
+        # Os centroides continuam válidos; as atribuições são recalculadas na reinserção
+        self._assignments = np.zeros(0, dtype=np.int32)
+        self._lists = None
+    
+    def _inverted_lists(self) -> List[np.ndarray]:
+        """Linhas ativas de cada lista (reconstruídas após modificações)."""
+        if self._lists is None:
+            active_rows = np.nonzero(self._active[:self._count])[0]
+            assignments = self._assignments[active_rows]
+            order = np.argsort(assignments, kind='stable')
+            boundaries = np.searchsorted(assignments[order], np.arange(len(self._centroids) + 1))
+            sorted_rows = active_rows[order]
+            self._lists = [sorted_rows[boundaries[i]:boundaries[i + 1]] for i in range(len(self._centroids))]
+        return self._lists
+    
+    def _snapshot(self) -> Dict[str, Any]:
+        snapshot = super()._snapshot()
+        if self.is_trained:
+            snapshot["centroids"] = self._centroids
+            snapshot["lists"] = self._inverted_lists()
+        return snapshot
+    
+    def _search(self, queries: np.ndarray, k: int, snapshot: Dict[str, Any]) -> Tuple[List[np.ndarray], List[np.ndarray]]:
+        if "centroids" not in snapshot:
+            return super()._search(queries, k, snapshot)
+        
+        vectors = snapshot["vectors"]
+        lists = snapshot["lists"]
+        nprobe = min(self.nprobe, len(lists))
+        probes = np.argpartition(-(queries @ snapshot["centroids"].T), nprobe - 1, axis=1)[:, :nprobe]
+        
+        result_rows, result_scores = [], []
+        for query, query_probes in zip(queries, probes):
+            candidates = np.concatenate([lists[probe] for probe in query_probes])
+            scores = np.asarray(vectors[candidates]) @ query
+            rows, top_scores = _top_k(candidates, scores, k)
+            result_rows.append(rows)
+            result_scores.append(top_scores)
+        return result_rows, result_scores
+    
+    def _save_extra(self) -> None:
+        if self.is_trained:
+            np.save(self._file("centroids.npy"), self._centroids)
+            np.save(self._file("assignments.npy"), self._assignments[:self._count])
+    
+    def _meta_extra(self) -> Dict[str, Any]:
+        return {
+            "trained": self.is_trained,
+            "params": {
+                "nlist": self.nlist,
+                "nprobe": self.nprobe,
+                "train_threshold": self.train_threshold,
+                "seed": self.seed
+            }
+        }
+    
+    def _load_extra(self, meta: Dict[str, Any]) -> None:
+        self._assignments = np.zeros(self._vectors.shape[0], dtype=np.int32)
+        if meta.get("trained") and os.path.exists(self._file("centroids.npy")):
+            self._centroids = np.load(self._file("centroids.npy"))
+            self._assignments[:self._count] = np.load(self._file("assignments.npy"))
+    
+    def info(self) -> Dict[str, Any]:
+        info = super().info()
+        info.update({"nlist": self.nlist, "nprobe": self.nprobe, "trained": self.is_trained})
+        return info
+
+
+def _spherical_kmeans(sample: np.ndarray, k: int, rng: np.random.Generator, iterations: int = 10) -> np.ndarray:
+    """
+    K-means com similaridade de cosseno (centroides de norma unitária).
+    
+    Args:
+        sample: Vetores normalizados [N, dimensão]
+        k: Número de centroides
+        rng: Gerador aleatório
+        iterations: Número de iterações
+    
+    Returns:
+        Centroides [k, dimensão]
+    """
+    centroids = sample[rng.choice(len(sample), k, replace=False)].copy()
+    
+    for _ in range(iterations):
+        assignments = np.argmax(sample @ centroids.T, axis=1)
+        counts = np.bincount(assignments, minlength=k)
+        
+        # Soma por lista com os pontos ordenados pela lista atribuída
+        order = np.argsort(assignments, kind='stable')
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        sums = np.zeros_like(centroids)
+        sums[counts > 0] = np.add.reduceat(sample[order], starts[counts > 0], axis=0)
+        
+        # Listas vazias recebem pontos aleatórios
+        empty = counts == 0
+        if np.any(empty):
+            sums[empty] = sample[rng.choice(len(sample), int(empty.sum()), replace=False)]
+        
+        centroids = sums / np.maximum(np.linalg.norm(sums, axis=1, keepdims=True), 1e-12)
+    
+    return centroids.astype(np.float32)
@@ -3,17 +3,17 @@ Ponto de entrada principal para o serviço de análise de machine learning.
 """
 
 import os
+import asyncio
 import logging
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from .api import api_router, LoggingMiddleware, MetricsMiddleware
-from .core.registry import ModelRegistry
-from .core.context import TensorFlowContext, ONNXContext, PyTorchContext
-from .models.generic.generic_model import GenericModel
+from .core.callbacks import get_callback_dispatcher
 from .utils.logging import setup_logging
-from .setup import setup_models, setup_health_routes
+from .utils.retention import RetentionWorker
+from .setup import initialize_service, setup_health_routes
 
 # Configurar logging
 setup_logging()
@@ -44,17 +44,24 @@ app.add_middleware(MetricsMiddleware)
 # Adicionar rotas da API
 app.include_router(api_router, prefix="/api")
 
+# Rotas de health check disponíveis antes do carregamento dos modelos
+setup_health_routes(app)
+
 
 @app.on_event("startup")
 async def startup_event():
     """Executa na inicialização do aplicativo."""
     logger.info("Iniciando serviço de análise de machine learning")
     
-    # Registrar modelos e contextos
-    setup_models()
+    # Registrar e aquecer modelos em segundo plano; /health/ready indica quando terminar
+    app.state.initialization_task = asyncio.create_task(initialize_service())
+    
+    # Remover uploads e resultados expirados periodicamente
+    app.state.retention_worker = RetentionWorker()
+    app.state.retention_worker.start()
     
-    # Configurar rotas de health check
-    setup_health_routes(app)
+    # Entregar callbacks de tarefas assíncronas, incluindo os pendentes de execuções anteriores
+    get_callback_dispatcher().start()
     
     logger.info("Serviço iniciado com sucesso")
 
@@ -63,6 +70,12 @@ async def startup_event():
 async def shutdown_event():
     """Executa no encerramento do aplicativo."""
     logger.info("Encerrando serviço de análise de machine learning")
+    
+    retention_worker = getattr(app.state, "retention_worker", None)
+    if retention_worker is not None:
+        await retention_worker.stop()
+    
+    await get_callback_dispatcher().stop()
 
 
 @app.exception_handler(HTTPException)
@@ -71,6 +84,7 @@ async def http_exception_handler(request, exc):
     return JSONResponse(
         status_code=exc.status_code,
         content={"error": exc.detail},
+        headers=getattr(exc, "headers", None),
     )
 
 
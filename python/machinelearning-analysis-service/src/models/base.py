@@ -1,9 +1,13 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Generic, TypeVar, Optional
+from typing import Any, Dict, Generic, Iterator, List, Tuple, TypeVar, Optional
 import os
+import time
+import logging
 import numpy as np
 from ..core.protocols import ModelProtocol, ExecutionContextProtocol
 
+logger = logging.getLogger(__name__)
+
 InputType = TypeVar('InputType')
 OutputType = TypeVar('OutputType')
 
@@ -63,42 +67,226 @@ class ModelContext:
         self.model = model
         self.context = context
         
-        # Carrega o modelo se ele tem um atributo model_path
-        if hasattr(model, 'model_path') and hasattr(model, 'load'):
+        # Carrega o modelo se ele tem um atributo model_path, reaproveitando
+        # o modelo já carregado (por exemplo, no aquecimento) com o mesmo contexto
+        # (o modelo pode executar em outro contexto, ex.: após conversão para ONNX)
+        loaded_context = getattr(model, '_source_context', getattr(model, '_context', None))
+        already_loaded = getattr(model, 'is_loaded', False) and loaded_context is context
+        if hasattr(model, 'model_path') and hasattr(model, 'load') and not already_loaded:
             model.load(context)
     
-    def analyze(self, inputs: Any) -> Dict[str, Any]:
-        """Executa o pipeline completo de análise."""
+    def _request_params(self, params: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Retorna os parâmetros da requisição se o modelo os aceitar."""
+        if not params:
+            return None
+        if not getattr(self.model, 'supports_request_params', False):
+            logger.warning(f"Modelo {self.model.model_id} não aceita parâmetros por requisição; ignorando {sorted(params)}")
+            return None
+        return params
+    
+    def _preprocess(self, inputs: Any, params: Optional[Dict[str, Any]]) -> Any:
+        """Pré-processa com os parâmetros da requisição, quando houver."""
+        params = self._request_params(params)
+        if params is None:
+            return self.model.preprocess(inputs)
+        return self.model.preprocess(inputs, params=params)
+    
+    def _postprocess(self, outputs: Any, params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Pós-processa com os parâmetros da requisição, quando houver."""
+        params = self._request_params(params)
+        if params is None:
+            return self.model.postprocess(outputs)
+        return self.model.postprocess(outputs, params=params)
+    
+    def analyze(self,
+                inputs: Any,
+                preprocessing_params: Optional[Dict[str, Any]] = None,
+                postprocessing_params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Executa o pipeline completo de análise.
+        
+        Args:
+            inputs: Entrada do modelo (caminho, bytes ou array)
+            preprocessing_params: Parâmetros de pré-processamento desta requisição
+            postprocessing_params: Parâmetros de pós-processamento desta requisição
+                (ex.: confidence_threshold). Não alteram a configuração do modelo,
+                que pode atender outras requisições simultaneamente
+            
+        Returns:
+            Resultados da análise
+        """
         # Registrar tempo de início
-        import time
         start_time = time.time()
         
         # Pré-processamento
-        processed_inputs = self.model.preprocess(inputs)
+        processed_inputs = self._preprocess(inputs, preprocessing_params)
         preprocess_time = time.time() - start_time
         
+        return self.analyze_preprocessed(processed_inputs, preprocess_time, postprocessing_params=postprocessing_params)
+    
+    def analyze_preprocessed(self,
+                             processed_inputs: Any,
+                             preprocess_time: float = 0.0,
+                             postprocessing_params: Optional[Dict[str, Any]] = None,
+                             **extra: Any) -> Dict[str, Any]:
+        """
+        Executa inferência e pós-processamento sobre entradas já pré-processadas.
+        
+        Args:
+            processed_inputs: Saída do pré-processamento do modelo
+            preprocess_time: Tempo gasto no pré-processamento, incluído nos metadados
+            postprocessing_params: Parâmetros de pós-processamento desta requisição
+            **extra: Metadados adicionais
+            
+        Returns:
+            Resultados da análise
+        """
+        start_time = time.time()
+        
         # Inferência
         raw_outputs = self.model.predict(processed_inputs)
-        inference_time = time.time() - start_time - preprocess_time
+        inference_time = time.time() - start_time
         
         # Pós-processamento
-        results = self.model.postprocess(raw_outputs)
-        postprocess_time = time.time() - start_time - preprocess_time - inference_time
+        results = self._postprocess(raw_outputs, postprocessing_params)
+        postprocess_time = time.time() - start_time - inference_time
         
         # Adicionar metadados
-        results["metadata"] = {
+        results["metadata"] = self._build_metadata({
+            "preprocess_time": preprocess_time,
+            "inference_time": inference_time,
+            "postprocess_time": postprocess_time,
+            "total_time": preprocess_time + time.time() - start_time
+        }, **extra)
+        
+        return results
+    
+    def analyze_tiled(self,
+                      inputs: Any,
+                      tile_size: Optional[int] = None,
+                      overlap: float = 0.25,
+                      max_tiles: int = 16,
+                      preprocessing_params: Optional[Dict[str, Any]] = None,
+                      postprocessing_params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Executa a análise de uma imagem de alta resolução dividida em blocos.
+        
+        Todos os blocos são inferidos em uma única passagem em lote e os
+        resultados são combinados pelo modelo.
+        
+        Args:
+            inputs: Imagem (caminho, bytes ou array)
+            tile_size: Lado do bloco em pixels da imagem original (None = resolução do modelo)
+            overlap: Fração de sobreposição entre blocos vizinhos
+            max_tiles: Número máximo de blocos
+            preprocessing_params: Parâmetros de pré-processamento desta requisição
+            postprocessing_params: Parâmetros de pós-processamento desta requisição
+            
+        Returns:
+            Resultados da análise
+        """
+        if not hasattr(self.model, 'preprocess_tiles'):
+            raise ValueError(f"O modelo {self.model.model_id} não suporta inferência em blocos")
+        
+        start_time = time.time()
+        
+        preprocessing_params = self._request_params(preprocessing_params)
+        postprocessing_params = self._request_params(postprocessing_params)
+        
+        tiles, tiling = self.model.preprocess_tiles(
+            inputs, tile_size=tile_size, overlap=overlap, max_tiles=max_tiles, params=preprocessing_params
+        )
+        preprocess_time = time.time() - start_time
+        
+        raw_outputs = self.model.predict(tiles)
+        inference_time = time.time() - start_time - preprocess_time
+        
+        results = self.model.postprocess_tiles(raw_outputs, tiling, params=postprocessing_params)
+        postprocess_time = time.time() - start_time - preprocess_time - inference_time
+        
+        results["metadata"] = self._build_metadata({
+            "preprocess_time": preprocess_time,
+            "inference_time": inference_time,
+            "postprocess_time": postprocess_time,
+            "total_time": time.time() - start_time
+        }, batch_size=len(tiling["windows"]))
+        
+        return results
+    
+    def analyze_batch(self,
+                      inputs: List[Any],
+                      batch_size: Optional[int] = None,
+                      preprocessing_params: Optional[Dict[str, Any]] = None,
+                      postprocessing_params: Optional[Dict[str, Any]] = None) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Executa a análise de vários itens em lotes, produzindo cada resultado ao ficar pronto.
+        
+        Cada lote é pré-processado e inferido de uma vez. Se o lote falhar, seus
+        itens são analisados individualmente para isolar o erro.
+        
+        Args:
+            inputs: Lista de entradas (caminhos, bytes ou arrays)
+            batch_size: Tamanho do lote (None = tamanho preferido do modelo)
+            preprocessing_params: Parâmetros de pré-processamento desta requisição
+            postprocessing_params: Parâmetros de pós-processamento desta requisição
+            
+        Yields:
+            Tuplas (índice da entrada, resultado). Em caso de falha, o resultado
+            contém apenas a chave "error"
+        """
+        batch_size = batch_size or getattr(self.model, 'batch_size', 1) or 1
+        
+        for start in range(0, len(inputs), batch_size):
+            chunk = list(inputs[start:start + batch_size])
+            chunk_start = time.time()
+            
+            try:
+                processed_inputs = self._preprocess(chunk, preprocessing_params)
+                preprocess_time = time.time() - chunk_start
+                
+                raw_outputs = self.model.predict(processed_inputs)
+                inference_time = time.time() - chunk_start - preprocess_time
+                
+                if not isinstance(raw_outputs, list) or len(raw_outputs) != len(chunk):
+                    raise ValueError("O modelo não produziu uma saída por item do lote")
+            except Exception:
+                # Analisar individualmente para que um item inválido não derrube o lote
+                for offset, item in enumerate(chunk):
+                    try:
+                        yield start + offset, self.analyze(item, preprocessing_params, postprocessing_params)
+                    except Exception as e:
+                        yield start + offset, {"error": str(e)}
+                continue
+            
+            # Tempos de pré-processamento e inferência divididos entre os itens do lote
+            for offset, output in enumerate(raw_outputs):
+                item_start = time.time()
+                try:
+                    results = self._postprocess(output, postprocessing_params)
+                except Exception as e:
+                    yield start + offset, {"error": str(e)}
+                    continue
+                postprocess_time = time.time() - item_start
+                
+                results["metadata"] = self._build_metadata({
+                    "preprocess_time": preprocess_time / len(chunk),
+                    "inference_time": inference_time / len(chunk),
+                    "postprocess_time": postprocess_time,
+                    "total_time": (preprocess_time + inference_time) / len(chunk) + postprocess_time
+                }, batch_size=len(chunk))
+                
+                yield start + offset, results
+    
+    def _build_metadata(self, performance: Dict[str, float], **extra: Any) -> Dict[str, Any]:
+        """Monta os metadados de uma análise."""
+        metadata = {
             "model_id": self.model.model_id,
             "model_version": self.model.version,
             "context": self.context.get_metadata(),
-            "performance": {
-                "preprocess_time": preprocess_time,
-                "inference_time": inference_time,
-                "postprocess_time": postprocess_time,
-                "total_time": time.time() - start_time
-            }
+            "performance": performance
         }
-        
-        return results
+        metadata.update(extra)
+        return metadata
     
     def get_info(self) -> Dict[str, Any]:
         """Retorna informações sobre o modelo e contexto."""
@@ -1,11 +1,15 @@
 import os
 import json
+import logging
 import numpy as np
 import tensorflow as tf
 from typing import Dict, Any, List, Optional
 
 from ...core.protocols import ModelProtocol
 from .protocols import NutritionInfo, FoodAnalysisProtocol
+from .nutrition_db import NUTRITION_FUZZY_MATCH, NutritionDatabase, get_nutrition_database
+
+logger = logging.getLogger(__name__)
 
 class FoodDetectionModel(ModelProtocol, FoodAnalysisProtocol):
     """
@@ -21,7 +25,9 @@ class FoodDetectionModel(ModelProtocol, FoodAnalysisProtocol):
         version: str = "1.0.0",
         model_path: str = None,
         nutrition_db_path: str = None,
-        classes_path: str = None
+        classes_path: str = None,
+        batch_size: int = 32,
+        fuzzy_match: Optional[bool] = None
     ):
         """
         Inicializa o modelo de detecção de alimentos.
@@ -32,9 +38,14 @@ class FoodDetectionModel(ModelProtocol, FoodAnalysisProtocol):
             model_path: Caminho para o modelo de machine learning
             nutrition_db_path: Caminho para o banco de dados nutricional
             classes_path: Caminho para mapeamento de classes
+            batch_size: Número máximo de imagens por chamada ao modelo em predict_batch
+            fuzzy_match: Se True, classes sem correspondência exata são buscadas
+                por similaridade de nome (None = NUTRITION_FUZZY_MATCH)
         """
         self.model_id = model_id
         self.version = version
+        self.batch_size = batch_size
+        self.fuzzy_match = NUTRITION_FUZZY_MATCH if fuzzy_match is None else fuzzy_match
         self._model = None
         
         # Caminhos para recursos
@@ -76,12 +87,12 @@ class FoodDetectionModel(ModelProtocol, FoodAnalysisProtocol):
         base_dir = os.path.dirname(os.path.abspath(__file__))
         return os.path.join(base_dir, "resources", "food_classes.json")
     
-    def _load_nutrition_database(self) -> Dict[str, Dict[str, Any]]:
+    def _load_nutrition_database(self) -> NutritionDatabase:
         """
-        Carrega o banco de dados nutricional.
+        Carrega o banco de dados nutricional (compartilhado entre instâncias).
         
         Returns:
-            Dicionário com informações nutricionais
+            Base nutricional indexada
         """
         os.makedirs(os.path.dirname(self._nutrition_db_path), exist_ok=True)
         
@@ -90,10 +101,8 @@ class FoodDetectionModel(ModelProtocol, FoodAnalysisProtocol):
             default_db = self._create_default_nutrition_db()
             with open(self._nutrition_db_path, 'w') as f:
                 json.dump(default_db, f, indent=2)
-            return default_db
         
-        with open(self._nutrition_db_path, 'r') as f:
-            return json.load(f)
+        return get_nutrition_database(self._nutrition_db_path)
     
     def _create_default_nutrition_db(self) -> Dict[str, Dict[str, Any]]:
         """
@@ -176,12 +185,18 @@ class FoodDetectionModel(ModelProtocol, FoodAnalysisProtocol):
         else:
             raise ValueError(f"Tipo de entrada não suportado: {type(inputs)}")
         
-        # Converter para array e normalizar
-        image_array = tf.keras.preprocessing.image.img_to_array(image)
+        # Converter para array e normalizar (cópia gravável: tensores geram arrays somente leitura)
+        image_array = np.array(tf.keras.preprocessing.image.img_to_array(image))
         image_array = tf.keras.applications.mobilenet_v2.preprocess_input(image_array)
         
         return image_array
     
+    def _get_model(self) -> Any:
+        """Carrega o modelo na primeira utilização."""
+        if self._model is None:
+            self._model = tf.keras.models.load_model(self._model_path)
+        return self._model
+    
     def predict(self, inputs: np.ndarray) -> np.ndarray:
         """
         Executa predição no modelo.
@@ -192,15 +207,28 @@ class FoodDetectionModel(ModelProtocol, FoodAnalysisProtocol):
         Returns:
             Predições do modelo
         """
-        # Verificar se o modelo foi carregado
-        if self._model is None:
-            self._model = tf.keras.models.load_model(self._model_path)
-        
         # Adicionar dimensão de batch
         inputs_batch = np.expand_dims(inputs, axis=0)
         
-        # Executar predição
-        return self._model.predict(inputs_batch)
+        # Chamada direta ao modelo: Model.predict tem custo fixo alto por chamada
+        return np.asarray(self._get_model()(inputs_batch, training=False))
+    
+    def predict_batch(self, inputs: np.ndarray) -> np.ndarray:
+        """
+        Executa predição em lotes de até batch_size imagens.
+        
+        Args:
+            inputs: Imagens pré-processadas empilhadas [N, altura, largura, canais]
+        
+        Returns:
+            Predições do modelo [N, classes]
+        """
+        model = self._get_model()
+        outputs = [
+            np.asarray(model(inputs[start:start + self.batch_size], training=False))
+            for start in range(0, len(inputs), self.batch_size)
+        ]
+        return np.concatenate(outputs, axis=0)
     
     def postprocess(self, outputs: np.ndarray) -> Dict[str, Any]:
         """
@@ -212,26 +240,40 @@ class FoodDetectionModel(ModelProtocol, FoodAnalysisProtocol):
         Returns:
             Resultados processados
         """
+        return self.postprocess_batch(outputs[:1])[0]
+    
+    def postprocess_batch(self, outputs: np.ndarray, top_k: int = 3) -> List[Dict[str, Any]]:
+        """
+        Processa as saídas de um lote com operações vetorizadas.
+        
+        Args:
+            outputs: Predições do modelo [N, classes]
+            top_k: Número de classes retornadas por imagem
+        
+        Returns:
+            Lista com os resultados de cada imagem
+        """
         # Aplicar softmax para obter probabilidades
-        probabilities = tf.nn.softmax(outputs, axis=-1).numpy()[0]
-        
-        # Encontrar as 3 melhores classes
-        top_k_indices = probabilities.argsort()[-3:][::-1]
-        
-        predictions = []
-        for idx in top_k_indices:
-            class_name = self._food_classes.get(idx, f"unknown_{idx}")
-            confidence = float(probabilities[idx])
-            
-            predictions.append({
-                "class_name": class_name,
-                "confidence": confidence
+        probabilities = tf.nn.softmax(outputs, axis=-1).numpy()
+        
+        # Encontrar as top_k melhores classes de cada imagem
+        top_k_indices = np.argsort(-probabilities, axis=-1, kind='stable')[:, :top_k]
+        top_k_confidences = np.take_along_axis(probabilities, top_k_indices, axis=-1)
+        
+        results = []
+        for indices, confidences in zip(top_k_indices.tolist(), top_k_confidences.tolist()):
+            predictions = [
+                {
+                    "class_name": self._food_classes.get(idx, f"unknown_{idx}"),
+                    "confidence": confidence
+                }
+                for idx, confidence in zip(indices, confidences)
+            ]
+            results.append({
+                "predictions": predictions,
+                "top_prediction": predictions[0] if predictions else None
             })
-        
-        return {
-            "predictions": predictions,
-            "top_prediction": predictions[0] if predictions else None
-        }
+        return results
     
     def classify_food(self, image: np.ndarray) -> Dict[str, Any]:
         """
@@ -280,25 +322,45 @@ class FoodDetectionModel(ModelProtocol, FoodAnalysisProtocol):
         Obtém informações nutricionais de um alimento.
         
         Args:
-            food_class: Classe do alimento
+            food_class: Classe do alimento (nome normalizado, apelido ou, com
+                fuzzy_match, nome aproximado)
         
         Returns:
             Objeto com informações nutricionais
         """
-        # Buscar no banco de dados
-        nutrition_data = self._nutrition_db.get(food_class, {})
-        
-        return NutritionInfo(
-            name=nutrition_data.get('name', food_class),
-            calories=nutrition_data.get('calories', 0),
-            proteins=nutrition_data.get('proteins', 0),
-            carbohydrates=nutrition_data.get('carbohydrates', 0),
-            fats=nutrition_data.get('fats', 0),
-            fiber=nutrition_data.get('fiber', 0),
-            vitamins=nutrition_data.get('vitamins', []),
-            minerals=nutrition_data.get('minerals', []),
-            health_tips=nutrition_data.get('health_tips', [])
-        )
+        return self.get_nutrition_info_batch([food_class])[0]
+    
+    def get_nutrition_info_batch(self, food_classes: List[str]) -> List[NutritionInfo]:
+        """
+        Obtém informações nutricionais de vários alimentos em uma única busca.
+        
+        Args:
+            food_classes: Classes dos alimentos
+        
+        Returns:
+            Lista com as informações de cada classe (zeros, com key e match
+            None, quando não encontrada)
+        """
+        infos = []
+        records = self._nutrition_db.find_batch(food_classes, fuzzy=self.fuzzy_match)
+        for food_class, nutrition_data in zip(food_classes, records):
+            if nutrition_data is None:
+                logger.warning(f"Classe de alimento sem informações nutricionais: {food_class}")
+                nutrition_data = {}
+            infos.append(NutritionInfo(
+                name=nutrition_data.get('name', food_class),
+                calories=nutrition_data.get('calories', 0),
+                proteins=nutrition_data.get('proteins', 0),
+                carbohydrates=nutrition_data.get('carbohydrates', 0),
+                fats=nutrition_data.get('fats', 0),
+                fiber=nutrition_data.get('fiber', 0),
+                vitamins=nutrition_data.get('vitamins', []),
+                minerals=nutrition_data.get('minerals', []),
+                health_tips=nutrition_data.get('health_tips', []),
+                key=nutrition_data.get('key'),
+                match=nutrition_data.get('match')
+            ))
+        return infos
     
     def analyze_health_impact(self, nutrition_info: NutritionInfo) -> str:
         """
@@ -0,0 +1,297 @@
+"""
+Base de dados nutricional indexada.
+
+Os alimentos são carregados uma única vez por processo (por arquivo) e
+compartilhados entre as instâncias dos modelos. Os macronutrientes ficam em
+colunas numpy e os textos (nomes, vitaminas, minerais, dicas) em uma tabela
+de strings compartilhada. A busca usa o nome normalizado (minúsculas, sem
+acentos, separadores unificados) e os apelidos de cada alimento. A
+correspondência aproximada, por um índice de trigramas, só é usada quando
+solicitada: nomes parecidos costumam ser alimentos diferentes ('pineapple' e
+'apple'), então ela exige alta similaridade e um único melhor candidato.
+"""
+
+import os
+import re
+import json
+import threading
+import unicodedata
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Colunas de macronutrientes e os nomes aceitos para cada uma no JSON
+MACRO_FIELDS: Dict[str, Tuple[str, ...]] = {
+    'calories': ('calories',),
+    'proteins': ('proteins', 'protein'),
+    'carbohydrates': ('carbohydrates', 'carbs'),
+    'fats': ('fats', 'fat'),
+    'fiber': ('fiber',),
+}
+
+# Campos de lista armazenados na tabela de strings
+LIST_FIELDS = ('vitamins', 'minerals', 'health_tips', 'diet_type')
+
+# Habilita a correspondência aproximada nos modelos de alimentos
+NUTRITION_FUZZY_MATCH = os.environ.get("NUTRITION_FUZZY_MATCH", "false").lower() == "true"
+
+# Similaridade mínima (coeficiente de Dice entre trigramas) para correspondência aproximada
+FUZZY_THRESHOLD = 0.8
+
+# Diferença mínima entre o melhor candidato e o segundo (outro alimento)
+FUZZY_MARGIN = 0.1
+
+# Tipos de correspondência informados em 'match'
+MATCH_EXACT = 'exact'
+MATCH_ALIAS = 'alias'
+MATCH_FUZZY = 'fuzzy'
+
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+
+
+def normalize_name(name: str) -> str:
+    """
+    Normaliza o nome de um alimento para busca.
+    
+    Args:
+        name: Nome ou classe do alimento (ex.: 'Chocolate Cake', 'maçã')
+    
+    Returns:
+        Nome em minúsculas, sem acentos e com '_' como separador (ex.: 'chocolate_cake', 'maca')
+    """
+    name = unicodedata.normalize('NFKD', str(name)).encode('ascii', 'ignore').decode('ascii')
+    return _NON_ALNUM.sub('_', name.lower()).strip('_')
+
+
+def _trigrams(key: str) -> List[str]:
+    """Trigramas do nome normalizado, com bordas marcadas."""
+    padded = f"  {key.replace('_', ' ')} "
+    return sorted({padded[i:i + 3] for i in range(len(padded) - 2)})
+
+
+class NutritionDatabase(Mapping):
+    """
+    Base nutricional em formato colunar com índices de nome, apelido e trigramas.
+    
+    Como Mapping, associa o nome de cada alimento (chave original do JSON) ao
+    seu registro; o acesso por [] aceita nomes normalizados e apelidos.
+    """
+    
+    def __init__(self, entries: Dict[str, Dict[str, Any]]):
+        """
+        Inicializa a base.
+        
+        Args:
+            entries: Dicionário nome -> informações nutricionais, no formato
+                do JSON da base (aceita 'protein'/'carbs'/'fat' como nomes
+                alternativos e uma lista opcional de 'aliases')
+        """
+        self._keys: List[str] = list(entries)
+        self._strings: List[str] = []
+        self._string_ids: Dict[str, int] = {}
+        
+        self._macros = np.zeros((len(self._keys), len(MACRO_FIELDS)), dtype=np.float64)
+        self._names = np.empty(len(self._keys), dtype=np.int32)
+        self._lists: Dict[str, List[Tuple[int, ...]]] = {field: [] for field in LIST_FIELDS}
+        
+        # Nome normalizado ou apelido -> índice do alimento
+        self._index: Dict[str, int] = {}
+        self._key_names = [normalize_name(key) for key in self._keys]
+        
+        for i, (key, data) in enumerate(entries.items()):
+            for j, aliases in enumerate(MACRO_FIELDS.values()):
+                value = next((data[alias] for alias in aliases if alias in data), 0)
+                self._macros[i, j] = value or 0
+            self._names[i] = self._intern(data.get('name', key))
+            for field in LIST_FIELDS:
+                self._lists[field].append(tuple(self._intern(value) for value in data.get(field, [])))
+            
+            for name in [key, data.get('name', key)] + list(data.get('aliases', [])):
+                self._index.setdefault(normalize_name(name), i)
+        
+        self._build_trigram_index()
+    
+    def _intern(self, value: str) -> int:
+        """Retorna o identificador da string na tabela, adicionando-a se necessário."""
+        string_id = self._string_ids.get(value)
+        if string_id is None:
+            string_id = self._string_ids[value] = len(self._strings)
+            self._strings.append(value)
+        return string_id
+    
+    def _build_trigram_index(self) -> None:
+        """Monta as listas invertidas trigrama -> nomes indexados."""
+        self._index_keys = list(self._index)
+        self._index_targets = np.array([self._index[key] for key in self._index_keys], dtype=np.int32)
+        self._key_trigram_counts = np.empty(len(self._index_keys), dtype=np.int32)
+        
+        postings: Dict[str, List[int]] = {}
+        for key_id, key in enumerate(self._index_keys):
+            trigrams = _trigrams(key)
+            self._key_trigram_counts[key_id] = len(trigrams)
+            for trigram in trigrams:
+                postings.setdefault(trigram, []).append(key_id)
+        self._postings = {trigram: np.array(ids, dtype=np.int32) for trigram, ids in postings.items()}
+    
+    @classmethod
+    def from_file(cls, path: str) -> 'NutritionDatabase':
+        """
+        Carrega a base de um arquivo JSON.
+        
+        Args:
+            path: Caminho do arquivo
+        
+        Returns:
+            Base nutricional
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+    
+    def __getitem__(self, name: str) -> Dict[str, Any]:
+        index = self._index.get(normalize_name(name))
+        if index is None:
+            raise KeyError(name)
+        return self.record(index)
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+    
+    def __len__(self) -> int:
+        return len(self._keys)
+    
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and normalize_name(name) in self._index
+    
+    def _fuzzy_match(self, key: str) -> int:
+        """
+        Alimento com maior similaridade de trigramas, ou -1 se a similaridade
+        ficar abaixo do limiar ou outro alimento estiver a menos de FUZZY_MARGIN.
+        """
+        trigrams = [trigram for trigram in _trigrams(key) if trigram in self._postings]
+        if not key or not trigrams:
+            return -1
+        
+        overlap = np.bincount(
+            np.concatenate([self._postings[trigram] for trigram in trigrams]),
+            minlength=len(self._index_keys)
+        )
+        dice = 2 * overlap / (len(_trigrams(key)) + self._key_trigram_counts)
+        best = int(np.argmax(dice))
+        if dice[best] < FUZZY_THRESHOLD:
+            return -1
+        
+        target = self._index_targets[best]
+        rivals = dice[self._index_targets != target]
+        if rivals.size and rivals.max() > dice[best] - FUZZY_MARGIN:
+            return -1
+        return int(target)
+    
+    def _resolve(self, names: Sequence[str], fuzzy: bool) -> Tuple[np.ndarray, List[Optional[str]]]:
+        """
+        Índices dos alimentos (-1 quando não encontrado) e tipo de
+        correspondência de cada nome; nomes repetidos são resolvidos uma única vez.
+        """
+        resolved: Dict[str, Tuple[int, Optional[str]]] = {}
+        indices = np.empty(len(names), dtype=np.int64)
+        matches: List[Optional[str]] = []
+        for i, name in enumerate(names):
+            key = normalize_name(name)
+            if key not in resolved:
+                index = self._index.get(key)
+                if index is not None:
+                    match = MATCH_EXACT if self._key_names[index] == key else MATCH_ALIAS
+                elif fuzzy:
+                    index = self._fuzzy_match(key)
+                    match = MATCH_FUZZY if index >= 0 else None
+                else:
+                    index, match = -1, None
+                resolved[key] = (index, match)
+            indices[i], match = resolved[key]
+            matches.append(match)
+        return indices, matches
+    
+    def record(self, index: int) -> Dict[str, Any]:
+        """
+        Retorna as informações nutricionais de um alimento.
+        
+        Args:
+            index: Índice do alimento
+        
+        Returns:
+            Dicionário com nome, macronutrientes (calories, proteins,
+            carbohydrates, fats, fiber) e listas (vitamins, minerals,
+            health_tips, diet_type)
+        """
+        record: Dict[str, Any] = {'name': self._strings[self._names[index]]}
+        record.update(zip(MACRO_FIELDS, self._macros[index].tolist()))
+        for field in LIST_FIELDS:
+            record[field] = [self._strings[string_id] for string_id in self._lists[field][index]]
+        return record
+    
+    def find(self, name: str, fuzzy: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Busca um alimento pelo nome.
+        
+        Args:
+            name: Nome ou classe do alimento
+            fuzzy: Se True, usa correspondência aproximada quando não há exata
+        
+        Returns:
+            Informações nutricionais (ver find_batch) ou None se não encontrado
+        """
+        return self.find_batch([name], fuzzy)[0]
+    
+    def find_batch(self, names: Sequence[str], fuzzy: bool = False) -> List[Optional[Dict[str, Any]]]:
+        """
+        Busca vários alimentos em uma única chamada.
+        
+        Args:
+            names: Nomes ou classes de alimentos
+            fuzzy: Se True, usa correspondência aproximada quando não há exata
+        
+        Returns:
+            Lista com as informações nutricionais (None quando não encontrado),
+            acrescidas de 'key' (chave do alimento na base) e 'match' ('exact',
+            'alias' ou 'fuzzy')
+        """
+        indices, matches = self._resolve(names, fuzzy)
+        records: List[Optional[Dict[str, Any]]] = []
+        for index, match in zip(indices.tolist(), matches):
+            if index < 0:
+                records.append(None)
+                continue
+            record = self.record(index)
+            record['key'] = self._keys[index]
+            record['match'] = match
+            records.append(record)
+        return records
+
+
+_databases: Dict[Tuple[str, float], NutritionDatabase] = {}
+_databases_lock = threading.Lock()
+
+
+def get_nutrition_database(path: str) -> NutritionDatabase:
+    """
+    Obtém a base nutricional de um arquivo, carregando-a uma vez por processo.
+    
+    A base é recarregada se o arquivo for modificado.
+    
+    Args:
+        path: Caminho do arquivo JSON
+    
+    Returns:
+        Base nutricional compartilhada
+    """
+    path = os.path.abspath(path)
+    key = (path, os.path.getmtime(path))
+    
+    with _databases_lock:
+        database = _databases.get(key)
+        if database is None:
+            # Descartar versões anteriores do mesmo arquivo
+            for old_key in [k for k in _databases if k[0] == path]:
+                del _databases[old_key]
+            database = _databases[key] = NutritionDatabase.from_file(path)
+        return database
@@ -0,0 +1,236 @@
+"""
+Tabela colunar para relatórios nutricionais.
+
+Os itens analisados são convertidos uma única vez em colunas numpy (classe,
+confiança, nutrientes, impacto e condição); totais e agregados por classe
+são calculados com operações vetorizadas e as exportações CSV/XLSX leem
+diretamente dessas colunas.
+"""
+
+import csv
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+# Nutrientes somados no relatório
+NUTRIENTS = ('calories', 'proteins', 'carbohydrates', 'fats', 'fiber')
+
+# Colunas de texto da tabela
+TEXT_COLUMNS = ('food_class', 'health_impact', 'food_condition', 'image_path', 'vitamins', 'minerals')
+
+# Colunas do CSV de detalhes, na ordem de exportação
+CSV_COLUMNS = ('food_class', 'confidence') + NUTRIENTS + ('health_impact', 'food_condition')
+
+
+class NutritionTable:
+    """Itens de um relatório nutricional armazenados por coluna."""
+    
+    def __init__(self, columns: Dict[str, np.ndarray], failed: int = 0):
+        """
+        Inicializa a tabela.
+        
+        Args:
+            columns: Colunas com o mesmo número de linhas
+            failed: Número de análises que falharam (sem linha na tabela)
+        """
+        self.columns = columns
+        self.failed = failed
+    
+    def __len__(self) -> int:
+        return len(self.columns['food_class'])
+    
+    @classmethod
+    def _build(cls, records: Iterable[tuple], failed: int = 0) -> 'NutritionTable':
+        """Monta a tabela a partir de tuplas (classe, confiança, nutrição, impacto, condição, caminho)."""
+        rows = list(records)
+        text = {name: [] for name in TEXT_COLUMNS}
+        numeric = np.zeros((len(rows), 1 + len(NUTRIENTS)), dtype=np.float64)
+        
+        for i, (food_class, confidence, nutrition, health_impact, condition, image_path) in enumerate(rows):
+            nutrition = nutrition or {}
+            numeric[i, 0] = confidence or 0
+            numeric[i, 1:] = [nutrition.get(name) or 0 for name in NUTRIENTS]
+            text['food_class'].append(food_class)
+            text['health_impact'].append(health_impact)
+            text['food_condition'].append((condition or {}).get('status', 'Não verificado'))
+            text['image_path'].append(image_path)
+            text['vitamins'].append(', '.join(nutrition.get('vitamins', [])))
+            text['minerals'].append(', '.join(nutrition.get('minerals', [])))
+        
+        columns = {name: np.array(values, dtype=object) for name, values in text.items()}
+        columns['confidence'] = numeric[:, 0]
+        for j, name in enumerate(NUTRIENTS, start=1):
+            columns[name] = numeric[:, j]
+        return cls(columns, failed)
+    
+    @classmethod
+    def from_results(cls, batch_results: List[Dict[str, Any]]) -> 'NutritionTable':
+        """
+        Cria a tabela a partir dos resultados de batch_analyze_foods.
+        
+        Args:
+            batch_results: Resultados da análise em lote
+        
+        Returns:
+            Tabela com uma linha por análise bem-sucedida
+        """
+        successful = [result for result in batch_results if result.get('status') != 'error']
+        records = (
+            (
+                result.get('top_prediction', {}).get('class_name', 'Desconhecido'),
+                result.get('top_prediction', {}).get('confidence', 0),
+                result.get('nutrition', {}),
+                result.get('health_impact', 'Não avaliado'),
+                result.get('condition', {'status': 'Não verificado'}),
+                result.get('image_path', '')
+            )
+            for result in successful
+        )
+        return cls._build(records, failed=len(batch_results) - len(successful))
+    
+    @classmethod
+    def from_report(cls, report: Dict[str, Any]) -> 'NutritionTable':
+        """
+        Cria a tabela a partir do campo 'food_details' de um relatório.
+        
+        Args:
+            report: Relatório nutricional
+        
+        Returns:
+            Tabela com uma linha por alimento
+        """
+        records = (
+            (
+                detail.get('food_classification', {}).get('food_class', 'Desconhecido'),
+                detail.get('food_classification', {}).get('confidence', 0),
+                detail.get('nutrition', {}),
+                detail.get('health_impact', 'Não avaliado'),
+                detail.get('condition', {}),
+                detail.get('image_path', '')
+            )
+            for detail in report.get('food_details', [])
+        )
+        return cls._build(records, failed=report.get('metadata', {}).get('failed_analyses', 0))
+    
+    def totals(self) -> Dict[str, float]:
+        """
+        Soma os nutrientes de todos os itens.
+        
+        Returns:
+            Total de cada nutriente
+        """
+        return {name: float(self.columns[name].sum()) for name in NUTRIENTS}
+    
+    def per_class(self) -> Dict[str, Dict[str, float]]:
+        """
+        Agrega os itens por classe de alimento.
+        
+        Returns:
+            Para cada classe: número de itens, confiança média e total de cada nutriente
+        """
+        if len(self) == 0:
+            return {}
+        
+        classes, inverse = np.unique(self.columns['food_class'].astype(str), return_inverse=True)
+        counts = np.bincount(inverse, minlength=len(classes))
+        sums = {
+            name: np.bincount(inverse, weights=self.columns[name], minlength=len(classes))
+            for name in ('confidence',) + NUTRIENTS
+        }
+        
+        summary = {}
+        for i, food_class in enumerate(classes):
+            summary[str(food_class)] = {
+                'count': int(counts[i]),
+                'mean_confidence': float(sums['confidence'][i] / counts[i]),
+                **{name: float(sums[name][i]) for name in NUTRIENTS}
+            }
+        return summary
+    
+    def count_matching(self, keyword: str) -> int:
+        """
+        Conta os itens cuja classe contém a palavra (sem diferenciar maiúsculas).
+        
+        Args:
+            keyword: Palavra procurada no nome da classe
+        
+        Returns:
+            Número de itens
+        """
+        if len(self) == 0:
+            return 0
+        names = np.char.lower(self.columns['food_class'].astype(str))
+        return int(np.count_nonzero(np.char.find(names, keyword.lower()) >= 0))
+    
+    def write_csv(self,
+                  output_path: str,
+                  total_nutrition: Optional[Dict[str, float]] = None,
+                  recommendations: Optional[List[str]] = None) -> str:
+        """
+        Grava os detalhes em CSV, seguidos da linha de total e das recomendações.
+        
+        Args:
+            output_path: Caminho do arquivo
+            total_nutrition: Totais a gravar na linha TOTAL (None = sem linha)
+            recommendations: Recomendações gravadas como linhas extras
+        
+        Returns:
+            Caminho do arquivo
+        """
+        with open(output_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f, lineterminator='\n')
+            writer.writerow(CSV_COLUMNS)
+            writer.writerows(zip(*(self.columns[name].tolist() for name in CSV_COLUMNS)))
+            
+            if total_nutrition is not None:
+                writer.writerow(['TOTAL', ''] + [total_nutrition.get(name, 0) for name in NUTRIENTS] + ['', ''])
+            for recommendation in recommendations or []:
+                writer.writerow(['RECOMENDAÇÃO'] + [''] * (len(CSV_COLUMNS) - 3) + [recommendation, ''])
+        
+        return output_path
+    
+    def write_excel(self,
+                    output_path: str,
+                    total_nutrition: Optional[Dict[str, float]] = None,
+                    recommendations: Optional[List[str]] = None) -> str:
+        """
+        Grava os detalhes, o resumo, os agregados por classe e as recomendações em XLSX.
+        
+        Requer pandas e um mecanismo de escrita de Excel (ex.: openpyxl).
+        
+        Args:
+            output_path: Caminho do arquivo
+            total_nutrition: Totais da planilha de resumo (None = sem planilha)
+            recommendations: Recomendações (None = sem planilha)
+        
+        Returns:
+            Caminho do arquivo
+        """
+        import pandas as pd
+        
+        details = pd.DataFrame({
+            name: self.columns[name]
+            for name in ('food_class', 'confidence') + NUTRIENTS
+            + ('vitamins', 'minerals', 'health_impact', 'food_condition')
+        })
+        
+        with pd.ExcelWriter(output_path) as writer:
+            details.to_excel(writer, sheet_name='Detalhes dos Alimentos', index=False)
+            
+            if total_nutrition is not None:
+                pd.DataFrame({
+                    'Nutriente': ['Calorias', 'Proteínas', 'Carboidratos', 'Gorduras'],
+                    'Total': [total_nutrition.get(name, 0) for name in NUTRIENTS[:4]]
+                }).to_excel(writer, sheet_name='Resumo Nutricional', index=False)
+            
+            per_class = self.per_class()
+            if per_class:
+                pd.DataFrame.from_dict(per_class, orient='index').rename_axis('food_class').reset_index() \
+                    .to_excel(writer, sheet_name='Resumo por Classe', index=False)
+            
+            if recommendations is not None:
+                pd.DataFrame({'Recomendações': recommendations}) \
+                    .to_excel(writer, sheet_name='Recomendações', index=False)
+        
+        return output_path
+
@@ -1,11 +1,14 @@
 import os
 import typing
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List, Optional
 
 from ...core.protocols import ModelContextProtocol
 from ...core.registry import ModelRegistry
 from .detection_model import FoodDetectionModel
 from .protocols import NutritionInfo, FoodAnalysisProtocol
+from .nutrition_report import NutritionTable
 
 class FoodNutritionContext:
     """
@@ -136,36 +139,13 @@ class FoodNutritionService(ModelContextProtocol):
             # Adicionar informações nutricionais detalhadas
             if results.get('top_prediction'):
                 food_class = results['top_prediction']['class_name']
-                nutrition_info = self._detection_model.get_nutrition_info(food_class)
+                results.update(self._nutrition_fields(food_class))
                 
                 # Avaliar condição do alimento
-                food_condition = self._detection_model.assess_food_condition(processed_inputs)
-                
-                # Analisar impacto na saúde
-                health_impact = self._detection_model.analyze_health_impact(nutrition_info)
-                
-                # Enriquecer resultados
-                results.update({
-                    'nutrition': {
-                        'name': nutrition_info.name,
-                        'calories': nutrition_info.calories,
-                        'proteins': nutrition_info.proteins,
-                        'carbohydrates': nutrition_info.carbohydrates,
-                        'fats': nutrition_info.fats,
-                        'fiber': nutrition_info.fiber,
-                        'vitamins': nutrition_info.vitamins,
-                        'minerals': nutrition_info.minerals
-                    },
-                    'health_impact': health_impact,
-                    'condition': food_condition
-                })
+                results['condition'] = self._detection_model.assess_food_condition(processed_inputs)
             
             # Adicionar metadados
-            results['metadata'] = {
-                'model_id': self._detection_model.model_id,
-                'model_version': self._detection_model.version,
-                'context': self._context.get_metadata()
-            }
+            results['metadata'] = self._metadata()
             
             return results
         
@@ -179,6 +159,47 @@ class FoodNutritionService(ModelContextProtocol):
                 }
             }
     
+    def _nutrition_fields(self, food_class: str) -> Dict[str, Any]:
+        """
+        Obtém a nutrição e o impacto na saúde de uma classe de alimento.
+        
+        Args:
+            food_class: Classe do alimento
+        
+        Returns:
+            Dicionário com as chaves 'nutrition' e 'health_impact'
+        """
+        return self._nutrition_fields_from_info(self._detection_model.get_nutrition_info(food_class))
+    
+    def _nutrition_fields_from_info(self, nutrition_info: NutritionInfo) -> Dict[str, Any]:
+        """Monta as chaves 'nutrition' e 'health_impact' a partir das informações nutricionais."""
+        return {
+            'nutrition': {
+                'name': nutrition_info.name,
+                'calories': nutrition_info.calories,
+                'proteins': nutrition_info.proteins,
+                'carbohydrates': nutrition_info.carbohydrates,
+                'fats': nutrition_info.fats,
+                'fiber': nutrition_info.fiber,
+                'vitamins': nutrition_info.vitamins,
+                'minerals': nutrition_info.minerals
+            },
+            # Chave da base e tipo de correspondência (None: classe sem informações)
+            'nutrition_match': {
+                'key': nutrition_info.key,
+                'match': nutrition_info.match
+            } if nutrition_info.key is not None else None,
+            'health_impact': self._detection_model.analyze_health_impact(nutrition_info)
+        }
+    
+    def _metadata(self) -> Dict[str, Any]:
+        """Metadados do modelo e do contexto incluídos em cada resultado."""
+        return {
+            'model_id': self._detection_model.model_id,
+            'model_version': self._detection_model.version,
+            'context': self._context.get_metadata()
+        }
+    
     def get_info(self) -> Dict[str, Any]:
         """
         Obtém informações sobre o modelo e contexto.
@@ -194,41 +215,99 @@ class FoodNutritionService(ModelContextProtocol):
             'context': self._context.get_metadata()
         }
     
-    def batch_analyze_foods(self, image_paths: List[str]) -> List[Dict[str, Any]]:
+    def batch_analyze_foods(self,
+                            image_paths: List[str],
+                            batch_size: Optional[int] = None,
+                            num_workers: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Analisa múltiplas imagens de alimentos em lote.
         
+        As imagens são pré-processadas em paralelo e o classificador é
+        executado em lotes de até batch_size imagens. A nutrição e o impacto
+        na saúde são obtidos uma vez por classe presente no lote. Falhas são
+        reportadas por imagem, sem interromper o lote.
+        
         Args:
             image_paths: Lista de caminhos para imagens de alimentos a serem analisadas
+            batch_size: Imagens por chamada ao modelo (None = batch_size do modelo)
+            num_workers: Threads de pré-processamento (None = automático)
         
         Returns:
-            Lista de resultados de análise para cada imagem
+            Lista de resultados de análise para cada imagem, na ordem de entrada
         """
-        results = []
+        model = self._detection_model
+        batch_size = batch_size or getattr(model, 'batch_size', 32)
+        results: List[Optional[Dict[str, Any]]] = [None] * len(image_paths)
+        
+        def error_result(index: int, error: Exception) -> Dict[str, Any]:
+            return {
+                'status': 'error',
+                'message': f"Erro ao analisar {image_paths[index]}: {str(error)}",
+                'image_path': image_paths[index]
+            }
         
-        for image_path in image_paths:
+        def preprocess(image_path: str) -> Any:
             try:
-                # Analisar cada imagem individualmente
-                food_analysis = self.analyze(image_path)
+                return model.preprocess(image_path)
+            except Exception as e:
+                return e
+        
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            for start in range(0, len(image_paths), batch_size):
+                chunk = list(range(start, min(start + batch_size, len(image_paths))))
                 
-                # Adicionar caminho da imagem ao resultado
-                food_analysis['image_path'] = image_path
+                # Pré-processamento paralelo; falhas ficam registradas por imagem
+                valid, images = [], []
+                for index, processed in zip(chunk, executor.map(preprocess, [image_paths[i] for i in chunk])):
+                    if isinstance(processed, Exception):
+                        results[index] = error_result(index, processed)
+                    else:
+                        valid.append(index)
+                        images.append(processed)
                 
-                # Adicionar nome do alimento como identificador
-                if 'top_prediction' in food_analysis:
-                    food_analysis['food_name'] = food_analysis['top_prediction']['class_name']
+                if not valid:
+                    continue
                 
-                results.append(food_analysis)
-            except Exception as e:
-                # Em caso de erro, adicionar resultado com erro
-                results.append({
-                    'status': 'error',
-                    'message': f"Erro ao analisar {image_path}: {str(e)}",
-                    'image_path': image_path
+                try:
+                    chunk_results = model.postprocess_batch(model.predict_batch(np.stack(images)))
+                except Exception:
+                    # Analisar individualmente para isolar a imagem com problema
+                    for index in valid:
+                        results[index] = self._with_image_path(self.analyze(image_paths[index]), image_paths[index])
+                    continue
+                
+                # Nutrição e impacto na saúde uma vez por classe presente no lote
+                food_classes = sorted({
+                    result['top_prediction']['class_name']
+                    for result in chunk_results if result.get('top_prediction')
                 })
+                nutrition_fields = {
+                    food_class: self._nutrition_fields_from_info(nutrition_info)
+                    for food_class, nutrition_info in zip(food_classes, model.get_nutrition_info_batch(food_classes))
+                }
+                
+                for index, image, result in zip(valid, images, chunk_results):
+                    try:
+                        if result.get('top_prediction'):
+                            result.update(nutrition_fields[result['top_prediction']['class_name']])
+                            result['condition'] = model.assess_food_condition(image)
+                        result['metadata'] = self._metadata()
+                        results[index] = self._with_image_path(result, image_paths[index])
+                    except Exception as e:
+                        results[index] = error_result(index, e)
         
         return results
     
+    def _with_image_path(self, food_analysis: Dict[str, Any], image_path: str) -> Dict[str, Any]:
+        """Adiciona o caminho da imagem e o nome do alimento ao resultado."""
+        food_analysis['image_path'] = image_path
+        
+        # Adicionar nome do alimento como identificador
+        if food_analysis.get('top_prediction'):
+            food_analysis['food_name'] = food_analysis['top_prediction']['class_name']
+        
+        return food_analysis
+    
     def generate_nutrition_report(self, batch_results: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
         Gera um relatório nutricional a partir dos resultados de análise em lote.
@@ -239,68 +318,49 @@ class FoodNutritionService(ModelContextProtocol):
         Returns:
             Relatório nutricional consolidado
         """
-        # Inicializar estrutura do relatório
+        # Montar a tabela colunar uma única vez e agregar de forma vetorizada
+        table = NutritionTable.from_results(batch_results)
+        
         report = {
-            'food_details': [],
-            'total_nutrition': {
-                'calories': 0,
-                'proteins': 0,
-                'carbohydrates': 0,
-                'fats': 0,
-                'fiber': 0
-            },
+            'food_details': [
+                {
+                    'food_classification': {
+                        'food_class': food_result.get('top_prediction', {}).get('class_name', 'Desconhecido'),
+                        'confidence': food_result.get('top_prediction', {}).get('confidence', 0)
+                    },
+                    'nutrition': food_result.get('nutrition', {}),
+                    'health_impact': food_result.get('health_impact', 'Não avaliado'),
+                    'condition': food_result.get('condition', {'status': 'Não verificado'}),
+                    'image_path': food_result.get('image_path', '')
+                }
+                for food_result in batch_results if food_result.get('status') != 'error'
+            ],
+            'total_nutrition': table.totals(),
+            'class_summary': table.per_class(),
             'recommendations': [],
             'metadata': {
                 'total_items': len(batch_results),
-                'successful_analyses': 0,
-                'failed_analyses': 0
+                'successful_analyses': len(table),
+                'failed_analyses': table.failed
             }
         }
         
-        # Processar cada resultado
-        for food_result in batch_results:
-            # Verificar se a análise foi bem-sucedida
-            if food_result.get('status') == 'error':
-                report['metadata']['failed_analyses'] += 1
-                continue
-            
-            report['metadata']['successful_analyses'] += 1
-            
-            # Extrair detalhes nutricionais
-            food_detail = {
-                'food_classification': {
-                    'food_class': food_result.get('top_prediction', {}).get('class_name', 'Desconhecido'),
-                    'confidence': food_result.get('top_prediction', {}).get('confidence', 0)
-                },
-                'nutrition': food_result.get('nutrition', {}),
-                'health_impact': food_result.get('health_impact', 'Não avaliado'),
-                'condition': food_result.get('condition', {'status': 'Não verificado'}),
-                'image_path': food_result.get('image_path', '')
-            }
-            
-            # Adicionar aos detalhes
-            report['food_details'].append(food_detail)
-            
-            # Somar ao total nutricional
-            nutrition = food_result.get('nutrition', {})
-            report['total_nutrition']['calories'] += nutrition.get('calories', 0)
-            report['total_nutrition']['proteins'] += nutrition.get('proteins', 0)
-            report['total_nutrition']['carbohydrates'] += nutrition.get('carbohydrates', 0)
-            report['total_nutrition']['fats'] += nutrition.get('fats', 0)
-            report['total_nutrition']['fiber'] += nutrition.get('fiber', 0)
-        
         # Gerar recomendações baseadas nos totais
-        self._generate_diet_recommendations(report)
+        self._generate_diet_recommendations(report, table)
         
         return report
     
-    def _generate_diet_recommendations(self, report: Dict[str, Any]) -> None:
+    def _generate_diet_recommendations(self, report: Dict[str, Any], table: Optional[NutritionTable] = None) -> None:
         """
         Gera recomendações dietéticas baseadas na análise nutricional.
         
         Args:
             report: Relatório nutricional a ser atualizado com recomendações
+            table: Tabela colunar dos itens (None = montada a partir do relatório)
         """
+        if table is None:
+            table = NutritionTable.from_report(report)
+        
         total = report['total_nutrition']
         recommendations = []
         
@@ -321,11 +381,8 @@ class FoodNutritionService(ModelContextProtocol):
             recommendations.append("O consumo de fibras está abaixo do recomendado. Aumente a ingestão de vegetais, frutas e grãos integrais.")
         
         # Verificações baseadas na composição da dieta
-        fruit_count = len([food for food in report['food_details'] 
-                         if 'fruit' in food['food_classification']['food_class'].lower()])
-        
-        vegetable_count = len([food for food in report['food_details'] 
-                             if 'vegetable' in food['food_classification']['food_class'].lower()])
+        fruit_count = table.count_matching('fruit')
+        vegetable_count = table.count_matching('vegetable')
         
         if fruit_count + vegetable_count < 2:
             recommendations.append("Consumo baixo de frutas e vegetais. Recomenda-se pelo menos 5 porções diárias.")
@@ -1,4 +1,4 @@
-from typing import Protocol, Dict, Any, List
+from typing import Protocol, Dict, Any, List, Optional
 from dataclasses import dataclass, field
 import numpy as np
 
@@ -16,6 +16,10 @@ class NutritionInfo:
     vitamins: List[str] = field(default_factory=list)
     minerals: List[str] = field(default_factory=list)
     health_tips: List[str] = field(default_factory=list)
+    # Chave do alimento na base e tipo de correspondência ('exact', 'alias' ou 'fuzzy');
+    # None quando a classe não foi encontrada e os valores são zeros
+    key: Optional[str] = None
+    match: Optional[str] = None
 
 class FoodAnalysisProtocol(Protocol):
     """
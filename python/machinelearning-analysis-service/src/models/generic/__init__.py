@@ -1,3 +1,4 @@
 from .generic_model import GenericModel
+from .cascade_model import CascadeModel
 
-__all__ = ['GenericModel']
+__all__ = ['GenericModel', 'CascadeModel']
@@ -0,0 +1,169 @@
+from typing import Any, Dict, List, Optional
+import tensorflow as tf
+import numpy as np
+from ...core.protocols import ModelProtocol, ExecutionContextProtocol
+from .generic_model import GenericModel
+
+
+class CascadeModel(ModelProtocol):
+    """
+    Modelo em dois estágios: detecção seguida da classificação de cada objeto.
+    
+    As caixas detectadas acima do limiar são recortadas da imagem original e
+    redimensionadas em um único tensor, classificado em lotes pelo segundo
+    modelo, sem uma requisição por recorte.
+    """
+    
+    def __init__(self,
+                 model_id: str,
+                 version: str,
+                 detector: GenericModel,
+                 classifier: GenericModel,
+                 confidence_threshold: Optional[float] = None,
+                 crop_batch_size: int = 32,
+                 metadata: Dict[str, Any] = None):
+        """
+        Inicializa o modelo em cascata.
+        
+        Args:
+            model_id: Identificador único do modelo
+            version: Versão do modelo
+            detector: Modelo de detecção (primeiro estágio)
+            classifier: Modelo de classificação aplicado a cada caixa (segundo estágio)
+            confidence_threshold: Confiança mínima das caixas classificadas
+                (None = limiar do detector)
+            crop_batch_size: Número máximo de recortes por chamada ao classificador
+            metadata: Metadados adicionais
+        """
+        if detector.task_type != 'detection':
+            raise ValueError(f"O primeiro estágio deve ser um modelo de detecção: {detector.model_id}")
+        if crop_batch_size < 1:
+            raise ValueError(f"Tamanho de lote de recortes inválido: {crop_batch_size}")
+        
+        self.model_id = model_id
+        self.version = version
+        self.detector = detector
+        self.classifier = classifier
+        self.confidence_threshold = confidence_threshold
+        self.crop_batch_size = crop_batch_size
+        
+        # Os estágios são carregados em load(); não há artefato próprio
+        self.model_path = None
+        self.batch_size = 1
+        self._context = None
+        self._is_loaded = False
+        
+        self.metadata = {
+            "task_type": "cascade",
+            "input_type": "image",
+            "input_shape": detector.input_shape,
+            "class_labels": classifier.metadata.get('class_labels', []),
+            "stages": {
+                "detector": {"id": detector.model_id, "version": detector.version},
+                "classifier": {"id": classifier.model_id, "version": classifier.version}
+            }
+        }
+        self.metadata.update(metadata or {})
+    
+    def load(self, context: ExecutionContextProtocol, model_path: Optional[str] = None) -> None:
+        """Carrega os dois estágios no contexto fornecido."""
+        for stage in (self.detector, self.classifier):
+            loaded_context = getattr(stage, '_source_context', getattr(stage, '_context', None))
+            if not (stage.is_loaded and loaded_context is context):
+                stage.load(context)
+        
+        self._context = context
+        self._is_loaded = True
+    
+    @property
+    def is_loaded(self) -> bool:
+        """Verifica se os dois estágios foram carregados."""
+        return self._is_loaded
+    
+    def preprocess(self, inputs: Any) -> Dict[str, tf.Tensor]:
+        """
+        Decodifica a imagem uma única vez para os dois estágios.
+        
+        Args:
+            inputs: Caminho, bytes ou array NumPy de uma imagem
+        
+        Returns:
+            Dicionário com a imagem original (usada nos recortes) e a entrada do detector
+        """
+        if isinstance(inputs, np.ndarray):
+            img = tf.convert_to_tensor(inputs)
+        elif isinstance(inputs, (str, bytes)):
+            data = tf.io.read_file(inputs) if isinstance(inputs, str) else tf.constant(inputs)
+            # Resolução completa: os recortes não devem perder detalhes
+            img = tf.image.decode_image(data, channels=3, expand_animations=False)
+        else:
+            raise ValueError(f"Tipo de entrada não suportado: {type(inputs)}")
+        
+        return {
+            "image": img,
+            "detector_inputs": self.detector.image_processor.standardize_image(img, add_batch_dim=True)
+        }
+    
+    def predict(self, inputs: Dict[str, tf.Tensor]) -> Dict[str, Any]:
+        """
+        Executa a detecção e classifica todas as caixas em lotes.
+        
+        Args:
+            inputs: Saída de preprocess
+        
+        Returns:
+            Detecções e saídas do classificador (uma linha por detecção)
+        """
+        detections = self.detector.postprocess(self.detector.predict(inputs["detector_inputs"]))["detections"]
+        if self.confidence_threshold is not None:
+            detections = [d for d in detections if d["score"] >= self.confidence_threshold]
+        
+        if not detections:
+            return {"detections": [], "classifier_outputs": None}
+        
+        crops = self._crop(inputs["image"], np.array([d["box"] for d in detections], dtype=np.float32))
+        
+        outputs = []
+        for start in range(0, len(detections), self.crop_batch_size):
+            batch_outputs = self.classifier._run_inference(crops[start:start + self.crop_batch_size])
+            outputs.append(batch_outputs.numpy() if hasattr(batch_outputs, 'numpy') else np.asarray(batch_outputs))
+        
+        return {"detections": detections, "classifier_outputs": np.concatenate(outputs, axis=0)}
+    
+    def _crop(self, img: tf.Tensor, boxes: np.ndarray) -> tf.Tensor:
+        """Recorta e redimensiona as caixas [y1, x1, y2, x2] normalizadas para a entrada do classificador."""
+        crops = tf.image.crop_and_resize(
+            tf.expand_dims(img, 0),
+            np.clip(boxes, 0.0, 1.0),
+            tf.zeros(len(boxes), dtype=tf.int32),
+            self.classifier.image_processor.target_size
+        )
+        return self.classifier.image_processor.standardize_image(crops, add_batch_dim=False)
+    
+    def postprocess(self, outputs: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Combina cada detecção com a classificação do seu recorte.
+        
+        Args:
+            outputs: Saída de predict
+        
+        Returns:
+            Detecções com a chave "classification"
+        """
+        detections: List[Dict[str, Any]] = []
+        classifier_outputs = outputs["classifier_outputs"]
+        
+        for i, detection in enumerate(outputs["detections"]):
+            detection = dict(detection)
+            detection["classification"] = self.classifier.postprocess(classifier_outputs[i:i + 1])
+            detections.append(detection)
+        
+        return {
+            "detections": detections,
+            "count": len(detections)
+        }
+    
+    def warmup(self) -> None:
+        """Aquece os dois estágios."""
+        self.detector.warmup()
+        self.classifier.warmup()
@@ -0,0 +1,123 @@
+"""
+Análise de uma mesma imagem por vários modelos.
+
+A imagem é decodificada uma única vez; cada configuração distinta de
+redimensionamento e normalização é calculada uma vez a partir do buffer
+decodificado e compartilhada pelos modelos que a usam. Os modelos são
+executados em paralelo (as operações dos frameworks liberam o GIL).
+"""
+
+import time
+import logging
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Dict, Hashable, Optional, Tuple
+import numpy as np
+import tensorflow as tf
+
+logger = logging.getLogger(__name__)
+
+
+def _preprocessing_key(image_processor) -> Hashable:
+    """Identifica configurações de pré-processamento que produzem o mesmo tensor."""
+    return (
+        tuple(image_processor.target_size),
+        image_processor.normalize,
+        tuple(image_processor.mean or ()),
+        tuple(image_processor.std or ()),
+        image_processor.output_dtype,
+        image_processor.add_batch_dim
+    )
+
+
+def _decode_once(inputs: Any, image_processors: list, full_resolution: bool) -> tf.Tensor:
+    """
+    Decodifica a imagem uma única vez para todos os modelos.
+    
+    Com decodificação reduzida, usa o processador de maior resolução, de modo
+    que a imagem decodificada cubra o tamanho alvo de todos os modelos.
+    """
+    if isinstance(inputs, np.ndarray):
+        return tf.convert_to_tensor(inputs)
+    
+    data = tf.io.read_file(inputs) if isinstance(inputs, str) else tf.constant(inputs)
+    if full_resolution or not image_processors:
+        return tf.image.decode_image(data, channels=3, expand_animations=False)
+    
+    largest = max(image_processors, key=lambda p: p.target_size[0] * p.target_size[1])
+    return largest.decode(data)
+
+
+def analyze_multi(
+    model_contexts: Dict[str, Any],
+    inputs: Any,
+    executor: Optional[Executor] = None
+) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Any]]:
+    """
+    Analisa uma imagem com vários modelos, decodificando-a uma única vez.
+    
+    Modelos com ImageProcessor (GenericModel) recebem o tensor pré-processado
+    compartilhado; os demais (ex.: CascadeModel) recebem a imagem decodificada
+    em resolução completa. A falha de um modelo não afeta os demais.
+    
+    Args:
+        model_contexts: Dicionário nome do alvo -> ModelContext
+        inputs: Imagem (caminho, bytes ou array NumPy)
+        executor: Executor para rodar os modelos (None = pool temporário)
+    
+    Returns:
+        Tupla (resultado por alvo, metadados da análise). Em caso de falha, o
+        resultado do alvo contém apenas a chave "error"
+    """
+    start_time = time.time()
+    
+    image_processors = {
+        name: model_context.model.image_processor
+        for name, model_context in model_contexts.items()
+        if hasattr(model_context.model, 'image_processor')
+    }
+    full_resolution = len(image_processors) < len(model_contexts)
+    
+    img = _decode_once(inputs, list(image_processors.values()), full_resolution)
+    decode_time = time.time() - start_time
+    
+    # Pré-processamento memoizado por configuração
+    preprocessed: Dict[Hashable, tf.Tensor] = {}
+    processed_inputs: Dict[str, Any] = {}
+    preprocess_times: Dict[str, float] = {}
+    for name, image_processor in image_processors.items():
+        key = _preprocessing_key(image_processor)
+        step_start = time.time()
+        if key not in preprocessed:
+            preprocessed[key] = image_processor.standardize_image(img)
+        processed_inputs[name] = preprocessed[key]
+        preprocess_times[name] = time.time() - step_start
+    
+    decoded_array = img.numpy() if full_resolution else None
+    
+    def run(name: str) -> Dict[str, Any]:
+        model_context = model_contexts[name]
+        try:
+            if name in processed_inputs:
+                return model_context.analyze_preprocessed(processed_inputs[name], preprocess_times[name])
+            return model_context.analyze(decoded_array)
+        except Exception as e:
+            logger.error(f"Erro na análise com {name}: {str(e)}", exc_info=True)
+            return {"error": str(e)}
+    
+    own_executor = executor is None
+    if own_executor:
+        executor = ThreadPoolExecutor(max_workers=max(1, len(model_contexts)))
+    try:
+        futures = {name: executor.submit(run, name) for name in model_contexts}
+        results = {name: future.result() for name, future in futures.items()}
+    finally:
+        if own_executor:
+            executor.shutdown(wait=False)
+    
+    metadata = {
+        "decode_time": decode_time,
+        "image_shape": [int(dim) for dim in img.shape],
+        "preprocessing_configs": len(preprocessed),
+        "total_time": time.time() - start_time
+    }
+    return results, metadata
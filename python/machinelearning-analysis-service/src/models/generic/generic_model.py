@@ -1,20 +1,44 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Hashable, List, Optional, Tuple
 import tensorflow as tf
 import numpy as np
 import os
-from ...core.protocols import ModelProtocol
+import logging
+from ...core.protocols import ModelProtocol, ExecutionContextProtocol
+from ...core.conversion import convert_model
 from ..base import BaseModel
-from .processors import ImageProcessor, VideoProcessor
+from .processors import ImageProcessor, VideoProcessor, BatchProcessor, TileProcessor
 from .post_processors import (
     ClassificationPostProcessor,
     DetectionPostProcessor,
     SegmentationPostProcessor,
-    VideoPostProcessor
+    VideoPostProcessor,
+    EmbeddingPostProcessor
 )
 
+# Extensões tratadas como vídeo
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv')
+
+# Conjuntos distintos de parâmetros de requisição com processadores em cache por modelo
+PROCESSOR_CACHE_SIZE = 32
+
+logger = logging.getLogger(__name__)
+
+
+def _freeze(value: Any) -> Hashable:
+    """Converte parâmetros (dicionários e listas aninhados) em uma chave hashable."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
 class GenericModel(BaseModel[Any, Any]):
     """Modelo genérico adaptável para diferentes tarefas de análise."""
     
+    # Aceita parâmetros de pré e pós-processamento por requisição
+    supports_request_params = True
+    
     def __init__(self, 
                  model_id: str, 
                  version: str,
@@ -23,7 +47,8 @@ class GenericModel(BaseModel[Any, Any]):
                  input_shape: List[int],
                  preprocessing_config: Dict[str, Any] = None,
                  postprocessing_config: Dict[str, Any] = None,
-                 metadata: Dict[str, Any] = None):
+                 metadata: Dict[str, Any] = None,
+                 conversion_target: Optional[str] = None):
         """
         Inicializa um modelo genérico.
         
@@ -31,11 +56,14 @@ class GenericModel(BaseModel[Any, Any]):
             model_id: Identificador único do modelo
             version: Versão do modelo
             model_path: Caminho para o arquivo do modelo
-            task_type: Tipo de tarefa ('classification', 'detection', 'segmentation', etc.)
+            task_type: Tipo de tarefa ('classification', 'detection', 'segmentation',
+                'embedding', etc.)
             input_shape: Formato de entrada esperado pelo modelo [batch, height, width, channels]
             preprocessing_config: Configurações para pré-processamento
             postprocessing_config: Configurações para pós-processamento
             metadata: Metadados adicionais como nomes de classes, etc.
+            conversion_target: Formato ('onnx' ou 'tflite') para o qual o modelo é
+                convertido no primeiro carregamento em um contexto TensorFlow
         """
         super().__init__(model_id, version)
         self.model_path = model_path
@@ -44,81 +72,255 @@ class GenericModel(BaseModel[Any, Any]):
         self.preprocessing_config = preprocessing_config or {}
         self.postprocessing_config = postprocessing_config or {}
         self.metadata = metadata or {}
+        self.conversion_target = conversion_target
         self._model = None
         
+        # Tamanho de batch preferido do modelo
+        self.batch_size = self.preprocessing_config.get('batch_size', 32)
+        
         # Inicializar processadores conforme o tipo de entrada
         self._init_processors()
     
     def _init_processors(self):
         """Inicializa os processadores adequados conforme configuração."""
-        # Processadores de entrada
-        self.image_processor = ImageProcessor(
-            target_size=self.preprocessing_config.get('target_size', self.input_shape[1:3]),
-            normalize=self.preprocessing_config.get('normalize', True),
-            mean=self.preprocessing_config.get('mean', None),
-            std=self.preprocessing_config.get('std', None),
-            add_batch_dim=self.preprocessing_config.get('add_batch_dim', True)
+        self.image_processor, self.video_processor, self.batch_processor = \
+            self._build_input_processors(self.preprocessing_config)
+        self.post_processor, self.video_post_processor = \
+            self._build_post_processors(self.postprocessing_config)
+        
+        # Processadores por conjunto de parâmetros de requisição
+        self._processor_cache: Dict[Hashable, Tuple[Any, ...]] = {}
+    
+    def _build_input_processors(self, config: Dict[str, Any]) -> Tuple[ImageProcessor, VideoProcessor, BatchProcessor]:
+        """Cria os processadores de entrada para uma configuração de pré-processamento."""
+        image_processor = ImageProcessor(
+            target_size=config.get('target_size', self.input_shape[1:3]),
+            normalize=config.get('normalize', True),
+            mean=config.get('mean', None),
+            std=config.get('std', None),
+            add_batch_dim=config.get('add_batch_dim', True),
+            fast_decode=config.get('fast_decode', True),
+            output_dtype=config.get('output_dtype', 'float32')
         )
         
-        self.video_processor = VideoProcessor(
-            image_processor=self.image_processor,
-            max_frames=self.preprocessing_config.get('max_frames', 30),
-            frame_interval=self.preprocessing_config.get('frame_interval', 1)
+        video_processor = VideoProcessor(
+            image_processor=image_processor,
+            max_frames=config.get('max_frames', 30),
+            frame_interval=config.get('frame_interval', 1)
         )
         
-        # Processadores de saída conforme o tipo de tarefa
+        # Pré-processamento paralelo para listas de imagens
+        batch_processor = BatchProcessor(
+            image_processor=image_processor,
+            batch_size=config.get('batch_size', 32),
+            num_parallel_calls=config.get('num_parallel_calls', None)
+        )
+        
+        return image_processor, video_processor, batch_processor
+    
+    def _build_post_processors(self, config: Dict[str, Any]) -> Tuple[Any, VideoPostProcessor]:
+        """Cria os processadores de saída para uma configuração de pós-processamento."""
         class_labels = self.metadata.get('class_labels', [])
         
         if self.task_type == 'classification':
-            self.post_processor = ClassificationPostProcessor(
+            post_processor = ClassificationPostProcessor(
                 class_labels=class_labels,
-                top_k=self.postprocessing_config.get('top_k', 5)
+                top_k=config.get('top_k', 5)
             )
         elif self.task_type == 'detection':
-            self.post_processor = DetectionPostProcessor(
+            post_processor = DetectionPostProcessor(
                 class_labels=class_labels,
                 output_format=self.metadata.get('output_format', 'default'),
-                confidence_threshold=self.postprocessing_config.get('confidence_threshold', 0.5),
-                apply_nms=self.postprocessing_config.get('apply_nms', True),
-                iou_threshold=self.postprocessing_config.get('iou_threshold', 0.5),
-                max_detections=self.postprocessing_config.get('max_detections', 100)
+                confidence_threshold=config.get('confidence_threshold', 0.5),
+                apply_nms=config.get('apply_nms', True),
+                iou_threshold=config.get('iou_threshold', 0.5),
+                max_detections=config.get('max_detections', 100)
             )
         elif self.task_type == 'segmentation':
-            self.post_processor = SegmentationPostProcessor(
+            post_processor = SegmentationPostProcessor(
                 class_labels=class_labels
             )
+        elif self.task_type == 'embedding':
+            post_processor = EmbeddingPostProcessor(
+                normalize=config.get('normalize', True)
+            )
         else:
             # Processador padrão
-            self.post_processor = ClassificationPostProcessor(
+            post_processor = ClassificationPostProcessor(
                 class_labels=class_labels,
-                top_k=self.postprocessing_config.get('top_k', 5)
+                top_k=config.get('top_k', 5)
             )
             
         # Processador de vídeo
-        self.video_post_processor = VideoPostProcessor(
+        video_post_processor = VideoPostProcessor(
             task_type=self.task_type,
-            frame_processor=self.post_processor
+            frame_processor=post_processor
         )
+        
+        return post_processor, video_post_processor
     
-    def preprocess(self, inputs: Any) -> Any:
-        """Processa entrada genérica com base no tipo de tarefa."""
+    def _get_processors(self, stage: str, params: Optional[Dict[str, Any]]) -> Tuple[Any, ...]:
+        """
+        Obtém os processadores para os parâmetros de uma requisição.
+        
+        Os parâmetros são combinados com a configuração do modelo sem alterá-la;
+        os processadores criados são mantidos em cache por conjunto distinto de
+        parâmetros e nunca modificados depois, de modo que requisições
+        simultâneas compartilham o modelo carregado sem travas.
+        
+        Args:
+            stage: 'pre' (processadores de entrada) ou 'post' (de saída)
+            params: Parâmetros da requisição (None = configuração do modelo)
+            
+        Returns:
+            Tupla de processadores do estágio
+        """
+        if not params:
+            if stage == 'pre':
+                return self.image_processor, self.video_processor, self.batch_processor
+            return self.post_processor, self.video_post_processor
+        
+        key = (stage, _freeze(params))
+        processors = self._processor_cache.get(key)
+        if processors is None:
+            if stage == 'pre':
+                processors = self._build_input_processors({**self.preprocessing_config, **params})
+            else:
+                processors = self._build_post_processors({**self.postprocessing_config, **params})
+            
+            # Parâmetros arbitrários não podem crescer o cache indefinidamente
+            if len(self._processor_cache) < PROCESSOR_CACHE_SIZE:
+                self._processor_cache.setdefault(key, processors)
+        return processors
+    
+    def load(self, context: ExecutionContextProtocol, model_path: Optional[str] = None) -> None:
+        """
+        Carrega o modelo, usando o artefato convertido quando configurado.
+        
+        Com conversion_target definido, o modelo solicitado em um contexto
+        TensorFlow é convertido (uma única vez por conteúdo do modelo) e
+        executado pelo contexto do formato convertido. Se a conversão ou o
+        carregamento do artefato falhar, o modelo original é usado.
+        """
+        if model_path is None and self.conversion_target and self._load_converted(context):
+            self._source_context = context
+            return
+        
+        super().load(context, model_path)
+        self._source_context = context
+    
+    def _load_converted(self, context: ExecutionContextProtocol) -> bool:
+        """Carrega o artefato convertido no contexto correspondente ao formato."""
+        from ...core.context import TensorFlowContext
+        from ...core.registry import ModelRegistry
+        
+        if not isinstance(context, TensorFlowContext):
+            return False
+        
+        target_context = ModelRegistry().get_context(self.conversion_target)
+        if target_context is None:
+            logger.warning(f"Contexto '{self.conversion_target}' indisponível para o modelo {self.model_id}")
+            return False
+        
+        converted_path = convert_model(self.model_path, self.conversion_target)
+        if converted_path is None:
+            return False
+        
+        try:
+            super().load(target_context, converted_path)
+        except Exception as e:
+            logger.warning(f"Falha ao carregar {converted_path}, usando o modelo original: {str(e)}")
+            return False
+        
+        logger.info(f"Modelo {self.model_id} carregado a partir de {converted_path}")
+        return True
+    
+    def _post_load_setup(self) -> None:
+        """
+        Para a tarefa de embedding, expõe a camada configurada como saída.
+        
+        A camada é indicada em postprocessing_config['embedding_layer']; sem
+        ela, a saída final do modelo é usada como embedding.
+        """
+        layer_name = self.postprocessing_config.get('embedding_layer')
+        if self.task_type != 'embedding' or not layer_name:
+            return
+        
+        if not hasattr(self._model, 'get_layer'):
+            logger.warning(
+                f"Modelo {self.model_id} não expõe camadas intermediárias; "
+                f"usando a saída final em vez de '{layer_name}'"
+            )
+            return
+        
+        self._model = tf.keras.Model(
+            inputs=self._model.inputs,
+            outputs=self._model.get_layer(layer_name).output
+        )
+    
+    def preprocess(self, inputs: Any, params: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Processa entrada genérica com base no tipo de tarefa.
+        
+        Args:
+            inputs: Caminho, bytes, array NumPy ou lista de entradas
+            params: Parâmetros de pré-processamento da requisição (sobrepõem a
+                configuração do modelo apenas nesta chamada)
+        """
+        image_processor, video_processor, batch_processor = self._get_processors('pre', params)
+        
         # Carrega imagem de diferentes formatos
         if isinstance(inputs, str):  # Caminho do arquivo
             # Verificar se é vídeo ou imagem
-            if inputs.lower().endswith(('.mp4', '.avi', '.mov', '.mkv')):
-                return self.video_processor.process_video(inputs)
+            if inputs.lower().endswith(VIDEO_EXTENSIONS):
+                return video_processor.process_video(inputs)
             else:  # Assumir imagem
-                return self.image_processor.process_from_path(inputs)
+                return image_processor.process_from_path(inputs)
         elif isinstance(inputs, bytes):  # Dados binários
-            return self.image_processor.process_from_bytes(inputs)
+            return image_processor.process_from_bytes(inputs)
         elif isinstance(inputs, np.ndarray):  # Array já carregado
-            return self.image_processor.process_from_array(inputs)
+            return image_processor.process_from_array(inputs)
         elif isinstance(inputs, list) and all(isinstance(x, (str, bytes, np.ndarray)) for x in inputs):
             # Lista de imagens/vídeos
-            return [self.preprocess(x) for x in inputs]
+            if any(isinstance(x, str) and x.lower().endswith(VIDEO_EXTENSIONS) for x in inputs):
+                return [self.preprocess(x, params) for x in inputs]
+            # Imagens são decodificadas e redimensionadas em paralelo
+            return batch_processor.process(inputs)
         else:
             raise ValueError(f"Formato de entrada não suportado: {type(inputs)}")
     
+    def preprocess_tiles(self,
+                         inputs: Any,
+                         tile_size: Optional[int] = None,
+                         overlap: float = 0.25,
+                         max_tiles: int = 16,
+                         params: Optional[Dict[str, Any]] = None) -> Tuple[tf.Tensor, Dict[str, Any]]:
+        """
+        Divide uma imagem de alta resolução em blocos sobrepostos na resolução do modelo.
+        
+        Args:
+            inputs: Caminho, bytes ou array NumPy de uma imagem
+            tile_size: Lado do bloco em pixels da imagem original (None = resolução do modelo)
+            overlap: Fração de sobreposição entre blocos vizinhos
+            max_tiles: Número máximo de blocos
+            params: Parâmetros de pré-processamento da requisição
+            
+        Returns:
+            Tupla (lote de blocos, informações da divisão usadas em postprocess_tiles)
+        """
+        if self.task_type not in ('detection', 'segmentation'):
+            raise ValueError(f"Inferência em blocos não suportada para a tarefa {self.task_type}")
+        
+        image_processor = self._get_processors('pre', params)[0]
+        tile_processor = TileProcessor(image_processor, tile_size=tile_size, overlap=overlap, max_tiles=max_tiles)
+        img = tile_processor.load(inputs)
+        tiles, windows = tile_processor.tile(img)
+        
+        return tiles, {
+            "windows": windows,
+            "image_size": (int(img.shape[0]), int(img.shape[1]))
+        }
+    
     def predict(self, inputs: Any) -> Any:
         """Executa inferência baseada no tipo de entrada."""
         if self._model is None:
@@ -129,21 +331,95 @@ class GenericModel(BaseModel[Any, Any]):
             # Lista de frames/imagens
             if self.metadata.get('batch_prediction', False):
                 # Modelo aceita batch de entrada
-                batched_inputs = tf.stack(inputs)
-                return self._model(batched_inputs, training=False)
+                return self._predict_batched(inputs)
             else:
                 # Predizer cada frame individualmente
-                return [self._model(x, training=False) for x in inputs]
+                return [self._run_inference(x) for x in inputs]
         else:
             # Imagem única
+            return self._run_inference(inputs)
+    
+    def _predict_batched(self, inputs: List[tf.Tensor]) -> List[Any]:
+        """
+        Executa a inferência em lotes de batch_size e separa a saída por item.
+        
+        Args:
+            inputs: Lista de tensores de imagens/frames
+            
+        Returns:
+            Lista com a saída de cada item, com dimensão de batch 1
+        """
+        outputs = []
+        for start in range(0, len(inputs), self.batch_size):
+            chunk = inputs[start:start + self.batch_size]
+            if chunk[0].shape.rank == 4:
+                batched_inputs = tf.concat(chunk, axis=0)
+            else:
+                batched_inputs = tf.stack(chunk)
+            
+            batch_outputs = self._run_inference(batched_inputs)
+            for i in range(len(chunk)):
+                outputs.append(tf.nest.map_structure(lambda output: output[i:i + 1], batch_outputs))
+        return outputs
+    
+    def _run_inference(self, inputs: Any) -> Any:
+        """Executa o modelo pelo contexto de execução em que foi carregado."""
+        context = getattr(self, '_context', None)
+        if context is None:
             return self._model(inputs, training=False)
+        return context.run_inference(self._model, inputs)
     
-    def postprocess(self, outputs: Any) -> Dict[str, Any]:
-        """Pós-processa saídas com base no tipo de tarefa."""
+    def warmup(self) -> None:
+        """
+        Executa uma inferência com entrada nula para inicializar o modelo.
+        
+        A primeira chamada ao modelo costuma incluir a construção do grafo e a
+        alocação de memória; fazê-la antes da primeira requisição remove essa
+        latência do caminho crítico.
+        """
+        height, width = self.preprocessing_config.get('target_size', self.input_shape[1:3])
+        channels = self.input_shape[3] if len(self.input_shape) > 3 and self.input_shape[3] else 3
+        dummy_input = tf.zeros([1, height, width, channels], dtype=self.image_processor.output_dtype)
+        self.predict(dummy_input)
+    
+    def postprocess(self, outputs: Any, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Pós-processa saídas com base no tipo de tarefa.
+        
+        Args:
+            outputs: Saída do modelo (lista para vídeo)
+            params: Parâmetros de pós-processamento da requisição (ex.:
+                confidence_threshold), sem alterar a configuração do modelo
+        """
+        post_processor, video_post_processor = self._get_processors('post', params)
+        
         # Verificar se temos processamento de vídeo (múltiplos frames)
         if isinstance(outputs, list):
             # Processamento de vídeo
-            return self.video_post_processor.process(outputs)
+            return video_post_processor.process(outputs)
         else:
             # Processamento de imagem única
-            return self.post_processor.process(outputs)
+            return post_processor.process(outputs)
+    
+    def postprocess_tiles(self, outputs: Any, tiling: Dict[str, Any],
+                          params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Combina as saídas dos blocos em um resultado para a imagem inteira.
+        
+        Args:
+            outputs: Saída do modelo para o lote de blocos
+            tiling: Informações da divisão retornadas por preprocess_tiles
+            params: Parâmetros de pós-processamento da requisição
+            
+        Returns:
+            Resultado da análise da imagem inteira
+        """
+        windows = tiling["windows"]
+        post_processor = self._get_processors('post', params)[0]
+        results = post_processor.process_tiles(outputs, windows, tiling["image_size"])
+        results["tiling"] = {
+            "tiles": len(windows),
+            "tile_size": [int(windows[0, 2] - windows[0, 0]), int(windows[0, 3] - windows[0, 1])],
+            "image_size": list(tiling["image_size"])
+        }
+        return results
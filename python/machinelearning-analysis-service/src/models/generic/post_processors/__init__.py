@@ -2,10 +2,12 @@ from .classification_postprocessor import ClassificationPostProcessor
 from .detection_postprocessor import DetectionPostProcessor
 from .segmentation_postprocessor import SegmentationPostProcessor
 from .video_postprocessor import VideoPostProcessor
+from .embedding_postprocessor import EmbeddingPostProcessor
 
 __all__ = [
     'ClassificationPostProcessor',
     'DetectionPostProcessor',
     'SegmentationPostProcessor',
-    'VideoPostProcessor'
+    'VideoPostProcessor',
+    'EmbeddingPostProcessor'
 ]
@@ -78,12 +78,11 @@ class ClassificationPostProcessor:
             confidence = float(probs[0][1])
             is_positive = confidence >= 0.5
         
-        # Garantir que temos pelo menos 2 labels
-        if len(self.class_labels) < 2:
-            self.class_labels = ["negative", "positive"]
+        # Garantir que temos pelo menos 2 labels (sem alterar o processador compartilhado)
+        class_labels = self.class_labels if len(self.class_labels) >= 2 else ["negative", "positive"]
             
         class_id = 1 if is_positive else 0
-        class_name = self.class_labels[class_id]
+        class_name = class_labels[class_id]
         
         prediction = {
             "class_id": class_id,
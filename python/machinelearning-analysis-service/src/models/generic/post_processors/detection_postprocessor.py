@@ -1,4 +1,4 @@
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import tensorflow as tf
 import numpy as np
 
@@ -60,6 +60,14 @@ class DetectionPostProcessor:
         scores = np.max(output_np[0, :, 4:], axis=1)
         class_indices = np.argmax(output_np[0, :, 4:], axis=1)
         
+        return self._select_detections(boxes, scores, class_indices, self.apply_nms)
+    
+    def _select_detections(self,
+                           boxes: np.ndarray,
+                           scores: np.ndarray,
+                           class_indices: np.ndarray,
+                           apply_nms: bool) -> Dict[str, Any]:
+        """Filtra por confiança, aplica NMS se solicitado e formata as detecções."""
         # Filtrar por confiança
         valid_indices = scores > self.confidence_threshold
         
@@ -68,7 +76,7 @@ class DetectionPostProcessor:
         filtered_classes = class_indices[valid_indices]
         
         # Aplicar NMS se configurado
-        if self.apply_nms and len(filtered_boxes) > 0:
+        if apply_nms and len(filtered_boxes) > 0:
             from tensorflow.image import non_max_suppression
             
             selected_indices = non_max_suppression(
@@ -101,6 +109,109 @@ class DetectionPostProcessor:
             "count": len(detections)
         }
     
+    def process_tiles(self, output: Any, windows: np.ndarray, image_size: Tuple[int, int]) -> Dict[str, Any]:
+        """
+        Combina as detecções de blocos de uma mesma imagem.
+        
+        As caixas, normalizadas em relação a cada bloco, são levadas para
+        coordenadas normalizadas da imagem inteira; caixas cortadas na borda
+        de um bloco são descartadas quando o bloco vizinho contém o objeto
+        inteiro, e o NMS é sempre aplicado sobre o conjunto para remover
+        objetos detectados em mais de um bloco.
+        
+        Args:
+            output: Saída do modelo para o lote de blocos
+            windows: Janelas dos blocos [N, 4] (y1, x1, y2, x2) em pixels
+            image_size: Tamanho da imagem original (altura, largura)
+            
+        Returns:
+            Detecções da imagem inteira
+        """
+        if self.output_format == 'ssd':
+            boxes = np.asarray(output[0])
+            scores = np.asarray(output[1])
+            class_indices = np.asarray(output[2])
+            num_detections = np.asarray(output[3]).astype(np.int64).reshape(-1)
+            # Detecções além de num_detections são preenchimento
+            valid = np.arange(scores.shape[1])[np.newaxis, :] < num_detections[:, np.newaxis]
+            scores = np.where(valid, scores, 0.0)
+        elif self.output_format == 'default':
+            output_np = output.numpy() if hasattr(output, 'numpy') else np.array(output)
+            boxes = output_np[:, :, :4]
+            scores = np.max(output_np[:, :, 4:], axis=2)
+            class_indices = np.argmax(output_np[:, :, 4:], axis=2)
+        else:
+            raise ValueError(f"Inferência em blocos não suportada para o formato {self.output_format}")
+        
+        height, width = image_size
+        window_origin = windows[:, np.newaxis, [0, 1, 0, 1]].astype(np.float32)
+        window_size = (windows[:, np.newaxis, [2, 3, 2, 3]] - windows[:, np.newaxis, [0, 1, 0, 1]]).astype(np.float32)
+        image_scale = np.array([height, width, height, width], dtype=np.float32)
+        global_boxes = ((window_origin + boxes * window_size) / image_scale).reshape(-1, 4)
+        scores = scores.reshape(-1)
+        class_indices = class_indices.reshape(-1)
+        
+        # Caixas que tocam uma borda interna do bloco podem ser objetos cortados
+        # (meio pixel de tolerância)
+        inner_edges = np.stack([
+            windows[:, 0] > 0, windows[:, 1] > 0, windows[:, 2] < height, windows[:, 3] < width
+        ], axis=-1)[:, np.newaxis, :]
+        at_edge = np.stack([
+            boxes[..., 0] * window_size[..., 0] <= 0.5,
+            boxes[..., 1] * window_size[..., 1] <= 0.5,
+            (1.0 - boxes[..., 2]) * window_size[..., 2] <= 0.5,
+            (1.0 - boxes[..., 3]) * window_size[..., 3] <= 0.5
+        ], axis=-1)
+        truncated = np.any(at_edge & inner_edges, axis=-1).reshape(-1)
+        
+        keep = self._drop_truncated(global_boxes, scores, class_indices, truncated)
+        
+        return self._select_detections(
+            global_boxes[keep],
+            scores[keep],
+            class_indices[keep],
+            apply_nms=True
+        )
+    
+    def _drop_truncated(self,
+                        boxes: np.ndarray,
+                        scores: np.ndarray,
+                        class_indices: np.ndarray,
+                        truncated: np.ndarray) -> np.ndarray:
+        """
+        Remove caixas cortadas na borda de um bloco contidas em uma caixa completa.
+        
+        Um objeto na região de sobreposição aparece inteiro em um bloco e cortado
+        no vizinho; a caixa cortada tem IoU baixo com a completa e sobreviveria
+        ao NMS. Por isso, uma caixa cortada é removida quando a maior parte de
+        sua área (fração >= iou_threshold) está dentro de uma caixa completa da
+        mesma classe. Objetos maiores que a sobreposição, cortados em todos os
+        blocos, são mantidos.
+        
+        Returns:
+            Máscara das caixas mantidas
+        """
+        keep = scores > self.confidence_threshold
+        candidates = np.nonzero(keep & truncated)[0]
+        complete = np.nonzero(keep & ~truncated)[0]
+        if len(candidates) == 0 or len(complete) == 0:
+            return keep
+        
+        inner = boxes[candidates][:, np.newaxis, :]
+        outer = boxes[complete][np.newaxis, :, :]
+        intersection_height = np.clip(
+            np.minimum(inner[..., 2], outer[..., 2]) - np.maximum(inner[..., 0], outer[..., 0]), 0, None
+        )
+        intersection_width = np.clip(
+            np.minimum(inner[..., 3], outer[..., 3]) - np.maximum(inner[..., 1], outer[..., 1]), 0, None
+        )
+        area = np.maximum((inner[..., 2] - inner[..., 0]) * (inner[..., 3] - inner[..., 1]), 1e-12)
+        contained = (intersection_height * intersection_width) / area >= self.iou_threshold
+        same_class = class_indices[candidates][:, np.newaxis] == class_indices[complete][np.newaxis, :]
+        
+        keep[candidates[np.any(contained & same_class, axis=1)]] = False
+        return keep
+    
     def _process_yolo(self, output: Any) -> Dict[str, Any]:
         """Processa saída no formato YOLO."""
         # Implementação simplificada para YOLO
@@ -0,0 +1,49 @@
+from typing import Dict, Any
+import numpy as np
+
+class EmbeddingPostProcessor:
+    """Converte a saída de uma camada do modelo em um vetor de embedding."""
+    
+    def __init__(self, normalize: bool = True):
+        """
+        Inicializa o processador.
+        
+        Args:
+            normalize: Se True, normaliza o vetor para norma L2 unitária, de
+                modo que o produto interno equivalha à similaridade de cosseno
+        """
+        self.normalize = normalize
+    
+    def process(self, output: Any) -> Dict[str, Any]:
+        """Processa a saída de uma imagem."""
+        if isinstance(output, dict):
+            output = next(iter(output.values()))
+        
+        # Converter para numpy se for tensor TF
+        if hasattr(output, 'numpy'):
+            output_np = output.numpy()
+        else:
+            output_np = np.array(output)
+        
+        embedding = self.to_vectors(output_np)[0]
+        return {
+            "embedding": embedding.tolist(),
+            "dimension": int(embedding.shape[0])
+        }
+    
+    def to_vectors(self, output: np.ndarray) -> np.ndarray:
+        """
+        Converte a saída de um lote em vetores [batch, dimensão].
+        
+        Mapas de ativação [batch, altura, largura, canais] são reduzidos por
+        média global; demais formatos são achatados.
+        """
+        output = np.asarray(output, dtype=np.float32)
+        if output.ndim == 4:
+            output = output.mean(axis=(1, 2))
+        vectors = output.reshape(output.shape[0], -1)
+        
+        if self.normalize:
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors = vectors / np.maximum(norms, 1e-12)
+        return vectors
@@ -1,4 +1,4 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 import tensorflow as tf
 import numpy as np
 
@@ -59,6 +59,57 @@ class SegmentationPostProcessor:
                           for c in unique_classes]
         }
     
+    def process_tiles(self, output: Any, windows: np.ndarray, image_size: Tuple[int, int]) -> Dict[str, Any]:
+        """
+        Combina os mapas de segmentação de blocos de uma mesma imagem.
+        
+        Os logits de cada bloco são posicionados em um mapa único e, nas regiões
+        de sobreposição, combinados por média ponderada com pesos que decaem em
+        direção às bordas do bloco, evitando descontinuidades entre blocos.
+        
+        Args:
+            output: Saída do modelo para o lote de blocos [N, altura, largura, classes]
+            windows: Janelas dos blocos [N, 4] (y1, x1, y2, x2) em pixels
+            image_size: Tamanho da imagem original (altura, largura)
+            
+        Returns:
+            Resultado de segmentação da imagem inteira
+        """
+        output_np = output.numpy() if hasattr(output, 'numpy') else np.array(output)
+        if output_np.ndim == 3:
+            output_np = output_np[..., np.newaxis]
+        output_np = output_np.astype(np.float32)
+        
+        # O mapa combinado mantém a resolução de saída do modelo em relação ao bloco
+        height, width = image_size
+        scale_y = output_np.shape[1] / float(windows[0, 2] - windows[0, 0])
+        scale_x = output_np.shape[2] / float(windows[0, 3] - windows[0, 1])
+        canvas_height = max(1, int(round(height * scale_y)))
+        canvas_width = max(1, int(round(width * scale_x)))
+        
+        logits = np.zeros((canvas_height, canvas_width, output_np.shape[-1]), dtype=np.float32)
+        weights = np.zeros((canvas_height, canvas_width, 1), dtype=np.float32)
+        
+        for tile_output, (y1, x1, y2, x2) in zip(output_np, windows):
+            top, left = int(round(y1 * scale_y)), int(round(x1 * scale_x))
+            bottom = min(canvas_height, max(top + 1, int(round(y2 * scale_y))))
+            right = min(canvas_width, max(left + 1, int(round(x2 * scale_x))))
+            
+            if tile_output.shape[:2] != (bottom - top, right - left):
+                tile_output = tf.image.resize(tile_output, (bottom - top, right - left)).numpy()
+            
+            weight = self._blend_weights(bottom - top, right - left)
+            logits[top:bottom, left:right] += tile_output * weight
+            weights[top:bottom, left:right] += weight
+        
+        return self.process((logits / np.maximum(weights, 1e-6))[np.newaxis])
+    
+    def _blend_weights(self, height: int, width: int) -> np.ndarray:
+        """Pesos triangulares [altura, largura, 1], máximos no centro do bloco."""
+        weight_y = np.minimum(np.arange(1, height + 1), np.arange(height, 0, -1)).astype(np.float32)
+        weight_x = np.minimum(np.arange(1, width + 1), np.arange(width, 0, -1)).astype(np.float32)
+        return np.outer(weight_y, weight_x)[..., np.newaxis]
+    
     def _simple_rle_encode(self, mask: np.ndarray) -> List[Dict[str, Any]]:
         """
         Implementa uma versão simplificada de Run-Length Encoding.
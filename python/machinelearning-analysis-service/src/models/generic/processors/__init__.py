@@ -1,4 +1,6 @@
 from .image_processor import ImageProcessor
 from .video_processor import VideoProcessor
+from .batch_processor import BatchProcessor
+from .tile_processor import TileProcessor
 
-__all__ = ['ImageProcessor', 'VideoProcessor']
+__all__ = ['ImageProcessor', 'VideoProcessor', 'BatchProcessor', 'TileProcessor']
@@ -0,0 +1,161 @@
+from typing import Any, Iterator, List, Optional, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor
+import tensorflow as tf
+import numpy as np
+
+
+class BatchProcessor:
+    """Classe responsável pelo pré-processamento paralelo de várias imagens."""
+    
+    def __init__(self,
+                 image_processor,
+                 batch_size: int = 32,
+                 num_parallel_calls: Optional[int] = None,
+                 use_tf_data: bool = True,
+                 ignore_errors: bool = False):
+        """
+        Inicializa o processador em lote.
+        
+        Args:
+            image_processor: Instância de ImageProcessor usada em cada imagem
+            batch_size: Tamanho dos lotes produzidos (tamanho de batch preferido do modelo)
+            num_parallel_calls: Número de imagens processadas em paralelo (None = automático)
+            use_tf_data: Se True, usa um pipeline tf.data para caminhos e bytes;
+                caso contrário (ou para arrays), usa um pool de threads
+            ignore_errors: Se True, descarta imagens que falham na decodificação
+                (os índices das imagens restantes acompanham cada lote)
+        """
+        self.image_processor = image_processor
+        self.batch_size = batch_size
+        self.num_parallel_calls = num_parallel_calls
+        self.use_tf_data = use_tf_data
+        self.ignore_errors = ignore_errors
+    
+    def process(self, inputs: List[Any]) -> List[Optional[tf.Tensor]]:
+        """
+        Processa uma lista de imagens, mantendo a ordem de entrada.
+        
+        Args:
+            inputs: Caminhos, bytes ou arrays NumPy
+        
+        Returns:
+            Lista com um tensor por imagem, no mesmo formato de ImageProcessor,
+            alinhada às entradas (None nas imagens descartadas com ignore_errors)
+        """
+        images: List[Optional[tf.Tensor]] = [None] * len(inputs)
+        for indices, batch in self.iter_indexed_batches(inputs):
+            if self.image_processor.add_batch_dim:
+                split = tf.split(batch, int(batch.shape[0]), axis=0)
+            else:
+                split = tf.unstack(batch, axis=0)
+            for index, image in zip(indices, split):
+                images[index] = image
+        return images
+    
+    def process_batch(self, inputs: List[Any],
+                      return_indices: bool = False) -> Union[tf.Tensor, Tuple[tf.Tensor, List[int]]]:
+        """
+        Processa uma lista de imagens em um único tensor [N, altura, largura, canais].
+        
+        Args:
+            inputs: Caminhos, bytes ou arrays NumPy
+            return_indices: Se True, retorna também os índices das entradas
+                presentes no tensor (com ignore_errors, as que falharam ficam de fora)
+        
+        Returns:
+            Tensor com todas as imagens empilhadas e, com return_indices, a
+            lista de índices das entradas correspondentes
+        """
+        indices: List[int] = []
+        batches = []
+        for batch_indices, batch in self.iter_indexed_batches(inputs):
+            indices.extend(batch_indices)
+            batches.append(batch)
+        if not batches:
+            raise ValueError("Nenhuma imagem pôde ser processada")
+        images = tf.concat(batches, axis=0)
+        return (images, indices) if return_indices else images
+    
+    def iter_batches(self, inputs: List[Any]) -> Iterator[tf.Tensor]:
+        """
+        Gera lotes de até batch_size imagens pré-processadas.
+        
+        Args:
+            inputs: Caminhos, bytes ou arrays NumPy
+        
+        Yields:
+            Tensores [lote, altura, largura, canais]
+        """
+        for _, batch in self.iter_indexed_batches(inputs):
+            yield batch
+    
+    def iter_indexed_batches(self, inputs: List[Any]) -> Iterator[Tuple[List[int], tf.Tensor]]:
+        """
+        Gera lotes de até batch_size imagens com os índices das entradas de origem.
+        
+        Args:
+            inputs: Caminhos, bytes ou arrays NumPy
+        
+        Yields:
+            Índices das entradas presentes no lote e tensor [lote, altura, largura, canais]
+        """
+        if not inputs:
+            return
+        
+        # tf.data recebe apenas listas homogêneas: caminhos são lidos e bytes
+        # decodificados diretamente, então listas mistas vão para o pool de threads
+        if self.use_tf_data and (all(isinstance(x, str) for x in inputs) or
+                                 all(isinstance(x, bytes) for x in inputs)):
+            yield from self._iter_tf_data(inputs)
+        else:
+            yield from self._iter_thread_pool(inputs)
+    
+    def _load(self, data: tf.Tensor) -> tf.Tensor:
+        """Decodifica e padroniza uma imagem sem dimensão de batch."""
+        img = self.image_processor.decode(data)
+        return self.image_processor.standardize_image(img, add_batch_dim=False)
+    
+    def _iter_tf_data(self, inputs: List[Any]) -> Iterator[Tuple[List[int], tf.Tensor]]:
+        """Pipeline tf.data com decodificação paralela e prefetch."""
+        num_parallel_calls = self.num_parallel_calls or tf.data.AUTOTUNE
+        read = isinstance(inputs[0], str)
+        
+        def load(index: tf.Tensor, data: tf.Tensor) -> Tuple[tf.Tensor, tf.Tensor]:
+            # O índice acompanha a imagem: ignore_errors descarta os dois juntos
+            return index, self._load(tf.io.read_file(data) if read else data)
+        
+        dataset = tf.data.Dataset.from_tensor_slices((tf.range(len(inputs), dtype=tf.int64), inputs))
+        dataset = dataset.map(load, num_parallel_calls=num_parallel_calls, deterministic=True)
+        if self.ignore_errors:
+            dataset = dataset.apply(tf.data.experimental.ignore_errors())
+        dataset = dataset.batch(self.batch_size).prefetch(tf.data.AUTOTUNE)
+        
+        for indices, batch in dataset:
+            yield indices.numpy().tolist(), batch
+    
+    def _process_one(self, item: Any) -> Optional[tf.Tensor]:
+        """Processa uma imagem individual no pool de threads."""
+        try:
+            if isinstance(item, np.ndarray):
+                img = tf.convert_to_tensor(item)
+            elif isinstance(item, str):
+                img = self.image_processor.decode(tf.io.read_file(item))
+            else:
+                img = self.image_processor.decode(tf.constant(item))
+            return self.image_processor.standardize_image(img, add_batch_dim=False)
+        except Exception:
+            if self.ignore_errors:
+                return None
+            raise
+    
+    def _iter_thread_pool(self, inputs: List[Any]) -> Iterator[Tuple[List[int], tf.Tensor]]:
+        """Processamento paralelo com threads (as operações do TensorFlow liberam o GIL)."""
+        with ThreadPoolExecutor(max_workers=self.num_parallel_calls) as executor:
+            for start in range(0, len(inputs), self.batch_size):
+                chunk = inputs[start:start + self.batch_size]
+                processed = [
+                    (start + offset, img)
+                    for offset, img in enumerate(executor.map(self._process_one, chunk)) if img is not None
+                ]
+                if processed:
+                    yield [index for index, _ in processed], tf.stack([img for _, img in processed])
@@ -3,6 +3,10 @@ import tensorflow as tf
 import numpy as np
 
 
+# Fatores de redução suportados pela decodificação JPEG no domínio DCT
+_JPEG_RATIOS = (1, 2, 4, 8)
+
+
 class ImageProcessor:
     """Classe responsável pelo processamento de imagens."""
     
@@ -11,7 +15,9 @@ class ImageProcessor:
                  normalize: bool = True,
                  mean: Optional[List[float]] = None,
                  std: Optional[List[float]] = None,
-                 add_batch_dim: bool = True):
+                 add_batch_dim: bool = True,
+                 fast_decode: bool = True,
+                 output_dtype: str = 'float32'):
         """
         Inicializa o processador de imagens.
         
@@ -21,48 +27,130 @@ class ImageProcessor:
             mean: Valores médios por canal para normalização
             std: Valores de desvio padrão por canal para normalização
             add_batch_dim: Se True, adiciona dimensão de batch
+            fast_decode: Se True, decodifica JPEGs já reduzidos para a menor
+                escala que ainda cobre o tamanho alvo
+            output_dtype: 'float32' para a saída normalizada ou 'uint8' para
+                modelos que já incluem a própria camada de normalização
         """
+        if output_dtype not in ('float32', 'uint8'):
+            raise ValueError(f"Tipo de saída não suportado: {output_dtype}")
+        
         self.target_size = target_size
         self.normalize = normalize
         self.mean = mean
         self.std = std
         self.add_batch_dim = add_batch_dim
+        self.fast_decode = fast_decode
+        self.output_dtype = output_dtype
+        
+        # Normalização pré-calculada como transformação afim:
+        # ((x / 255) - mean) / std == x * scale + offset
+        # Sem mean/std a escala é um escalar, aplicável a qualquer número de canais
+        self._scale = None
+        self._offset = None
+        if normalize:
+            if mean is not None and std is not None:
+                std_array = np.asarray(std, dtype=np.float32)
+                self._scale = tf.constant(1.0 / 255.0 / std_array)
+                offset = -np.asarray(mean, dtype=np.float32) / std_array
+                self._offset = tf.constant(offset) if np.any(offset) else None
+            else:
+                self._scale = tf.constant(1.0 / 255.0, dtype=tf.float32)
     
     def process_from_path(self, path: str) -> tf.Tensor:
         """Processa imagem a partir do caminho do arquivo."""
-        img = tf.io.read_file(path)
-        img = tf.image.decode_image(img, channels=3, expand_animations=False)
+        img = self.decode(tf.io.read_file(path))
         return self.standardize_image(img)
     
     def process_from_bytes(self, data: bytes) -> tf.Tensor:
         """Processa imagem a partir de dados binários."""
-        img = tf.image.decode_image(tf.constant(data), channels=3, expand_animations=False)
+        img = self.decode(tf.constant(data))
         return self.standardize_image(img)
     
+    def decode(self, data: tf.Tensor) -> tf.Tensor:
+        """
+        Decodifica uma imagem codificada em um tensor uint8 [altura, largura, 3].
+        
+        Com fast_decode, JPEGs são decodificados no domínio DCT com o maior
+        fator de redução (1, 2, 4 ou 8) que ainda mantém a imagem maior ou igual
+        ao tamanho alvo, evitando decodificar todos os pixels de fotos grandes.
+        Compatível com modo grafo (tf.data e tf.function).
+        
+        Args:
+            data: Tensor string com os bytes da imagem
+            
+        Returns:
+            Imagem decodificada
+        """
+        if not self.fast_decode:
+            return tf.image.decode_image(data, channels=3, expand_animations=False)
+        
+        return tf.cond(
+            tf.io.is_jpeg(data),
+            lambda: self._decode_jpeg_scaled(data),
+            lambda: tf.image.decode_image(data, channels=3, expand_animations=False)
+        )
+    
+    def _decode_jpeg_scaled(self, data: tf.Tensor) -> tf.Tensor:
+        """Decodifica um JPEG na menor escala potência de dois que cobre o alvo."""
+        # Apenas o cabeçalho é lido para obter as dimensões
+        shape = tf.image.extract_jpeg_shape(data)
+        target_height, target_width = self.target_size
+        scale = tf.minimum(shape[0] // target_height, shape[1] // target_width)
+        
+        # Índice do maior fator em _JPEG_RATIOS que não ultrapassa a escala
+        index = tf.reduce_sum(
+            tf.cast(scale >= tf.constant(_JPEG_RATIOS[1:], dtype=scale.dtype), tf.int32)
+        )
+        branches = [
+            (lambda ratio=ratio: tf.io.decode_jpeg(data, channels=3, ratio=ratio))
+            for ratio in _JPEG_RATIOS
+        ]
+        return tf.switch_case(index, branches)
+    
     def process_from_array(self, array: np.ndarray) -> tf.Tensor:
         """Processa imagem a partir de array NumPy."""
         img = tf.convert_to_tensor(array)
         return self.standardize_image(img)
     
-    def standardize_image(self, img: tf.Tensor) -> tf.Tensor:
-        """Padroniza imagem para o formato esperado pelo modelo."""
-        # Garantir que a imagem é float32
-        if img.dtype != tf.float32:
-            img = tf.cast(img, tf.float32)
-            
-        # Redimensionar
-        img = tf.image.resize(img, self.target_size)
+    def standardize_image(self, img: tf.Tensor, add_batch_dim: Optional[bool] = None) -> tf.Tensor:
+        """Padroniza imagem para o formato esperado pelo modelo.
         
-        # Normalizar
-        if self.normalize:
-            img = img / 255.0
+        Args:
+            img: Imagem [altura, largura, canais]
+            add_batch_dim: Sobrescreve a configuração de dimensão de batch (None = usa a do processador)
+        """
+        # Redimensionar apenas se necessário; o resize aceita uint8 diretamente
+        # e já devolve float32, sem um cast separado
+        if self._needs_resize(img):
+            img = tf.image.resize(img, self.target_size)
+        
+        if self.output_dtype == 'uint8':
+            # O modelo aplica a própria normalização
+            if img.dtype != tf.uint8:
+                img = tf.saturate_cast(tf.round(img), tf.uint8)
+        else:
+            # Garantir que a imagem é float32
+            if img.dtype != tf.float32:
+                img = tf.cast(img, tf.float32)
             
-            # Aplicar normalização específica se configurada
-            if self.mean is not None and self.std is not None:
-                img = (img - self.mean) / self.std
+            # Normalização em uma única transformação afim pré-calculada
+            if self._scale is not None:
+                img = img * self._scale
+                if self._offset is not None:
+                    img = img + self._offset
         
         # Adicionar dimensão de batch se necessário
-        if self.add_batch_dim and len(img.shape) == 3:
+        if add_batch_dim is None:
+            add_batch_dim = self.add_batch_dim
+        if add_batch_dim and len(img.shape) == 3:
             img = tf.expand_dims(img, 0)
             
         return img
+    
+    def _needs_resize(self, img: tf.Tensor) -> bool:
+        """Verifica se a imagem ainda não está no tamanho alvo."""
+        height, width = img.shape[-3], img.shape[-2]
+        if height is None or width is None:
+            return True
+        return (height, width) != tuple(self.target_size)
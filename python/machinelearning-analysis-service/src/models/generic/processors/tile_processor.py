@@ -0,0 +1,124 @@
+from typing import Any, Optional, Tuple
+import math
+import tensorflow as tf
+import numpy as np
+
+
+class TileProcessor:
+    """Classe responsável por dividir imagens de alta resolução em blocos sobrepostos."""
+    
+    def __init__(self,
+                 image_processor,
+                 tile_size: Optional[int] = None,
+                 overlap: float = 0.25,
+                 max_tiles: int = 16):
+        """
+        Inicializa o processador de blocos.
+        
+        Args:
+            image_processor: Instância de ImageProcessor usada para normalizar os blocos
+            tile_size: Lado do bloco em pixels da imagem original
+                (None = resolução de entrada do modelo)
+            overlap: Fração de sobreposição entre blocos vizinhos (0.0 a 1.0, exclusivo)
+            max_tiles: Número máximo de blocos; se excedido, os blocos são
+                ampliados e redimensionados para a resolução do modelo
+        """
+        if not 0.0 <= overlap < 1.0:
+            raise ValueError(f"Sobreposição inválida: {overlap}")
+        if max_tiles < 1:
+            raise ValueError(f"Número máximo de blocos inválido: {max_tiles}")
+        if tile_size is not None and tile_size < 1:
+            raise ValueError(f"Tamanho de bloco inválido: {tile_size}")
+        
+        self.image_processor = image_processor
+        self.tile_size = tile_size
+        self.overlap = overlap
+        self.max_tiles = max_tiles
+    
+    def load(self, inputs: Any) -> tf.Tensor:
+        """
+        Decodifica a imagem na resolução original.
+        
+        A decodificação reduzida de ImageProcessor não é usada aqui, pois
+        descartaria justamente os detalhes que a divisão em blocos preserva.
+        
+        Args:
+            inputs: Caminho, bytes ou array NumPy
+        
+        Returns:
+            Imagem [altura, largura, 3]
+        """
+        if isinstance(inputs, np.ndarray):
+            return tf.convert_to_tensor(inputs)
+        if isinstance(inputs, str):
+            inputs = tf.io.read_file(inputs)
+        return tf.image.decode_image(inputs, channels=3, expand_animations=False)
+    
+    def compute_windows(self, height: int, width: int) -> np.ndarray:
+        """
+        Calcula as janelas dos blocos cobrindo toda a imagem.
+        
+        Args:
+            height: Altura da imagem
+            width: Largura da imagem
+        
+        Returns:
+            Array [N, 4] com as janelas (y1, x1, y2, x2) em pixels
+        """
+        target_height, target_width = self.image_processor.target_size
+        if self.tile_size is not None:
+            # Mantém a proporção da entrada do modelo
+            scale = self.tile_size / max(target_height, target_width)
+        else:
+            scale = 1.0
+        
+        while True:
+            tile_height = min(height, max(1, round(target_height * scale)))
+            tile_width = min(width, max(1, round(target_width * scale)))
+            starts_y = self._axis_starts(height, tile_height)
+            starts_x = self._axis_starts(width, tile_width)
+            
+            if len(starts_y) * len(starts_x) <= self.max_tiles:
+                break
+            # Blocos maiores até respeitar o limite
+            scale *= 1.25
+        
+        return np.array([
+            (y, x, y + tile_height, x + tile_width) for y in starts_y for x in starts_x
+        ], dtype=np.int64)
+    
+    def _axis_starts(self, length: int, tile: int) -> np.ndarray:
+        """Posições iniciais dos blocos em um eixo, distribuídas uniformemente."""
+        if tile >= length:
+            return np.array([0])
+        stride = max(1, tile * (1.0 - self.overlap))
+        count = math.ceil((length - tile) / stride) + 1
+        return np.round(np.linspace(0, length - tile, count)).astype(np.int64)
+    
+    def tile(self, img: tf.Tensor) -> Tuple[tf.Tensor, np.ndarray]:
+        """
+        Divide a imagem em blocos na resolução de entrada do modelo.
+        
+        Args:
+            img: Imagem [altura, largura, canais]
+        
+        Returns:
+            Tupla (blocos [N, altura_modelo, largura_modelo, canais] normalizados,
+            janelas [N, 4] em pixels da imagem original)
+        """
+        height, width = int(img.shape[0]), int(img.shape[1])
+        windows = self.compute_windows(height, width)
+        
+        # Recorte e redimensionamento de todos os blocos em uma única operação;
+        # as coordenadas normalizadas seguem a convenção de crop_and_resize (pixel * (dim - 1))
+        scale = np.array([max(height - 1, 1), max(width - 1, 1)] * 2, dtype=np.float32)
+        boxes = (windows - np.array([0, 0, 1, 1])).astype(np.float32) / scale
+        
+        tiles = tf.image.crop_and_resize(
+            tf.expand_dims(img, 0),
+            boxes,
+            tf.zeros(len(windows), dtype=tf.int32),
+            self.image_processor.target_size
+        )
+        
+        return self.image_processor.standardize_image(tiles, add_batch_dim=False), windows
@@ -1,19 +1,23 @@
 from .requests import (
     AnalysisRequest, BatchAnalysisRequest, 
     ImageAnalysisRequest, VideoAnalysisRequest,
-    TaskStatusRequest
+    TaskStatusRequest, BulkTaskRequest
 )
 from .responses import (
     TaskStatus, ModelInfo, ContextInfo, PerformanceMetrics,
     AnalysisMetadata, AnalysisResponse, AsyncAnalysisResponse,
-    BatchAnalysisResponse, ModelListResponse, ExportResponse
+    BatchAnalysisResponse, BatchItemResult, BatchSummary,
+    TaskStatusRecord, BulkTaskStatusResponse,
+    ModelListResponse, ExportResponse
 )
 
 __all__ = [
     'AnalysisRequest', 'BatchAnalysisRequest', 
     'ImageAnalysisRequest', 'VideoAnalysisRequest',
-    'TaskStatusRequest',
+    'TaskStatusRequest', 'BulkTaskRequest',
     'TaskStatus', 'ModelInfo', 'ContextInfo', 'PerformanceMetrics',
     'AnalysisMetadata', 'AnalysisResponse', 'AsyncAnalysisResponse',
-    'BatchAnalysisResponse', 'ModelListResponse', 'ExportResponse'
+    'BatchAnalysisResponse', 'BatchItemResult', 'BatchSummary',
+    'TaskStatusRecord', 'BulkTaskStatusResponse',
+    'ModelListResponse', 'ExportResponse'
 ]
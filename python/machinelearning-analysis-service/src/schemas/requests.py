@@ -47,3 +47,30 @@ class TaskStatusRequest(BaseModel):
     """Modelo de requisição para verificar status de uma tarefa."""
     
     task_id: str = Field(..., description="ID da tarefa")
+
+
+class BulkTaskRequest(BaseModel):
+    """Modelo de requisição para consultar várias tarefas de uma vez."""
+    
+    task_ids: List[str] = Field(..., min_items=1, max_items=10000, description="IDs das tarefas")
+
+
+class VectorInsertRequest(BaseModel):
+    """Modelo de requisição para inserção de vetores em um índice."""
+    
+    ids: List[str] = Field(..., min_items=1, description="Identificadores dos vetores")
+    vectors: List[List[float]] = Field(..., min_items=1, description="Vetores a inserir (mesma ordem dos identificadores)")
+    index_type: Optional[str] = Field(None, description="Tipo do índice, se ainda não existir (flat, ivf ou faiss)")
+
+
+class VectorDeleteRequest(BaseModel):
+    """Modelo de requisição para remoção de vetores de um índice."""
+    
+    ids: List[str] = Field(..., min_items=1, description="Identificadores dos vetores a remover")
+
+
+class VectorQueryRequest(BaseModel):
+    """Modelo de requisição para busca dos vetores mais similares."""
+    
+    vectors: List[List[float]] = Field(..., min_items=1, description="Vetores de consulta")
+    k: int = Field(10, gt=0, le=1000, description="Número de vizinhos por consulta")
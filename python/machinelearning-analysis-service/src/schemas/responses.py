@@ -10,6 +10,7 @@ class TaskStatus(str, Enum):
     PROCESSING = "processing"
     COMPLETED = "completed"
     FAILED = "failed"
+    NOT_FOUND = "not_found"
 
 
 class ModelInfo(BaseModel):
@@ -68,6 +69,45 @@ class AsyncAnalysisResponse(BaseModel):
     message: Optional[str] = Field(None, description="Mensagem informativa")
 
 
+class TaskStatusRecord(BaseModel):
+    """Status compacto de uma tarefa em uma consulta em massa."""
+    
+    task_id: str = Field(..., description="ID da tarefa")
+    status: TaskStatus = Field(..., description="Status da tarefa")
+    exports: List[str] = Field(default_factory=list, description="Formatos exportados disponíveis")
+
+
+class BulkTaskStatusResponse(BaseModel):
+    """Resposta para consulta de status de várias tarefas."""
+    
+    tasks: List[TaskStatusRecord] = Field(..., description="Status de cada tarefa, na ordem da requisição")
+    counts: Dict[str, int] = Field(..., description="Número de tarefas por status")
+
+
+class BatchItemResult(BaseModel):
+    """Resultado de um item de uma análise em lote (uma linha NDJSON)."""
+    
+    type: str = Field("result", description="Tipo da linha")
+    batch_id: str = Field(..., description="ID do lote")
+    index: int = Field(..., description="Posição do item na requisição")
+    file_name: Optional[str] = Field(None, description="Nome ou caminho do arquivo")
+    status: TaskStatus = Field(..., description="Status do item")
+    results: Optional[Dict[str, Any]] = Field(None, description="Resultados da análise")
+    error: Optional[str] = Field(None, description="Mensagem de erro, se houver")
+
+
+class BatchSummary(BaseModel):
+    """Resumo final de uma análise em lote (última linha NDJSON)."""
+    
+    type: str = Field("summary", description="Tipo da linha")
+    batch_id: str = Field(..., description="ID do lote")
+    total_items: int = Field(..., description="Número total de itens")
+    completed_items: int = Field(..., description="Número de itens analisados com sucesso")
+    failed_items: int = Field(..., description="Número de itens com erro")
+    total_time: float = Field(..., description="Tempo total de processamento em segundos")
+    items_per_second: float = Field(..., description="Vazão média do lote")
+
+
 class BatchAnalysisResponse(BaseModel):
     """Resposta para requisição de análise em lote."""
     
@@ -92,3 +132,28 @@ class ExportResponse(BaseModel):
     format: str = Field(..., description="Formato de exportação")
     url: str = Field(..., description="URL para download do arquivo exportado")
     mime_type: str = Field(..., description="MIME type do arquivo exportado")
+
+
+class IndexInfo(BaseModel):
+    """Informações sobre um índice vetorial."""
+    
+    name: str = Field(..., description="Nome do índice")
+    index_type: str = Field(..., description="Tipo do índice")
+    dimension: int = Field(..., description="Dimensão dos vetores")
+    count: int = Field(..., description="Número de vetores no índice")
+    details: Dict[str, Any] = Field(default_factory=dict, description="Parâmetros específicos do tipo")
+
+
+class VectorMatch(BaseModel):
+    """Vetor encontrado em uma busca por similaridade."""
+    
+    id: str = Field(..., description="Identificador do vetor")
+    score: float = Field(..., description="Similaridade de cosseno com a consulta")
+
+
+class VectorQueryResponse(BaseModel):
+    """Resposta para busca por similaridade."""
+    
+    index: str = Field(..., description="Nome do índice")
+    matches: List[List[VectorMatch]] = Field(..., description="Vizinhos de cada consulta, do mais ao menos similar")
+    query_time: float = Field(..., description="Tempo da busca em segundos")
@@ -3,15 +3,17 @@ Configuração do serviço de análise de machine learning.
 """
 
 import os
+import asyncio
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from fastapi import FastAPI, HTTPException
 from fastapi.responses import JSONResponse
+from typing import Any, Dict, Optional
 import time
 
 from .core.registry import ModelRegistry
-from .core.context import TensorFlowContext, ONNXContext, PyTorchContext
-from .models.generic.generic_model import GenericModel
-from .utils.metrics import get_metrics
+from .utils.metrics import get_metrics, observe_histogram, set_gauge
 
 # Logger
 logger = logging.getLogger(__name__)
@@ -19,6 +21,112 @@ logger = logging.getLogger(__name__)
 # Diretório de modelos
 MODELS_DIR = os.environ.get("MODELS_DIR", "models_repository")
 
+# Aquecimento dos modelos na inicialização
+WARMUP_ON_STARTUP = os.environ.get("WARMUP_ON_STARTUP", "true").lower() == "true"
+WARMUP_CONTEXT = os.environ.get("WARMUP_CONTEXT", "tensorflow")
+WARMUP_WORKERS = int(os.environ.get("WARMUP_WORKERS", 4))
+
+# Configurações do TensorFlow
+TF_COMPILE_INFERENCE = os.environ.get("TF_COMPILE_INFERENCE", "false").lower() == "true"
+TF_JIT_COMPILE = os.environ.get("TF_JIT_COMPILE", "false").lower() == "true"
+TF_BATCH_BUCKETS = [
+    int(size) for size in os.environ.get("TF_BATCH_BUCKETS", "1,2,4,8,16,32").split(",") if size.strip()
+]
+
+# Configurações do ONNX Runtime
+ONNX_INTRA_OP_THREADS = int(os.environ.get("ONNX_INTRA_OP_THREADS", 0))
+ONNX_INTER_OP_THREADS = int(os.environ.get("ONNX_INTER_OP_THREADS", 0))
+ONNX_GRAPH_OPTIMIZATION = os.environ.get("ONNX_GRAPH_OPTIMIZATION", "all")
+ONNX_OPTIMIZED_MODELS_DIR = os.environ.get("ONNX_OPTIMIZED_MODELS_DIR", os.path.join(MODELS_DIR, ".onnx_optimized"))
+ONNX_IO_BINDING = os.environ.get("ONNX_IO_BINDING", "false").lower() == "true"
+
+# Configurações do TFLite
+TFLITE_NUM_THREADS = int(os.environ.get("TFLITE_NUM_THREADS", 0)) or None
+
+# Configurações do PyTorch
+TORCH_COMPILE_MODE = os.environ.get("TORCH_COMPILE_MODE") or None
+TORCH_CHANNELS_LAST = os.environ.get("TORCH_CHANNELS_LAST", "false").lower() == "true"
+TORCH_NUM_THREADS = int(os.environ.get("TORCH_NUM_THREADS", 0)) or None
+TORCH_CACHE_DIR = os.environ.get("TORCH_CACHE_DIR", os.path.join(MODELS_DIR, ".torch_compiled"))
+# 'nhwc' permuta as entradas 4D (saída NHWC do pré-processamento) para NCHW;
+# vazio mantém as entradas como estão, para modelos que já recebem NCHW
+TORCH_INPUT_LAYOUT = os.environ.get("TORCH_INPUT_LAYOUT") or None
+
+# Conversão dos modelos Keras no primeiro carregamento ('onnx', 'tflite' ou vazio)
+MODEL_CONVERSION_TARGET = os.environ.get("MODEL_CONVERSION_TARGET") or None
+
+# Recortes classificados por chamada nos modelos em cascata
+CASCADE_CROP_BATCH_SIZE = int(os.environ.get("CASCADE_CROP_BATCH_SIZE", 32))
+
+# Estado de prontidão do serviço, exposto em /health/ready
+_readiness_lock = threading.Lock()
+_readiness: Dict[str, Any] = {
+    "status": "starting",
+    "models": {}
+}
+
+
+def _set_readiness(status: Optional[str] = None, model_key: Optional[str] = None,
+                   model_state: Optional[Dict[str, Any]] = None) -> None:
+    """Atualiza o estado de prontidão de forma segura entre threads."""
+    with _readiness_lock:
+        if status is not None:
+            _readiness["status"] = status
+        if model_key is not None:
+            _readiness["models"][model_key] = model_state
+
+
+def get_readiness() -> Dict[str, Any]:
+    """
+    Retorna uma cópia do estado de prontidão do serviço.
+    
+    Returns:
+        Dicionário com o status geral e o estado de cada modelo
+    """
+    with _readiness_lock:
+        return {
+            "status": _readiness["status"],
+            "models": {key: dict(state) for key, state in _readiness["models"].items()}
+        }
+
+
+def _create_tensorflow_context(gpu_enabled: bool):
+    from .core.context import TensorFlowContext
+    return TensorFlowContext(
+        gpu_enabled=gpu_enabled,
+        compile_inference=TF_COMPILE_INFERENCE,
+        jit_compile=TF_JIT_COMPILE,
+        batch_buckets=TF_BATCH_BUCKETS
+    )
+
+
+def _create_onnx_context(variant: Optional[str] = None):
+    from .core.context import ONNXContext
+    return ONNXContext(
+        intra_op_num_threads=ONNX_INTRA_OP_THREADS,
+        inter_op_num_threads=ONNX_INTER_OP_THREADS,
+        graph_optimization_level=ONNX_GRAPH_OPTIMIZATION,
+        optimized_model_dir=ONNX_OPTIMIZED_MODELS_DIR or None,
+        use_io_binding=ONNX_IO_BINDING,
+        variant=variant
+    )
+
+
+def _create_tflite_context(variant: Optional[str] = None):
+    from .core.context import TFLiteContext
+    return TFLiteContext(num_threads=TFLITE_NUM_THREADS, variant=variant)
+
+
+def _create_pytorch_context():
+    from .core.context import PyTorchContext
+    return PyTorchContext(
+        compile_mode=TORCH_COMPILE_MODE,
+        channels_last=TORCH_CHANNELS_LAST,
+        num_threads=TORCH_NUM_THREADS,
+        cache_dir=TORCH_CACHE_DIR or None,
+        input_layout=TORCH_INPUT_LAYOUT
+    )
+
 
 def setup_models():
     """
@@ -32,23 +140,23 @@ def setup_models():
     # Obter instância do registry
     registry = ModelRegistry()
     
-    # Registrar contextos de execução
-    registry.register_context("tensorflow", TensorFlowContext(gpu_enabled=True))
-    registry.register_context("tensorflow_cpu", TensorFlowContext(gpu_enabled=False))
+    # Registrar contextos de execução. Os frameworks só são importados quando
+    # o contexto é usado pela primeira vez
+    registry.register_context_factory("tensorflow", lambda: _create_tensorflow_context(True))
+    registry.register_context_factory("tensorflow_cpu", lambda: _create_tensorflow_context(False))
     
-    try:
-        # Tenta registrar contexto ONNX se disponível
-        registry.register_context("onnx", ONNXContext())
-        logger.info("Contexto ONNX registrado com sucesso")
-    except ImportError:
-        logger.warning("ONNX Runtime não disponível, contexto ONNX não registrado")
+    # ONNX Runtime e PyTorch são opcionais: o ImportError surge no primeiro uso
+    # e o registry deixa de anunciar o contexto
+    registry.register_context_factory("onnx", _create_onnx_context)
+    registry.register_context_factory("tflite", _create_tflite_context)
+    registry.register_context_factory("pytorch", _create_pytorch_context)
     
-    try:
-        # Tenta registrar contexto PyTorch se disponível
-        registry.register_context("pytorch", PyTorchContext())
-        logger.info("Contexto PyTorch registrado com sucesso")
-    except ImportError:
-        logger.warning("PyTorch não disponível, contexto PyTorch não registrado")
+    # Variantes quantizadas geradas por scripts/quantize_model.py; o nome do
+    # contexto é o nome da variante no manifesto do modelo
+    for variant in ("onnx_int8", "onnx_float16"):
+        registry.register_context_factory(variant, lambda variant=variant: _create_onnx_context(variant))
+    for variant in ("tflite_int8", "tflite_float16"):
+        registry.register_context_factory(variant, lambda variant=variant: _create_tflite_context(variant))
     
     # Registrar modelos genéricos para diferentes tarefas
     _register_sample_models(registry)
@@ -64,6 +172,9 @@ def _register_sample_models(registry):
     Em um ambiente de produção, esta função carregaria modelos reais de um
     repositório ou serviço de armazenamento.
     """
+    from .models.generic.generic_model import GenericModel
+    from .models.generic.cascade_model import CascadeModel
+    
     # Modelo genérico para classificação de imagens
     generic_classifier = GenericModel(
         model_id="generic_classifier",
@@ -80,10 +191,12 @@ def _register_sample_models(registry):
         postprocessing_config={
             "top_k": 5
         },
+        conversion_target=MODEL_CONVERSION_TARGET,
         metadata={
             "description": "Modelo genérico para classificação de imagens baseado em MobileNetV2",
             "class_labels": ["class1", "class2", "class3"],  # Exemplo simplificado
-            "input_type": "image"
+            "input_type": "image",
+            "batch_prediction": True
         }
     )
     registry.register_model(generic_classifier)
@@ -125,10 +238,12 @@ def _register_sample_models(registry):
             "normalize": True
         },
         postprocessing_config={},
+        conversion_target=MODEL_CONVERSION_TARGET,
         metadata={
             "description": "Modelo genérico para segmentação semântica baseado em DeepLabV3",
             "class_labels": ["background", "person", "car"],  # Exemplo simplificado
-            "input_type": "image"
+            "input_type": "image",
+            "batch_prediction": True
         }
     )
     registry.register_model(generic_segmenter)
@@ -159,6 +274,149 @@ def _register_sample_models(registry):
         }
     )
     registry.register_model(generic_video_analyzer)
+    
+    # Modelo genérico para extração de embeddings (busca por similaridade)
+    generic_embedder = GenericModel(
+        model_id="generic_embedder",
+        version="1.0.0",
+        model_path=os.path.join(MODELS_DIR, "mobilenet_v2"),
+        task_type="embedding",
+        input_shape=[None, 224, 224, 3],
+        preprocessing_config={
+            "target_size": [224, 224],
+            "normalize": True,
+            "mean": [0.485, 0.456, 0.406],
+            "std": [0.229, 0.224, 0.225]
+        },
+        postprocessing_config={
+            "embedding_layer": "global_average_pooling2d",
+            "normalize": True
+        },
+        metadata={
+            "description": "Embeddings de imagens extraídos da penúltima camada do MobileNetV2",
+            "input_type": "image",
+            "batch_prediction": True
+        }
+    )
+    registry.register_model(generic_embedder)
+    
+    # Cascata: cada objeto detectado é classificado em lote pelo classificador
+    detect_and_classify = CascadeModel(
+        model_id="generic_detect_classify",
+        version="1.0.0",
+        detector=generic_detector,
+        classifier=generic_classifier,
+        crop_batch_size=CASCADE_CROP_BATCH_SIZE,
+        metadata={
+            "description": "Detecção de objetos seguida da classificação de cada objeto detectado"
+        }
+    )
+    registry.register_model(detect_and_classify)
+
+
+def _warmup_model(registry: ModelRegistry, model_id: str, version: str, context_name: str) -> Dict[str, Any]:
+    """
+    Carrega um modelo e executa uma inferência de aquecimento.
+    
+    Args:
+        registry: Registro de modelos
+        model_id: ID do modelo
+        version: Versão do modelo
+        context_name: Nome do contexto de execução
+        
+    Returns:
+        Estado final do modelo
+    """
+    start_time = time.time()
+    model = registry.get_model(model_id, version)
+    
+    try:
+        context = registry.get_context(context_name)
+        if context is None:
+            raise ValueError(f"Contexto não encontrado: {context_name}")
+        
+        loaded_context = getattr(model, '_source_context', getattr(model, '_context', None))
+        already_loaded = getattr(model, 'is_loaded', False) and loaded_context is context
+        if hasattr(model, 'model_path') and hasattr(model, 'load') and not already_loaded:
+            model.load(context)
+        
+        # A primeira inferência inicializa kernels e alocações do framework
+        if hasattr(model, 'warmup'):
+            model.warmup()
+        
+        duration = time.time() - start_time
+        observe_histogram("model_warmup_duration_seconds", duration, {"model_id": model_id})
+        logger.info(f"Modelo aquecido: {model_id}@{version} ({duration:.2f}s)")
+        return {"status": "ready", "context": context_name, "duration": duration}
+    
+    except Exception as e:
+        logger.warning(f"Falha ao aquecer modelo {model_id}@{version}: {str(e)}")
+        return {"status": "failed", "context": context_name, "error": str(e)}
+
+
+def warmup_models(context_name: str = WARMUP_CONTEXT, max_workers: int = WARMUP_WORKERS) -> Dict[str, Any]:
+    """
+    Carrega e aquece todos os modelos registrados em paralelo.
+    
+    Falhas de modelos individuais são registradas no estado de prontidão sem
+    impedir o aquecimento dos demais.
+    
+    Args:
+        context_name: Nome do contexto usado no aquecimento
+        max_workers: Número máximo de modelos aquecidos simultaneamente
+        
+    Returns:
+        Estado de prontidão após o aquecimento
+    """
+    registry = ModelRegistry()
+    models = registry.list_available_models()
+    
+    for info in models:
+        _set_readiness(model_key=f"{info['id']}@{info['version']}", model_state={"status": "loading"})
+    
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {
+            f"{info['id']}@{info['version']}": executor.submit(
+                _warmup_model, registry, info['id'], info['version'], context_name
+            )
+            for info in models
+        }
+        for model_key, future in futures.items():
+            _set_readiness(model_key=model_key, model_state=future.result())
+    
+    ready_count = sum(
+        1 for state in get_readiness()["models"].values() if state["status"] == "ready"
+    )
+    set_gauge("models_ready", ready_count)
+    
+    return get_readiness()
+
+
+async def initialize_service(warmup: bool = WARMUP_ON_STARTUP) -> None:
+    """
+    Registra os modelos e os aquece fora do loop de eventos.
+    
+    Executada como tarefa em segundo plano na inicialização, permitindo que
+    /health responda imediatamente enquanto /health/ready indica o progresso.
+    
+    Args:
+        warmup: Se True, carrega e aquece os modelos após o registro
+    """
+    loop = asyncio.get_running_loop()
+    
+    try:
+        await loop.run_in_executor(None, setup_models)
+        
+        if warmup:
+            _set_readiness(status="warming_up")
+            await loop.run_in_executor(None, warmup_models)
+        
+        _set_readiness(status="ready")
+        logger.info("Serviço pronto para receber requisições")
+    
+    except Exception as e:
+        _set_readiness(status="failed")
+        logger.error(f"Falha na inicialização do serviço: {str(e)}", exc_info=True)
 
 
 def setup_health_routes(app: FastAPI):
@@ -188,6 +446,22 @@ def setup_health_routes(app: FastAPI):
             "contexts_count": contexts_count
         }
 
+    @app.get("/health/ready", tags=["health"])
+    async def readiness_check():
+        """
+        Endpoint para verificação de prontidão do serviço.
+        
+        Diferente de /health, que indica apenas que o processo está vivo, este
+        endpoint retorna 503 até que os modelos tenham sido registrados e aquecidos.
+        
+        Returns:
+            Estado de prontidão do serviço e de cada modelo
+        """
+        readiness = get_readiness()
+        status_code = 200 if readiness["status"] == "ready" else 503
+        
+        return JSONResponse(status_code=status_code, content=readiness)
+
     @app.get("/metrics", tags=["monitoring"])
     async def metrics():
         """
@@ -0,0 +1,360 @@
+"""
+Retenção dos arquivos de upload e de resultados.
+
+Um worker em segundo plano percorre periodicamente UPLOAD_DIR, o diretório de
+uploads temporários e RESULTS_DIR, classifica cada arquivo por tipo de
+artefato (uploads, results, errors, exports, archives) e remove os que
+ultrapassaram o TTL do tipo. Se o tipo tiver uma cota de bytes, os arquivos
+mais antigos são removidos até que o total caiba nela. As remoções são feitas
+em lotes com pausa entre eles, para não competir com o I/O das requisições.
+
+Opcionalmente, resultados mais antigos que RETENTION_ARCHIVE_AFTER são
+compactados em pacotes zip em RETENTION_ARCHIVE_DIR e removidos de
+RESULTS_DIR; resultados arquivados deixam de ser servidos pela API.
+"""
+
+import os
+import time
+import asyncio
+import logging
+import threading
+import uuid
+import zipfile
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional
+
+from .metrics import increment_counter, observe_histogram, set_gauge
+from .storage import UPLOAD_DIR, RESULTS_DIR, TEMP_UPLOAD_DIR, ensure_directory
+
+logger = logging.getLogger(__name__)
+
+# Tipos de artefato controlados pela retenção
+ARTIFACT_TYPES = ("uploads", "results", "errors", "exports", "archives")
+
+# Intervalo entre varreduras (segundos, 0 = retenção desativada)
+RETENTION_INTERVAL = float(os.environ.get("RETENTION_INTERVAL", 60 * 60))
+
+# TTL por tipo de artefato (segundos, 0 = sem expiração)
+RETENTION_TTL: Dict[str, float] = {
+    "uploads": float(os.environ.get("RETENTION_UPLOADS_TTL", 24 * 60 * 60)),
+    "results": float(os.environ.get("RETENTION_RESULTS_TTL",
+                                    os.environ.get("CLEANUP_RESULTS_AFTER", 7 * 24 * 60 * 60))),
+    "errors": float(os.environ.get("RETENTION_ERRORS_TTL", 7 * 24 * 60 * 60)),
+    "exports": float(os.environ.get("RETENTION_EXPORTS_TTL", 24 * 60 * 60)),
+    "archives": float(os.environ.get("RETENTION_ARCHIVES_TTL", 30 * 24 * 60 * 60)),
+}
+
+# Cota de bytes por tipo de artefato (0 = sem cota)
+RETENTION_MAX_BYTES: Dict[str, int] = {
+    artifact_type: int(os.environ.get(f"RETENTION_{artifact_type.upper()}_MAX_BYTES", 0))
+    for artifact_type in ARTIFACT_TYPES
+}
+
+# Arquivos removidos por lote e pausa entre lotes (segundos)
+RETENTION_BATCH_SIZE = int(os.environ.get("RETENTION_BATCH_SIZE", 100))
+RETENTION_BATCH_PAUSE = float(os.environ.get("RETENTION_BATCH_PAUSE", 0.05))
+
+# Idade mínima para remoção por cota (segundos), protege arquivos ainda em uso
+RETENTION_MIN_AGE = float(os.environ.get("RETENTION_MIN_AGE", 60))
+
+# Idade a partir da qual resultados são compactados (segundos, 0 = sem compactação)
+RETENTION_ARCHIVE_AFTER = float(os.environ.get("RETENTION_ARCHIVE_AFTER", 0))
+# Diretório dos pacotes compactados (padrão: '<RESULTS_DIR>/archive')
+RETENTION_ARCHIVE_DIR = os.environ.get("RETENTION_ARCHIVE_DIR")
+
+
+class Artifact(NamedTuple):
+    """Arquivo encontrado na varredura."""
+    path: str
+    size: int
+    mtime: float
+
+
+def classify_result_file(name: str) -> Optional[str]:
+    """
+    Classifica um arquivo de RESULTS_DIR pelo nome.
+    
+    Args:
+        name: Nome do arquivo (ex.: '<task>.json', '<task>.error.json', '<task>.csv')
+    
+    Returns:
+        Tipo de artefato ('results', 'errors' ou 'exports'), ou None para
+        arquivos ocultos ou temporários
+    """
+    if name.startswith(".") or name.endswith(".tmp"):
+        return None
+    if name.endswith(".error.json"):
+        return "errors"
+    if name.endswith(".json"):
+        return "results"
+    return "exports"
+
+
+def _scan_directory(directory: str) -> List[os.DirEntry]:
+    """Arquivos regulares de um diretório (não recursivo)."""
+    try:
+        with os.scandir(directory) as entries:
+            return [entry for entry in entries if entry.is_file(follow_symlinks=False)]
+    except FileNotFoundError:
+        return []
+
+
+def _artifact(entry: os.DirEntry) -> Optional[Artifact]:
+    """Tamanho e data de modificação de um arquivo, ou None se já foi removido."""
+    try:
+        stat = entry.stat(follow_symlinks=False)
+    except FileNotFoundError:
+        return None
+    return Artifact(entry.path, stat.st_size, stat.st_mtime)
+
+
+class RetentionWorker:
+    """
+    Aplica TTLs, cotas e compactação aos diretórios de upload e resultados.
+    
+    As varreduras são síncronas (run_once) e, no serviço, executadas em uma
+    thread pelo laço iniciado com start().
+    """
+    
+    def __init__(self,
+                 upload_dirs: Optional[List[str]] = None,
+                 results_dir: str = RESULTS_DIR,
+                 archive_dir: Optional[str] = None,
+                 ttl: Optional[Dict[str, float]] = None,
+                 max_bytes: Optional[Dict[str, int]] = None,
+                 interval: float = RETENTION_INTERVAL,
+                 batch_size: int = RETENTION_BATCH_SIZE,
+                 batch_pause: float = RETENTION_BATCH_PAUSE,
+                 min_age: float = RETENTION_MIN_AGE,
+                 archive_after: float = RETENTION_ARCHIVE_AFTER):
+        """
+        Inicializa o worker.
+        
+        Args:
+            upload_dirs: Diretórios de uploads (None = UPLOAD_DIR e uploads temporários)
+            results_dir: Diretório de resultados
+            archive_dir: Diretório dos pacotes compactados (None = RETENTION_ARCHIVE_DIR
+                ou '<results_dir>/archive')
+            ttl: TTL por tipo de artefato em segundos (tipos ausentes usam RETENTION_TTL)
+            max_bytes: Cota por tipo de artefato (tipos ausentes usam RETENTION_MAX_BYTES)
+            interval: Intervalo entre varreduras (segundos)
+            batch_size: Arquivos removidos por lote
+            batch_pause: Pausa entre lotes (segundos)
+            min_age: Idade mínima para remoção por cota (segundos)
+            archive_after: Idade a partir da qual resultados são compactados
+                (segundos, 0 = sem compactação)
+        """
+        self.upload_dirs = upload_dirs if upload_dirs is not None else [UPLOAD_DIR, TEMP_UPLOAD_DIR]
+        self.results_dir = results_dir
+        self.archive_dir = archive_dir or RETENTION_ARCHIVE_DIR or os.path.join(results_dir, "archive")
+        self.ttl = {**RETENTION_TTL, **(ttl or {})}
+        self.max_bytes = {**RETENTION_MAX_BYTES, **(max_bytes or {})}
+        self.interval = interval
+        self.batch_size = max(1, batch_size)
+        self.batch_pause = batch_pause
+        self.min_age = min_age
+        self.archive_after = archive_after
+        
+        self._stopping = threading.Event()
+        self._task: Optional[asyncio.Task] = None
+    
+    def scan(self) -> Dict[str, List[Artifact]]:
+        """
+        Lista os arquivos de cada tipo de artefato.
+        
+        Returns:
+            Dicionário tipo -> arquivos
+        """
+        artifacts: Dict[str, List[Artifact]] = {artifact_type: [] for artifact_type in ARTIFACT_TYPES}
+        
+        for directory in dict.fromkeys(self.upload_dirs):
+            for entry in _scan_directory(directory):
+                artifact = _artifact(entry)
+                if artifact and not entry.name.endswith(".tmp"):
+                    artifacts["uploads"].append(artifact)
+        
+        for entry in _scan_directory(self.results_dir):
+            artifact_type = classify_result_file(entry.name)
+            artifact = _artifact(entry) if artifact_type else None
+            if artifact:
+                artifacts[artifact_type].append(artifact)
+        
+        for entry in _scan_directory(self.archive_dir):
+            artifact = _artifact(entry)
+            if artifact and entry.name.endswith(".zip"):
+                artifacts["archives"].append(artifact)
+        
+        return artifacts
+    
+    def run_once(self) -> Dict[str, Dict[str, int]]:
+        """
+        Executa uma varredura: compactação, expiração por TTL e cotas.
+        
+        Returns:
+            Dicionário tipo -> {'deleted_files', 'reclaimed_bytes', 'stored_bytes'}
+        """
+        start = time.time()
+        artifacts = self.scan()
+        stats = {
+            artifact_type: {"deleted_files": 0, "reclaimed_bytes": 0, "stored_bytes": 0}
+            for artifact_type in ARTIFACT_TYPES
+        }
+        
+        if self.archive_after > 0:
+            self._archive_results(artifacts, stats, start)
+        
+        for artifact_type in ARTIFACT_TYPES:
+            if self._stopping.is_set():
+                break
+            
+            victims, kept = self._select_victims(artifact_type, artifacts[artifact_type], start)
+            deleted_files, reclaimed_bytes = self._delete(victims)
+            
+            stats[artifact_type]["deleted_files"] += deleted_files
+            stats[artifact_type]["reclaimed_bytes"] += reclaimed_bytes
+            stats[artifact_type]["stored_bytes"] = sum(artifact.size for artifact in kept)
+            
+            labels = {"artifact": artifact_type, "action": "delete"}
+            increment_counter("retention_deleted_files", deleted_files, labels=labels)
+            increment_counter("retention_reclaimed_bytes", reclaimed_bytes, labels=labels)
+            set_gauge("retention_stored_bytes", stats[artifact_type]["stored_bytes"],
+                      labels={"artifact": artifact_type})
+        
+        observe_histogram("retention_run_time", time.time() - start)
+        
+        deleted = sum(item["deleted_files"] for item in stats.values())
+        if deleted:
+            logger.info(
+                f"Retenção removeu {deleted} arquivos "
+                f"({sum(item['reclaimed_bytes'] for item in stats.values())} bytes)"
+            )
+        
+        return stats
+    
+    def _select_victims(self, artifact_type: str, files: List[Artifact], now: float):
+        """Separa os arquivos expirados ou acima da cota dos mantidos."""
+        ttl = self.ttl.get(artifact_type, 0)
+        if ttl > 0:
+            victims = [artifact for artifact in files if artifact.mtime < now - ttl]
+            kept = [artifact for artifact in files if artifact.mtime >= now - ttl]
+        else:
+            victims, kept = [], list(files)
+        
+        max_bytes = self.max_bytes.get(artifact_type, 0)
+        total = sum(artifact.size for artifact in kept)
+        if max_bytes > 0 and total > max_bytes:
+            # Remover os mais antigos primeiro, preservando arquivos recentes
+            kept.sort(key=lambda artifact: artifact.mtime)
+            evicted = 0
+            while evicted < len(kept) and total > max_bytes and kept[evicted].mtime < now - self.min_age:
+                total -= kept[evicted].size
+                evicted += 1
+            victims.extend(kept[:evicted])
+            kept = kept[evicted:]
+        
+        return victims, kept
+    
+    def _delete(self, victims: List[Artifact]):
+        """Remove arquivos em lotes, com pausa entre eles."""
+        deleted_files = 0
+        reclaimed_bytes = 0
+        
+        for i in range(0, len(victims), self.batch_size):
+            if i and self._stopping.wait(self.batch_pause):
+                break
+            for artifact in victims[i:i + self.batch_size]:
+                try:
+                    os.remove(artifact.path)
+                except FileNotFoundError:
+                    continue
+                except OSError as e:
+                    logger.warning(f"Falha ao remover {artifact.path}: {e}")
+                    continue
+                deleted_files += 1
+                reclaimed_bytes += artifact.size
+        
+        return deleted_files, reclaimed_bytes
+    
+    def _archive_results(self, artifacts: Dict[str, List[Artifact]], stats: Dict[str, Dict[str, int]],
+                         now: float) -> None:
+        """Compacta resultados antigos (ainda dentro do TTL) em um pacote zip."""
+        ttl = self.ttl.get("results", 0)
+        candidates = [
+            artifact for artifact in artifacts["results"]
+            if artifact.mtime < now - self.archive_after and (ttl <= 0 or artifact.mtime >= now - ttl)
+        ]
+        if not candidates:
+            return
+        
+        ensure_directory(self.archive_dir)
+        # Cada processo executa a própria retenção: o sufixo único impede que
+        # pacotes gravados no mesmo segundo se sobrescrevam
+        name = f"results-{datetime.fromtimestamp(now).strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:12]}.zip"
+        bundle_path = os.path.join(self.archive_dir, name)
+        temp_path = f"{bundle_path}.{os.getpid()}.tmp"
+        
+        archived: List[Artifact] = []
+        try:
+            with zipfile.ZipFile(temp_path, "w", compression=zipfile.ZIP_DEFLATED) as bundle:
+                for i in range(0, len(candidates), self.batch_size):
+                    if i and self._stopping.wait(self.batch_pause):
+                        break
+                    for artifact in candidates[i:i + self.batch_size]:
+                        try:
+                            bundle.write(artifact.path, os.path.basename(artifact.path))
+                        except FileNotFoundError:
+                            continue
+                        archived.append(artifact)
+            os.replace(temp_path, bundle_path)
+        except OSError as e:
+            logger.warning(f"Falha ao compactar resultados em {bundle_path}: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return
+        
+        # Os originais só são removidos depois que o pacote foi gravado
+        deleted_files, original_bytes = self._delete(archived)
+        bundle_size = os.path.getsize(bundle_path)
+        reclaimed_bytes = max(0, original_bytes - bundle_size)
+        
+        archived_paths = {artifact.path for artifact in archived}
+        artifacts["results"] = [artifact for artifact in artifacts["results"] if artifact.path not in archived_paths]
+        artifacts["archives"].append(Artifact(bundle_path, bundle_size, now))
+        
+        stats["results"]["deleted_files"] += deleted_files
+        stats["results"]["reclaimed_bytes"] += reclaimed_bytes
+        
+        labels = {"artifact": "results", "action": "archive"}
+        increment_counter("retention_deleted_files", deleted_files, labels=labels)
+        increment_counter("retention_reclaimed_bytes", reclaimed_bytes, labels=labels)
+        
+        logger.info(f"Retenção compactou {deleted_files} resultados em {bundle_path}")
+    
+    async def _run(self) -> None:
+        """Laço de varreduras periódicas."""
+        loop = asyncio.get_running_loop()
+        while not self._stopping.is_set():
+            try:
+                await loop.run_in_executor(None, self.run_once)
+            except Exception as e:
+                logger.error(f"Erro na varredura de retenção: {e}", exc_info=True)
+            await asyncio.sleep(self.interval)
+    
+    def start(self) -> None:
+        """Inicia as varreduras periódicas no loop de eventos atual (intervalo 0 = desativado)."""
+        if self.interval <= 0 or self._task is not None:
+            return
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        """Interrompe as varreduras; uma varredura em andamento para após o lote atual."""
+        if self._task is None:
+            return
+        self._stopping.set()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
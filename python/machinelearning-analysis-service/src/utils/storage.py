@@ -1,13 +1,20 @@
 import os
+import json
 import uuid
 from pathlib import Path
 import aiofiles
 from fastapi import UploadFile
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 # Diretórios padrão
 UPLOAD_DIR = os.environ.get("UPLOAD_DIR", "uploads")
 RESULTS_DIR = os.environ.get("RESULTS_DIR", "results")
+TEMP_UPLOAD_DIR = os.path.join(os.environ.get("TEMP_DIR", "/tmp"), "ml_analysis_uploads")
+
+# Diretórios dos quais arquivos do servidor podem ser analisados (separados por vírgula)
+ALLOWED_INPUT_DIRS = [
+    directory for directory in os.environ.get("ALLOWED_INPUT_DIRS", UPLOAD_DIR).split(",") if directory
+]
 
 
 def ensure_directory(directory: str) -> None:
@@ -36,7 +43,7 @@ async def save_uploaded_file(file: UploadFile, permanent: bool = False) -> str:
         directory = UPLOAD_DIR
     else:
         # Usar diretório temporário do sistema
-        directory = os.path.join(os.environ.get("TEMP_DIR", "/tmp"), "ml_analysis_uploads")
+        directory = TEMP_UPLOAD_DIR
     
     # Garantir que o diretório existe
     ensure_directory(directory)
@@ -60,6 +67,27 @@ async def save_uploaded_file(file: UploadFile, permanent: bool = False) -> str:
     return save_path
 
 
+def resolve_input_path(path: str, allowed_dirs: Optional[List[str]] = None) -> Optional[str]:
+    """
+    Resolve o caminho de um arquivo do servidor, restrito aos diretórios permitidos.
+    
+    Args:
+        path: Caminho informado pelo cliente
+        allowed_dirs: Diretórios permitidos (None = ALLOWED_INPUT_DIRS)
+        
+    Returns:
+        Caminho absoluto resolvido, ou None se estiver fora dos diretórios permitidos
+    """
+    real_path = os.path.realpath(path)
+    
+    for directory in allowed_dirs if allowed_dirs is not None else ALLOWED_INPUT_DIRS:
+        real_directory = os.path.realpath(directory)
+        if os.path.commonpath([real_path, real_directory]) == real_directory:
+            return real_path
+    
+    return None
+
+
 def get_result_path(task_id: str, extension: str = "json") -> str:
     """
     Obtém o caminho para um arquivo de resultado.
@@ -81,6 +109,34 @@ def get_result_path(task_id: str, extension: str = "json") -> str:
     return os.path.join(RESULTS_DIR, f"{task_id}.{extension}")
 
 
+def save_result_json(task_id: str, data: Dict[str, Any], extension: str = "json") -> str:
+    """
+    Grava um resultado JSON de forma atômica.
+    
+    O conteúdo é gravado em um arquivo temporário (.tmp, ignorado pelas
+    listagens do diretório) e movido para o destino, de modo que outros
+    processos nunca leiam um resultado gravado pela metade.
+    
+    Args:
+        task_id: ID da tarefa
+        data: Conteúdo do resultado
+        extension: Extensão do arquivo ('json' ou 'error.json')
+        
+    Returns:
+        Caminho do arquivo gravado
+    """
+    result_path = get_result_path(task_id, extension)
+    temp_path = f"{result_path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, result_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return result_path
+
+
 def list_results(task_id: Optional[str] = None) -> Dict[str, Any]:
     """
     Lista arquivos de resultados disponíveis.
@@ -99,6 +155,10 @@ def list_results(task_id: Optional[str] = None) -> Dict[str, Any]:
     files = os.listdir(RESULTS_DIR)
     
     for file in files:
+        # Ignorar subdiretórios (ex.: pacotes compactados pela retenção)
+        if not os.path.isfile(os.path.join(RESULTS_DIR, file)):
+            continue
+        
         # Extrair task_id da parte inicial do nome do arquivo
         if "." in file:
             file_task_id, extension = file.split(".", 1)
@@ -0,0 +1,80 @@
+"""
+Testes para o controle de admissão das análises.
+"""
+
+import time
+import asyncio
+import pytest
+
+from src.core.admission import AdmissionController, AdmissionRejected
+
+
+class TestAdmissionController:
+    """Testes para os limites por modelo, a fila e o prazo."""
+    
+    def test_in_flight_limit_and_queue_bound(self):
+        """Testa que o excedente aguarda na fila e que a fila cheia é rejeitada."""
+        controller = AdmissionController(max_in_flight=1, max_queue=1)
+        running = []
+        
+        async def analysis(name, duration):
+            async with controller.admit("model@1"):
+                running.append(name)
+                assert controller.stats()["model@1"]["in_flight"] == 1
+                await asyncio.sleep(duration)
+        
+        async def scenario():
+            first = asyncio.create_task(analysis("first", 0.05))
+            await asyncio.sleep(0)
+            second = asyncio.create_task(analysis("second", 0.0))
+            await asyncio.sleep(0)
+            
+            # Uma análise em execução e uma na fila: a terceira é descartada
+            with pytest.raises(AdmissionRejected) as exc_info:
+                await analysis("third", 0.0)
+            assert exc_info.value.status_code == 503
+            assert exc_info.value.reason == "queue_full"
+            
+            await asyncio.gather(first, second)
+        
+        asyncio.run(scenario())
+        
+        assert running == ["first", "second"]
+        stats = controller.stats()["model@1"]
+        assert stats["in_flight"] == 0 and stats["queued"] == 0
+        assert stats["latency_ewma"] is not None
+    
+    def test_deadline_and_disconnect(self):
+        """Testa a rejeição por prazo e o descarte de clientes desconectados."""
+        controller = AdmissionController(max_in_flight=1, max_queue=10)
+        
+        async def disconnected():
+            return True
+        
+        async def scenario():
+            # Registrar a duração média do modelo (cerca de 0.2s)
+            async with controller.admit("model@1"):
+                await asyncio.sleep(0.2)
+            
+            async with controller.admit("model@1"):
+                # Espera estimada maior que o prazo: rejeitado na chegada
+                with pytest.raises(AdmissionRejected) as exc_info:
+                    async with controller.admit("model@1", deadline=time.monotonic() + 0.05):
+                        pass
+                assert exc_info.value.status_code == 429
+                
+                # Cliente desconectado enquanto aguarda na fila
+                with pytest.raises(AdmissionRejected) as exc_info:
+                    async with controller.admit("model@1", is_disconnected=disconnected):
+                        pass
+                assert exc_info.value.reason == "client_disconnected"
+            
+            # A vaga foi devolvida mesmo após as rejeições
+            async with controller.admit("model@1"):
+                pass
+        
+        asyncio.run(scenario())
+        
+        assert controller.stats()["model@1"]["queued"] == 0
+        assert controller.parse_deadline(None) is None
+        assert controller.parse_deadline("1500") > time.monotonic()
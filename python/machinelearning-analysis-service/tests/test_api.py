@@ -21,8 +21,15 @@ class TestAPI:
     
     @patch("src.api.routes.analyze.save_uploaded_file")
     @patch("src.api.routes.analyze.registry")
-    def test_analyze_endpoint(self, mock_registry, mock_save, test_client, tmp_path):
+    def test_analyze_endpoint(self, mock_registry, mock_save, test_client, tmp_path, monkeypatch):
         """Testa o endpoint de análise síncrona."""
+        from src.core.tasks import TaskIndex
+        
+        # Índice sem relistagens: o resultado precisa ser registrado pela rota
+        task_index = TaskIndex(results_dir=str(tmp_path / "empty"), rescan_interval=3600, max_age=3600)
+        task_index.refresh()
+        monkeypatch.setattr("src.core.tasks._task_index", task_index)
+        
         # Mock para save_uploaded_file
         test_file_path = str(tmp_path / "test_image.jpg")
         mock_save.return_value = test_file_path
@@ -49,6 +56,8 @@ class TestAPI:
         assert "task_id" in response.json()
         assert response.json()["status"] == "completed"
         assert "test_result" in response.json()["results"]
+        task_id = response.json()["task_id"]
+        assert task_index.lookup([task_id]) == {task_id: {"json"}}
         
         # Verificar que o modelo correto foi usado
         mock_registry.create_model_context.assert_called_once_with(
@@ -80,6 +89,71 @@ class TestAPI:
         assert "task_id" in response.json()
         assert response.json()["status"] == "processing"
     
+    @patch("src.api.routes.analyze.registry")
+    def test_analyze_batch_endpoint(self, mock_registry, test_client):
+        """Testa o endpoint de análise em lote com resultados em NDJSON."""
+        # Mock para ModelContext
+        mock_model_context = MagicMock()
+        mock_model_context.model.model_id = "test_model"
+        mock_model_context.analyze_batch.return_value = iter([
+            (0, {"test_result": "success"}),
+            (1, {"error": "Imagem inválida"})
+        ])
+        mock_registry.create_model_context.return_value = mock_model_context
+        
+        # Executar requisição com dois arquivos
+        response = test_client.post(
+            "/api/analyze/batch",
+            files=[
+                ("files", ("a.jpg", b"image a", "image/jpeg")),
+                ("files", ("b.jpg", b"image b", "image/jpeg"))
+            ],
+            params={"model_id": "test_model"}
+        )
+        
+        # Verificar resultado
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        
+        assert len(lines) == 3
+        assert lines[0]["status"] == "completed"
+        assert lines[0]["file_name"] == "a.jpg"
+        assert lines[1]["status"] == "failed"
+        assert lines[2]["type"] == "summary"
+        assert lines[2]["completed_items"] == 1
+        assert lines[2]["failed_items"] == 1
+        
+        # As entradas são passadas em memória, na ordem da requisição
+        mock_model_context.analyze_batch.assert_called_once_with([b"image a", b"image b"])
+    
+    def test_analyze_batch_paths_rejects_outside_paths(self, test_client):
+        """Testa que caminhos fora dos diretórios permitidos são rejeitados."""
+        response = test_client.post(
+            "/api/analyze/batch/paths",
+            json={"model_id": "test_model", "file_paths": ["/etc/passwd"]}
+        )
+        
+        assert response.status_code == 400
+    
+    @pytest.mark.parametrize("fields", [
+        {"preprocessing_params": {"batch_size": 100000}},
+        {"preprocessing_params": {"target_size": [100000, 100000]}},
+        {"preprocessing_params": {"std": [0.2, 0, 0.2]}},
+        {"postprocessing_params": {"top_k": -1}},
+        {"export_format": "csv"}
+    ])
+    @patch("src.api.routes.analyze.registry")
+    def test_analyze_batch_paths_rejects_params(self, mock_registry, fields, test_client):
+        """Testa que parâmetros não permitidos ou fora dos limites são rejeitados antes do modelo."""
+        response = test_client.post(
+            "/api/analyze/batch/paths",
+            json={"model_id": "test_model", "file_paths": ["uploads/image.jpg"], **fields}
+        )
+        
+        assert response.status_code == 400
+        mock_registry.create_model_context.assert_not_called()
+    
     @patch("src.api.routes.models.registry")
     def test_list_models(self, mock_registry, test_client):
         """Testa o endpoint para listar modelos."""
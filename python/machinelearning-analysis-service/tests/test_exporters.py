@@ -0,0 +1,91 @@
+"""
+Testes para os exportadores de resultados.
+"""
+
+import csv
+import pytest
+
+from src.exporters import get_exporter
+
+
+def _video_result(num_frames=10, detections_per_frame=3):
+    """Gera um resultado de vídeo com detecções em todos os frames."""
+    return {
+        "frames": [
+            {
+                "frame_id": frame_id,
+                "detections": [
+                    {"box": [0.1, 0.2, 0.3, 0.4], "score": 0.5 + i / 10, "class_id": i, "class_name": f"class_{i}"}
+                    for i in range(detections_per_frame)
+                ]
+            }
+            for frame_id in range(num_frames)
+        ],
+        "aggregated": {"total_detections": num_frames * detections_per_frame},
+        "metadata": {"model_id": "detector"}
+    }
+
+
+class TestColumnarExporters:
+    """Testes para os exportadores Parquet e Arrow IPC."""
+    
+    def test_parquet_row_groups(self, tmp_path):
+        """Testa que o Parquet é gravado em grupos de linhas com colunas tipadas."""
+        pa = pytest.importorskip("pyarrow")
+        pq = pytest.importorskip("pyarrow.parquet")
+        exporter = get_exporter("parquet")
+        exporter.batch_size = 8
+        output_path = exporter.export(_video_result(), str(tmp_path / "result.parquet"))
+        
+        parquet_file = pq.ParquetFile(output_path)
+        assert parquet_file.metadata.num_rows == 30
+        assert parquet_file.metadata.num_row_groups == 4
+        
+        table = pq.read_table(output_path, columns=["frame_id", "score"])
+        assert table.column_names == ["frame_id", "score"]
+        assert table.schema.field("score").type == pa.float32()
+        assert table.column("frame_id").to_pylist()[-1] == 9
+        assert b"metadata" in parquet_file.schema_arrow.metadata
+    
+    def test_arrow_stream_classification(self, tmp_path):
+        """Testa a exportação de classificações no formato Arrow IPC."""
+        pa = pytest.importorskip("pyarrow")
+        result = {
+            "predictions": [
+                {"class_id": 3, "class_name": "cat", "confidence": 0.9},
+                {"class_id": 5, "class_name": "dog", "confidence": 0.1}
+            ]
+        }
+        output_path = get_exporter("arrow").export(result, str(tmp_path / "result.arrow"))
+        
+        with pa.ipc.open_stream(output_path) as reader:
+            table = reader.read_all()
+        
+        assert table.column("class_id").to_pylist() == [3, 5]
+        assert table.column("kind").to_pylist() == ["classification"] * 2
+        assert table.column("y1").null_count == 2
+
+
+class TestCsvExporter:
+    """Testes para o exportador CSV."""
+    
+    def test_video_rows(self, tmp_path):
+        """Testa que cada detecção de cada frame vira uma linha com o ID do frame."""
+        output_path = get_exporter("csv").export(_video_result(), str(tmp_path / "result.csv"))
+        
+        with open(output_path, newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        
+        assert len(rows) == 30
+        assert list(rows[0]) == ["box", "score", "class_id", "class_name", "frame_id"]
+        assert rows[-1]["frame_id"] == "9"
+        assert rows[0]["box"] == "[0.1, 0.2, 0.3, 0.4]"
+    
+    def test_generic_result(self, tmp_path):
+        """Testa que resultados sem itens tabulares viram uma única linha."""
+        output_path = get_exporter("csv").export({"metadata": {"model_id": "m"}}, str(tmp_path / "result.csv"))
+        
+        with open(output_path, newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        
+        assert len(rows) == 1
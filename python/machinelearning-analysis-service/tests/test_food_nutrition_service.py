@@ -0,0 +1,73 @@
+"""
+Testes para o serviço de análise nutricional.
+"""
+
+import numpy as np
+import tensorflow as tf
+
+from src.models.food.detection_model import FoodDetectionModel
+from src.models.food.nutrition_service import FoodNutritionService
+
+
+class TestFoodNutritionService:
+    """Testes para a análise de alimentos em lote."""
+    
+    def test_batch_analyze_foods(self, tmp_path):
+        """Testa o lote com inferência agrupada e falha isolada por imagem."""
+        model = FoodDetectionModel(
+            model_path=str(tmp_path / "missing_model"),
+            nutrition_db_path=str(tmp_path / "nutrition.json"),
+            classes_path=str(tmp_path / "classes.json"),
+            batch_size=2
+        )
+        
+        calls = []
+        keras_model = tf.keras.Sequential([
+            tf.keras.Input((224, 224, 3)),
+            tf.keras.layers.GlobalAveragePooling2D(),
+            tf.keras.layers.Dense(5)
+        ])
+        
+        def call_model(inputs, training=False):
+            calls.append(int(inputs.shape[0]))
+            return keras_model(inputs, training=training)
+        
+        model._model = call_model
+        
+        # Imagens já carregadas; a segunda entrada é inválida
+        images = [np.full((32, 32, 3), 40 * i, dtype=np.float32) for i in range(3)]
+        images.insert(1, np.zeros(3, dtype=np.float32))
+        
+        service = FoodNutritionService(model=model)
+        results = service.batch_analyze_foods(images)
+        
+        assert len(results) == 4
+        assert results[1]['status'] == 'error'
+        assert calls == [1, 2]
+        
+        for result in (results[0], results[2], results[3]):
+            assert result['food_name'] == result['top_prediction']['class_name']
+            assert 'nutrition' in result and 'health_impact' in result
+            assert 'nutrition_match' in result
+            assert result['condition']['condition'] == 'fresh'
+    
+    def test_nutrition_match(self, tmp_path):
+        """Testa que a correspondência usada é informada e que classes ausentes ficam sem correspondência."""
+        def create_model(fuzzy_match):
+            return FoodDetectionModel(
+                model_path=str(tmp_path / "missing_model"),
+                nutrition_db_path=str(tmp_path / "nutrition.json"),
+                classes_path=str(tmp_path / "classes.json"),
+                fuzzy_match=fuzzy_match
+            )
+        
+        exact, approximate, missing = create_model(True).get_nutrition_info_batch(["Apple", "banan", "unknown_food"])
+        assert (exact.key, exact.match) == ("apple", "exact")
+        assert (approximate.key, approximate.match) == ("banana", "fuzzy")
+        assert (missing.key, missing.match, missing.calories) == (None, None, 0)
+        
+        assert create_model(False).get_nutrition_info("banan").match is None
+        
+        service = FoodNutritionService(model=create_model(False))
+        assert service._nutrition_fields("apple")['nutrition_match'] == {'key': 'apple', 'match': 'exact'}
+        assert service._nutrition_fields("banan")['nutrition_match'] is None
@@ -126,3 +126,389 @@ class TestGenericModel:
         assert hasattr(model, "video_processor")
         assert hasattr(model, "post_processor")
         assert hasattr(model, "video_post_processor")
+    
+    def test_predict_batched_list(self):
+        """Testa a inferência em lotes de uma lista de imagens."""
+        model = GenericModel(
+            model_id="test_model",
+            version="1.0.0",
+            model_path="test_path",
+            task_type="classification",
+            input_shape=[None, 32, 32, 3],
+            preprocessing_config={"target_size": [32, 32], "batch_size": 2},
+            metadata={"batch_prediction": True}
+        )
+        batch_sizes = []
+        
+        def fake_model(inputs, training=False):
+            batch_sizes.append(int(inputs.shape[0]))
+            return tf.reduce_mean(inputs, axis=[1, 2])
+        
+        model._model = fake_model
+        images = [np.random.randint(0, 256, (40, 40, 3), dtype=np.uint8) for _ in range(5)]
+        
+        outputs = model.predict(model.preprocess(images))
+        
+        assert batch_sizes == [2, 2, 1]
+        assert len(outputs) == 5
+        assert all(output.shape == (1, 3) for output in outputs)
+    
+    def test_analyze_batch_isolates_invalid_items(self):
+        """Testa que um item inválido não impede a análise dos demais itens do lote."""
+        from src.models.base import ModelContext
+        from tests.conftest import MockContext
+        
+        model = GenericModel(
+            model_id="test_model",
+            version="1.0.0",
+            model_path="test_path",
+            task_type="classification",
+            input_shape=[None, 32, 32, 3],
+            preprocessing_config={"target_size": [32, 32], "batch_size": 2},
+            metadata={"class_labels": ["a", "b", "c"], "batch_prediction": True}
+        )
+        model._model = lambda inputs, training=False: tf.nn.softmax(tf.reduce_mean(inputs, axis=[1, 2]))
+        model._is_loaded = True
+        context = MockContext()
+        model._context = context
+        context.run_inference = lambda m, inputs: m(inputs)
+        
+        valid_image = tf.io.encode_jpeg(np.zeros((40, 40, 3), dtype=np.uint8)).numpy()
+        inputs = [valid_image, b"not an image", valid_image]
+        
+        results = dict(ModelContext(model, context).analyze_batch(inputs))
+        
+        assert sorted(results) == [0, 1, 2]
+        assert "error" in results[1]
+        assert results[0]["metadata"]["model_id"] == "test_model"
+        assert results[2]["metadata"]["batch_size"] == 1
+    
+    def test_conversion_lock_released(self, tmp_path, monkeypatch):
+        """Testa que um arquivo de trava deixado por um processo encerrado não bloqueia a conversão."""
+        from src.core import conversion
+        
+        model_path = tmp_path / "classifier.keras"
+        model_path.write_bytes(b"modelo")
+        output_path = conversion.converted_model_path(str(model_path), "tflite")
+        with open(f"{output_path}.lock", "w") as f:
+            f.write("123")
+        
+        def fake_convert(source, destination):
+            with open(destination, "wb") as f:
+                f.write(b"convertido")
+        
+        monkeypatch.setitem(conversion._CONVERTERS, "tflite", fake_convert)
+        assert conversion.convert_model(str(model_path), "tflite", timeout=0) == output_path
+        assert conversion.convert_model(str(model_path), "tflite", timeout=0) == output_path
+    
+    def test_conversion_failures(self, tmp_path, monkeypatch):
+        """Testa que só erros do conversor são marcados e que o marcador expira."""
+        from src.core import conversion
+        
+        model_path = tmp_path / "classifier.keras"
+        model_path.write_bytes(b"modelo")
+        output_path = conversion.converted_model_path(str(model_path), "tflite")
+        errors = [OSError("disco cheio"), ValueError("operação não suportada")]
+        
+        def fake_convert(source, destination):
+            if errors:
+                raise errors.pop(0)
+            with open(destination, "wb") as f:
+                f.write(b"convertido")
+        
+        monkeypatch.setitem(conversion._CONVERTERS, "tflite", fake_convert)
+        
+        # Erro transitório: sem marcador; erro do conversor: marcado e não repetido
+        assert conversion.convert_model(str(model_path), "tflite") is None
+        assert not os.path.exists(f"{output_path}.failed")
+        assert conversion.convert_model(str(model_path), "tflite") is None
+        assert conversion.convert_model(str(model_path), "tflite") is None
+        assert os.path.exists(f"{output_path}.failed")
+        
+        # Marcador expirado: a conversão é tentada de novo; travas de outras versões são mantidas
+        monkeypatch.setattr(conversion, "CONVERSION_FAILURE_TTL", 0)
+        stale_lock = tmp_path / "classifier.converted-0000.tflite.lock"
+        stale_lock.write_text("")
+        (tmp_path / "classifier.converted-0000.tflite").write_bytes(b"antigo")
+        assert conversion.convert_model(str(model_path), "tflite") == output_path
+        assert stale_lock.exists()
+        assert not (tmp_path / "classifier.converted-0000.tflite").exists()
+    
+    def test_load_converted_model(self, mock_registry, tmp_path):
+        """Testa que o modelo é convertido uma vez e executado pelo contexto do formato convertido."""
+        from src.core.context import TFLiteContext
+        from src.core.conversion import converted_model_path
+        from src.models.base import ModelContext
+        
+        keras_model = tf.keras.Sequential([
+            tf.keras.Input((16, 16, 3)),
+            tf.keras.layers.GlobalAveragePooling2D(),
+            tf.keras.layers.Dense(3, activation="softmax")
+        ])
+        model_path = str(tmp_path / "classifier.keras")
+        keras_model.save(model_path)
+        mock_registry.register_context("tflite", TFLiteContext())
+        
+        def create_model(conversion_target):
+            return GenericModel(
+                model_id="converted_model",
+                version="1.0.0",
+                model_path=model_path,
+                task_type="classification",
+                input_shape=[None, 16, 16, 3],
+                conversion_target=conversion_target
+            )
+        
+        tensorflow_context = TensorFlowContext(gpu_enabled=False)
+        model = create_model("tflite")
+        model_context = ModelContext(model, tensorflow_context)
+        converted_path = converted_model_path(model_path, "tflite")
+        
+        assert isinstance(model._context, TFLiteContext)
+        assert os.path.exists(converted_path)
+        
+        # Outro worker reaproveita o artefato sem converter de novo
+        modified_time = os.path.getmtime(converted_path)
+        create_model("tflite").load(tensorflow_context)
+        
+        assert os.path.getmtime(converted_path) == modified_time
+        
+        # Mesmo contexto solicitado: o modelo já carregado não é recarregado
+        loaded = model._model
+        ModelContext(model, tensorflow_context)
+        
+        assert model._model is loaded
+        
+        inputs = np.random.rand(2, 16, 16, 3).astype(np.float32)
+        np.testing.assert_allclose(
+            model_context.model.predict(tf.constant(inputs)), keras_model(inputs).numpy(), atol=1e-5
+        )
+        
+        # Sem contexto para o formato de destino, o modelo original é usado
+        fallback_model = create_model("onnx")
+        fallback_model.load(tensorflow_context)
+        
+        assert fallback_model._context is tensorflow_context
+    
+    def test_analyze_tiled_detection(self):
+        """Testa que as caixas dos blocos são levadas à imagem inteira e deduplicadas entre blocos."""
+        from src.models.base import ModelContext
+        from tests.conftest import MockContext
+        
+        model = GenericModel(
+            model_id="test_detector",
+            version="1.0.0",
+            model_path="test_path",
+            task_type="detection",
+            input_shape=[None, 64, 64, 3],
+            preprocessing_config={"normalize": False},
+            metadata={"class_labels": ["object"]}
+        )
+        
+        # Um objeto claro em [100:120, 100:120]; cada bloco retorna a caixa da região clara
+        img = np.zeros((200, 200, 3), dtype=np.uint8)
+        img[100:120, 100:120] = 255
+        
+        def fake_model(tiles, training=False):
+            outputs = []
+            for tile in tiles.numpy():
+                ys, xs = np.nonzero(tile[..., 0] > 128)
+                if len(ys):
+                    box = [ys.min() / 64, xs.min() / 64, (ys.max() + 1) / 64, (xs.max() + 1) / 64]
+                    outputs.append([box + [0.9]])
+                else:
+                    outputs.append([[0.0, 0.0, 0.0, 0.0, 0.0]])
+            return tf.constant(outputs, dtype=tf.float32)
+        
+        model._model = fake_model
+        model._is_loaded = True
+        context = MockContext()
+        model._context = context
+        context.run_inference = lambda m, inputs: m(inputs)
+        
+        result = ModelContext(model, context).analyze_tiled(img, overlap=0.5, max_tiles=64)
+        
+        assert result["tiling"]["tiles"] == result["metadata"]["batch_size"] > 1
+        assert result["count"] == 1
+        np.testing.assert_allclose(result["detections"][0]["box"], [0.5, 0.5, 0.6, 0.6], atol=1e-6)
+    
+    def test_request_postprocessing_params(self):
+        """Testa parâmetros por requisição sem alterar a configuração compartilhada do modelo."""
+        from concurrent.futures import ThreadPoolExecutor
+        from src.models.base import ModelContext
+        from tests.conftest import MockContext
+        
+        model = GenericModel(
+            model_id="test_detector",
+            version="1.0.0",
+            model_path="test_path",
+            task_type="detection",
+            input_shape=[None, 32, 32, 3],
+            preprocessing_config={"normalize": False},
+            postprocessing_config={"confidence_threshold": 0.5, "apply_nms": False},
+            metadata={"class_labels": ["object"]}
+        )
+        
+        # Duas caixas: uma com confiança 0.9 e outra com 0.4
+        model._model = lambda inputs, training=False: tf.constant(
+            [[[0.1, 0.1, 0.3, 0.3, 0.9], [0.6, 0.6, 0.8, 0.8, 0.4]]], dtype=tf.float32
+        )
+        model._is_loaded = True
+        context = MockContext()
+        model._context = context
+        context.run_inference = lambda m, inputs: m(inputs)
+        model_context = ModelContext(model, context)
+        
+        img = np.zeros((32, 32, 3), dtype=np.uint8)
+        thresholds = [None, 0.3] * 8
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(
+                lambda threshold: model_context.analyze(
+                    img, postprocessing_params={"confidence_threshold": threshold} if threshold else None
+                ),
+                thresholds
+            ))
+        
+        assert [result["count"] for result in results] == [1, 2] * 8
+        assert model.postprocessing_config["confidence_threshold"] == 0.5
+        assert model.post_processor.confidence_threshold == 0.5
+        
+        # Um processador em cache por conjunto distinto de parâmetros
+        assert len(model._processor_cache) == 1
+        cached = model._get_processors('post', {"confidence_threshold": 0.3})
+        assert cached is model._get_processors('post', {"confidence_threshold": 0.3})
+    
+    def test_analyze_tiled_segmentation(self):
+        """Testa que os logits dos blocos são combinados em um mapa da imagem inteira."""
+        from src.models.base import ModelContext
+        from tests.conftest import MockContext
+        
+        model = GenericModel(
+            model_id="test_segmenter",
+            version="1.0.0",
+            model_path="test_path",
+            task_type="segmentation",
+            input_shape=[None, 32, 32, 3],
+            preprocessing_config={"normalize": False},
+            metadata={"class_labels": ["background", "object"]}
+        )
+        img = np.zeros((50, 90, 3), dtype=np.uint8)
+        img[:, 45:] = 255
+        
+        # Logits: classe "object" onde o pixel é claro
+        model._model = lambda tiles, training=False: tf.concat(
+            [128.0 - tiles[..., :1], tiles[..., :1] - 128.0], axis=-1
+        )
+        model._is_loaded = True
+        context = MockContext()
+        model._context = context
+        context.run_inference = lambda m, inputs: m(inputs)
+        
+        result = ModelContext(model, context).analyze_tiled(img, overlap=0.25)
+        
+        assert tuple(result["shape"]) == (50, 90)
+        assert result["class_distribution"] == {"background": 50.0, "object": 50.0}
+
+
+class TestCascadeModel:
+    """Testes para a classe CascadeModel."""
+    
+    def test_classifies_detections_in_batches(self):
+        """Testa que as caixas detectadas são classificadas em lotes de crop_batch_size."""
+        from src.models.base import ModelContext
+        from src.models.generic.cascade_model import CascadeModel
+        from tests.conftest import MockContext
+        
+        detector = GenericModel(
+            model_id="test_detector",
+            version="1.0.0",
+            model_path="detector_path",
+            task_type="detection",
+            input_shape=[None, 32, 32, 3],
+            postprocessing_config={"apply_nms": False},
+            metadata={"class_labels": ["object"]}
+        )
+        classifier = GenericModel(
+            model_id="test_classifier",
+            version="1.0.0",
+            model_path="classifier_path",
+            task_type="classification",
+            input_shape=[None, 8, 8, 3],
+            preprocessing_config={"normalize": False},
+            metadata={"class_labels": ["dark", "bright"]}
+        )
+        
+        # Três caixas, uma delas abaixo do limiar; a imagem é clara apenas à direita
+        boxes = [
+            [0.0, 0.0, 0.5, 0.4, 0.9],
+            [0.5, 0.6, 1.0, 1.0, 0.8],
+            [0.0, 0.6, 0.5, 1.0, 0.7],
+            [0.0, 0.0, 1.0, 1.0, 0.1]
+        ]
+        detector._model = lambda inputs, training=False: tf.constant([boxes], dtype=tf.float32)
+        batch_sizes = []
+        
+        def classify(crops, training=False):
+            batch_sizes.append(int(crops.shape[0]))
+            brightness = tf.reduce_mean(crops, axis=[1, 2, 3]) / 255.0
+            return tf.stack([1.0 - brightness, brightness], axis=-1)
+        
+        classifier._model = classify
+        
+        context = MockContext()
+        context.run_inference = lambda m, inputs: m(inputs)
+        context.load_model = lambda model_path: {"detector_path": detector._model, "classifier_path": classify}[model_path]
+        
+        cascade = CascadeModel("test_cascade", "1.0.0", detector, classifier, crop_batch_size=2)
+        img = np.zeros((100, 100, 3), dtype=np.uint8)
+        img[:, 60:] = 255
+        
+        result = ModelContext(cascade, context).analyze(img)
+        
+        assert batch_sizes == [2, 1]
+        assert result["count"] == 3
+        labels = [d["classification"]["top_class"] for d in result["detections"]]
+        assert labels == ["dark", "bright", "bright"]
+
+
+class TestAnalyzeMulti:
+    """Testes para a análise de uma imagem por vários modelos."""
+    
+    def test_shared_decode_and_preprocessing(self):
+        """Testa que modelos com a mesma configuração compartilham o pré-processamento."""
+        from src.models.base import ModelContext
+        from src.models.generic.fanout import analyze_multi
+        from tests.conftest import MockContext
+        
+        context = MockContext()
+        context.run_inference = lambda m, inputs: m(inputs)
+        
+        def create_model(model_id, size):
+            model = GenericModel(
+                model_id=model_id,
+                version="1.0.0",
+                model_path="test_path",
+                task_type="classification",
+                input_shape=[None, size, size, 3],
+                metadata={"class_labels": ["a", "b", "c"]}
+            )
+            model._model = lambda inputs, training=False: tf.nn.softmax(tf.reduce_mean(inputs, axis=[1, 2]))
+            model._is_loaded = True
+            model._context = context
+            return model
+        
+        model_contexts = {
+            "small_a": ModelContext(create_model("small_a", 32), context),
+            "small_b": ModelContext(create_model("small_b", 32), context),
+            "large": ModelContext(create_model("large", 64), context)
+        }
+        image = tf.io.encode_png(np.random.randint(0, 256, (80, 100, 3), dtype=np.uint8)).numpy()
+        
+        results, metadata = analyze_multi(model_contexts, image)
+        
+        assert metadata["preprocessing_configs"] == 2
+        assert metadata["image_shape"] == [80, 100, 3]
+        for name, model_context in model_contexts.items():
+            expected = model_context.analyze(image)
+            assert results[name]["metadata"]["model_id"] == name
+            assert results[name]["predictions"] == expected["predictions"]
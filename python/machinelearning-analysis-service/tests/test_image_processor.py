@@ -0,0 +1,172 @@
+"""
+Testes para o processador de imagens.
+"""
+
+import numpy as np
+import pytest
+import tensorflow as tf
+
+from src.models.generic.processors import ImageProcessor, BatchProcessor, TileProcessor
+
+
+def _encode_image(height, width, fmt="jpeg"):
+    """Gera uma imagem suave e a codifica no formato pedido."""
+    y = np.linspace(0, 255, height, dtype=np.float32)[:, None]
+    x = np.linspace(0, 255, width, dtype=np.float32)[None, :]
+    img = np.stack([np.broadcast_to(y, (height, width)),
+                    np.broadcast_to(x, (height, width)),
+                    np.full((height, width), 128.0, dtype=np.float32)], axis=-1).astype(np.uint8)
+    if fmt == "jpeg":
+        return tf.io.encode_jpeg(img, quality=95).numpy()
+    return tf.io.encode_png(img).numpy()
+
+
+class TestImageProcessor:
+    """Testes para a classe ImageProcessor."""
+
+    @pytest.mark.parametrize("size,expected", [
+        ((1200, 1600), (300, 400)),  # fator 4
+        ((480, 640), (240, 320)),    # fator 2
+        ((300, 300), (300, 300)),    # sem redução
+    ])
+    def test_fast_decode_scale(self, size, expected):
+        """Testa que o JPEG é decodificado na menor escala que cobre o alvo."""
+        processor = ImageProcessor(target_size=(224, 224))
+        img = processor.decode(tf.constant(_encode_image(*size)))
+
+        assert tuple(img.shape[:2]) == expected
+        assert img.dtype == tf.uint8
+
+    def test_fast_decode_matches_full_decode(self):
+        """Testa que a decodificação reduzida produz resultado equivalente."""
+        data = _encode_image(1200, 1600)
+        fast = ImageProcessor(target_size=(224, 224)).process_from_bytes(data)
+        full = ImageProcessor(target_size=(224, 224), fast_decode=False).process_from_bytes(data)
+
+        assert fast.shape == full.shape == (1, 224, 224, 3)
+        assert float(tf.reduce_mean(tf.abs(fast - full))) < 0.02
+
+    def test_fast_decode_non_jpeg(self):
+        """Testa que outros formatos seguem pela decodificação padrão."""
+        processor = ImageProcessor(target_size=(224, 224))
+        img = processor.decode(tf.constant(_encode_image(480, 640, fmt="png")))
+
+        assert tuple(img.shape) == (480, 640, 3)
+
+    def test_fused_normalization(self):
+        """Testa que a transformação afim equivale à normalização por etapas."""
+        mean, std = [0.485, 0.456, 0.406], [0.229, 0.224, 0.225]
+        img = np.random.randint(0, 256, (64, 48, 3), dtype=np.uint8)
+        processor = ImageProcessor(target_size=(32, 32), mean=mean, std=std)
+
+        result = processor.process_from_array(img)
+        expected = (tf.image.resize(tf.cast(img, tf.float32), (32, 32)) / 255.0 - mean) / std
+
+        np.testing.assert_allclose(result[0].numpy(), expected.numpy(), rtol=1e-5, atol=1e-5)
+
+    @pytest.mark.parametrize("channels", [1, 4])
+    def test_non_rgb_arrays(self, channels):
+        """Testa que arrays com 1 ou 4 canais mantêm o número de canais na normalização."""
+        img = np.random.randint(0, 256, (8, 8, channels), dtype=np.uint8)
+        processor = ImageProcessor(target_size=(8, 8))
+
+        result = processor.process_from_array(img)
+
+        assert result.shape == (1, 8, 8, channels)
+        np.testing.assert_allclose(result[0].numpy(), img / 255.0, rtol=1e-6)
+
+    def test_uint8_output_without_resize(self):
+        """Testa a saída uint8 quando a imagem já está no tamanho alvo."""
+        img = np.random.randint(0, 256, (32, 32, 3), dtype=np.uint8)
+        processor = ImageProcessor(target_size=(32, 32), output_dtype='uint8')
+
+        result = processor.process_from_array(img)
+
+        assert result.dtype == tf.uint8
+        np.testing.assert_array_equal(result[0].numpy(), img)
+
+
+class TestBatchProcessor:
+    """Testes para a classe BatchProcessor."""
+
+    @pytest.mark.parametrize("use_tf_data", [True, False])
+    def test_process_preserves_order(self, tmp_path, use_tf_data):
+        """Testa que o processamento em lote mantém a ordem e o formato de cada imagem."""
+        paths = []
+        for i, size in enumerate([(480, 640), (300, 300), (240, 320)]):
+            path = tmp_path / f"image_{i}.jpg"
+            path.write_bytes(_encode_image(*size))
+            paths.append(str(path))
+
+        image_processor = ImageProcessor(target_size=(224, 224))
+        batch_processor = BatchProcessor(image_processor, batch_size=2, use_tf_data=use_tf_data)
+
+        results = batch_processor.process(paths)
+
+        assert len(results) == 3
+        for path, result in zip(paths, results):
+            assert result.shape == (1, 224, 224, 3)
+            np.testing.assert_allclose(
+                result.numpy(), image_processor.process_from_path(path).numpy(), atol=1e-5
+            )
+
+    def test_mixed_paths_and_bytes(self, tmp_path):
+        """Testa que listas com caminhos e bytes misturados são processadas corretamente."""
+        path = tmp_path / "image.jpg"
+        path.write_bytes(_encode_image(240, 320))
+        inputs = [str(path), _encode_image(300, 300), str(path)]
+
+        image_processor = ImageProcessor(target_size=(64, 64))
+        batch_processor = BatchProcessor(image_processor, batch_size=2, use_tf_data=True)
+
+        results = batch_processor.process(inputs)
+
+        assert len(results) == 3
+        np.testing.assert_allclose(
+            results[1].numpy(), image_processor.process_from_bytes(inputs[1]).numpy(), atol=1e-5
+        )
+        np.testing.assert_allclose(results[0].numpy(), results[2].numpy())
+
+    @pytest.mark.parametrize("use_tf_data", [True, False])
+    def test_ignore_errors_keeps_indices(self, use_tf_data):
+        """Testa que imagens descartadas não desalinham os resultados das entradas."""
+        inputs = [_encode_image(240, 320), b"imagem corrompida", _encode_image(300, 300)]
+        image_processor = ImageProcessor(target_size=(64, 64))
+        batch_processor = BatchProcessor(image_processor, batch_size=2, use_tf_data=use_tf_data, ignore_errors=True)
+
+        results = batch_processor.process(inputs)
+        images, indices = batch_processor.process_batch(inputs, return_indices=True)
+
+        assert results[1] is None
+        np.testing.assert_allclose(
+            results[2].numpy(), image_processor.process_from_bytes(inputs[2]).numpy(), atol=1e-5
+        )
+        assert indices == [0, 2] and images.shape[0] == 2
+
+
+class TestTileProcessor:
+    """Testes para a classe TileProcessor."""
+
+    def test_tiles_cover_image_at_model_resolution(self):
+        """Testa que os blocos cobrem a imagem e são recortes exatos na resolução do modelo."""
+        img = np.random.randint(0, 256, (300, 500, 3), dtype=np.uint8)
+        tile_processor = TileProcessor(ImageProcessor(target_size=(128, 128), normalize=False), overlap=0.25)
+
+        tiles, windows = tile_processor.tile(tf.constant(img))
+
+        assert tiles.shape == (len(windows), 128, 128, 3)
+        assert windows[:, 2].max() == 300 and windows[:, 3].max() == 500
+        covered = np.zeros((300, 500), dtype=bool)
+        for tile, (y1, x1, y2, x2) in zip(tiles.numpy(), windows):
+            covered[y1:y2, x1:x2] = True
+            np.testing.assert_allclose(tile, img[y1:y2, x1:x2], atol=0.01)
+        assert covered.all()
+
+    def test_max_tiles_enlarges_tiles(self):
+        """Testa que o limite de blocos amplia as janelas em vez de ignorar partes da imagem."""
+        tile_processor = TileProcessor(ImageProcessor(target_size=(128, 128)), max_tiles=4)
+
+        windows = tile_processor.compute_windows(2160, 3840)
+
+        assert len(windows) <= 4
+        assert windows[:, 2].max() == 2160 and windows[:, 3].max() == 3840
@@ -0,0 +1,60 @@
+"""
+Testes para a base de dados nutricional indexada.
+"""
+
+import os
+import json
+
+from src.models.food.nutrition_db import NutritionDatabase, get_nutrition_database, normalize_name
+
+
+ENTRIES = {
+    "apple": {"name": "Maçã", "calories": 52, "proteins": 0.3, "carbohydrates": 14, "fats": 0.2,
+              "fiber": 2.4, "vitamins": ["C", "K"], "aliases": ["green apple"]},
+    "chocolate_cake": {"calories": 371, "protein": 5.1, "carbs": 47.2, "fat": 18.8, "fiber": 2.1,
+                       "vitamins": ["B2", "E"], "diet_type": ["ocasional"]},
+    "broccoli": {"calories": 34, "protein": 2.8, "carbs": 6.6, "fat": 0.4}
+}
+
+
+class TestNutritionDatabase:
+    """Testes para a busca por nome, apelido e similaridade."""
+    
+    def test_lookup(self):
+        """Testa busca normalizada, por apelido, aproximada e em lote."""
+        database = NutritionDatabase(ENTRIES)
+        
+        assert normalize_name("Chocolate Cake") == "chocolate_cake"
+        assert database["Chocolate-Cake"]["proteins"] == 5.1
+        assert database["maçã"]["name"] == "Maçã"
+        assert "Green Apple" in database
+        assert database.find("nonexistent_food", fuzzy=True) is None
+        
+        record = database.find("Chocolate Cake")
+        assert (record["key"], record["match"]) == ("chocolate_cake", "exact")
+        assert database.find("green apple")["match"] == "alias"
+        
+        # Aproximada apenas quando solicitada, com alta similaridade e candidato único
+        assert database.find("brocoli") is None
+        record = database.find("brocoli", fuzzy=True)
+        assert (record["key"], record["match"], record["calories"]) == ("broccoli", "fuzzy", 34)
+        for name in ("pineapple", "apple pie", "chocolate_mousse", "cake"):
+            assert database.find(name, fuzzy=True) is None, name
+        assert database.find_batch(["apple", "brocoli"], fuzzy=True)[1]["key"] == "broccoli"
+        
+        records = database.find_batch(["apple", "unknown", "chocolate cake", "apple"])
+        assert records[1] is None and records[0] == records[3]
+        assert records[2]["calories"] == 371
+    
+    def test_shared_per_file(self, tmp_path):
+        """Testa que a base é carregada uma vez por arquivo e recarregada se ele mudar."""
+        path = tmp_path / "nutrition.json"
+        path.write_text(json.dumps(ENTRIES), encoding="utf-8")
+        
+        database = get_nutrition_database(str(path))
+        assert get_nutrition_database(str(path)) is database
+        assert len(database) == 3
+        
+        path.write_text(json.dumps({"apple": ENTRIES["apple"]}), encoding="utf-8")
+        os.utime(path, (0, 0))
+        assert len(get_nutrition_database(str(path))) == 1
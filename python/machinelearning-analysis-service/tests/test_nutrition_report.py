@@ -0,0 +1,60 @@
+"""
+Testes para o relatório nutricional colunar.
+"""
+
+import csv
+
+from src.exporters.nutrition_exporter import NutritionExporter
+from src.models.food.nutrition_report import NutritionTable
+from src.models.food.nutrition_service import FoodNutritionService
+
+
+def _batch_results():
+    """Gera resultados de análise em lote com uma falha."""
+    results = [
+        {
+            'top_prediction': {'class_name': name, 'confidence': confidence},
+            'nutrition': {'calories': calories, 'proteins': 1.0, 'carbohydrates': 10.0, 'fats': 0.5,
+                          'fiber': 2.0, 'vitamins': ['C'], 'minerals': []},
+            'health_impact': 'Positivo',
+            'condition': {'status': 'fresh'},
+            'image_path': f'{name}.jpg'
+        }
+        for name, confidence, calories in [('apple_fruit', 0.9, 52), ('rice', 0.8, 130), ('apple_fruit', 0.7, 52)]
+    ]
+    results.append({'status': 'error', 'message': 'falha', 'image_path': 'broken.jpg'})
+    return results
+
+
+class TestNutritionTable:
+    """Testes para a tabela colunar e o relatório nutricional."""
+    
+    def test_totals_and_per_class(self):
+        """Testa os totais e os agregados por classe."""
+        table = NutritionTable.from_results(_batch_results())
+        
+        assert len(table) == 3
+        assert table.failed == 1
+        assert table.totals()['calories'] == 234
+        assert table.per_class()['apple_fruit']['count'] == 2
+        assert abs(table.per_class()['apple_fruit']['mean_confidence'] - 0.8) < 1e-9
+        assert table.count_matching('FRUIT') == 2
+    
+    def test_report_and_csv_export(self, tmp_path):
+        """Testa o relatório do serviço e a exportação CSV com total e recomendações."""
+        service = FoodNutritionService.__new__(FoodNutritionService)
+        report = service.generate_nutrition_report(_batch_results())
+        
+        assert report['metadata'] == {'total_items': 4, 'successful_analyses': 3, 'failed_analyses': 1}
+        assert report['total_nutrition']['fiber'] == 6
+        assert set(report['class_summary']) == {'apple_fruit', 'rice'}
+        assert report['recommendations']
+        
+        output_path = NutritionExporter().export(report, str(tmp_path / 'report.csv'))
+        with open(output_path, newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        
+        assert [row['food_class'] for row in rows[:4]] == ['apple_fruit', 'rice', 'apple_fruit', 'TOTAL']
+        assert float(rows[3]['calories']) == 234
+        assert rows[4]['food_class'] == 'RECOMENDAÇÃO'
+        assert rows[4]['health_impact'] == report['recommendations'][0]
@@ -0,0 +1,78 @@
+"""
+Testes para o contexto de execução ONNX.
+"""
+
+import os
+import numpy as np
+import pytest
+
+ort = pytest.importorskip("onnxruntime")
+onnx = pytest.importorskip("onnx")
+from onnx import helper, TensorProto
+
+from src.core.context import ONNXContext, ONNXModelSession
+
+
+def _create_scale_model(path, factor, batch=None):
+    """Cria um modelo ONNX que multiplica a entrada por um fator."""
+    dims = [batch if batch is not None else "batch", 4]
+    scale = helper.make_tensor("scale", TensorProto.FLOAT, [1], [factor])
+    node = helper.make_node("Mul", ["input", "scale"], ["output"])
+    graph = helper.make_graph(
+        [node], "scale",
+        [helper.make_tensor_value_info("input", TensorProto.FLOAT, dims)],
+        [helper.make_tensor_value_info("output", TensorProto.FLOAT, dims)],
+        initializer=[scale]
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)])
+    model.ir_version = 8
+    onnx.save(model, str(path))
+    return str(path)
+
+
+class TestONNXContext:
+    """Testes para a classe ONNXContext."""
+
+    def test_one_session_per_model(self, tmp_path):
+        """Testa que carregar um segundo modelo não substitui o primeiro."""
+        context = ONNXContext()
+        double = context.load_model(_create_scale_model(tmp_path / "double.onnx", 2.0))
+        triple = context.load_model(_create_scale_model(tmp_path / "triple.onnx", 3.0))
+        inputs = np.ones((2, 4), dtype=np.float32)
+
+        assert isinstance(double, ONNXModelSession)
+        assert context.load_model(str(tmp_path / "double.onnx")) is double
+        np.testing.assert_allclose(context.run_inference(double, inputs), inputs * 2)
+        np.testing.assert_allclose(context.run_inference(triple, inputs), inputs * 3)
+
+    def test_io_binding_fixed_shape(self, tmp_path):
+        """Testa IOBinding com buffers pré-alocados em modelos de formato fixo."""
+        context = ONNXContext(use_io_binding=True)
+        model = context.load_model(_create_scale_model(tmp_path / "fixed.onnx", 2.0, batch=1))
+
+        assert model.use_io_binding
+        first = context.run_inference(model, np.ones((1, 4), dtype=np.float64))
+        second = context.run_inference(model, np.full((1, 4), 2.0, dtype=np.float32))
+
+        # A segunda inferência não pode sobrescrever o resultado da primeira
+        np.testing.assert_allclose(first, np.full((1, 4), 2.0))
+        np.testing.assert_allclose(second, np.full((1, 4), 4.0))
+
+    def test_optimized_model_cache(self, tmp_path):
+        """Testa que o grafo otimizado é salvo e reaproveitado."""
+        model_path = _create_scale_model(tmp_path / "model.onnx", 2.0)
+        cache_dir = tmp_path / "optimized"
+
+        ONNXContext(optimized_model_dir=str(cache_dir)).load_model(model_path)
+        cached = os.listdir(cache_dir)
+
+        # Apenas o arquivo final, movido de um temporário depois de completo
+        assert len(cached) == 1 and cached[0].endswith(".opt.onnx")
+
+        context = ONNXContext(optimized_model_dir=str(cache_dir))
+        model = context.load_model(model_path)
+
+        assert os.listdir(cache_dir) == cached
+        np.testing.assert_allclose(
+            context.run_inference(model, np.ones((1, 4), dtype=np.float32)), np.full((1, 4), 2.0)
+        )
@@ -0,0 +1,64 @@
+"""
+Testes para o contexto de execução PyTorch.
+"""
+
+import os
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from src.core.context import PyTorchContext, PyTorchCompiledModel
+
+
+class SmallConvNet(torch.nn.Module):
+    """Rede convolucional mínima para os testes."""
+
+    def __init__(self):
+        super().__init__()
+        self.conv = torch.nn.Conv2d(3, 4, 3)
+
+    def forward(self, x):
+        return self.conv(x).mean(dim=(2, 3))
+
+
+@pytest.fixture
+def model_path(tmp_path):
+    """Salva um modelo completo em disco."""
+    torch.manual_seed(0)
+    path = tmp_path / "model.pt"
+    torch.save(SmallConvNet().eval(), str(path))
+    return str(path)
+
+
+class TestPyTorchContext:
+    """Testes para a classe PyTorchContext."""
+
+    @pytest.mark.parametrize("compile_mode", ["script", "trace"])
+    def test_compiled_matches_eager(self, model_path, tmp_path, compile_mode):
+        """Testa que o modo compilado produz o mesmo resultado do eager e é salvo em cache."""
+        cache_dir = tmp_path / "cache"
+        inputs = np.random.rand(2, 16, 16, 3).astype(np.float32)
+
+        eager = PyTorchContext(gpu_enabled=False, input_layout="nhwc")
+        expected = eager.run_inference(eager.load_model(model_path), inputs)
+
+        context = PyTorchContext(
+            gpu_enabled=False, compile_mode=compile_mode, channels_last=True,
+            cache_dir=str(cache_dir), input_layout="nhwc"
+        )
+        compiled = context.load_model(model_path)
+        outputs = context.run_inference(compiled, inputs)
+
+        assert isinstance(compiled, PyTorchCompiledModel)
+        assert isinstance(outputs, np.ndarray)
+        np.testing.assert_allclose(outputs, expected, rtol=1e-5, atol=1e-5)
+        assert len(os.listdir(cache_dir)) == 1
+
+        # Um novo contexto reaproveita o módulo compilado em disco
+        reloaded = PyTorchContext(
+            gpu_enabled=False, compile_mode=compile_mode, channels_last=True,
+            cache_dir=str(cache_dir), input_layout="nhwc"
+        ).load_model(model_path)
+
+        assert reloaded.traced
@@ -78,3 +78,22 @@ class TestModelRegistry:
         assert metadata["version"] == "1.0.0"
         assert "description" in metadata
         assert metadata["task_type"] == "test"
+    
+    def test_context_factory_is_lazy(self, mock_registry):
+        """Testa que o contexto registrado por fábrica só é criado no primeiro uso."""
+        from tests.conftest import MockContext
+        calls = []
+        
+        def factory():
+            calls.append(1)
+            return MockContext()
+        
+        mock_registry.register_context_factory("lazy_context", factory)
+        
+        assert "lazy_context" in mock_registry.list_available_contexts()
+        assert calls == []
+        
+        context = mock_registry.get_context("lazy_context")
+        
+        assert context is mock_registry.get_context("lazy_context")
+        assert len(calls) == 1
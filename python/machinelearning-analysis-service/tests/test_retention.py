@@ -0,0 +1,102 @@
+"""
+Testes para a retenção de uploads e resultados.
+"""
+
+import os
+import time
+import zipfile
+
+from src.utils.retention import RetentionWorker, classify_result_file
+
+
+def _write(path, size, age):
+    """Cria um arquivo com o tamanho e a idade (segundos) informados."""
+    path.write_bytes(b"x" * size)
+    mtime = time.time() - age
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+class TestRetentionWorker:
+    """Testes para TTL, cotas e compactação."""
+    
+    def test_ttl_and_quota(self, tmp_path):
+        """Testa a remoção por TTL e, acima da cota, dos arquivos mais antigos."""
+        uploads = tmp_path / "uploads"
+        results = tmp_path / "results"
+        uploads.mkdir()
+        results.mkdir()
+        
+        old_upload = _write(uploads / "old.jpg", 10, 7200)
+        new_upload = _write(uploads / "new.jpg", 10, 10)
+        result = _write(results / "task1.json", 100, 300)
+        error = _write(results / "task2.error.json", 50, 7200)
+        exports = [_write(results / f"task{i}.csv", 100, 1000 - i) for i in range(3)]
+        
+        worker = RetentionWorker(
+            upload_dirs=[str(uploads)],
+            results_dir=str(results),
+            ttl={"uploads": 3600, "results": 3600, "errors": 3600, "exports": 0},
+            max_bytes={"exports": 150},
+            batch_size=1,
+            batch_pause=0,
+            min_age=60
+        )
+        stats = worker.run_once()
+        
+        assert not old_upload.exists() and new_upload.exists()
+        assert result.exists() and not error.exists()
+        assert [path.exists() for path in exports] == [False, False, True]
+        assert stats["exports"] == {"deleted_files": 2, "reclaimed_bytes": 200, "stored_bytes": 100}
+        assert stats["errors"]["reclaimed_bytes"] == 50
+        assert classify_result_file("task.error.json") == "errors"
+        assert classify_result_file("task.parquet") == "exports"
+    
+    def test_archive_results(self, tmp_path):
+        """Testa a compactação de resultados antigos em um pacote zip."""
+        results = tmp_path / "results"
+        results.mkdir()
+        old = _write(results / "old.json", 1000, 7200)
+        recent = _write(results / "recent.json", 1000, 10)
+        
+        worker = RetentionWorker(
+            upload_dirs=[],
+            results_dir=str(results),
+            ttl={"results": 0},
+            archive_after=3600,
+            batch_pause=0
+        )
+        stats = worker.run_once()
+        
+        assert not old.exists() and recent.exists()
+        assert stats["results"]["deleted_files"] == 1
+        assert stats["results"]["reclaimed_bytes"] > 0
+        
+        bundles = list((results / "archive").glob("*.zip"))
+        assert len(bundles) == 1
+        with zipfile.ZipFile(bundles[0]) as bundle:
+            assert bundle.namelist() == ["old.json"]
+    
+    def test_archive_names_unique(self, tmp_path, monkeypatch):
+        """Testa que pacotes gravados no mesmo segundo por processos distintos não se sobrescrevem."""
+        results = tmp_path / "results"
+        results.mkdir()
+        _write(results / "first.json", 1000, 7200)
+        
+        workers = [
+            RetentionWorker(upload_dirs=[], results_dir=str(results), ttl={"results": 0},
+                            archive_after=3600, batch_pause=0)
+            for _ in range(2)
+        ]
+        monkeypatch.setattr(time, "time", lambda now=time.time(): now)
+        workers[0].run_once()
+        _write(results / "second.json", 1000, 7200)
+        workers[1].run_once()
+        
+        bundles = sorted((results / "archive").glob("*.zip"))
+        assert len(bundles) == 2
+        names = set()
+        for path in bundles:
+            with zipfile.ZipFile(path) as bundle:
+                names.update(bundle.namelist())
+        assert names == {"first.json", "second.json"}
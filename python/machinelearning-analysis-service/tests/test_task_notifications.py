@@ -0,0 +1,196 @@
+"""
+Testes para o long-poll e os callbacks de conclusão das tarefas assíncronas.
+"""
+
+import os
+import json
+import hmac
+import asyncio
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from src.core.callbacks import CallbackDispatcher, validate_callback_url
+from src.core.tasks import TaskIndex, TaskNotifier, get_task_notifier
+from src.utils.storage import save_result_json
+
+
+@pytest.fixture
+def callback_server():
+    """Servidor HTTP local que registra os callbacks recebidos."""
+    received = []
+    responses = []
+    
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            received.append((dict(self.headers), body))
+            self.send_response(responses.pop(0) if responses else 200)
+            self.send_header("Location", "http://169.254.169.254/latest/meta-data/")
+            self.end_headers()
+        
+        def log_message(self, *args):
+            pass
+    
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/done", received, responses
+    server.shutdown()
+    server.server_close()
+
+
+class TestTaskNotifier:
+    """Testes para a espera pela conclusão das tarefas."""
+    
+    def test_wait(self):
+        """Testa a espera acordada por outra thread, o prazo e tarefas desconhecidas."""
+        notifier = TaskNotifier()
+        
+        async def scenario():
+            notifier.register("a")
+            notifier.register("b")
+            threading.Timer(0.05, notifier.complete, args=("a", "completed")).start()
+            
+            assert await notifier.wait("a", 5) == "completed"
+            assert await notifier.wait("b", 0.05) == "processing"
+            assert await notifier.wait("unknown", 5) is None
+        
+        asyncio.run(scenario())
+        assert notifier.status("a") == "completed"
+        assert notifier.status("b") == "processing"
+    
+    def test_pending_task_status(self, test_client):
+        """Testa que tarefas em andamento são respondidas pelo mapa, com e sem espera."""
+        get_task_notifier().register("pending-task")
+        
+        response = test_client.get("/api/analyze/tasks/pending-task", params={"wait": 0.05})
+        assert response.status_code == 200
+        assert response.json()["status"] == "processing"
+        
+        get_task_notifier().complete("pending-task", "failed")
+        assert test_client.get("/api/analyze/tasks/pending-task").status_code == 404
+
+
+class TestBulkTaskEndpoints:
+    """Testes para as consultas de status e resultados em massa."""
+    
+    def test_bulk_status_and_results(self, test_client, tmp_path, monkeypatch):
+        """Testa status compactos e resultados NDJSON servidos pelo índice."""
+        monkeypatch.setattr("src.utils.storage.RESULTS_DIR", str(tmp_path))
+        monkeypatch.setattr("src.core.tasks._task_index", TaskIndex())
+        (tmp_path / "done.json").write_text(json.dumps({"detections": [{"class": "a"}]}, indent=2), encoding="utf-8")
+        (tmp_path / "done.csv").write_text("class\na\n", encoding="utf-8")
+        (tmp_path / "broken.error.json").write_text(json.dumps({"error": "falha"}), encoding="utf-8")
+        get_task_notifier().register("running")
+        
+        task_ids = ["done", "broken", "running", "missing"]
+        response = test_client.post("/api/analyze/tasks/status", json={"task_ids": task_ids})
+        assert response.status_code == 200
+        body = response.json()
+        assert [(task["task_id"], task["status"]) for task in body["tasks"]] == [
+            ("done", "completed"), ("broken", "failed"), ("running", "processing"), ("missing", "not_found")
+        ]
+        assert body["tasks"][0]["exports"] == ["csv"]
+        assert body["counts"] == {"completed": 1, "failed": 1, "processing": 1, "not_found": 1}
+        
+        # Arquivo removido depois da listagem: a linha informa que não foi encontrado
+        os.remove(tmp_path / "broken.error.json")
+        response = test_client.post("/api/analyze/tasks/results", json={"task_ids": task_ids})
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert lines[0] == {"task_id": "done", "status": "completed", "results": {"detections": [{"class": "a"}]}}
+        assert lines[1]["status"] == "not_found"
+        assert lines[2] == {"task_id": "running", "status": "processing"}
+        
+        get_task_notifier().complete("running", "completed")
+    
+    def test_partial_result_not_indexed(self, tmp_path, monkeypatch):
+        """Testa que resultados em gravação (temporários) não aparecem no índice."""
+        monkeypatch.setattr("src.utils.storage.RESULTS_DIR", str(tmp_path))
+        (tmp_path / "writing.json.123.tmp").write_text('{"detections": [', encoding="utf-8")
+        save_result_json("done", {"detections": []})
+        
+        assert sorted(os.listdir(tmp_path)) == ["done.json", "writing.json.123.tmp"]
+        assert TaskIndex().lookup(["done", "writing"]) == {"done": {"json"}, "writing": set()}
+
+
+class TestCallbackDispatcher:
+    """Testes para a caixa de saída de callbacks."""
+    
+    def test_delivery(self, callback_server, tmp_path, monkeypatch):
+        """Testa a entrega assinada com o resultado da tarefa."""
+        url, received, _ = callback_server
+        monkeypatch.setattr("src.utils.storage.RESULTS_DIR", str(tmp_path))
+        (tmp_path / "task1.json").write_text(json.dumps({"detections": [1, 2]}), encoding="utf-8")
+        
+        dispatcher = CallbackDispatcher(
+            outbox_dir=str(tmp_path / "outbox"), secret="segredo", allowed_hosts=["127.0.0.1"]
+        )
+        dispatcher.enqueue("task1", url, "completed")
+        assert dispatcher.deliver_due() == 1
+        
+        headers, body = received[0]
+        assert json.loads(body) == {"task_id": "task1", "status": "completed", "results": {"detections": [1, 2]}}
+        signature = hmac.new(b"segredo", body, hashlib.sha256).hexdigest()
+        assert headers["X-Signature-256"] == f"sha256={signature}"
+        assert dispatcher.pending() == {}
+        assert os.listdir(tmp_path / "outbox") == []
+    
+    def test_retry_and_give_up(self, callback_server, tmp_path, monkeypatch):
+        """Testa a nova tentativa após 503, a retomada da caixa de saída e o abandono."""
+        url, received, responses = callback_server
+        monkeypatch.setattr("src.utils.storage.RESULTS_DIR", str(tmp_path))
+        responses.extend([503, 503])
+        (tmp_path / "task2.error.json").write_text(json.dumps({"error": "falha"}), encoding="utf-8")
+        
+        outbox = str(tmp_path / "outbox")
+        dispatcher = CallbackDispatcher(outbox_dir=outbox, max_attempts=2, backoff=0, allowed_hosts=["127.0.0.1"])
+        dispatcher.enqueue("task2", url, "failed")
+        dispatcher.deliver_due()
+        assert "task2" in dispatcher.pending()
+        
+        # Um novo despachante retoma a entrega pendente gravada em disco
+        dispatcher = CallbackDispatcher(outbox_dir=outbox, max_attempts=2, backoff=0, allowed_hosts=["127.0.0.1"])
+        dispatcher.deliver_due()
+        assert len(received) == 2
+        assert json.loads(received[1][1]) == {"task_id": "task2", "status": "failed", "error": "falha"}
+        assert os.listdir(outbox) == ["task2.failed.json"]
+    
+    def test_not_retried(self, callback_server, tmp_path, monkeypatch):
+        """Testa que redirecionamentos, erros no resultado e hosts internos não são repetidos."""
+        url, received, responses = callback_server
+        monkeypatch.setattr("src.utils.storage.RESULTS_DIR", str(tmp_path))
+        (tmp_path / "redirect.json").write_text("{}", encoding="utf-8")
+        (tmp_path / "broken.error.json").write_text("{não é json", encoding="utf-8")
+        responses.append(302)
+        
+        outbox = tmp_path / "outbox"
+        dispatcher = CallbackDispatcher(outbox_dir=str(outbox), backoff=0, allowed_hosts=["127.0.0.1"])
+        dispatcher.enqueue("redirect", url, "completed")
+        dispatcher.enqueue("broken", url, "failed")
+        dispatcher.deliver_due()
+        
+        # Sem lista de hosts, o servidor local (loopback) é recusado a cada envio
+        internal = CallbackDispatcher(outbox_dir=str(outbox), backoff=0, allowed_hosts=[])
+        internal.enqueue("internal", url, "completed")
+        internal.deliver_due()
+        
+        assert len(received) == 1
+        assert dispatcher.pending() == {} and internal.pending() == {}
+        assert sorted(os.listdir(outbox)) == ["broken.failed.json", "internal.failed.json", "redirect.failed.json"]
+        failed = json.loads((outbox / "broken.failed.json").read_text(encoding="utf-8"))
+        assert failed["attempts"] == 1 and "inválido" in failed["last_error"]
+        assert "HTTP 302" in (outbox / "redirect.failed.json").read_text(encoding="utf-8")
+    
+    def test_validate_callback_url(self):
+        """Testa a validação do esquema, dos hosts permitidos e dos endereços internos."""
+        assert validate_callback_url("https://93.184.216.34/hook", allowed_hosts=[]) is None
+        assert validate_callback_url("file:///etc/passwd") is not None
+        assert validate_callback_url("http://internal/hook", allowed_hosts=["example.com"]) is not None
+        assert validate_callback_url("http://internal/hook", allowed_hosts=["internal"]) is None
+        for url in ("http://127.0.0.1:8000/", "http://localhost/", "http://10.0.0.5/", "http://169.254.169.254/",
+                    "http://[::1]/", "http://[::ffff:192.168.0.1]/", "http://0.0.0.0/"):
+            assert validate_callback_url(url, allowed_hosts=[]) is not None, url
@@ -0,0 +1,49 @@
+"""
+Testes para o contexto de execução TensorFlow.
+"""
+
+import gc
+import weakref
+
+import numpy as np
+import tensorflow as tf
+
+from src.core.context import TensorFlowContext
+from src.utils.metrics import get_metrics
+
+
+class TestTensorFlowContext:
+    """Testes para a classe TensorFlowContext."""
+
+    def test_compiled_inference_reuses_graph(self):
+        """Testa que batches de tamanhos diferentes reutilizam o mesmo grafo."""
+        model = tf.keras.Sequential([
+            tf.keras.Input((8, 8, 3)),
+            tf.keras.layers.Conv2D(4, 3),
+            tf.keras.layers.GlobalAveragePooling2D()
+        ], name="compiled_test_model")
+        context = TensorFlowContext(gpu_enabled=False, compile_inference=True, batch_buckets=[1, 2, 4, 8])
+
+        for batch_size in [1, 3, 5, 2, 7]:
+            inputs = np.random.rand(batch_size, 8, 8, 3).astype(np.float32)
+            outputs = context.run_inference(model, inputs)
+
+            # O padding do bucket não pode aparecer na saída
+            assert outputs.shape[0] == batch_size
+            np.testing.assert_allclose(outputs.numpy(), model(inputs).numpy(), rtol=1e-5, atol=1e-5)
+
+        assert get_metrics()["counters"]["tf_function_traces_total_model:compiled_test_model"] == 1
+
+    def test_compiled_functions_released_with_model(self):
+        """Testa que as funções compiladas não mantêm vivo um modelo descartado."""
+        model = tf.keras.Sequential([tf.keras.Input((4,)), tf.keras.layers.Dense(2)])
+        context = TensorFlowContext(gpu_enabled=False, compile_inference=True)
+        context.run_inference(model, np.ones((1, 4), dtype=np.float32))
+        assert len(context._compiled) == 1
+
+        model_ref = weakref.ref(model)
+        del model
+        gc.collect()
+
+        assert model_ref() is None
+        assert len(context._compiled) == 0
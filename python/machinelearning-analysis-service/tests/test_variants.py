@@ -0,0 +1,72 @@
+"""
+Testes para as variantes quantizadas de modelos.
+"""
+
+import os
+import numpy as np
+import tensorflow as tf
+
+from src.core.context import TFLiteContext
+from src.core.variants import save_variant, resolve_variant_path
+from src.models.generic.generic_model import GenericModel
+
+
+def _create_keras_model():
+    """Cria um classificador mínimo."""
+    return tf.keras.Sequential([
+        tf.keras.Input((16, 16, 3)),
+        tf.keras.layers.Conv2D(4, 3, activation="relu"),
+        tf.keras.layers.GlobalAveragePooling2D(),
+        tf.keras.layers.Dense(3, activation="softmax")
+    ])
+
+
+class TestVariants:
+    """Testes para a seleção de variantes pelo contexto de execução."""
+    
+    def test_variant_selected_by_context(self, mock_registry, tmp_path):
+        """Testa que o contexto tflite_int8 usa o artefato registrado no manifesto."""
+        keras_model = _create_keras_model()
+        model_path = str(tmp_path / "classifier.keras")
+        keras_model.save(model_path)
+        
+        # Variante INT8 dinâmica gerada com o conversor TFLite
+        converter = tf.lite.TFLiteConverter.from_keras_model(keras_model)
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        variant_path = str(tmp_path / "classifier.tflite_int8.tflite")
+        with open(variant_path, "wb") as f:
+            f.write(converter.convert())
+        save_variant(model_path, "tflite_int8", variant_path, {"mode": "dynamic"})
+        
+        model = GenericModel(
+            model_id="classifier",
+            version="1.0.0",
+            model_path=model_path,
+            task_type="classification",
+            input_shape=[None, 16, 16, 3],
+            metadata={"class_labels": ["a", "b", "c"]}
+        )
+        mock_registry.register_model(model)
+        mock_registry.register_context("tflite_int8", TFLiteContext(variant="tflite_int8"))
+        
+        assert resolve_variant_path(model, "tflite_int8") == os.path.normpath(variant_path)
+        
+        model_context = mock_registry.create_model_context("classifier", "1.0.0", "tflite_int8")
+        
+        # O modelo registrado continua apontando para o original
+        assert model_context.model is not model
+        assert model_context.model.model_path == os.path.normpath(variant_path)
+        assert model.model_path == model_path
+        assert mock_registry.get_model_metadata("classifier", "1.0.0")["variants"] == ["tflite_int8"]
+        
+        inputs = np.random.rand(2, 16, 16, 3).astype(np.float32)
+        outputs = model_context.model.predict(tf.constant(inputs))
+        
+        assert outputs.shape == (2, 3)
+        np.testing.assert_allclose(outputs, keras_model(inputs).numpy(), atol=0.05)
+    
+    def test_missing_variant(self, mock_registry):
+        """Testa que uma variante inexistente não cria o contexto."""
+        mock_registry.register_context("onnx_int8", TFLiteContext(variant="onnx_int8"))
+        
+        assert mock_registry.create_model_context("test_model", "1.0.0", "onnx_int8") is None
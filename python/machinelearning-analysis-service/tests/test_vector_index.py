@@ -0,0 +1,167 @@
+"""
+Testes para os índices de similaridade vetorial.
+"""
+
+import os
+
+import numpy as np
+import pytest
+import tensorflow as tf
+
+from src.indexes import FlatIndex, IVFIndex, get_index
+from src.core.context import TensorFlowContext
+from src.models.generic.generic_model import GenericModel
+
+
+def _clustered_vectors(num_vectors=5000, dimension=32, num_clusters=40, seed=0):
+    """Gera vetores agrupados em torno de centros aleatórios."""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(num_clusters, dimension))
+    vectors = centers[rng.integers(0, num_clusters, num_vectors)] + 0.3 * rng.normal(size=(num_vectors, dimension))
+    return vectors.astype(np.float32)
+
+
+class TestFlatIndex:
+    """Testes para o índice de força bruta."""
+    
+    def test_add_search_remove(self):
+        """Testa inserção, busca exata, substituição e remoção."""
+        index = FlatIndex(3)
+        index.add(["a", "b", "c"], [[1, 0, 0], [0, 1, 0], [0.9, 0.1, 0]])
+        
+        results = index.search([[1, 0, 0]], k=2)
+        assert [vector_id for vector_id, _ in results[0]] == ["a", "c"]
+        assert np.isclose(results[0][0][1], 1.0)
+        
+        # Substituir o vetor de "c" e remover "a"
+        index.add(["c"], [[0, 0, 1]])
+        assert index.remove(["a", "missing"]) == 1
+        assert len(index) == 2
+        
+        results = index.search([[0, 0, 1]], k=5)
+        assert [vector_id for vector_id, _ in results[0]] == ["c", "b"]
+    
+    def test_persistence(self, tmp_path):
+        """Testa que o índice salvo é recarregado do disco com mapeamento em memória."""
+        vectors = _clustered_vectors(2000)
+        ids = [f"v{i}" for i in range(len(vectors))]
+        
+        index = FlatIndex(32, str(tmp_path / "flat"))
+        index.add(ids, vectors)
+        index.remove(ids[:1000])
+        index.save()
+        
+        reloaded = FlatIndex(32, str(tmp_path / "flat"))
+        assert len(reloaded) == 1000
+        assert isinstance(reloaded._vectors, np.memmap)
+        assert reloaded.search(vectors[1500], k=1)[0][0][0] == "v1500"
+        assert reloaded.search(vectors[0], k=1)[0][0][0] != "v0"
+    
+    def test_incremental_id_log(self, tmp_path):
+        """Testa que saves sucessivos só acrescentam alterações ao log de identificadores."""
+        vectors = _clustered_vectors(3000)
+        path = tmp_path / "flat"
+        
+        index = FlatIndex(32, str(path))
+        index.add([f"v{i}" for i in range(2000)], vectors[:2000])
+        index.save()
+        snapshot = (path / "ids.1.json").read_bytes()
+        
+        index.add(["v2000", "v2001"], vectors[2000:2002])
+        index.remove(["v5"])
+        index.save()
+        assert (path / "ids.1.json").read_bytes() == snapshot
+        assert len((path / "ids.1.log").read_text(encoding="utf-8").splitlines()) == 3
+        
+        reloaded = FlatIndex(32, str(path))
+        assert len(reloaded) == 2001
+        assert reloaded.search(vectors[2001], k=1)[0][0][0] == "v2001"
+        assert "v5" not in reloaded._rows
+        
+        # A compactação grava um novo retrato e descarta o log anterior
+        reloaded.remove([f"v{i}" for i in range(1000)])
+        reloaded.save()
+        assert sorted(os.listdir(path)) == ["ids.2.json", "meta.json", "vectors.npy"]
+        assert len(FlatIndex(32, str(path))) == 1002
+    
+    def test_get_index_reloads_type(self, tmp_path, monkeypatch):
+        """Testa que get_index recupera o índice salvo com o tipo e parâmetros originais."""
+        import src.indexes as indexes
+        monkeypatch.setattr(indexes, "VECTOR_INDEX_DIR", str(tmp_path))
+        monkeypatch.setattr(indexes, "_indexes", {})
+        
+        index = get_index("products", dimension=32, index_type="ivf", nlist=16, nprobe=4)
+        index.add([f"v{i}" for i in range(1000)], _clustered_vectors(1000))
+        index.save()
+        
+        monkeypatch.setattr(indexes, "_indexes", {})
+        reloaded = get_index("products")
+        assert isinstance(reloaded, IVFIndex)
+        assert reloaded.nlist == 16 and reloaded.nprobe == 4
+        assert len(reloaded) == 1000
+        assert get_index("unknown") is None
+        
+        for name in (".", "..", ".hidden", "a/b", "products\n"):
+            with pytest.raises(ValueError):
+                get_index(name, dimension=32)
+
+
+class TestIVFIndex:
+    """Testes para o índice de arquivo invertido."""
+    
+    def test_recall_against_flat(self, tmp_path):
+        """Testa a revocação do IVF em relação à busca exata e a persistência."""
+        vectors = _clustered_vectors()
+        ids = [f"v{i}" for i in range(len(vectors))]
+        queries = vectors[:100] + 0.05
+        
+        flat_index = FlatIndex(32)
+        flat_index.add(ids, vectors)
+        ivf_index = IVFIndex(32, str(tmp_path / "ivf"), nlist=32, nprobe=8)
+        ivf_index.add(ids, vectors)
+        assert ivf_index.is_trained
+        
+        def recall(index):
+            hits = 0
+            for exact, approximate in zip(flat_index.search(queries, k=10), index.search(queries, k=10)):
+                hits += len({i for i, _ in exact} & {i for i, _ in approximate})
+            return hits / (10 * len(queries))
+        
+        assert recall(ivf_index) >= 0.9
+        
+        ivf_index.save()
+        reloaded = IVFIndex(32, str(tmp_path / "ivf"), nlist=32, nprobe=8)
+        assert reloaded.is_trained
+        assert recall(reloaded) >= 0.9
+
+
+class TestEmbeddingModel:
+    """Testes para a extração de embeddings."""
+    
+    def test_embedding_from_layer(self, tmp_path):
+        """Testa que o embedding é a saída normalizada da camada configurada."""
+        keras_model = tf.keras.Sequential([
+            tf.keras.Input((16, 16, 3)),
+            tf.keras.layers.Conv2D(8, 3, activation="relu"),
+            tf.keras.layers.GlobalAveragePooling2D(name="pool"),
+            tf.keras.layers.Dense(3, activation="softmax")
+        ])
+        model_path = str(tmp_path / "embedder.keras")
+        keras_model.save(model_path)
+        
+        model = GenericModel(
+            model_id="embedder",
+            version="1.0.0",
+            model_path=model_path,
+            task_type="embedding",
+            input_shape=[None, 16, 16, 3],
+            preprocessing_config={"target_size": [16, 16], "normalize": False},
+            postprocessing_config={"embedding_layer": "pool"}
+        )
+        model.load(TensorFlowContext())
+        
+        image = np.random.default_rng(0).uniform(0, 255, (16, 16, 3)).astype(np.float32)
+        result = model.postprocess(model.predict(model.preprocess(image)))
+        
+        assert result["dimension"] == 8
+        assert np.isclose(np.linalg.norm(result["embedding"]), 1.0, atol=1e-5)